@@ -74,7 +74,7 @@ def assignment(course_class):
 class TestAssignmentCreateView:
     """과제 생성 API 테스트"""
 
-    @patch("assignments.views.boto3.client")
+    @patch("core.clients.boto3.client")
     def test_create_assignment_success(self, mock_boto3, api_client, course_class, student, enrollment):
         """과제 생성 성공 테스트"""
         # Mock S3 presigned URL
@@ -114,7 +114,7 @@ class TestAssignmentCreateView:
         assert personal_assignment.exists()
         assert personal_assignment.first().status == PersonalAssignment.Status.NOT_STARTED
 
-    @patch("assignments.views.boto3.client")
+    @patch("core.clients.boto3.client")
     def test_create_assignment_multiple_students(self, mock_boto3, api_client, course_class):
         """여러 학생이 등록된 클래스에 과제 생성 테스트"""
         # Mock S3
@@ -149,7 +149,7 @@ class TestAssignmentCreateView:
         for student in students:
             assert personal_assignments.filter(student=student).exists()
 
-    @patch("assignments.views.boto3.client")
+    @patch("core.clients.boto3.client")
     def test_create_assignment_no_enrolled_students(self, mock_boto3, api_client, course_class):
         """등록된 학생이 없는 클래스에 과제 생성 테스트"""
         # Mock S3
@@ -173,7 +173,7 @@ class TestAssignmentCreateView:
         assignment = Assignment.objects.get(id=response.data["data"]["assignment_id"])
         assert PersonalAssignment.objects.filter(assignment=assignment).count() == 0
 
-    @patch("assignments.views.boto3.client")
+    @patch("core.clients.boto3.client")
     def test_create_assignment_only_enrolled_students(self, mock_boto3, api_client, course_class):
         """ENROLLED 상태 학생만 PersonalAssignment 생성 테스트"""
         # Mock S3
@@ -227,7 +227,7 @@ class TestAssignmentCreateView:
         assert response.data["success"] is False
         assert "Invalid class_id" in response.data["error"]
 
-    @patch("assignments.views.boto3.client")
+    @patch("core.clients.boto3.client")
     def test_create_assignment_invalid_due_at(self, mock_boto3, api_client, course_class):
         """잘못된 due_at 형식으로 과제 생성 테스트"""
         url = reverse("assignment-create")
@@ -244,7 +244,7 @@ class TestAssignmentCreateView:
         assert response.data["success"] is False
         assert "Invalid due_at format" in response.data["error"]
 
-    @patch("assignments.views.boto3.client")
+    @patch("core.clients.boto3.client")
     def test_create_assignment_missing_required_fields(self, mock_boto3, api_client):
         """필수 필드 누락 시 과제 생성 테스트"""
         url = reverse("assignment-create")
@@ -257,7 +257,7 @@ class TestAssignmentCreateView:
 
         assert response.status_code == status.HTTP_400_BAD_REQUEST
 
-    @patch("assignments.views.boto3.client")
+    @patch("core.clients.boto3.client")
     def test_create_assignment_s3_failure(self, mock_boto3, api_client, course_class):
         """S3 presigned URL 생성 실패 시 테스트"""
         # Mock S3 에러
@@ -281,7 +281,7 @@ class TestAssignmentCreateView:
         # Assignment가 rollback 되었는지 확인
         assert Assignment.objects.filter(title="S3 Failed Assignment").count() == 0
 
-    @patch("assignments.views.boto3.client")
+    @patch("core.clients.boto3.client")
     def test_create_assignment_with_description(self, mock_boto3, api_client, course_class):
         """설명이 포함된 과제 생성 테스트"""
         # Mock S3
@@ -306,7 +306,7 @@ class TestAssignmentCreateView:
         assignment = Assignment.objects.get(id=response.data["data"]["assignment_id"])
         assert assignment.description == description
 
-    @patch("assignments.views.boto3.client")
+    @patch("core.clients.boto3.client")
     def test_create_assignment_response_format(self, mock_boto3, api_client, course_class):
         """응답 형식 검증 테스트"""
         # Mock S3
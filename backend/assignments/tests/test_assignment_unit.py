@@ -25,7 +25,7 @@ class TestAssignmentCreateViewUnit:
     @patch("assignments.views.settings")
     @patch("assignments.views.logger")
     @patch("assignments.views.Material.objects")
-    @patch("assignments.views.boto3.client")
+    @patch("core.clients.boto3.client")
     @patch("assignments.views.PersonalAssignment")
     @patch("assignments.views.Subject.objects")
     @patch("assignments.views.Enrollment.objects")
@@ -200,7 +200,7 @@ class TestAssignmentCreateViewUnit:
     @patch("assignments.views.uuid.uuid4")
     @patch("assignments.views.settings")
     @patch("assignments.views.logger")
-    @patch("assignments.views.boto3.client")
+    @patch("core.clients.boto3.client")
     @patch("assignments.views.Subject.objects")
     @patch("assignments.views.Enrollment.objects")
     @patch("assignments.views.Assignment.objects")
@@ -279,7 +279,7 @@ class TestAssignmentCreateViewUnit:
     @patch("assignments.views.settings")
     @patch("assignments.views.logger")
     @patch("assignments.views.Material.objects")
-    @patch("assignments.views.boto3.client")
+    @patch("core.clients.boto3.client")
     @patch("assignments.views.PersonalAssignment")
     @patch("assignments.views.Subject.objects")
     @patch("assignments.views.Enrollment.objects")
@@ -247,7 +247,7 @@ def test_assignment_simple_views_all(mock_serializer, mock_pa_objects):
 @patch("assignments.views.Assignment.objects")
 @patch("assignments.views.Enrollment.objects")
 @patch("assignments.views.PersonalAssignment")
-@patch("assignments.views.boto3.client")
+@patch("core.clients.boto3.client")
 def test_due_at_make_aware_branch(
     mock_boto3,
     mock_personal_assignment,
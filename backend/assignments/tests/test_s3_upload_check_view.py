@@ -67,7 +67,7 @@ def pdf_material(assignment):
 class TestS3UploadCheckView:
     """S3UploadCheckView 테스트"""
 
-    @patch("assignments.views.boto3.client")
+    @patch("core.clients.boto3.client")
     @patch("assignments.views.settings")
     def test_s3_check_file_exists(self, mock_settings, mock_boto3, api_client, assignment, pdf_material):
         """S3에 파일이 존재하는 경우 테스트"""
@@ -101,7 +101,7 @@ class TestS3UploadCheckView:
         # S3 client 호출 확인
         mock_s3_client.head_object.assert_called_once_with(Bucket="test-bucket", Key=pdf_material.s3_key)
 
-    @patch("assignments.views.boto3.client")
+    @patch("core.clients.boto3.client")
     @patch("assignments.views.settings")
     def test_s3_check_file_not_exists(self, mock_settings, mock_boto3, api_client, assignment, pdf_material):
         """S3에 파일이 존재하지 않는 경우 테스트"""
@@ -153,7 +153,7 @@ class TestS3UploadCheckView:
         assert response.data["success"] is False
         assert "PDF 자료가 없습니다" in response.data["message"]
 
-    @patch("assignments.views.boto3.client")
+    @patch("core.clients.boto3.client")
     @patch("assignments.views.settings")
     def test_s3_check_exception_handling(self, mock_settings, mock_boto3, api_client, assignment, pdf_material):
         """S3 확인 중 예외 발생 테스트"""
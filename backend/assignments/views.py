@@ -1,8 +1,8 @@
 import logging
 import uuid
 
-import boto3
 from catalog.models import Subject
+from core.clients import get_s3_client
 from courses.models import CourseClass, Enrollment
 from dateutil import parser
 from django.conf import settings
@@ -340,13 +340,7 @@ class AssignmentCreateView(APIView):  # POST /assignments
         # S3 presigned URL 생성
         s3_key = f"pdf/{data['class_id']}/{assignment.id}/{uuid.uuid4()}.pdf"
 
-        s3_client = boto3.client(
-            "s3",
-            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-            region_name=settings.AWS_REGION,
-            endpoint_url=f"https://s3.{settings.AWS_REGION}.amazonaws.com",
-        )
+        s3_client = get_s3_client(endpoint_url=f"https://s3.{settings.AWS_REGION}.amazonaws.com")
 
         try:
             presigned_url = s3_client.generate_presigned_url(
@@ -487,14 +481,8 @@ class S3UploadCheckView(APIView):
                     status_code=status.HTTP_404_NOT_FOUND,
                 )
 
-            # S3 클라이언트 생성
-            s3_client = boto3.client(
-                "s3",
-                aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                region_name=settings.AWS_REGION,
-                endpoint_url=f"https://s3.{settings.AWS_REGION}.amazonaws.com",
-            )
+            # S3 클라이언트 (프로세스 공용 풀)
+            s3_client = get_s3_client(endpoint_url=f"https://s3.{settings.AWS_REGION}.amazonaws.com")
 
             # S3에서 파일 존재 여부 확인
             try:
@@ -0,0 +1,10 @@
+import pytest
+from core import clients
+
+
+@pytest.fixture(autouse=True)
+def reset_client_pool():
+    """테스트마다 mock 클라이언트가 프로세스 공용 클라이언트 풀에 남지 않도록 초기화"""
+    clients.reset()
+    yield
+    clients.reset()
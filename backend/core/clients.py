@@ -0,0 +1,175 @@
+"""
+프로세스 단위 외부 API 클라이언트 풀 (OpenAI / S3 / Google Speech / 일반 HTTP)
+
+요청마다 ChatOpenAI / boto3.client / requests.post를 새로 만들면 TLS handshake와 클라이언트 초기화
+(boto3는 endpoint / credential 해석까지)를 매번 다시 하게 됩니다. 여기서 만든 클라이언트는 프로세스당
+한 번만 생성되고 keep-alive 연결을 재사용합니다.
+
+- get_openai_http_client() / get_chat_model(...): 공유 httpx 연결 풀을 쓰는 ChatOpenAI (설정별로 하나)
+- get_s3_client(endpoint_url=None): 연결 수 / timeout / TCP keep-alive를 설정한 boto3 S3 클라이언트 (스레드 안전)
+- get_speech_client(): keep-alive ping을 켠 gRPC 채널의 SpeechClient
+- get_http_session(): host별 연결 풀을 쓰는 requests.Session (OpenAI REST 직접 호출 등)
+- 연결 수 / timeout은 환경 변수(CLIENT_*)로 조정
+- fork된 자식 프로세스(gunicorn --preload 워커)에서는 부모의 소켓 / gRPC 채널을 쓰지 않도록 모두 버리고 다시 생성
+"""
+
+import logging
+import os
+import threading
+import time
+
+import boto3
+import httpx
+import requests
+from botocore.config import Config as BotoConfig
+from django.conf import settings
+from google.cloud import speech
+from langchain_openai import ChatOpenAI
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# host별 최대 연결 수 (gthread 워커의 스레드 수 + 파이프라인 풀 크기 이상으로)
+CLIENT_MAX_CONNECTIONS = int(os.getenv("CLIENT_MAX_CONNECTIONS", "20"))
+CLIENT_CONNECT_TIMEOUT = float(os.getenv("CLIENT_CONNECT_TIMEOUT", "5"))
+CLIENT_READ_TIMEOUT = float(os.getenv("CLIENT_READ_TIMEOUT", "60"))
+# 사용하지 않는 keep-alive 연결을 유지하는 시간 (초)
+CLIENT_KEEPALIVE_SECONDS = float(os.getenv("CLIENT_KEEPALIVE_SECONDS", "60"))
+# gRPC keep-alive ping 간격 (ms, 유휴 연결이 LB / NAT에서 끊기지 않도록)
+GRPC_KEEPALIVE_MS = int(os.getenv("GRPC_KEEPALIVE_MS", "30000"))
+
+_lock = threading.RLock()
+_clients = {}
+
+
+def _get_or_create(key, factory, label=None):
+    """label: 로그에 남길 이름 (key에 API key 등 비밀 값이 들어가는 경우 key 대신 사용)"""
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            start = time.perf_counter()
+            client = factory()
+            _clients[key] = client
+            logger.info(f"[ClientPool] 생성 완료 - key={label or key}, {time.perf_counter() - start:.2f}s")
+    return client
+
+
+def get_openai_http_client() -> httpx.Client:
+    """모든 ChatOpenAI가 공유하는 httpx 연결 풀"""
+    return _get_or_create(
+        "openai_http",
+        lambda: httpx.Client(
+            limits=httpx.Limits(
+                max_connections=CLIENT_MAX_CONNECTIONS,
+                max_keepalive_connections=CLIENT_MAX_CONNECTIONS,
+                keepalive_expiry=CLIENT_KEEPALIVE_SECONDS,
+            ),
+            timeout=httpx.Timeout(CLIENT_READ_TIMEOUT, connect=CLIENT_CONNECT_TIMEOUT),
+        ),
+    )
+
+
+def get_chat_model(model: str, temperature: float, **kwargs) -> ChatOpenAI:
+    """
+    설정(model / temperature / kwargs)별로 하나씩 만든 ChatOpenAI (공유 httpx 연결 풀 사용)
+    API key는 OPENAI_API_KEY 환경 변수에서 읽으므로 넘기지 않음 (넘기더라도 로그에는 kwargs 이름만 남김)
+    """
+    key = ("chat", model, temperature, repr(sorted(kwargs.items())))
+    return _get_or_create(
+        key,
+        lambda: ChatOpenAI(model=model, temperature=temperature, http_client=get_openai_http_client(), **kwargs),
+        label=f"chat:{model}:{temperature} ({', '.join(sorted(kwargs))})",
+    )
+
+
+def get_s3_client(endpoint_url: str = None):
+    """S3 클라이언트 (boto3 클라이언트는 스레드 안전, 생성은 lock 안에서 한 번만)"""
+    return _get_or_create(
+        ("s3", endpoint_url),
+        lambda: boto3.client(
+            "s3",
+            aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
+            aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+            region_name=settings.AWS_REGION,
+            endpoint_url=endpoint_url,
+            config=BotoConfig(
+                max_pool_connections=CLIENT_MAX_CONNECTIONS,
+                connect_timeout=CLIENT_CONNECT_TIMEOUT,
+                read_timeout=CLIENT_READ_TIMEOUT,
+                tcp_keepalive=True,
+                retries={"max_attempts": 3, "mode": "standard"},
+            ),
+        ),
+    )
+
+
+def _create_speech_client():
+    from google.cloud.speech_v1.services.speech.transports import SpeechGrpcTransport
+
+    options = [
+        ("grpc.keepalive_time_ms", GRPC_KEEPALIVE_MS),
+        ("grpc.keepalive_timeout_ms", 10000),
+        ("grpc.keepalive_permit_without_calls", 1),
+        ("grpc.max_send_message_length", -1),
+        ("grpc.max_receive_message_length", -1),
+    ]
+    try:
+        channel = SpeechGrpcTransport.create_channel(options=options)
+    except Exception as e:
+        # 인증 정보를 채널 생성 시점에 찾지 못한 경우: 기본 채널로 생성 (인증 오류는 호출 시 그대로 발생)
+        logger.warning(f"[ClientPool] Speech gRPC 채널 옵션 적용 실패, 기본 채널 사용: {e}")
+        return speech.SpeechClient()
+    return speech.SpeechClient(transport=SpeechGrpcTransport(channel=channel))
+
+
+def get_speech_client() -> speech.SpeechClient:
+    """Google Speech-to-Text 클라이언트 (gRPC 채널 하나를 프로세스 내에서 공유)"""
+    return _get_or_create("speech", _create_speech_client)
+
+
+def get_http_session() -> requests.Session:
+    """host별 keep-alive 연결 풀을 쓰는 requests.Session (연결 실패만 재시도)"""
+
+    def create():
+        session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=10,
+            pool_maxsize=CLIENT_MAX_CONNECTIONS,
+            max_retries=Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.3),
+        )
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
+    return _get_or_create("http_session", create)
+
+
+def http_timeout(read: float = None):
+    """requests용 (connect, read) timeout"""
+    return (CLIENT_CONNECT_TIMEOUT, read if read is not None else CLIENT_READ_TIMEOUT)
+
+
+def is_created(key) -> bool:
+    return key in _clients
+
+
+def reset():
+    """생성된 클라이언트를 모두 버림 (테스트 / 설정 변경용, 다음 호출 때 다시 생성)"""
+    with _lock:
+        _clients.clear()
+
+
+def _reset_after_fork():
+    # 부모 프로세스의 소켓 / gRPC 채널은 닫지 않고(부모가 계속 사용) 참조만 버림
+    global _lock
+    _lock = threading.RLock()
+    _clients.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,60 @@
+"""
+core.clients (프로세스 공용 외부 API 클라이언트 풀) 테스트
+- 같은 설정의 클라이언트는 한 번만 생성해서 재사용
+- 연결 수 / timeout / keep-alive 설정
+- fork된 자식 프로세스에서는 새로 생성
+"""
+
+from unittest.mock import patch
+
+from core import clients
+
+
+class TestClientPool:
+    def test_s3_client_reused_per_endpoint(self):
+        s3 = clients.get_s3_client()
+
+        assert clients.get_s3_client() is s3
+        assert clients.get_s3_client(endpoint_url="https://s3.ap-northeast-2.amazonaws.com") is not s3
+        config = s3.meta.config
+        assert config.max_pool_connections == clients.CLIENT_MAX_CONNECTIONS
+        assert config.tcp_keepalive is True
+        assert config.connect_timeout == clients.CLIENT_CONNECT_TIMEOUT
+
+    def test_chat_models_share_http_client(self):
+        quiz_llm = clients.get_chat_model(model="gpt-4o-mini", temperature=0.5, timeout=60.0)
+        summary_llm = clients.get_chat_model(model="gpt-4o-mini", temperature=0.2)
+
+        assert clients.get_chat_model(model="gpt-4o-mini", temperature=0.5, timeout=60.0) is quiz_llm
+        assert summary_llm is not quiz_llm
+        assert quiz_llm.http_client is summary_llm.http_client is clients.get_openai_http_client()
+
+    def test_chat_model_log_omits_kwarg_values(self):
+        with patch.object(clients.logger, "info") as log:
+            clients.get_chat_model(model="gpt-4o-mini", temperature=0.5, api_key="sk-secret", timeout=60.0)
+
+        message = log.call_args.args[0]
+        assert "gpt-4o-mini" in message and "api_key" in message
+        assert "sk-secret" not in message
+
+    def test_http_session_pool_size(self):
+        session = clients.get_http_session()
+
+        assert clients.get_http_session() is session
+        assert session.get_adapter("https://api.openai.com")._pool_maxsize == clients.CLIENT_MAX_CONNECTIONS
+        assert clients.http_timeout(30) == (clients.CLIENT_CONNECT_TIMEOUT, 30)
+
+    @patch("core.clients.speech.SpeechClient")
+    def test_speech_client_created_once(self, mock_client_class):
+        assert clients.get_speech_client() is clients.get_speech_client()
+        mock_client_class.assert_called_once()
+
+    def test_clients_recreated_after_fork(self):
+        s3 = clients.get_s3_client()
+        http_client = clients.get_openai_http_client()
+
+        clients._reset_after_fork()
+
+        assert not clients.is_created(("s3", None))
+        assert clients.get_s3_client() is not s3
+        assert clients.get_openai_http_client() is not http_client
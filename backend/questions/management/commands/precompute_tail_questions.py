@@ -0,0 +1,27 @@
+from assignments.models import Assignment
+from django.core.management.base import BaseCommand, CommandError
+from questions.utils.tail_precompute import precompute_tail_questions
+
+
+class Command(BaseCommand):
+    help = "과제의 base 문제마다 bucket(A~D)별 꼬리 질문을 미리 생성합니다. (이미 생성된 항목은 건너뜀)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--assignment-id", type=int, action="append", help="대상 과제 ID (여러 번 지정 가능)")
+        parser.add_argument("--all", action="store_true", help="문제가 생성된 모든 과제")
+
+    def handle(self, *args, **options):
+        if options["all"]:
+            assignment_ids = list(Assignment.objects.filter(is_question_created=True).values_list("id", flat=True))
+        elif options["assignment_id"]:
+            assignment_ids = options["assignment_id"]
+        else:
+            raise CommandError("--assignment-id 또는 --all 중 하나를 지정해주세요.")
+
+        total = 0
+        for assignment_id in assignment_ids:
+            created = precompute_tail_questions(assignment_id)
+            total += created
+            self.stdout.write(f"  - assignment_id={assignment_id}: 꼬리 질문 {created}개 생성")
+
+        self.stdout.write(self.style.SUCCESS(f"꼬리 질문 사전 생성 완료 - 총 {total}개"))
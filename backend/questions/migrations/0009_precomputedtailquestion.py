@@ -0,0 +1,62 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:00
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assignments", "0007_remove_assignment_assignments_visible_549811_idx_and_more"),
+        ("questions", "0008_merge_20251026_1113"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PrecomputedTailQuestion",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                (
+                    "question_hash",
+                    models.CharField(help_text="base 문제 내용(question + model_answer) 해시", max_length=64),
+                ),
+                (
+                    "bucket",
+                    models.CharField(
+                        choices=[
+                            ("A", "Correct / High confidence"),
+                            ("B", "Correct / Low confidence"),
+                            ("C", "Incorrect / High confidence"),
+                            ("D", "Incorrect / Low confidence"),
+                        ],
+                        max_length=1,
+                    ),
+                ),
+                ("topic", models.CharField(blank=True, max_length=255)),
+                ("content", models.TextField()),
+                ("model_answer", models.TextField(blank=True)),
+                ("explanation", models.TextField(blank=True)),
+                (
+                    "difficulty",
+                    models.CharField(
+                        choices=[("easy", "Easy"), ("medium", "Medium"), ("hard", "Hard")],
+                        default="medium",
+                        max_length=20,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "assignment",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="precomputed_tail_questions",
+                        to="assignments.assignment",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "precomputed_tail_question",
+                "unique_together": {("question_hash", "bucket")},
+            },
+        ),
+    ]
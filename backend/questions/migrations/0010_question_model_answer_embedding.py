@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("questions", "0009_precomputedtailquestion"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="question",
+            name="model_answer_embedding",
+            field=models.BinaryField(
+                blank=True, help_text="모범답안 SBERT 임베딩 (float16, 로컬 정오답 판정용)", null=True
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-17 04:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("assignments", "0007_remove_assignment_assignments_visible_549811_idx_and_more"),
+        ("questions", "0010_question_model_answer_embedding"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="precomputedtailquestion",
+            name="assignment",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="처음 생성한 과제 (출처 기록용, 과제가 삭제되어도 꼬리 질문은 유지)",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="precomputed_tail_questions",
+                to="assignments.assignment",
+            ),
+        ),
+    ]
@@ -19,6 +19,9 @@ class Question(models.Model):
     recalled_num = models.IntegerField(help_text="몇 번째 (tail) question인지 나타내는 숫자")
     explanation = models.TextField(blank=True, null=True)
     model_answer = models.TextField(blank=True)
+    model_answer_embedding = models.BinaryField(
+        null=True, blank=True, editable=False, help_text="모범답안 SBERT 임베딩 (float16, 로컬 정오답 판정용)"
+    )
     difficulty = models.CharField(max_length=20, choices=Difficulty.choices, default=Difficulty.MEDIUM)
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -38,3 +41,45 @@ class Question(models.Model):
 
     def __str__(self) -> str:
         return f"Q{self.number} of {self.personal_assignment}"
+
+
+class PrecomputedTailQuestion(models.Model):
+    """
+    base 문제 생성 직후 bucket(A/B/C/D)별로 미리 만들어 둔 꼬리 질문 후보
+
+    같은 base 문제가 학생마다 복사되므로 문제 내용 해시(question_hash)로 저장하고,
+    recalled_num=0 답안 제출 시 정오답 판정 + 점수로 정한 bucket으로 바로 조회합니다.
+    같은 내용의 문제를 쓰는 다른 과제도 공유하므로, 처음 만든 과제가 삭제되어도 지우지 않습니다 (assignment는 출처 기록용).
+    """
+
+    class Bucket(models.TextChoices):
+        A = "A", "Correct / High confidence"
+        B = "B", "Correct / Low confidence"
+        C = "C", "Incorrect / High confidence"
+        D = "D", "Incorrect / Low confidence"
+
+    assignment = models.ForeignKey(
+        "assignments.Assignment",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="precomputed_tail_questions",
+        help_text="처음 생성한 과제 (출처 기록용, 과제가 삭제되어도 꼬리 질문은 유지)",
+    )
+    question_hash = models.CharField(max_length=64, help_text="base 문제 내용(question + model_answer) 해시")
+    bucket = models.CharField(max_length=1, choices=Bucket.choices)
+    topic = models.CharField(max_length=255, blank=True)
+    content = models.TextField()
+    model_answer = models.TextField(blank=True)
+    explanation = models.TextField(blank=True)
+    difficulty = models.CharField(
+        max_length=20, choices=Question.Difficulty.choices, default=Question.Difficulty.MEDIUM
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "precomputed_tail_question"
+        unique_together = ("question_hash", "bucket")
+
+    def __str__(self) -> str:
+        return f"Precomputed tail ({self.bucket}) for {self.question_hash[:8]}"
@@ -5,12 +5,12 @@ from unittest.mock import patch
 import pytest
 from langchain_core.exceptions import OutputParserException
 from langchain_core.messages import AIMessage
-from questions.utils.base_question_generator import generate_base_quizzes
+from questions.utils.base_question_generator import FEW_SHOT_EXAMPLES_JSON, generate_base_quizzes, multi_quiz_prompt
 
 
 @pytest.mark.django_db
 class TestBaseQuestionGenerator:
-    @patch("questions.utils.base_question_generator.ChatOpenAI")
+    @patch("core.clients.ChatOpenAI")
     def test_generate_quizzes_normal(self, mock_llm_class):
         """정상 생성 케이스"""
         mock_instance = mock_llm_class.return_value
@@ -39,7 +39,7 @@ class TestBaseQuestionGenerator:
 
         mock_instance.invoke.assert_called_once()
 
-    @patch("questions.utils.base_question_generator.ChatOpenAI")
+    @patch("core.clients.ChatOpenAI")
     def test_generate_quizzes_invalid_json(self, mock_llm_class):
         """잘못된 JSON 응답 → 예외 발생 테스트"""
         mock_instance = mock_llm_class.return_value
@@ -51,7 +51,7 @@ class TestBaseQuestionGenerator:
         assert "Invalid json" in str(excinfo.value) or "INVALID_JSON" in str(excinfo.value)
         mock_instance.invoke.assert_called_once()
 
-    @patch("questions.utils.base_question_generator.ChatOpenAI")
+    @patch("core.clients.ChatOpenAI")
     def test_generate_quizzes_interpreter_shutdown(self, mock_llm_class):
         """Python 인터프리터 종료 중 예외 테스트 (line 128)"""
         # _exiting 플래그 설정
@@ -65,7 +65,7 @@ class TestBaseQuestionGenerator:
         finally:
             sys._exiting = original_exiting
 
-    @patch("questions.utils.base_question_generator.ChatOpenAI")
+    @patch("core.clients.ChatOpenAI")
     def test_generate_quizzes_unexpected_json_structure(self, mock_llm_class):
         """예상치 못한 JSON 구조 테스트 (line 172)"""
         mock_instance = mock_llm_class.return_value
@@ -76,7 +76,7 @@ class TestBaseQuestionGenerator:
             generate_base_quizzes("Sample Material", n=1)
         assert "Unexpected JSON structure" in str(excinfo.value)
 
-    @patch("questions.utils.base_question_generator.ChatOpenAI")
+    @patch("core.clients.ChatOpenAI")
     def test_generate_quizzes_json_decode_error(self, mock_llm_class):
         """JSON 파싱 오류 테스트 (line 183-190)"""
         mock_instance = mock_llm_class.return_value
@@ -86,7 +86,7 @@ class TestBaseQuestionGenerator:
             generate_base_quizzes("Sample Material", n=1)
         assert "Invalid json output" in str(excinfo.value)
 
-    @patch("questions.utils.base_question_generator.ChatOpenAI")
+    @patch("core.clients.ChatOpenAI")
     def test_generate_quizzes_exception_during_parsing(self, mock_llm_class):
         """파싱 중 다른 예외 테스트 (line 183-190)"""
         mock_instance = mock_llm_class.return_value
@@ -98,7 +98,7 @@ class TestBaseQuestionGenerator:
                 generate_base_quizzes("Sample Material", n=1)
             assert "Parsing error" in str(excinfo.value)
 
-    @patch("questions.utils.base_question_generator.ChatOpenAI")
+    @patch("core.clients.ChatOpenAI")
     def test_generate_quizzes_runtime_error_retry(self, mock_llm_class):
         """RuntimeError 재시도 테스트 (line 193-201)"""
         mock_instance = mock_llm_class.return_value
@@ -117,7 +117,7 @@ class TestBaseQuestionGenerator:
             assert len(quizzes) == 1
             assert mock_instance.invoke.call_count == 2
 
-    @patch("questions.utils.base_question_generator.ChatOpenAI")
+    @patch("core.clients.ChatOpenAI")
     def test_generate_quizzes_runtime_error_max_retries(self, mock_llm_class):
         """RuntimeError 최대 재시도 후 실패 테스트 (line 193-201)"""
         mock_instance = mock_llm_class.return_value
@@ -130,7 +130,7 @@ class TestBaseQuestionGenerator:
             # 3번 재시도
             assert mock_instance.invoke.call_count == 3
 
-    @patch("questions.utils.base_question_generator.ChatOpenAI")
+    @patch("core.clients.ChatOpenAI")
     def test_generate_quizzes_timeout_retry(self, mock_llm_class):
         """타임아웃 재시도 테스트 (line 208-210)"""
         mock_instance = mock_llm_class.return_value
@@ -149,7 +149,7 @@ class TestBaseQuestionGenerator:
             assert len(quizzes) == 1
             assert mock_instance.invoke.call_count == 2
 
-    @patch("questions.utils.base_question_generator.ChatOpenAI")
+    @patch("core.clients.ChatOpenAI")
     def test_generate_quizzes_all_retries_failed(self, mock_llm_class):
         """모든 재시도 실패 후 예외 발생 테스트"""
         mock_instance = mock_llm_class.return_value
@@ -165,3 +165,20 @@ class TestBaseQuestionGenerator:
             assert "timeout error" in str(excinfo.value)
             # 3번 재시도 (max_retries = 3)
             assert mock_instance.invoke.call_count == 3
+
+
+class TestMultiQuizPromptPrefix:
+    def test_static_guidance_precedes_variable_content(self):
+        """provider prefix 캐시: 문제 수 / 학습 자료만 달라지고 그 앞의 지침과 예시는 byte 단위로 동일"""
+        a = multi_quiz_prompt.format(n=3, examples=FEW_SHOT_EXAMPLES_JSON, learning_material="광합성 자료")
+        b = multi_quiz_prompt.format(n=5, examples=FEW_SHOT_EXAMPLES_JSON, learning_material="뉴턴 법칙 자료")
+
+        n = 0
+        while a[n] == b[n]:
+            n += 1
+        prefix = a[:n].encode("utf-8")
+
+        assert prefix == b[:n].encode("utf-8")
+        assert FEW_SHOT_EXAMPLES_JSON.encode("utf-8") in prefix
+        assert b"### Output Format (JSON)" in prefix
+        assert a[:n].endswith("# Number of Questions: ")
@@ -41,7 +41,7 @@ class TestProcessPage:
 
     @patch("questions.utils.pdf_to_text.encode_image_to_base64")
     @patch("questions.utils.pdf_to_text.vision_summary_prompt")
-    @patch("questions.utils.pdf_to_text.ChatOpenAI")
+    @patch("core.clients.ChatOpenAI")
     def test_process_page_success(self, mock_llm_class, mock_prompt, mock_encode):
         """정상적인 페이지 처리 테스트"""
         from questions.utils.pdf_to_text import _process_page
@@ -71,7 +71,7 @@ class TestSummarizePdfFromS3:
     """summarize_pdf_from_s3 테스트"""
 
     @patch("questions.utils.pdf_to_text.convert_from_path")
-    @patch("questions.utils.pdf_to_text.ChatOpenAI")
+    @patch("core.clients.ChatOpenAI")
     @patch("questions.utils.pdf_to_text.ThreadPoolExecutor")
     def test_summarize_pdf_from_s3_success(self, mock_executor, mock_llm_class, mock_convert):
         """정상적인 PDF 요약 테스트"""
@@ -121,7 +121,7 @@ class TestSummarizePdfFromS3:
                 os.unlink(tmp_path)
 
     @patch("questions.utils.pdf_to_text.convert_from_path")
-    @patch("questions.utils.pdf_to_text.ChatOpenAI")
+    @patch("core.clients.ChatOpenAI")
     def test_summarize_pdf_from_s3_error_handling(self, mock_llm_class, mock_convert):
         """PDF 요약 중 에러 처리 테스트"""
         from concurrent.futures import Future, ThreadPoolExecutor
@@ -146,7 +146,7 @@ class TestQuestionCreateView(TestCase):
     @patch("questions.views.Assignment.objects.get")
     @patch("questions.views.Material.objects.get")
     @patch("questions.views.PersonalAssignment.objects.filter")
-    @patch("questions.views.boto3.client")
+    @patch("core.clients.boto3.client")
     @patch("questions.views.tempfile.NamedTemporaryFile")
     @patch("questions.views.summarize_pdf_from_s3")
     @patch("questions.views.generate_base_quizzes")
@@ -287,7 +287,7 @@ class TestQuestionCreateView(TestCase):
 
     @patch("questions.views.Assignment.objects.get")
     @patch("questions.views.Material.objects.get")
-    @patch("questions.views.boto3.client")
+    @patch("core.clients.boto3.client")
     def test_post_s3_download_error(self, mock_boto3, mock_material_get, mock_assignment_get):
         """S3 다운로드 오류 테스트"""
         # Given
@@ -320,7 +320,7 @@ class TestQuestionCreateView(TestCase):
 
     @patch("questions.views.Assignment.objects.get")
     @patch("questions.views.Material.objects.get")
-    @patch("questions.views.boto3.client")
+    @patch("core.clients.boto3.client")
     @patch("questions.views.tempfile.NamedTemporaryFile")
     @patch("questions.views.summarize_pdf_from_s3")
     def test_post_pdf_summarization_error(
@@ -409,7 +409,7 @@ class TestQuestionCreateView(TestCase):
     @patch("questions.views.Assignment.objects.get")
     @patch("questions.views.Material.objects.get")
     @patch("questions.views.PersonalAssignment.objects.filter")
-    @patch("questions.views.boto3.client")
+    @patch("core.clients.boto3.client")
     @patch("questions.views.tempfile.NamedTemporaryFile")
     @patch("questions.views.summarize_pdf_from_s3")
     @patch("questions.views.generate_base_quizzes")
@@ -491,7 +491,7 @@ class TestQuestionCreateView(TestCase):
     @patch("questions.views.Assignment.objects.get")
     @patch("questions.views.Material.objects.get")
     @patch("questions.views.PersonalAssignment.objects.filter")
-    @patch("questions.views.boto3.client")
+    @patch("core.clients.boto3.client")
     @patch("questions.views.tempfile.NamedTemporaryFile")
     @patch("questions.views.summarize_pdf_from_s3")
     @patch("questions.views.generate_base_quizzes")
@@ -660,7 +660,7 @@ class TestQuestionCreateView(TestCase):
 
     @patch("questions.views.Assignment.objects.get")
     @patch("questions.views.Material.objects.get")
-    @patch("questions.views.boto3.client")
+    @patch("core.clients.boto3.client")
     @patch("questions.views.tempfile.NamedTemporaryFile")
     def test_post_s3_download_runtime_error_cannot_schedule(
         self, mock_tempfile, mock_boto3, mock_material_get, mock_assignment_get
@@ -696,7 +696,7 @@ class TestQuestionCreateView(TestCase):
 
     @patch("questions.views.Assignment.objects.get")
     @patch("questions.views.Material.objects.get")
-    @patch("questions.views.boto3.client")
+    @patch("core.clients.boto3.client")
     @patch("questions.views.tempfile.NamedTemporaryFile")
     def test_post_s3_download_runtime_error_other(
         self, mock_tempfile, mock_boto3, mock_material_get, mock_assignment_get
@@ -731,7 +731,7 @@ class TestQuestionCreateView(TestCase):
 
     @patch("questions.views.Assignment.objects.get")
     @patch("questions.views.Material.objects.get")
-    @patch("questions.views.boto3.client")
+    @patch("core.clients.boto3.client")
     @patch("questions.views.tempfile.NamedTemporaryFile")
     @patch("questions.views.summarize_pdf_from_s3")
     def test_post_summarize_runtime_error_interpreter_shutdown(
@@ -770,7 +770,7 @@ class TestQuestionCreateView(TestCase):
 
     @patch("questions.views.Assignment.objects.get")
     @patch("questions.views.Material.objects.get")
-    @patch("questions.views.boto3.client")
+    @patch("core.clients.boto3.client")
     @patch("questions.views.tempfile.NamedTemporaryFile")
     @patch("questions.views.summarize_pdf_from_s3")
     def test_post_summarize_runtime_error_other(
@@ -808,7 +808,7 @@ class TestQuestionCreateView(TestCase):
 
     @patch("questions.views.Assignment.objects.get")
     @patch("questions.views.Material.objects.get")
-    @patch("questions.views.boto3.client")
+    @patch("core.clients.boto3.client")
     @patch("questions.views.tempfile.NamedTemporaryFile")
     @patch("questions.views.summarize_pdf_from_s3")
     def test_post_summarize_timeout_exception(
@@ -849,7 +849,7 @@ class TestQuestionCreateView(TestCase):
 
     @patch("questions.views.Assignment.objects.get")
     @patch("questions.views.Material.objects.get")
-    @patch("questions.views.boto3.client")
+    @patch("core.clients.boto3.client")
     @patch("questions.views.tempfile.NamedTemporaryFile")
     @patch("questions.views.summarize_pdf_from_s3")
     def test_post_summarize_openai_error(
@@ -890,7 +890,7 @@ class TestQuestionCreateView(TestCase):
 
     @patch("questions.views.Assignment.objects.get")
     @patch("questions.views.Material.objects.get")
-    @patch("questions.views.boto3.client")
+    @patch("core.clients.boto3.client")
     @patch("questions.views.tempfile.NamedTemporaryFile")
     @patch("questions.views.summarize_pdf_from_s3")
     def test_post_summarize_network_error(
@@ -931,7 +931,7 @@ class TestQuestionCreateView(TestCase):
 
     @patch("questions.views.Assignment.objects.get")
     @patch("questions.views.Material.objects.get")
-    @patch("questions.views.boto3.client")
+    @patch("core.clients.boto3.client")
     @patch("questions.views.tempfile.NamedTemporaryFile")
     @patch("questions.views.summarize_pdf_from_s3")
     def test_post_summarize_poppler_error(
@@ -0,0 +1,156 @@
+"""
+bucket별 꼬리 질문 사전 생성 테스트
+- 학생마다 복사된 같은 base 문제는 한 번만 생성 (문제 내용 해시 기준), bucket A~D 각각 하나씩
+- 이미 생성된 항목은 다시 생성하지 않고, 실패한 bucket은 건너뜀
+- QuestionCreateView는 TAIL_PRECOMPUTE_ENABLED일 때 문제 생성 후 사전 생성을 예약
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from assignments.models import Assignment, Material
+from catalog.models import Subject
+from courses.models import CourseClass
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from questions.models import PrecomputedTailQuestion, Question
+from questions.utils.base_question_generator import Quiz
+from questions.utils.tail_precompute import load_precomputed_tails, precompute_tail_questions
+from rest_framework.test import APIClient
+from submissions.models import PersonalAssignment
+
+Account = get_user_model()
+
+pytestmark = pytest.mark.django_db
+
+
+def _fake_tail(question, model_answer, bucket):
+    return {
+        "topic": f"topic-{bucket}",
+        "question": f"{question}의 {bucket} 꼬리 질문",
+        "model_answer": "답",
+        "explanation": "설명",
+        "difficulty": "Hard" if bucket == "A" else "medium",
+    }
+
+
+@pytest.fixture
+def assignment():
+    teacher = Account.objects.create_user(
+        email="teacher@test.com", password="testpass123", display_name="Teacher", is_student=False
+    )
+    subject = Subject.objects.create(name="Science")
+    course_class = CourseClass.objects.create(teacher=teacher, subject=subject, name="Class", description="")
+    return Assignment.objects.create(
+        course_class=course_class,
+        subject=subject,
+        title="HW",
+        description="",
+        total_questions=2,
+        due_at=timezone.now() + timedelta(days=7),
+        grade="",
+    )
+
+
+@pytest.fixture
+def base_questions(assignment):
+    questions = []
+    for i in range(2):  # 학생 두 명에게 같은 base 문제 2개씩 복사
+        student = Account.objects.create_user(
+            email=f"student{i}@test.com", password="testpass123", display_name=f"S{i}", is_student=True
+        )
+        pa = PersonalAssignment.objects.create(student=student, assignment=assignment)
+        for number, content in enumerate(["광합성의 목적은?", "증발이란?"], 1):
+            questions.append(
+                Question.objects.create(
+                    personal_assignment=pa, number=number, content=content, model_answer="답", recalled_num=0
+                )
+            )
+    return questions
+
+
+class TestPrecomputeTailQuestions:
+    @patch("questions.utils.tail_precompute.generate_bucket_tail_question", side_effect=_fake_tail)
+    def test_one_per_unique_question_and_bucket(self, mock_generate, assignment, base_questions):
+        created = precompute_tail_questions(assignment.id)
+
+        assert created == 8  # 고유 문제 2개 x bucket 4개
+        assert mock_generate.call_count == 8
+        tails = load_precomputed_tails(base_questions[2])  # 다른 학생에게 복사된 같은 문제
+        assert set(tails) == {"A", "B", "C", "D"}
+        assert tails["A"].content == "광합성의 목적은?의 A 꼬리 질문"
+        assert tails["A"].difficulty == "hard"
+
+    @patch("questions.utils.tail_precompute.generate_bucket_tail_question", side_effect=_fake_tail)
+    def test_existing_entries_skipped(self, mock_generate, assignment, base_questions):
+        precompute_tail_questions(assignment.id)
+        mock_generate.reset_mock()
+
+        assert precompute_tail_questions(assignment.id) == 0
+        mock_generate.assert_not_called()
+
+    @patch("questions.utils.tail_precompute.generate_bucket_tail_question")
+    def test_failed_bucket_skipped(self, mock_generate, assignment, base_questions):
+        def flaky(question, model_answer, bucket):
+            if bucket == "C":
+                raise RuntimeError("LLM error")
+            return _fake_tail(question, model_answer, bucket)
+
+        mock_generate.side_effect = flaky
+
+        assert precompute_tail_questions(assignment.id) == 6
+        assert "C" not in load_precomputed_tails(base_questions[0])
+
+    @patch("questions.utils.tail_precompute.generate_bucket_tail_question", side_effect=_fake_tail)
+    def test_shared_tails_survive_origin_assignment_deletion(self, mock_generate, assignment, base_questions):
+        precompute_tail_questions(assignment.id)
+        other_copy = base_questions[2]
+        content, model_answer = other_copy.content, other_copy.model_answer
+
+        assignment.delete()
+
+        assert PrecomputedTailQuestion.objects.count() == 8
+        tails = load_precomputed_tails(Question(content=content, model_answer=model_answer, recalled_num=0))
+        assert set(tails) == {"A", "B", "C", "D"}
+        assert tails["A"].assignment is None
+
+    def test_tail_questions_not_looked_up(self, base_questions):
+        tail = Question.objects.create(
+            personal_assignment=base_questions[0].personal_assignment,
+            number=1,
+            content="꼬리",
+            recalled_num=1,
+            base_question=base_questions[0],
+        )
+        assert load_precomputed_tails(tail) == {}
+
+    @patch("questions.utils.tail_precompute.generate_bucket_tail_question", side_effect=_fake_tail)
+    def test_management_command(self, mock_generate, assignment, base_questions):
+        call_command("precompute_tail_questions", "--assignment-id", str(assignment.id))
+
+        assert PrecomputedTailQuestion.objects.count() == 8
+
+
+class TestQuestionCreateSchedulesPrecompute:
+    @override_settings(TAIL_PRECOMPUTE_ENABLED=True)
+    @patch("questions.views.schedule_tail_precompute")
+    @patch("questions.views.generate_base_quizzes")
+    def test_scheduled_after_base_questions(self, mock_generate, mock_schedule, assignment):
+        student = Account.objects.create_user(
+            email="student@test.com", password="testpass123", display_name="S", is_student=True
+        )
+        PersonalAssignment.objects.create(student=student, assignment=assignment)
+        material = Material.objects.create(assignment=assignment, summary="요약", s3_key="k")
+        mock_generate.return_value = [Quiz(question="Q", model_answer="A", explanation="E", difficulty="easy")]
+
+        response = APIClient().post(
+            "/api/questions/create/",
+            {"assignment_id": assignment.id, "material_id": material.id, "total_number": 1},
+            format="json",
+        )
+
+        assert response.status_code == 200
+        mock_schedule.assert_called_once_with(assignment.id)
@@ -4,10 +4,11 @@ import sys
 import time
 from typing import List
 
-from django.conf import settings
+from core.clients import get_chat_model
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_openai import ChatOpenAI
 from pydantic import BaseModel, Field
+from submissions.utils.tail_question_generator.llm_usage import usage_ledger
+from submissions.utils.tail_question_generator.rate_limiter import BACKGROUND, estimate_tokens, rate_limited_call
 
 
 # === Quiz Schema ===
@@ -47,12 +48,17 @@ FEW_SHOT_EXAMPLES = [
 ]
 
 
+FEW_SHOT_EXAMPLES_JSON = json.dumps(FEW_SHOT_EXAMPLES, ensure_ascii=False, indent=2)
+
+
 # --- Prompt Template ---
+# 정적인 지침/예시를 앞에, 호출마다 바뀌는 값({n}, 학습 자료)을 맨 뒤에 두어 OpenAI prefix 캐시가 적용되도록 함
 multi_quiz_prompt = ChatPromptTemplate.from_template(
     """
 You are an expert educational quiz designer who creates high-quality review questions based on **learning materials**.
 
-Your task is to generate **{n}** well-crafted quiz questions in Korean that align with the provided learning material.  
+Your task is to generate well-crafted quiz questions in Korean that align with the learning material given at the end.
+The number of questions to generate is also given at the end.
 Each quiz must:
 - Focus on a **different topic or concept** within the material.
 - Have **clear educational intent**, assessing understanding or reasoning, not mere recall.
@@ -114,6 +120,8 @@ Return your output **only** as a valid JSON array with the following structure:
   ...
 ]
 
+# Number of Questions: {n}
+
 # Learning Materials:
 {learning_material}
 """
@@ -133,17 +141,26 @@ def generate_base_quizzes(material_text: str, n: int = 3) -> List[Quiz]:
 
     for attempt in range(max_retries):
         try:
-            llm = ChatOpenAI(
+            # 재시도마다 새로 만들지 않고 프로세스 공용 클라이언트(keep-alive 연결) 재사용
+            llm = get_chat_model(
                 model="gpt-4o-mini",
                 temperature=0.5,
-                api_key=settings.OPENAI_API_KEY,
                 timeout=60.0,  # 60초 타임아웃 설정
             )
-            few_shot_str = json.dumps(FEW_SHOT_EXAMPLES, ensure_ascii=False, indent=2)
-            prompt = multi_quiz_prompt.format(n=n, examples=few_shot_str, learning_material=material_text)
-
-            # 동기적으로 처리
-            response = llm.invoke(prompt).content
+            prompt = multi_quiz_prompt.format(n=n, examples=FEW_SHOT_EXAMPLES_JSON, learning_material=material_text)
+
+            # 동기적으로 처리 (토큰 사용량 / prefix 캐시 hit은 usage ledger에 기록)
+            # 공유 rate limiter를 거치므로 429는 서버 Retry-After 힌트만큼 기다린 뒤 재시도됨 (백그라운드 우선순위)
+            def invoke():
+                started = time.perf_counter()
+                reply = llm.invoke(prompt)
+                usage_ledger.record("base_quiz", reply, started)
+                return reply
+
+            reply = rate_limited_call(
+                "base_quiz", invoke, lambda: estimate_tokens(prompt, completion_tokens=300 * n), BACKGROUND
+            )
+            response = reply.content
 
             try:
                 # JSON 파싱 전에 LaTeX 백슬래시 이스케이프 문제 해결
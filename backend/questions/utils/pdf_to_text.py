@@ -3,10 +3,12 @@ import os
 import tempfile
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
+from core.clients import get_chat_model
 from django.conf import settings
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 from pdf2image import convert_from_path
+from submissions.utils.tail_question_generator.rate_limiter import BACKGROUND, estimate_tokens, rate_limited_call
 
 if not getattr(settings, "OPENAI_API_KEY", None):
     raise ValueError("OPENAI_API_KEY not found in Django settings.")
@@ -82,17 +84,23 @@ def _process_page(llm: ChatOpenAI, page, page_num: int, tmpdir: str) -> str:
     image_data = encode_image_to_base64(tmp_img_path)
 
     messages = vision_summary_prompt.format_messages()
-    response = llm.invoke(
-        [
-            *messages,
-            {
-                "role": "user",
-                "content": [
-                    {"type": "text", "text": "Analyze this educational image."},
-                    {"type": "image_url", "image_url": {"url": image_data}},
-                ],
-            },
-        ]
+    # 페이지 10개가 동시에 호출되므로 공유 rate limiter를 거침 (백그라운드 우선순위)
+    response = rate_limited_call(
+        "pdf_summary",
+        lambda: llm.invoke(
+            [
+                *messages,
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": "Analyze this educational image."},
+                        {"type": "image_url", "image_url": {"url": image_data}},
+                    ],
+                },
+            ]
+        ),
+        lambda: estimate_tokens(messages, completion_tokens=1500, images=1),
+        BACKGROUND,
     )
 
     return response.content.strip()
@@ -100,7 +108,7 @@ def _process_page(llm: ChatOpenAI, page, page_num: int, tmpdir: str) -> str:
 
 def summarize_pdf_from_s3(local_pdf_path: str) -> str:
     """Analyze each PDF page using GPT-4o Vision and return summarized text."""
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.2)
+    llm = get_chat_model(model="gpt-4o-mini", temperature=0.2)
     pages = convert_from_path(local_pdf_path, dpi=200)
     summaries = [None] * len(pages)  # 순서 보장을 위한 빈 리스트
 
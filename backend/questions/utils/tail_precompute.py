@@ -0,0 +1,160 @@
+"""
+bucket별 꼬리 질문 사전 생성 (base 문제 생성 직후, 백그라운드)
+
+꼬리 질문 전략은 decide_bucket_confidence의 bucket(A/B/C/D) 네 가지로만 정해지므로,
+base 문제가 만들어지면 문제마다 bucket별 후보를 하나씩 미리 생성해 PrecomputedTailQuestion에 저장합니다.
+recalled_num=0 답안 제출 시에는 planner(정오답 판정) 호출 + 테이블 조회만으로 꼬리 질문을 정할 수 있어
+가장 느린 actor LLM 호출이 응답 경로에서 빠집니다.
+
+- schedule_tail_precompute: 트랜잭션 커밋 후 백그라운드 스레드에서 precompute_tail_questions 실행
+- precompute_tail_questions: 과제의 고유 base 문제 x bucket 중 아직 없는 것만 생성 (LLM 호출은 동시에)
+- load_precomputed_tails / precomputed_tail_payload: 제출 시 조회 + generate_tail_question과 같은 형식의 payload
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+from django.db import close_old_connections, transaction
+from submissions.utils.stage_executor import Stage, run_stages
+from submissions.utils.tail_question_cache import question_hash
+from submissions.utils.tail_question_generator.generate_questions_routed import generate_bucket_tail_question
+
+from ..models import PrecomputedTailQuestion, Question
+
+logger = logging.getLogger(__name__)
+
+TAIL_PRECOMPUTE_MAX_WORKERS = int(os.getenv("TAIL_PRECOMPUTE_MAX_WORKERS", "4"))
+
+# 사전 생성 전용 풀 (채점 요청이 쓰는 파이프라인 풀을 점유하지 않도록 분리)
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=TAIL_PRECOMPUTE_MAX_WORKERS, thread_name_prefix="tail-pre")
+    return _executor
+
+
+def _reset_after_fork():
+    global _executor, _executor_lock
+    _executor = None
+    _executor_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def _difficulty(value) -> str:
+    value = str(value or "").strip().lower()
+    return value if value in Question.Difficulty.values else Question.Difficulty.MEDIUM
+
+
+def _generate_or_none(question: str, model_answer: str, bucket: str):
+    try:
+        response = generate_bucket_tail_question(question, model_answer, bucket)
+    except Exception as e:
+        logger.warning(f"[TailPrecompute] 꼬리 질문 사전 생성 실패 (bucket={bucket}): {e}")
+        return None
+    return response if response and str(response.get("question", "")).strip() else None
+
+
+def precompute_tail_questions(assignment_id: int) -> int:
+    """과제의 고유 base 문제마다 bucket별 꼬리 질문을 생성해 저장, 새로 저장한 개수 반환"""
+    base_questions = (
+        Question.objects.filter(personal_assignment__assignment_id=assignment_id, recalled_num=0)
+        .values_list("content", "model_answer")
+        .distinct()
+    )
+    targets = {
+        question_hash(content, model_answer): (content, model_answer) for content, model_answer in base_questions
+    }
+    existing = set(
+        PrecomputedTailQuestion.objects.filter(question_hash__in=targets).values_list("question_hash", "bucket")
+    )
+
+    stages = [
+        Stage(f"{qhash}:{bucket}", lambda r, c=content, m=answer, b=bucket: _generate_or_none(c, m, b))
+        for qhash, (content, answer) in targets.items()
+        for bucket in PrecomputedTailQuestion.Bucket.values
+        if (qhash, bucket) not in existing
+    ]
+    if not stages:
+        return 0
+
+    run = run_stages(stages, executor=_get_executor())
+    created = 0
+    for name, response in run.results.items():
+        if response is None:
+            continue
+        qhash, bucket = name.split(":")
+        _, is_new = PrecomputedTailQuestion.objects.get_or_create(
+            question_hash=qhash,
+            bucket=bucket,
+            defaults={
+                "assignment_id": assignment_id,
+                "topic": str(response.get("topic", ""))[:255],
+                "content": response.get("question", ""),
+                "model_answer": response.get("model_answer", ""),
+                "explanation": response.get("explanation", ""),
+                "difficulty": _difficulty(response.get("difficulty")),
+            },
+        )
+        created += int(is_new)
+    logger.info(
+        f"[TailPrecompute] assignment_id={assignment_id} - base 문제 {len(targets)}개, "
+        f"꼬리 질문 {created}개 생성 ({run.format_timings()})"
+    )
+    return created
+
+
+def _run_in_background(assignment_id: int):
+    try:
+        precompute_tail_questions(assignment_id)
+    except Exception as e:
+        logger.error(f"[TailPrecompute] assignment_id={assignment_id} 사전 생성 실패: {e}", exc_info=True)
+    finally:
+        close_old_connections()
+
+
+def schedule_tail_precompute(assignment_id: int):
+    """현재 트랜잭션이 커밋된 뒤 백그라운드 스레드에서 사전 생성 (응답을 기다리게 하지 않음)"""
+    transaction.on_commit(
+        lambda: threading.Thread(
+            target=_run_in_background, args=(assignment_id,), name="tail-precompute", daemon=True
+        ).start()
+    )
+
+
+def load_precomputed_tails(question) -> Dict[str, PrecomputedTailQuestion]:
+    """base 문제(recalled_num=0)에 대해 미리 만들어 둔 bucket별 꼬리 질문 {bucket: row}"""
+    if question.recalled_num != 0:
+        return {}
+    rows = PrecomputedTailQuestion.objects.filter(question_hash=question_hash(question.content, question.model_answer))
+    return {row.bucket: row for row in rows}
+
+
+def precomputed_tail_payload(row: PrecomputedTailQuestion, is_correct: bool, confidence: str) -> dict:
+    """generate_tail_question과 같은 형식의 payload (recalled_num=0 -> 항상 ASK, recalled_time=1)"""
+    return {
+        "is_correct": bool(is_correct),
+        "confidence": confidence,
+        "bucket": row.bucket,
+        "plan": "ASK",
+        "recalled_time": 1,
+        "tail_question": {
+            "topic": row.topic,
+            "question": row.content,
+            "model_answer": row.model_answer,
+            "explanation": row.explanation,
+            "difficulty": row.difficulty,
+        },
+        "cache_hit": True,
+    }
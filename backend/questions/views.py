@@ -1,8 +1,8 @@
 import tempfile
 
-import boto3
 from assignments.models import Assignment, Material
 from boto3.s3.transfer import TransferConfig
+from core.clients import get_s3_client
 from django.conf import settings
 from django.db import transaction
 from drf_yasg.utils import swagger_auto_schema
@@ -12,12 +12,14 @@ from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from submissions.models import PersonalAssignment
+from submissions.utils.local_grader import model_answer_embeddings
 
 from .models import Question
 from .request_serializers import QuestionCreateRequestSerializer
 from .serializers import QuestionCreateSerializer
 from .utils.base_question_generator import generate_base_quizzes
 from .utils.pdf_to_text import summarize_pdf_from_s3
+from .utils.tail_precompute import schedule_tail_precompute
 
 
 class QuestionCreateView(APIView):
@@ -68,12 +70,7 @@ class QuestionCreateView(APIView):
                 s3_key = material.s3_key
                 transfer_config = TransferConfig(use_threads=False)
 
-                s3 = boto3.client(
-                    "s3",
-                    aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
-                    aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
-                    region_name=settings.AWS_REGION,
-                )
+                s3 = get_s3_client()
 
                 with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as tmp:
                     try:
@@ -135,6 +132,13 @@ class QuestionCreateView(APIView):
                         status=status.HTTP_400_BAD_REQUEST,
                     )
 
+            # 로컬 정오답 판정용 모범답안 임베딩 (학생별 복사본이 같은 값을 공유하므로 문제당 한 번만 encode)
+            embeddings = (
+                model_answer_embeddings([quiz.model_answer for quiz in quizzes])
+                if settings.LOCAL_GRADER_ENABLED
+                else [None] * len(quizzes)
+            )
+
             created_questions = []
             total_questions_created = 0
 
@@ -149,6 +153,7 @@ class QuestionCreateView(APIView):
                                 recalled_num=0,
                                 explanation=quiz.explanation,
                                 model_answer=quiz.model_answer,
+                                model_answer_embedding=embeddings[i - 1],
                                 difficulty=quiz.difficulty.lower(),
                             )
                             total_questions_created += 1
@@ -172,6 +177,9 @@ class QuestionCreateView(APIView):
             if assignment.total_questions != 0:
                 assignment.is_question_created = True
                 assignment.save()
+                if settings.TAIL_PRECOMPUTE_ENABLED:
+                    # 문제별 bucket(A~D) 꼬리 질문을 백그라운드에서 미리 생성 (응답은 기다리지 않음)
+                    schedule_tail_precompute(assignment.id)
             else:
                 assignment.delete()  # 시간 얼마 안 걸림
                 return Response(
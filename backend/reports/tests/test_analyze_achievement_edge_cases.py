@@ -155,7 +155,7 @@ class TestAnalyzeAchievementEdgeCases:
             # Warning 메시지가 출력되었는지 확인
             assert any("Could not determine best achievement code" in str(call) for call in mock_print.call_args_list)
 
-    @patch("reports.utils.analyze_achievement.requests.post")
+    @patch("core.clients.requests.Session.post")
     def test_find_best_achievement_code_request_exception(self, mock_post):
         """GPT API 요청 예외 처리 테스트"""
         import requests
@@ -168,7 +168,7 @@ class TestAnalyzeAchievementEdgeCases:
 
         assert result is None
 
-    @patch("reports.utils.analyze_achievement.requests.post")
+    @patch("core.clients.requests.Session.post")
     def test_find_best_achievement_code_general_exception(self, mock_post):
         """GPT API 처리 중 일반 예외 처리 테스트"""
         from reports.utils.analyze_achievement import find_best_achievement_code
@@ -278,7 +278,7 @@ class TestFindBestAchievementCodeUnit:
     """find_best_achievement_code 함수 단위 테스트"""
 
     @patch("reports.utils.analyze_achievement.settings")
-    @patch("reports.utils.analyze_achievement.requests.post")
+    @patch("core.clients.requests.Session.post")
     def test_find_best_achievement_code_success(self, mock_requests_post, mock_settings):
         """find_best_achievement_code 성공 케이스 테스트"""
         # Mock settings
@@ -321,7 +321,7 @@ class TestFindBestAchievementCodeUnit:
         assert result is None
 
     @patch("reports.utils.analyze_achievement.settings")
-    @patch("reports.utils.analyze_achievement.requests.post")
+    @patch("core.clients.requests.Session.post")
     def test_find_best_achievement_code_api_error(self, mock_requests_post, mock_settings):
         """API 오류 발생 시 테스트"""
         # Mock settings
@@ -344,7 +344,7 @@ class TestFindBestAchievementCodeUnit:
         assert result is None
 
     @patch("reports.utils.analyze_achievement.settings")
-    @patch("reports.utils.analyze_achievement.requests.post")
+    @patch("core.clients.requests.Session.post")
     def test_find_best_achievement_code_invalid_response(self, mock_requests_post, mock_settings):
         """잘못된 API 응답 테스트"""
         # Mock settings
@@ -367,7 +367,7 @@ class TestFindBestAchievementCodeUnit:
         assert result is None
 
     @patch("reports.utils.analyze_achievement.settings")
-    @patch("reports.utils.analyze_achievement.requests.post")
+    @patch("core.clients.requests.Session.post")
     def test_find_best_achievement_code_request_exception(self, mock_requests_post, mock_settings):
         """요청 예외 발생 시 테스트"""
         # Mock settings
@@ -4,9 +4,11 @@ import os
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 import requests
+from core.clients import get_http_session, http_timeout
 from django.conf import settings
 from questions.models import Question
 from submissions.models import Answer, PersonalAssignment
+from submissions.utils.tail_question_generator.rate_limiter import BACKGROUND, estimate_tokens, rate_limited_call
 
 
 def parse_curriculum(student_id, class_id):
@@ -272,9 +274,25 @@ Do not return anything other than the Code. For example, just return '2과03-01'
         "temperature": 0.1,
     }
 
+    def post():
+        response = get_http_session().post(
+            "https://api.openai.com/v1/chat/completions",
+            headers=headers,
+            data=json.dumps(data),
+            timeout=http_timeout(30),
+        )
+        if response.status_code == 429:
+            # 공유 rate limiter가 Retry-After 힌트만큼 모든 워커를 쉬게 한 뒤 재시도
+            response.raise_for_status()
+        return response
+
     try:
-        response = requests.post(
-            "https://api.openai.com/v1/chat/completions", headers=headers, data=json.dumps(data), timeout=30
+        # 성취기준 매칭은 백그라운드 작업: 답안 채점(interactive) 몫의 여유분은 쓰지 않음
+        response = rate_limited_call(
+            "achievement_code",
+            post,
+            lambda: estimate_tokens([m["content"] for m in data["messages"]], completion_tokens=data["max_tokens"]),
+            BACKGROUND,
         )
 
         if response.status_code == 200:
@@ -14,6 +14,9 @@ fi
 # 스레드 수: 워커당 스레드 수
 THREADS=4
 
+# SBERT / XGBoost 모델을 --preload 단계에서 미리 로드 (로컬 모델이 없으면 서버 시작 실패)
+export MODEL_WARMUP_ENABLED=${MODEL_WARMUP_ENABLED:-true}
+
 # 최대 동시 요청 수 = WORKERS * THREADS
 echo "Starting Gunicorn with $WORKERS workers, $THREADS threads per worker"
 echo "Max concurrent requests: $((WORKERS * THREADS))"
@@ -35,3 +38,11 @@ nohup gunicorn voicetutor.wsgi:application \
 
 echo "Gunicorn started with PID: $!"
 echo "Logs are being written to nohup.out"
+
+# 비동기 채점(ASYNC_GRADING_ENABLED=True) 사용 시 DB 작업 큐 워커도 함께 실행
+if [ "${ASYNC_GRADING_ENABLED,,}" = "true" ] || [ "$ASYNC_GRADING_ENABLED" = "1" ]; then
+  nohup python manage.py run_grading_worker > grading_worker.out 2>&1 &
+  echo "Grading worker started with PID: $!"
+fi
+# 워커 없이 동기 채점만 쓰는 경우: 오래 PROCESSING으로 남은 답안은 cron 등으로 정리
+#   */10 * * * * cd <backend> && python manage.py reclaim_processing_answers
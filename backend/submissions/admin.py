@@ -1,6 +1,8 @@
 from django.contrib import admin
 
-from .models import Answer, PersonalAssignment
+from .models import Answer, AnswerFeatures, GradingJob, PersonalAssignment
 
 admin.site.register(PersonalAssignment)
 admin.site.register(Answer)
+admin.site.register(AnswerFeatures)
+admin.site.register(GradingJob)
@@ -0,0 +1,85 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from submissions.models import Answer
+from submissions.utils.local_grader import (
+    DEFAULT_SIM_WEIGHT,
+    LOCAL_GRADER_CALIBRATION_PATH,
+    calibrate_thresholds,
+    combined_score,
+    save_thresholds,
+    score_answers,
+)
+
+
+class Command(BaseCommand):
+    help = "저장된 LLM 정오답 판정으로 로컬 정오답 판정기(local_grader)의 임계값을 보정합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output", type=str, default=LOCAL_GRADER_CALIBRATION_PATH, help="보정 결과(JSON)를 저장할 경로"
+        )
+        parser.add_argument(
+            "--target-precision", type=float, default=0.97, help="로컬 판정이 LLM 판정과 일치해야 하는 최소 비율"
+        )
+        parser.add_argument("--min-support", type=int, default=20, help="각 판정 구간에 필요한 최소 답안 수")
+        parser.add_argument(
+            "--sim-weight", type=float, default=DEFAULT_SIM_WEIGHT, help="점수에서 cosine 유사도의 가중치 (0~1)"
+        )
+        parser.add_argument("--limit", type=int, default=None, help="최근 답안 N개만 사용")
+        parser.add_argument("--dry-run", action="store_true", help="임계값만 출력하고 파일은 저장하지 않음")
+
+    def handle(self, *args, **options):
+        if not 0.5 < options["target_precision"] <= 1.0:
+            raise CommandError("--target-precision은 0.5 초과 1 이하여야 합니다.")
+        if not 0.0 <= options["sim_weight"] <= 1.0:
+            raise CommandError("--sim-weight는 0~1 사이여야 합니다.")
+
+        # 로컬 판정 결과로 다시 보정하지 않도록 LLM이 판정한 답안만 사용
+        queryset = (
+            Answer.objects.filter(
+                graded_by=Answer.GradedBy.LLM, state__in=[Answer.State.CORRECT, Answer.State.INCORRECT]
+            )
+            .exclude(text_answer="")
+            .exclude(question__model_answer="")
+            .order_by("-id")
+            .values_list("text_answer", "state", "question__model_answer", "question__model_answer_embedding")
+        )
+        if options["limit"] is not None:
+            queryset = queryset[: options["limit"]]
+        rows = list(queryset)
+        if not rows:
+            raise CommandError("보정에 사용할 LLM 판정 답안이 없습니다.")
+
+        self.stdout.write(self.style.HTTP_INFO(f"로컬 판정기 보정 시작 - LLM 판정 답안 {len(rows)}개\n"))
+        start = time.perf_counter()
+        transcripts, states, model_answers, embeddings = zip(*rows)
+        try:
+            pairs = score_answers(transcripts, model_answers, embeddings)
+        except FileNotFoundError as e:
+            raise CommandError(f"SBERT 모델을 찾을 수 없습니다: {e}")
+        scores = [combined_score(sim, cov, options["sim_weight"]) for sim, cov in pairs]
+        labels = [state == Answer.State.CORRECT for state in states]
+
+        thresholds, report = calibrate_thresholds(
+            scores,
+            labels,
+            target_precision=options["target_precision"],
+            min_support=options["min_support"],
+            sim_weight=options["sim_weight"],
+        )
+        elapsed = time.perf_counter() - start
+        if thresholds is None:
+            raise CommandError(
+                f"목표 일치율 {options['target_precision']}을 만족하는 구간이 없습니다 "
+                f"(답안 {report['n_samples']}개). 데이터를 더 모으거나 --target-precision을 낮춰 주세요."
+            )
+
+        self.stdout.write(
+            f"  - 정답 임계값 {thresholds.correct_thr:.4f}, 오답 임계값 {thresholds.incorrect_thr:.4f}\n"
+            f"  - 보정 데이터 기준 LLM 호출 생략 비율 {report['skip_rate']:.1%}, LLM 판정 일치율 {report['agreement']:.1%}"
+        )
+        if not options["dry_run"]:
+            save_thresholds(thresholds, options["output"], **report)
+        action = "저장 안 함(dry-run)" if options["dry_run"] else f"저장: {options['output']}"
+        self.stdout.write(self.style.SUCCESS(f"보정 완료 - {action}, {elapsed:.2f}초"))
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+from submissions.utils.grading_queue import reclaim_orphaned_answers
+
+
+class Command(BaseCommand):
+    help = (
+        "처리 중인 채점 작업 없이 오래 PROCESSING으로 남은 답안을 삭제합니다. "
+        "(run_grading_worker는 매 루프마다 수행하므로, 워커 없이 동기 채점만 쓰는 배포에서 cron 등으로 주기 실행)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--stale-seconds", type=int, default=None, help="기준 시간(초), 기본은 GRADING_JOB_STALE_SECONDS"
+        )
+
+    def handle(self, *args, **options):
+        deleted = reclaim_orphaned_answers(stale_seconds=options["stale_seconds"])
+        self.stdout.write(self.style.SUCCESS(f"PROCESSING 답안 정리 완료 - {deleted}개 삭제"))
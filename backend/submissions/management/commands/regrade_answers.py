@@ -0,0 +1,68 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from submissions.models import Answer, AnswerFeatures
+from submissions.utils.feature_store import model_input_matrix
+from submissions.utils.inference import DEFAULT_MODEL_PATH, get_xgb_model, run_inference_batch
+
+
+class Command(BaseCommand):
+    help = "저장된 답안 특징 벡터(AnswerFeatures)로 STT 없이 답안을 다시 채점해 eval_grade를 갱신합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model-path", type=str, default=DEFAULT_MODEL_PATH, help="재채점에 사용할 joblib 모델 경로"
+        )
+        parser.add_argument("--chunk-size", type=int, default=2000, help="한 번에 읽어 예측 / 갱신할 답안 수")
+        parser.add_argument("--assignment-id", type=int, default=None, help="특정 과제의 답안만 재채점")
+        parser.add_argument("--dry-run", action="store_true", help="예측만 하고 DB는 갱신하지 않음")
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        if chunk_size <= 0:
+            raise CommandError("--chunk-size는 1 이상이어야 합니다.")
+
+        try:
+            get_xgb_model(options["model_path"])
+        except FileNotFoundError as e:
+            raise CommandError(f"모델 파일을 찾을 수 없습니다: {e}")
+
+        queryset = AnswerFeatures.objects.order_by("answer_id").only("answer_id", "schema_version", "vector")
+        if options["assignment_id"] is not None:
+            queryset = queryset.filter(answer__question__personal_assignment__assignment_id=options["assignment_id"])
+
+        self.stdout.write(self.style.HTTP_INFO(f"재채점 시작 - model={options['model_path']}\n"))
+        start = time.perf_counter()
+        total = changed = 0
+
+        chunk = []
+        for row in queryset.iterator(chunk_size=chunk_size):
+            chunk.append(row)
+            if len(chunk) == chunk_size:
+                changed += self._regrade_chunk(chunk, options)
+                total += len(chunk)
+                chunk = []
+        if chunk:
+            changed += self._regrade_chunk(chunk, options)
+            total += len(chunk)
+
+        elapsed = time.perf_counter() - start
+        action = "예측만 수행(dry-run)" if options["dry_run"] else "갱신"
+        self.stdout.write(
+            self.style.SUCCESS(f"재채점 완료 - 답안 {total}개 중 {changed}개 점수 변경, {action}, {elapsed:.2f}초")
+        )
+
+    def _regrade_chunk(self, rows, options) -> int:
+        """청크 하나를 한 번에 예측하고 점수가 바뀐 답안만 bulk_update, 바뀐 개수 반환"""
+        results = run_inference_batch(model_input_matrix(rows), options["model_path"])
+        current = dict(Answer.objects.filter(id__in=[row.answer_id for row in rows]).values_list("id", "eval_grade"))
+
+        updated = [
+            Answer(id=row.answer_id, eval_grade=result["pred_cont"])
+            for row, result in zip(rows, results)
+            if current.get(row.answer_id) != result["pred_cont"]
+        ]
+        if updated and not options["dry_run"]:
+            Answer.objects.bulk_update(updated, ["eval_grade"])
+        self.stdout.write(f"  - 답안 {len(rows)}개 예측, {len(updated)}개 변경")
+        return len(updated)
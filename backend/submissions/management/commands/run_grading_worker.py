@@ -0,0 +1,55 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from submissions.utils.grading_queue import (
+    claim_next_job,
+    default_worker_id,
+    process_job,
+    reclaim_orphaned_answers,
+    reclaim_stale_jobs,
+)
+from submissions.utils.model_registry import warmup_models
+
+
+class Command(BaseCommand):
+    help = "DB 작업 큐(GradingJob)에 쌓인 음성 답안 채점 작업을 처리하는 워커를 실행합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--poll-interval", type=float, default=1.0, help="큐가 비었을 때 대기 시간(초)")
+        parser.add_argument("--worker-id", type=str, default=None, help="작업 선점 시 기록할 워커 ID")
+        parser.add_argument("--once", action="store_true", help="큐에 남은 작업을 모두 처리하면 종료")
+
+    def handle(self, *args, **options):
+        worker_id = options["worker_id"] or default_worker_id()
+        poll_interval = options["poll_interval"]
+        once = options["once"]
+        processed = 0
+
+        self.stdout.write(self.style.HTTP_INFO(f"채점 워커 시작 - worker_id={worker_id}\n"))
+
+        if settings.MODEL_WARMUP_ENABLED:
+            warmup_models()
+            self.stdout.write("  - 모델 워밍업 완료")
+
+        try:
+            while True:
+                close_old_connections()
+                reclaim_stale_jobs()
+                reclaim_orphaned_answers()
+
+                job = claim_next_job(worker_id)
+                if job is None:
+                    if once:
+                        break
+                    time.sleep(poll_interval)
+                    continue
+
+                job = process_job(job)
+                processed += 1
+                self.stdout.write(f"  - job_id={job.id} -> {job.status}")
+        except KeyboardInterrupt:
+            self.stdout.write(self.style.WARNING("채점 워커 중단"))
+
+        self.stdout.write(self.style.SUCCESS(f"채점 워커 종료 - 처리한 작업 {processed}개"))
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-17 00:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("submissions", "0004_gradingjob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AnswerFeatures",
+            fields=[
+                (
+                    "answer",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="features",
+                        serialize=False,
+                        to="submissions.answer",
+                    ),
+                ),
+                ("schema_version", models.PositiveSmallIntegerField()),
+                ("vector", models.BinaryField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": "answer_features",
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.7 on 2026-10-17 01:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("submissions", "0005_answerfeatures"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="answer",
+            name="graded_by",
+            field=models.CharField(
+                choices=[("llm", "LLM"), ("local", "Local grader")],
+                default="llm",
+                help_text="정오답 판정 주체 (로컬 판정기 보정에는 LLM 판정만 사용)",
+                max_length=8,
+            ),
+        ),
+    ]
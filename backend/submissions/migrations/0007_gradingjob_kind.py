@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-17 02:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("submissions", "0006_answer_graded_by"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="gradingjob",
+            name="kind",
+            field=models.CharField(
+                choices=[("GRADE", "Grade answer"), ("TAIL_QUESTION", "Tail question")], default="GRADE", max_length=20
+            ),
+        ),
+    ]
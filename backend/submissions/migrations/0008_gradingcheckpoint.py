@@ -0,0 +1,60 @@
+# Generated by Django 5.2.7 on 2026-10-17 02:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("questions", "0010_question_model_answer_embedding"),
+        ("submissions", "0007_gradingjob_kind"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GradingCheckpoint",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("audio_hash", models.CharField(max_length=64)),
+                ("transcript", models.TextField(blank=True)),
+                ("features", models.JSONField(blank=True, null=True)),
+                ("script_features", models.JSONField(blank=True, null=True)),
+                ("eval_grade", models.FloatField(blank=True, null=True)),
+                ("is_correct", models.BooleanField(blank=True, null=True)),
+                (
+                    "graded_by",
+                    models.CharField(blank=True, choices=[("llm", "LLM"), ("local", "Local grader")], max_length=8),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "question",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="grading_checkpoints",
+                        to="questions.question",
+                    ),
+                ),
+                (
+                    "student",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="grading_checkpoints",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "grading_checkpoint",
+                "indexes": [models.Index(fields=["updated_at"], name="grading_che_updated_d7cab6_idx")],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("question", "student", "audio_hash"), name="unique_grading_checkpoint"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -36,6 +36,10 @@ class Answer(models.Model):
         INCORRECT = "incorrect", "Incorrect"
         PROCESSING = "PROCESSING", "Processing"
 
+    class GradedBy(models.TextChoices):
+        LLM = "llm", "LLM"
+        LOCAL = "local", "Local grader"
+
     question = models.ForeignKey("questions.Question", on_delete=models.CASCADE, related_name="answers")
     student = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="answers")
     started_at = models.DateTimeField(null=True, blank=True)
@@ -43,6 +47,12 @@ class Answer(models.Model):
     state = models.CharField(max_length=32, choices=State.choices, null=True, blank=True)
     text_answer = models.TextField(blank=True)
     eval_grade = models.FloatField(null=True, blank=True)
+    graded_by = models.CharField(
+        max_length=8,
+        choices=GradedBy.choices,
+        default=GradedBy.LLM,
+        help_text="정오답 판정 주체 (로컬 판정기 보정에는 LLM 판정만 사용)",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -54,3 +64,111 @@ class Answer(models.Model):
 
     def __str__(self) -> str:
         return f"Answer by {self.student} on {self.question}"
+
+
+class AnswerFeatures(models.Model):
+    """
+    답안 하나에서 추출한 음향 / 스크립트 특징 벡터 (재채점용)
+
+    STT를 다시 돌리지 않고 새 모델(model.joblib)로 예전 답안을 다시 채점할 수 있도록
+    특징 값을 float32 바이트열로 저장합니다. 열 순서는 schema_version별로
+    utils.feature_store.FEATURE_SCHEMAS에 정의되어 있고, 계산하지 않은 특징은 NaN입니다.
+    """
+
+    answer = models.OneToOneField(Answer, on_delete=models.CASCADE, primary_key=True, related_name="features")
+    schema_version = models.PositiveSmallIntegerField()
+    vector = models.BinaryField()  # float32 little-endian
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "answer_features"
+
+    def __str__(self) -> str:
+        return f"AnswerFeatures for answer {self.answer_id} (v{self.schema_version})"
+
+
+class GradingJob(models.Model):
+    """
+    음성 답안 비동기 채점 작업 (DB 기반 작업 큐)
+
+    AnswerSubmitView가 음성 파일과 함께 QUEUED 상태로 등록하고,
+    run_grading_worker 커맨드가 하나씩 가져가(claim) 채점한 뒤 결과 응답을 result에 저장합니다.
+    kind가 TAIL_QUESTION인 작업은 이미 채점된 답안의 꼬리 질문만 생성합니다 (요청 시간 예산 초과 시).
+    idempotency_key가 있는 작업은 같은 답안 제출의 중복 요청을 묶습니다 (요청 스레드에서 채점하는 경우도 기록).
+    """
+
+    class Status(models.TextChoices):
+        QUEUED = "QUEUED", "Queued"
+        RUNNING = "RUNNING", "Running"
+        DONE = "DONE", "Done"
+        FAILED = "FAILED", "Failed"
+
+    class Kind(models.TextChoices):
+        GRADE = "GRADE", "Grade answer"
+        TAIL_QUESTION = "TAIL_QUESTION", "Tail question"  # 시간 예산 초과로 미룬 꼬리 질문 생성 (음성 없음)
+
+    answer = models.ForeignKey(Answer, on_delete=models.SET_NULL, null=True, blank=True, related_name="grading_jobs")
+    kind = models.CharField(max_length=20, choices=Kind.choices, default=Kind.GRADE)
+    question = models.ForeignKey("questions.Question", on_delete=models.CASCADE, related_name="grading_jobs")
+    student = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="grading_jobs")
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.QUEUED)
+    audio = models.BinaryField(null=True, blank=True)  # 업로드된 .wav 원본 (완료 후 비움)
+    attempts = models.IntegerField(default=0)
+    locked_by = models.CharField(max_length=255, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    result_status_code = models.IntegerField(null=True, blank=True)
+    result = models.JSONField(null=True, blank=True)  # create_api_response 응답 본문
+    # 답안 제출 요청 키 (Idempotency-Key 헤더 또는 음성 sha256 + questionId + studentId의 sha256, 없으면 빈 문자열)
+    idempotency_key = models.CharField(max_length=64, blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = "grading_job"
+        indexes = [
+            models.Index(fields=["status", "created_at"]),
+            models.Index(fields=["status", "locked_at"]),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["idempotency_key"],
+                condition=~models.Q(idempotency_key=""),
+                name="unique_grading_job_idempotency_key",
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f"GradingJob {self.id} ({self.status})"
+
+
+class GradingCheckpoint(models.Model):
+    """
+    음성 답안 채점 중간 결과 (실패 후 같은 음성을 다시 제출하면 이어서 채점)
+
+    question / student / 음성 sha256(audio_hash)마다 하나씩, 성공한 단계의 결과만 채워 둡니다.
+    STT + 음향 특징(features) -> 스크립트 특징(script_features) -> eval_grade / 정오답(is_correct) 순서로 재사용하고,
+    채점이 끝나면 삭제합니다. 만료 시간은 GRADING_CHECKPOINT_TTL_SECONDS입니다.
+    """
+
+    question = models.ForeignKey("questions.Question", on_delete=models.CASCADE, related_name="grading_checkpoints")
+    student = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="grading_checkpoints")
+    audio_hash = models.CharField(max_length=64)
+    transcript = models.TextField(blank=True)
+    features = models.JSONField(null=True, blank=True)  # extract_all_features 결과 (STT + 음향 특징)
+    script_features = models.JSONField(null=True, blank=True)  # extract_script_features 결과
+    eval_grade = models.FloatField(null=True, blank=True)
+    is_correct = models.BooleanField(null=True, blank=True)
+    graded_by = models.CharField(max_length=8, choices=Answer.GradedBy.choices, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "grading_checkpoint"
+        constraints = [
+            models.UniqueConstraint(fields=["question", "student", "audio_hash"], name="unique_grading_checkpoint")
+        ]
+        indexes = [models.Index(fields=["updated_at"])]
+
+    def __str__(self) -> str:
+        return f"GradingCheckpoint {self.audio_hash[:12]} (question {self.question_id}, student {self.student_id})"
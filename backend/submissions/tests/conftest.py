@@ -0,0 +1,10 @@
+import pytest
+from submissions.utils import model_registry
+
+
+@pytest.fixture(autouse=True)
+def clear_model_registry():
+    """테스트마다 mock 모델이 프로세스 레지스트리에 남지 않도록 초기화"""
+    model_registry.clear()
+    yield
+    model_registry.clear()
@@ -0,0 +1,170 @@
+"""
+AnswerStreamView 테스트
+- POST /api/personal_assignments/answer/stream/: 채점 진행 상황을 SSE로 전달
+  (transcript -> correctness -> tail_question_delta ... -> result)
+- 채점은 별도 스레드에서 실행되므로 transaction=True (커밋된 데이터만 보임)
+"""
+
+import io
+import json
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from assignments.models import Assignment
+from catalog.models import Subject
+from courses.models import CourseClass
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from django.utils import timezone
+from questions.models import Question
+from rest_framework import status
+from rest_framework.test import APIClient
+from submissions.models import Answer, PersonalAssignment
+
+Account = get_user_model()
+
+pytestmark = pytest.mark.django_db(transaction=True)
+
+
+@pytest.fixture(autouse=True)
+def mock_parallel_stages():
+    """planner LLM(정오답 판정)과 스크립트 특징 단계는 외부 API / SBERT 없이 통과시킴"""
+    with (
+        patch("submissions.views.judge_correctness", return_value=False) as mock_judge,
+        patch("submissions.views.extract_script_features", side_effect=lambda features: features),
+    ):
+        yield mock_judge
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def student():
+    return Account.objects.create_user(
+        email="student@test.com", password="testpass123", display_name="Student", is_student=True
+    )
+
+
+@pytest.fixture
+def question(student):
+    teacher = Account.objects.create_user(
+        email="teacher@test.com", password="testpass123", display_name="Teacher", is_student=False
+    )
+    subject = Subject.objects.create(name="Math")
+    course_class = CourseClass.objects.create(teacher=teacher, subject=subject, name="Algebra 1", description="")
+    assignment = Assignment.objects.create(
+        course_class=course_class,
+        subject=subject,
+        title="HW 1",
+        description="",
+        total_questions=1,
+        due_at=timezone.now() + timedelta(days=7),
+        grade="",
+    )
+    personal_assignment = PersonalAssignment.objects.create(student=student, assignment=assignment)
+    return Question.objects.create(
+        personal_assignment=personal_assignment,
+        number=1,
+        content="Q1",
+        model_answer="A1",
+        explanation="E1",
+        difficulty=Question.Difficulty.MEDIUM,
+        recalled_num=0,
+    )
+
+
+@pytest.fixture
+def mock_audio_file():
+    f = io.BytesIO(b"RIFF" + b"\x00" * 4 + b"WAVE" + b"\x00" * 1024)
+    f.name = "test.wav"
+    return f
+
+
+def _stream(api_client, data):
+    return api_client.post(reverse("answer-stream"), data, format="multipart", HTTP_ACCEPT="text/event-stream")
+
+
+def _events(resp):
+    body = b"".join(resp.streaming_content).decode("utf-8")
+    events = []
+    for block in body.strip().split("\n\n"):
+        fields = dict(line.split(": ", 1) for line in block.split("\n") if not line.startswith(":"))
+        events.append((fields["event"], json.loads(fields["data"])))
+    return events
+
+
+def _fake_tail_generation(**kwargs):
+    for piece in ("왜 ", "그렇게 ", "생각했나요?"):
+        kwargs["on_question_delta"](piece)
+    return {
+        "is_correct": kwargs["is_correct"],
+        "confidence": "low",
+        "bucket": "D",
+        "plan": "ASK",
+        "recalled_time": 1,
+        "tail_question": {
+            "topic": "T",
+            "question": "왜 그렇게 생각했나요?",
+            "model_answer": "TA",
+            "explanation": "TE",
+            "difficulty": "easy",
+        },
+        "cache_hit": False,
+    }
+
+
+class TestAnswerStreamView:
+    @patch("submissions.views.generate_tail_question", side_effect=_fake_tail_generation)
+    @patch("submissions.views.run_inference", return_value={"pred_cont": 1.0})
+    @patch("submissions.views.extract_all_features", return_value={"script": "잘 모르겠어요", "total_length": 1.0})
+    def test_stage_events_then_result(
+        self, mock_extract, mock_infer, mock_tail, api_client, student, question, mock_audio_file
+    ):
+        resp = _stream(api_client, {"studentId": student.id, "questionId": question.id, "audioFile": mock_audio_file})
+
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp["Content-Type"] == "text/event-stream"
+        events = _events(resp)
+        names = [name for name, _ in events]
+        assert names == [
+            "transcript",
+            "correctness",
+            "tail_question_delta",
+            "tail_question_delta",
+            "tail_question_delta",
+            "result",
+        ]
+        assert events[0][1] == {"transcript": "잘 모르겠어요"}
+        assert events[1][1] == {"is_correct": False, "graded_by": Answer.GradedBy.LLM}
+        assert (
+            "".join(data["text"] for name, data in events if name == "tail_question_delta") == "왜 그렇게 생각했나요?"
+        )
+
+        result = events[-1][1]
+        assert result["status_code"] == status.HTTP_201_CREATED
+        assert result["data"]["is_correct"] is False
+        assert result["data"]["tail_question"]["question"] == "왜 그렇게 생각했나요?"
+        assert result["data"]["number_str"] == "1-1"
+        assert Answer.objects.get(question=question).state == Answer.State.INCORRECT
+
+    @patch("submissions.views.extract_all_features", return_value={"script": "", "total_length": 1.0})
+    def test_stt_failure_sent_as_error_event(self, mock_extract, api_client, student, question, mock_audio_file):
+        resp = _stream(api_client, {"studentId": student.id, "questionId": question.id, "audioFile": mock_audio_file})
+
+        ((name, data),) = _events(resp)
+        assert name == "error"
+        assert data["status_code"] == status.HTTP_400_BAD_REQUEST
+        assert data["error"] == "STT failed"
+        assert not Answer.objects.filter(question=question).exists()
+
+    def test_validation_error_before_stream(self, api_client, question, mock_audio_file):
+        resp = _stream(api_client, {"questionId": question.id, "audioFile": mock_audio_file})
+
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+        body = resp.content.decode("utf-8")
+        assert body.startswith("event: error\n")
+        assert json.loads(body.split("data: ", 1)[1])["error"] == "Missing studentId"
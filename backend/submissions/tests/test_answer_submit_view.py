@@ -9,23 +9,38 @@ import os
 from datetime import timedelta
 from unittest.mock import patch
 
+import numpy as np
 import pytest
 from assignments.models import Assignment
 from catalog.models import Subject
 from courses.models import CourseClass
 from django.contrib.auth import get_user_model
+from django.test import override_settings
 from django.urls import reverse
 from django.utils import timezone
-from questions.models import Question
+from questions.models import PrecomputedTailQuestion, Question
 from rest_framework import status
 from rest_framework.test import APIClient
-from submissions.models import Answer, PersonalAssignment
+from submissions.models import Answer, AnswerFeatures, GradingCheckpoint, PersonalAssignment
+from submissions.utils.feature_store import decode_features
+from submissions.utils.local_grader import GraderThresholds, LocalGrader
+from submissions.utils.tail_question_cache import question_hash
 
 Account = get_user_model()
 
 pytestmark = pytest.mark.django_db
 
 
+@pytest.fixture(autouse=True)
+def mock_parallel_stages():
+    """planner LLM(정오답 판정)과 스크립트 특징 단계는 외부 API / SBERT 없이 통과시킴"""
+    with (
+        patch("submissions.views.judge_correctness", return_value=True) as mock_judge,
+        patch("submissions.views.extract_script_features", side_effect=lambda features: features),
+    ):
+        yield mock_judge
+
+
 @pytest.fixture
 def api_client():
     return APIClient()
@@ -435,6 +450,233 @@ class TestAnswerSubmitViewPOST:
         assert ans.text_answer == "new"
         assert ans.eval_grade == 0.9
 
+    @patch("submissions.views.generate_tail_question")
+    @patch("submissions.views.run_inference")
+    @patch("submissions.views.extract_all_features")
+    def test_stores_answer_features(
+        self, mock_extract, mock_infer, mock_tail, api_client, student, personal_assignment, mock_audio_file
+    ):
+        q = Question.objects.create(
+            personal_assignment=personal_assignment,
+            number=9,
+            content="Q",
+            model_answer="A",
+            explanation="E",
+            difficulty=Question.Difficulty.MEDIUM,
+            recalled_num=0,
+        )
+        mock_extract.return_value = {"script": "ok", "total_length": 2.0, "word_cnt": 12, "voc_speed": 3.5}
+        mock_infer.return_value = {"pred_cont": 0.9}
+        mock_tail.return_value = {"is_correct": True, "plan": "PASS", "recalled_time": 0}
+        url = reverse("answer")
+        resp = api_client.post(
+            url, {"studentId": student.id, "questionId": q.id, "audioFile": mock_audio_file}, format="multipart"
+        )
+        assert resp.status_code == status.HTTP_201_CREATED
+        ans = Answer.objects.get(question=q, student=student)
+        stored = decode_features(AnswerFeatures.objects.get(answer=ans))
+        assert stored["word_cnt"] == 12
+        assert stored["voc_speed"] == 3.5
+        assert stored["repeat_cnt"] is None
+
+    @patch("submissions.views.generate_tail_question")
+    @patch("submissions.views.run_inference")
+    @patch("submissions.views.extract_all_features")
+    def test_precomputed_tail_question_skips_actor(
+        self, mock_extract, mock_infer, mock_tail, api_client, student, personal_assignment, mock_audio_file
+    ):
+        q = Question.objects.create(
+            personal_assignment=personal_assignment,
+            number=10,
+            content="Q",
+            model_answer="A",
+            explanation="E",
+            difficulty=Question.Difficulty.MEDIUM,
+            recalled_num=0,
+        )
+        for bucket in ("A", "B", "C", "D"):
+            PrecomputedTailQuestion.objects.create(
+                assignment=personal_assignment.assignment,
+                question_hash=question_hash("Q", "A"),
+                bucket=bucket,
+                content=f"미리 만든 {bucket} 질문",
+                model_answer="TA",
+                explanation="TE",
+                difficulty=Question.Difficulty.HARD,
+            )
+        mock_extract.return_value = {"script": "ok", "total_length": 1.0}
+        mock_infer.return_value = {"pred_cont": 5.0}  # planner는 정답(True) -> bucket A
+        url = reverse("answer")
+        resp = api_client.post(
+            url, {"studentId": student.id, "questionId": q.id, "audioFile": mock_audio_file}, format="multipart"
+        )
+        assert resp.status_code == status.HTTP_201_CREATED
+        mock_tail.assert_not_called()
+        tail = Question.objects.get(personal_assignment=personal_assignment, number=10, recalled_num=1)
+        assert tail.content == "미리 만든 A 질문"
+        assert tail.base_question == q
+
+    @override_settings(LOCAL_GRADER_ENABLED=True)
+    @patch("submissions.views.get_local_grader")
+    @patch("submissions.views.generate_tail_question")
+    @patch("submissions.views.run_inference")
+    @patch("submissions.views.extract_all_features")
+    def test_local_grader_skips_planner_llm(
+        self,
+        mock_extract,
+        mock_infer,
+        mock_tail,
+        mock_get_grader,
+        mock_parallel_stages,
+        api_client,
+        student,
+        personal_assignment,
+        mock_audio_file,
+    ):
+        q = Question.objects.create(
+            personal_assignment=personal_assignment,
+            number=12,
+            content="Q",
+            model_answer="A",
+            explanation="E",
+            difficulty=Question.Difficulty.MEDIUM,
+            recalled_num=0,
+        )
+        grader = LocalGrader(
+            GraderThresholds(correct_thr=0.9, incorrect_thr=0.2), encoder=lambda texts: np.ones((len(texts), 2))
+        )
+        mock_get_grader.return_value = grader
+        mock_extract.return_value = {"script": "A", "total_length": 1.0}
+        mock_infer.return_value = {"pred_cont": 4.0}
+        mock_tail.return_value = {
+            "is_correct": True,
+            "confidence": "high",
+            "bucket": "A",
+            "plan": "ONLY_CORRECT",
+            "recalled_time": 1,
+            "tail_question": None,
+        }
+        url = reverse("answer")
+        resp = api_client.post(
+            url, {"studentId": student.id, "questionId": q.id, "audioFile": mock_audio_file}, format="multipart"
+        )
+        assert resp.status_code == status.HTTP_201_CREATED
+        mock_parallel_stages.assert_not_called()
+        assert mock_tail.call_args.kwargs["is_correct"] is True
+        assert Answer.objects.get(question=q).graded_by == Answer.GradedBy.LOCAL
+        assert grader.stats()["llm_skip_rate"] == 1.0
+
+    @override_settings(SPECULATIVE_ACTOR_ENABLED=True)
+    @patch("submissions.views.get_speculative_actor")
+    @patch("submissions.views.get_local_grader")
+    @patch("submissions.views.generate_tail_question")
+    @patch("submissions.views.run_inference")
+    @patch("submissions.views.extract_all_features")
+    def test_speculative_actor_started_for_predicted_bucket(
+        self,
+        mock_extract,
+        mock_infer,
+        mock_tail,
+        mock_get_grader,
+        mock_get_spec,
+        api_client,
+        student,
+        personal_assignment,
+        mock_audio_file,
+    ):
+        q = Question.objects.create(
+            personal_assignment=personal_assignment,
+            number=13,
+            content="Q",
+            model_answer="A",
+            explanation="E",
+            difficulty=Question.Difficulty.MEDIUM,
+            recalled_num=1,
+        )
+        mock_get_grader.return_value.predict_correct.return_value = None  # SBERT 없음 -> eval_grade로 추정
+        mock_extract.return_value = {"script": "잘 모르겠어요", "total_length": 1.0}
+        mock_infer.return_value = {"pred_cont": 1.0}
+        mock_tail.return_value = {
+            "is_correct": True,
+            "confidence": "low",
+            "bucket": "B",
+            "plan": "ONLY_CORRECT",
+            "recalled_time": 2,
+            "tail_question": None,
+        }
+        speculative_actor = mock_get_spec.return_value
+        speculative_actor.stats.return_value = {
+            "hits": 0,
+            "misses": 1,
+            "cancelled": 0,
+            "hit_rate": 0.0,
+            "wasted_prompt_tokens": 0,
+            "wasted_completion_tokens": 0,
+        }
+        url = reverse("answer")
+        resp = api_client.post(
+            url, {"studentId": student.id, "questionId": q.id, "audioFile": mock_audio_file}, format="multipart"
+        )
+        assert resp.status_code == status.HTTP_201_CREATED
+        speculative_actor.start.assert_called_once_with("Q", "A", "잘 모르겠어요", "D")
+        assert mock_tail.call_args.kwargs["speculation"] is speculative_actor.start.return_value
+
+    @override_settings(FUSED_TAIL_GENERATION_ENABLED=True)
+    @patch("submissions.views.generate_tail_question_fused")
+    @patch("submissions.views.generate_tail_question")
+    @patch("submissions.views.run_inference")
+    @patch("submissions.views.extract_all_features")
+    def test_fused_tail_generation_skips_planner(
+        self,
+        mock_extract,
+        mock_infer,
+        mock_tail,
+        mock_fused,
+        mock_parallel_stages,
+        api_client,
+        student,
+        personal_assignment,
+        mock_audio_file,
+    ):
+        q = Question.objects.create(
+            personal_assignment=personal_assignment,
+            number=11,
+            content="Q",
+            model_answer="A",
+            explanation="E",
+            difficulty=Question.Difficulty.MEDIUM,
+            recalled_num=0,
+        )
+        mock_extract.return_value = {"script": "ok", "total_length": 1.0}
+        mock_infer.return_value = {"pred_cont": 1.0}
+        mock_fused.return_value = {
+            "is_correct": False,
+            "confidence": "low",
+            "bucket": "D",
+            "plan": "ASK",
+            "recalled_time": 1,
+            "tail_question": {
+                "topic": "T",
+                "question": "기초 질문",
+                "model_answer": "TA",
+                "explanation": "TE",
+                "difficulty": "easy",
+            },
+            "cache_hit": False,
+            "fused": True,
+        }
+        url = reverse("answer")
+        resp = api_client.post(
+            url, {"studentId": student.id, "questionId": q.id, "audioFile": mock_audio_file}, format="multipart"
+        )
+        assert resp.status_code == status.HTTP_201_CREATED
+        mock_parallel_stages.assert_not_called()
+        mock_tail.assert_not_called()
+        assert mock_fused.call_args.kwargs["eval_grade"] == 1.0
+        assert Answer.objects.get(question=q).state == Answer.State.INCORRECT
+        tail = Question.objects.get(personal_assignment=personal_assignment, number=11, recalled_num=1)
+        assert tail.content == "기초 질문"
+
     @patch("submissions.views.generate_tail_question")
     @patch("submissions.views.run_inference")
     @patch("submissions.views.extract_all_features")
@@ -704,6 +946,79 @@ class TestAnswerSubmitViewPOST:
         assert resp.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
         assert resp.data["success"] is False
 
+    @patch("submissions.views.generate_tail_question")
+    @patch("submissions.views.run_inference")
+    @patch("submissions.views.extract_all_features")
+    def test_planner_runs_as_parallel_stage(
+        self,
+        mock_extract,
+        mock_infer,
+        mock_tail,
+        mock_parallel_stages,
+        api_client,
+        student,
+        personal_assignment,
+        mock_audio_file,
+    ):
+        """planner(정오답 판정) 결과가 tail 생성에 전달되고, 추론에는 스크립트 특징 단계 결과가 사용됨"""
+        q = Question.objects.create(
+            personal_assignment=personal_assignment,
+            number=12,
+            content="Q12",
+            model_answer="A12",
+            explanation="E12",
+            difficulty=Question.Difficulty.MEDIUM,
+            recalled_num=0,
+        )
+        mock_extract.return_value = {"script": "answer", "total_length": 1.0}
+        mock_infer.return_value = {"pred_cont": 0.7}
+        mock_tail.return_value = {"is_correct": True, "plan": "ONLY_CORRECT", "recalled_time": 1}
+        mock_parallel_stages.return_value = False
+
+        url = reverse("answer")
+        resp = api_client.post(
+            url, {"studentId": student.id, "questionId": q.id, "audioFile": mock_audio_file}, format="multipart"
+        )
+
+        assert resp.status_code == status.HTTP_201_CREATED
+        mock_extract.assert_called_once()
+        assert mock_extract.call_args.kwargs["include_script_features"] is False
+        mock_parallel_stages.assert_called_once_with("Q12", "A12", "answer")
+        assert mock_tail.call_args.kwargs["is_correct"] is False
+        assert mock_tail.call_args.kwargs["eval_grade"] == 0.7
+
+    @patch("submissions.views.generate_tail_question")
+    @patch("submissions.views.run_inference")
+    @patch("submissions.views.extract_all_features")
+    def test_upload_stream_passed_without_temp_file(
+        self, mock_extract, mock_infer, mock_tail, api_client, student, personal_assignment, mock_audio_file
+    ):
+        """업로드된 음성은 임시 파일로 복사하지 않고 스트림 그대로 extract_all_features에 전달"""
+        q = Question.objects.create(
+            personal_assignment=personal_assignment,
+            number=13,
+            content="Q13",
+            model_answer="A13",
+            explanation="E13",
+            difficulty=Question.Difficulty.MEDIUM,
+            recalled_num=0,
+        )
+        mock_extract.return_value = {"script": "answer", "total_length": 1.0}
+        mock_infer.return_value = {"pred_cont": 0.7}
+        mock_tail.return_value = {"is_correct": True, "plan": "ONLY_CORRECT", "recalled_time": 1}
+
+        url = reverse("answer")
+        with patch("tempfile.NamedTemporaryFile") as mock_tempfile:
+            resp = api_client.post(
+                url, {"studentId": student.id, "questionId": q.id, "audioFile": mock_audio_file}, format="multipart"
+            )
+
+        assert resp.status_code == status.HTTP_201_CREATED
+        mock_tempfile.assert_not_called()
+        audio = mock_extract.call_args[0][0]
+        assert audio.name == "test.wav"
+        assert hasattr(audio, "read")
+
     @patch("submissions.views.generate_tail_question")
     @patch("submissions.views.run_inference")
     @patch("submissions.views.extract_all_features")
@@ -788,6 +1103,111 @@ class TestAnswerSubmitViewPOST:
             assert resp.data["data"]["tail_question"] is None
 
 
+class TestGradingCheckpointResume:
+    """GRADING_CHECKPOINT_ENABLED: 실패한 단계는 재시도하고, 같은 음성을 다시 제출하면 성공한 단계는 건너뜀"""
+
+    @pytest.fixture(autouse=True)
+    def checkpointing(self, settings):
+        settings.GRADING_CHECKPOINT_ENABLED = True
+        settings.GRADING_STAGE_MAX_ATTEMPTS = 2
+        settings.GRADING_STAGE_RETRY_BACKOFF = 0
+
+    @pytest.fixture
+    def question(self, personal_assignment):
+        return Question.objects.create(
+            personal_assignment=personal_assignment,
+            number=1,
+            content="Q",
+            model_answer="A",
+            explanation="E",
+            difficulty=Question.Difficulty.MEDIUM,
+            recalled_num=0,
+        )
+
+    def _submit(self, api_client, student, question, data):
+        audio = io.BytesIO(data)
+        audio.name = "test.wav"
+        return api_client.post(
+            reverse("answer"),
+            {"studentId": student.id, "questionId": question.id, "audioFile": audio},
+            format="multipart",
+        )
+
+    @patch("submissions.views.generate_tail_question")
+    @patch("submissions.views.run_inference")
+    @patch("submissions.views.extract_all_features")
+    def test_resubmission_resumes_after_tail_failure(
+        self, mock_extract, mock_infer, mock_tail, mock_parallel_stages, api_client, student, question
+    ):
+        audio = b"RIFF" + b"\x00" * 4 + b"WAVE" + b"\x01" * 1024
+        mock_extract.return_value = {"script": "answer", "total_length": 1.0, "min_f0_hz": np.float32(110.0)}
+        mock_infer.return_value = {"pred_cont": 0.4}
+        mock_tail.side_effect = RuntimeError("LLM down")
+
+        resp = self._submit(api_client, student, question, audio)
+
+        assert resp.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        assert mock_tail.call_count == 2  # GRADING_STAGE_MAX_ATTEMPTS
+        checkpoint = GradingCheckpoint.objects.get(question=question, student=student)
+        assert checkpoint.transcript == "answer"
+        assert checkpoint.features["min_f0_hz"] == 110.0
+        assert (checkpoint.eval_grade, checkpoint.is_correct) == (0.4, True)
+
+        mock_tail.side_effect = None
+        mock_tail.return_value = {"is_correct": True, "plan": "ONLY_CORRECT", "recalled_time": 1}
+        resp = self._submit(api_client, student, question, audio)
+
+        assert resp.status_code == status.HTTP_201_CREATED
+        assert mock_extract.call_count == 1
+        assert mock_infer.call_count == 1
+        assert mock_parallel_stages.call_count == 1
+        assert mock_tail.call_args.kwargs["student_answer"] == "answer"
+        assert mock_tail.call_args.kwargs["eval_grade"] == 0.4
+        assert Answer.objects.get(question=question, student=student).eval_grade == 0.4
+        assert not GradingCheckpoint.objects.exists()
+
+    @patch("submissions.views.generate_tail_question")
+    @patch("submissions.views.run_inference")
+    @patch("submissions.views.extract_all_features")
+    def test_different_audio_starts_over(self, mock_extract, mock_infer, mock_tail, api_client, student, question):
+        mock_extract.return_value = {"script": "answer", "total_length": 1.0}
+        mock_infer.return_value = {"pred_cont": 0.4}
+        mock_tail.side_effect = RuntimeError("LLM down")
+        self._submit(api_client, student, question, b"RIFF-first")
+
+        mock_tail.side_effect = None
+        mock_tail.return_value = {"is_correct": True, "plan": "ONLY_CORRECT", "recalled_time": 1}
+        resp = self._submit(api_client, student, question, b"RIFF-second")
+
+        assert resp.status_code == status.HTTP_201_CREATED
+        assert mock_extract.call_count == 2
+
+    @patch("submissions.views.generate_tail_question")
+    @patch("submissions.views.run_inference")
+    @patch("submissions.views.extract_all_features")
+    def test_transient_inference_failure_retried(
+        self, mock_extract, mock_infer, mock_tail, api_client, student, question
+    ):
+        mock_extract.return_value = {"script": "answer", "total_length": 1.0}
+        mock_infer.side_effect = [RuntimeError("model busy"), {"pred_cont": 0.4}]
+        mock_tail.return_value = {"is_correct": True, "plan": "ONLY_CORRECT", "recalled_time": 1}
+
+        resp = self._submit(api_client, student, question, b"RIFF")
+
+        assert resp.status_code == status.HTTP_201_CREATED
+        assert mock_infer.call_count == 2
+
+    @patch("submissions.views.run_inference")
+    @patch("submissions.views.extract_all_features")
+    def test_failed_stt_is_not_checkpointed(self, mock_extract, mock_infer, api_client, student, question):
+        mock_extract.return_value = {"script": "음성 인식 실패", "total_length": 1.0}
+        mock_infer.side_effect = RuntimeError("model busy")
+
+        self._submit(api_client, student, question, b"RIFF")
+
+        assert not GradingCheckpoint.objects.exists()
+
+
 class TestFeatureExtractionAndInference:
     """extract_all_features와 run_inference 로직 테스트"""
 
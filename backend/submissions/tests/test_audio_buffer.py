@@ -0,0 +1,115 @@
+"""
+AudioBuffer 테스트
+- 경로 / 파일 객체에서 한 번만 디코딩, 16kHz mono 신호는 처음 접근할 때 한 번만 계산
+- speech_to_text / silence_features_fast / compute_f0 / extract_acoustic_features가 버퍼를 그대로 받는지
+"""
+
+import io
+import os
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+import soundfile as sf
+from submissions.utils.audio_buffer import STT_SAMPLE_RATE, AudioBuffer
+from submissions.utils.feature_extractor.extract_acoustic_features import (
+    compute_f0,
+    extract_acoustic_features,
+    silence_features_fast,
+)
+from submissions.utils.wave_to_text import resample_to_16k_mono, speech_to_text
+
+
+@pytest.fixture
+def test_wav_path():
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    wav_path = os.path.join(current_dir, "test_sample/test_record.wav")
+    if not os.path.exists(wav_path):
+        pytest.skip(f"테스트용 WAV 파일이 없습니다: {wav_path}")
+    return wav_path
+
+
+def _stereo_wav_bytes(sr=22050, seconds=0.5):
+    t = np.arange(int(sr * seconds)) / sr
+    left = 0.5 * np.sin(2 * np.pi * 220 * t)
+    right = 0.25 * np.sin(2 * np.pi * 440 * t)
+    buffer = io.BytesIO()
+    sf.write(buffer, np.stack([left, right], axis=1), sr, format="WAV", subtype="PCM_16")
+    return buffer.getvalue()
+
+
+class TestAudioBuffer:
+    def test_decode_from_path_and_stream_match(self, test_wav_path):
+        from_path = AudioBuffer.from_source(test_wav_path)
+        with open(test_wav_path, "rb") as f:
+            from_stream = AudioBuffer.from_source(io.BytesIO(f.read()))
+
+        assert from_path.samples.dtype == np.float32
+        assert from_path.sr == from_stream.sr
+        np.testing.assert_array_equal(from_path.samples, from_stream.samples)
+        assert AudioBuffer.from_source(from_path) is from_path
+
+    def test_stereo_views(self):
+        audio = AudioBuffer.from_source(io.BytesIO(_stereo_wav_bytes()))
+
+        assert audio.samples.shape[1] == 2
+        np.testing.assert_array_equal(audio.first_channel, audio.samples[:, 0])
+        np.testing.assert_allclose(audio.mono, audio.samples.mean(axis=1), atol=1e-6)
+        assert audio.duration == pytest.approx(0.5)
+
+    def test_mono_16k_computed_once(self):
+        audio = AudioBuffer.from_source(io.BytesIO(_stereo_wav_bytes(sr=22050)))
+
+        with patch("resampy.resample", side_effect=lambda y, sr_orig, sr_new: y[::2]) as mock_resample:
+            first = audio.mono_16k
+            second = audio.mono_16k
+
+        assert first is second
+        mock_resample.assert_called_once()
+        assert mock_resample.call_args[0][1:] == (22050, STT_SAMPLE_RATE)
+
+    def test_empty_and_missing_sources(self, tmp_path):
+        empty = tmp_path / "empty.wav"
+        empty.write_bytes(b"")
+
+        with pytest.raises(ValueError):
+            AudioBuffer.from_source(str(empty))
+        with pytest.raises(FileNotFoundError):
+            AudioBuffer.from_source(str(tmp_path / "missing.wav"))
+
+
+class TestConsumersAcceptBuffer:
+    def test_acoustic_features_same_for_path_and_buffer(self, test_wav_path):
+        audio = AudioBuffer.from_source(test_wav_path)
+
+        assert extract_acoustic_features(audio) == pytest.approx(extract_acoustic_features(test_wav_path), nan_ok=True)
+
+        sil = silence_features_fast(audio)
+        assert sil["total_length"] == pytest.approx(audio.duration)
+        f0 = compute_f0(audio)
+        f0_array = compute_f0(audio.first_channel, audio.sr)
+        np.testing.assert_array_equal(f0["t"], f0_array["t"])
+
+    def test_resample_to_16k_mono_from_buffer(self):
+        audio = AudioBuffer.from_source(io.BytesIO(_stereo_wav_bytes(sr=22050)))
+
+        wav_bytes, sr = resample_to_16k_mono(audio)
+
+        data, read_sr = sf.read(io.BytesIO(wav_bytes))
+        assert sr == read_sr == STT_SAMPLE_RATE
+        assert data.ndim == 1
+        assert len(data) == pytest.approx(0.5 * STT_SAMPLE_RATE, abs=2)
+
+    @patch("submissions.utils.wave_to_text.speech.SpeechClient")
+    def test_speech_to_text_accepts_buffer(self, mock_client_class):
+        mock_result = Mock()
+        mock_result.alternatives = [Mock(transcript="안녕하세요")]
+        mock_client_class.return_value.recognize.return_value = Mock(results=[mock_result])
+        audio = AudioBuffer.from_source(io.BytesIO(_stereo_wav_bytes(sr=16000)))
+
+        with patch("tempfile.NamedTemporaryFile") as mock_tempfile:
+            assert speech_to_text(audio) == "안녕하세요"
+
+        mock_tempfile.assert_not_called()
+        sent = mock_client_class.return_value.recognize.call_args[1]["audio"].content
+        assert sf.info(io.BytesIO(sent)).samplerate == STT_SAMPLE_RATE
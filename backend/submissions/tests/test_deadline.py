@@ -0,0 +1,43 @@
+"""
+deadline 테스트 (가짜 시계)
+- 남은 시간 / 뒤 단계 몫을 남긴 단계별 제한 시간
+- ANSWER_DEADLINE_SECONDS가 0이면 제한 없음
+"""
+
+from django.test import override_settings
+from submissions.utils.deadline import MIN_STAGE_TIMEOUT, Deadline, answer_deadline
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDeadline:
+    def test_remaining_and_stage_timeout(self):
+        clock = FakeClock()
+        deadline = Deadline(10, clock=clock)
+
+        clock.now += 3
+        assert deadline.remaining() == 7
+        assert deadline.timeout(reserve=2) == 5
+        assert deadline.allows(7) and not deadline.allows(7.5)
+
+    def test_exhausted_budget_keeps_minimum_stage_timeout(self):
+        clock = FakeClock()
+        deadline = Deadline(10, clock=clock)
+
+        clock.now += 12
+        assert deadline.remaining() == 0
+        assert deadline.timeout(reserve=1) == MIN_STAGE_TIMEOUT
+
+    @override_settings(ANSWER_DEADLINE_SECONDS=0)
+    def test_disabled_by_default(self):
+        assert answer_deadline() is None
+
+    @override_settings(ANSWER_DEADLINE_SECONDS=15)
+    def test_answer_deadline_from_settings(self):
+        assert answer_deadline().seconds == 15
@@ -0,0 +1,124 @@
+"""
+embedding_cache 테스트
+- 메모리 LRU tier: hit/miss 집계, 용량 초과 시 가장 오래 안 쓴 항목 제거
+- 디스크 tier: 다른 프로세스(인스턴스)가 저장한 임베딩을 float32 memmap에서 그대로 읽음
+- BatchedEncoder + 캐시: 캐시에 없는 텍스트만 encode, 필러 seed 프로토타입은 모델당 한 번
+"""
+
+import numpy as np
+import pytest
+from submissions.utils.embedding_cache import EmbeddingCache, get_embedding_cache, text_key
+from submissions.utils.feature_extractor.extract_features_from_script import (
+    BatchedEncoder,
+    extract_features_from_script,
+    filler_seed_prototype,
+)
+
+
+class FakeSBERT:
+    def __init__(self, dim=8):
+        self.dim = dim
+        self.calls = []
+
+    def encode(self, texts, **kwargs):
+        self.calls.append(list(texts))
+        out = []
+        for t in texts:
+            rng = np.random.default_rng(sum(ord(c) * (i + 1) for i, c in enumerate(t)))
+            v = rng.standard_normal(self.dim).astype(np.float32)
+            out.append(v / np.linalg.norm(v))
+        return np.array(out)
+
+
+def _vec(*values):
+    return np.array([values], dtype=np.float32)
+
+
+class TestEmbeddingCache:
+    def test_text_key_normalizes_whitespace(self):
+        assert text_key(" 그러니까  에너지 ") == text_key("그러니까 에너지")
+
+    def test_hits_misses_and_lru_eviction(self):
+        cache = EmbeddingCache("m", max_entries=2)
+        cache.put_many(["a"], _vec(1, 0))
+        cache.put_many(["b"], _vec(0, 1))
+
+        assert set(cache.get_many(["a", "c"])) == {"a"}  # a 사용 -> b가 가장 오래됨
+        cache.put_many(["c"], _vec(1, 1))
+
+        assert set(cache.get_many(["a", "b", "c"])) == {"a", "c"}
+        stats = cache.stats()
+        assert stats["memory_hits"] == 3
+        assert stats["misses"] == 2
+        assert stats["entries"] == 2
+
+    def test_disk_tier_shared_between_instances(self, tmp_path):
+        writer = EmbeddingCache("m", disk_dir=str(tmp_path))
+        writer.put_many(["광합성", "에너지"], np.array([[0.5, 0.25], [0.125, 1.0]], dtype=np.float32))
+
+        reader = EmbeddingCache("m", disk_dir=str(tmp_path))  # 다른 워커
+        found = reader.get_many(["에너지", "없음"])
+
+        np.testing.assert_allclose(found["에너지"], [0.125, 1.0])
+        assert reader.stats()["disk_hits"] == 1
+        assert reader.stats()["misses"] == 1
+        # 디스크에서 읽은 항목은 메모리 tier에도 올라감
+        reader.get_many(["에너지"])
+        assert reader.stats()["memory_hits"] == 1
+
+    def test_disk_tier_keeps_exact_values(self, tmp_path):
+        vectors = FakeSBERT().encode(["그러니까 에너지가"])
+        EmbeddingCache("m", disk_dir=str(tmp_path)).put_many(["그러니까 에너지가"], vectors)
+
+        found = EmbeddingCache("m", disk_dir=str(tmp_path)).get_many(["그러니까 에너지가"])
+
+        # 먼저 encode한 워커와 디스크에서 읽은 워커의 특징 값이 같도록 반올림 없이 저장
+        np.testing.assert_array_equal(found["그러니까 에너지가"], vectors[0])
+
+    def test_disk_tier_row_limit(self, tmp_path):
+        cache = EmbeddingCache("m", disk_dir=str(tmp_path), disk_max_rows=1)
+        cache.put_many(["a", "b"], np.eye(2, dtype=np.float32))
+
+        other = EmbeddingCache("m", disk_dir=str(tmp_path))
+        assert set(other.get_many(["a", "b"])) == {"a"}
+
+    def test_one_cache_per_model(self):
+        assert get_embedding_cache("model-a") is get_embedding_cache("model-a")
+        assert get_embedding_cache("model-a") is not get_embedding_cache("model-b")
+
+
+class TestCachedEncoding:
+    def test_encoder_only_encodes_cache_misses(self):
+        model = FakeSBERT()
+        cache = EmbeddingCache("fake")
+
+        first = BatchedEncoder(model, ["광합성", "빛 에너지"], cache=cache)
+        second = BatchedEncoder(model, ["빛 에너지", "산소"], cache=cache)
+
+        assert model.calls == [["광합성", "빛 에너지"], ["산소"]]
+        assert second.n_encoded == 1
+        np.testing.assert_array_equal(second.encode(["빛 에너지"]), first.encode(["빛 에너지"]))
+
+    def test_features_identical_with_cache(self):
+        script = "광합성은 빛 에너지를 이용해요. 빛 에너지로 포도당을 만들어요. 산소도 나와요."
+        data = {"script": script, "total_length": 4.0}
+        cache = EmbeddingCache("fake")
+        model = FakeSBERT()
+
+        uncached = extract_features_from_script(data, shared_model=FakeSBERT())
+        extract_features_from_script(data, shared_model=model, embedding_cache=cache)
+        cached = extract_features_from_script(data, shared_model=model, embedding_cache=cache)
+
+        assert len(model.calls) == 1  # 두 번째 답변은 전부 캐시 hit
+        for key in ("repeat_cnt", "adj_sim_mean", "coherence_score", "inter_div"):
+            assert cached[key] == pytest.approx(uncached[key])
+
+    def test_seed_prototype_computed_once_per_model(self):
+        model = FakeSBERT()
+
+        first = filler_seed_prototype(model)
+        second = filler_seed_prototype(model)
+
+        assert first is second
+        assert len(model.calls) == 1
+        assert np.linalg.norm(first) == pytest.approx(1.0, abs=1e-5)
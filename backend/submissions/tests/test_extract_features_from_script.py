@@ -289,3 +289,241 @@ class TestExtractSemanticFeaturesFromScript:
 
         with pytest.raises(RuntimeError, match="SentenceTransformer 사용 불가"):
             extract_semantic_features_from_script({"script": "test"}, model=None)
+
+
+class FakeSBERT:
+    """텍스트마다 고정된 정규화 임베딩을 돌려주는 SBERT 대용 (호출 기록 포함)"""
+
+    def __init__(self, dim=16):
+        self.dim = dim
+        self.calls = []
+
+    def _embed(self, text):
+        rng = np.random.default_rng(sum(ord(c) * (i + 1) for i, c in enumerate(text)))
+        v = rng.standard_normal(self.dim).astype(np.float32)
+        return v / np.linalg.norm(v)
+
+    def encode(self, texts, **kwargs):
+        self.calls.append(list(texts))
+        return np.array([self._embed(t) for t in texts])
+
+
+class TestBatchedEncode:
+    """transcript 하나당 SBERT encode 한 번 (중복 제거 + 길이순 정렬)"""
+
+    SCRIPT = "음 그러니까 광합성은 빛을 이용해요. 광합성은 빛을 이용해서 포도당을 만들어요. 그 뭐지 산소도 나와요."
+
+    def test_single_encode_call_with_deduped_sorted_texts(self):
+        from submissions.utils.feature_extractor.extract_features_from_script import (
+            extract_features_from_script,
+            filler_seed_prototype,
+        )
+
+        model = FakeSBERT()
+        filler_seed_prototype(model)  # 모델 로드 시 한 번 계산 (warmup_models)
+        model.calls.clear()
+
+        extract_features_from_script(
+            {"script": self.SCRIPT, "total_length": 5.0}, shared_model=model, use_embeddings=True
+        )
+
+        assert len(model.calls) == 1
+        texts = model.calls[0]
+        assert len(texts) == len(set(texts))
+        assert [len(t) for t in texts] == sorted(len(t) for t in texts)
+
+    def test_results_match_separate_encodes(self):
+        from submissions.utils.feature_extractor.extract_features_from_script import (
+            DEFAULT_SEED_PHRASES,
+            embeddings_boost_count,
+            extract_features_from_script,
+            semantic_near_dup_count,
+        )
+
+        batched = extract_features_from_script(
+            {"script": self.SCRIPT, "total_length": 5.0}, shared_model=FakeSBERT(), use_embeddings=True
+        )
+
+        model = FakeSBERT()
+        assert batched["filler_embed_boost_cnt"] == embeddings_boost_count(self.SCRIPT, model, DEFAULT_SEED_PHRASES)
+        assert batched["repeat_cnt"] == semantic_near_dup_count(self.SCRIPT, model)["sem_near_dup_cnt"]
+        separate = _semantic_1d_features_from_script(self.SCRIPT, model=model)
+        for key, value in separate.items():
+            assert batched[key] == pytest.approx(value)
+
+
+def _near_dup_reference(spans, embs, thr, window):
+    """벡터화 이전의 이중 루프 + union-find 구현 (결과 비교용)"""
+    n = len(spans)
+    parent = list(range(n))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    pairs = []
+    for i in range(n):
+        for j in range(i + 1, min(i + 1 + window, n)):
+            (li, ri), (lj, rj) = spans[i][1], spans[j][1]
+            if lj < ri and li < rj:
+                continue
+            sim = float((embs[i] * embs[j]).sum())
+            if sim >= thr:
+                parent[find(j)] = find(i)
+                pairs.append({"i": i, "j": j, "span_i": spans[i], "span_j": spans[j], "sim": round(sim, 3)})
+    roots = [find(i) for i in range(n)]
+    return n - len(set(roots)), pairs
+
+
+class TestVectorizedNearDup:
+    """semantic_near_dup_count: 띠 유사도 + 연결 요소 구현이 이중 루프 구현과 같은 결과인지"""
+
+    class ClusteredSBERT:
+        """같은 어휘는 비슷한 방향의 임베딩을 주는 SBERT 대용 (중복 쌍이 충분히 생기도록)"""
+
+        def encode(self, texts, **kwargs):
+            out = []
+            for t in texts:
+                base = np.random.default_rng(len(t) % 5).standard_normal(32)
+                noise = np.random.default_rng(sum(map(ord, t))).standard_normal(32) * 0.6
+                v = (base + noise).astype(np.float32)
+                out.append(v / np.linalg.norm(v))
+            return np.array(out)
+
+    @pytest.mark.parametrize("thr,window", [(0.85, 3), (0.7, 6), (0.5, 1)])
+    def test_matches_reference(self, thr, window):
+        from submissions.utils.feature_extractor.extract_features_from_script import (
+            _STOP_NEARDUP_DEFAULT,
+            _make_spans,
+            semantic_near_dup_count,
+            tokenize_ko,
+        )
+
+        words = ["광합성", "빛", "에너지", "포도당", "산소", "엽록체", "이산화탄소", "물", "만들어요", "흡수해요"]
+        rng = np.random.default_rng(0)
+        script = " ".join(rng.choice(words, size=300))
+        model = self.ClusteredSBERT()
+
+        result = semantic_near_dup_count(script, model, thr=thr, window=window, return_pairs=True)
+
+        spans = _make_spans(tokenize_ko(script), 1, 2, min_char_len=2, skip_words=_STOP_NEARDUP_DEFAULT)
+        embs = model.encode([s for s, _ in spans])
+        expected_cnt, expected_pairs = _near_dup_reference(spans, embs, thr, window)
+
+        assert result["sem_near_dup_cnt"] == expected_cnt
+        assert result["sem_near_dup_pairs"] == expected_pairs
+        assert expected_cnt > 0
+
+    def test_edge_cases(self):
+        from submissions.utils.feature_extractor.extract_features_from_script import semantic_near_dup_count
+
+        model = self.ClusteredSBERT()
+        assert semantic_near_dup_count("광합성", model) == {"sem_near_dup_cnt": 0}
+        assert semantic_near_dup_count("", model, return_pairs=True) == {
+            "sem_near_dup_cnt": 0,
+            "sem_near_dup_pairs": [],
+        }
+        assert semantic_near_dup_count("광합성 광합성", None) == {"sem_near_dup_cnt": 0}
+
+
+def _fillers_reference(text, base, multi, thr):
+    """인덱스 도입 이전의 difflib 전수 비교 + 구절별 정규식 구현 (결과/속도 비교용)"""
+    import difflib
+    import re
+
+    from submissions.utils.feature_extractor.extract_features_from_script import normalize_text_basic, tokenize_ko
+
+    norm = normalize_text_basic(text)
+    single = 0
+    for tk in tokenize_ko(norm):
+        if tk in base or any(difflib.SequenceMatcher(None, tk, w).ratio() >= thr for w in base):
+            single += 1
+    multi_cnt = 0
+    for phrase in multi:
+        pat = r"\b" + r"\s*".join(map(re.escape, phrase.split())) + r"\b"
+        multi_cnt += len(re.findall(pat, norm))
+    return {"filler_single_cnt": single, "filler_multi_cnt": multi_cnt, "filler_words_cnt": single + multi_cnt}
+
+
+def _long_filler_transcript(n_words, seed=0):
+    from submissions.utils.feature_extractor.extract_features_from_script import FILLER_BASE, FILLER_MULTI
+
+    vocab = sorted(FILLER_BASE | FILLER_MULTI) + [
+        "그러니깐",
+        "그니깐",
+        "음흠흠",
+        "어어어",
+        "그런대",
+        "그러면은",
+        "뭐랄까요",
+        "그뭐지",
+        "이제뭐",
+        "광합성은",
+        "빛",
+        "에너지를",
+        "이용해서",
+        "포도당을",
+        "만들어요",
+        "엽록체에서",
+        "일어나요",
+    ]
+    rng = np.random.default_rng(seed)
+    words = rng.choice(vocab, size=n_words)
+    punct = rng.choice(["", "", "", ",", ".", "..."], size=n_words)
+    return " ".join(w + p for w, p in zip(words, punct))
+
+
+class TestFillerMatcher:
+    """FillerMatcher: difflib 전수 비교 구현과 같은 개수를 더 빠르게 계산하는지"""
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_counts_match_difflib_scan(self, seed):
+        from submissions.utils.feature_extractor.extract_features_from_script import (
+            FILLER_BASE,
+            FILLER_MULTI,
+            rule_fuzzy_fillers,
+        )
+
+        text = _long_filler_transcript(400, seed=seed)
+
+        expected = _fillers_reference(text, FILLER_BASE, FILLER_MULTI, 0.86)
+        assert rule_fuzzy_fillers(text, token_ratio_thr=0.86) == expected
+        assert expected["filler_single_cnt"] > 0 and expected["filler_multi_cnt"] > 0
+
+    def test_every_token_judged_like_difflib(self):
+        import difflib
+
+        from submissions.utils.feature_extractor.extract_features_from_script import FILLER_BASE, FillerMatcher
+
+        matcher = FillerMatcher(FILLER_BASE, (), 0.86)
+        tokens = ["그러니깐", "그니깐", "그런대", "음흠흠", "어어", "뭐랄까요", "그리구", "광합성", "일단은", "a"]
+        for tok in tokens:
+            expected = any(difflib.SequenceMatcher(None, tok, w).ratio() >= 0.86 for w in FILLER_BASE)
+            assert matcher.is_filler(tok) == expected, tok
+
+    def test_matcher_built_once_per_lexicon(self):
+        from submissions.utils.feature_extractor.extract_features_from_script import get_filler_matcher
+
+        assert get_filler_matcher() is get_filler_matcher()
+        assert get_filler_matcher(ratio_thr=0.9) is not get_filler_matcher()
+
+    def test_long_transcript_counts_match_reference(self):
+        """긴 transcript(약 5천 단어)에서도 새 매처(memo 비어 있음)의 필러 개수가 difflib 기준 구현과 같음"""
+        from submissions.utils.feature_extractor.extract_features_from_script import (
+            FILLER_BASE,
+            FILLER_MULTI,
+            FillerMatcher,
+            normalize_text_basic,
+            tokenize_ko,
+        )
+
+        text = _long_filler_transcript(5000, seed=42)
+        expected = _fillers_reference(text, FILLER_BASE, FILLER_MULTI, 0.86)
+
+        matcher = FillerMatcher(FILLER_BASE, FILLER_MULTI, 0.86)
+        single = sum(1 for tk in tokenize_ko(normalize_text_basic(text)) if matcher.is_filler(tk))
+        multi = matcher.count_multi(text)
+
+        assert (single, multi) == (expected["filler_single_cnt"], expected["filler_multi_cnt"])
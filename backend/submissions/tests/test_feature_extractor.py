@@ -29,6 +29,15 @@ def test_script():
         return f.read().strip()
 
 
+@pytest.fixture
+def local_sbert_dir(tmp_path, monkeypatch):
+    """로컬 SBERT 모델 디렉터리(KR_SBERT_local)가 있는 환경을 흉내냄"""
+    monkeypatch.setattr(
+        "submissions.utils.feature_extractor.extract_all_features.DEFAULT_SBERT_MODEL_PATH", str(tmp_path)
+    )
+    return str(tmp_path)
+
+
 class TestExtractAllFeatures:
     """extract_all_features 함수 테스트"""
 
@@ -44,6 +53,7 @@ class TestExtractAllFeatures:
         mock_sentence_transformer_class,
         test_wav_path,
         test_script,
+        local_sbert_dir,
     ):
         """extract_all_features 정상 동작 테스트"""
         # Mock 설정
@@ -94,8 +104,13 @@ class TestExtractAllFeatures:
         assert "max_f0_hz" in result
 
         # Mock 호출 확인
-        mock_speech_to_text.assert_called_once_with(test_wav_path)
-        mock_extract_acoustic_features.assert_called_once_with(test_wav_path)
+        # 음성은 한 번만 디코딩되고, STT와 음향 특징 추출이 같은 AudioBuffer를 공유
+        from submissions.utils.audio_buffer import AudioBuffer
+
+        mock_speech_to_text.assert_called_once()
+        audio = mock_speech_to_text.call_args[0][0]
+        assert isinstance(audio, AudioBuffer)
+        mock_extract_acoustic_features.assert_called_once_with(audio, include_f0=True)
         mock_sentence_transformer_class.assert_called_once()
         mock_extract_features_from_script.assert_called_once()
 
@@ -262,6 +277,7 @@ class TestExtractAllFeatures:
         mock_sentence_transformer_class,
         test_wav_path,
         test_script,
+        local_sbert_dir,
     ):
         """실제 extract_acoustic_features와 통합 테스트 (STT와 SentenceTransformer, extract_features_from_script만 mock)"""
         # Mock 설정
@@ -0,0 +1,93 @@
+"""
+feature_graph 테스트
+- 모델 컬럼(FEATURE_COLUMNS)에 필요한 producer만 선택하고, 나머지는 건너뛴 producer로 보고
+- 필요 없는 SBERT / f0 계산은 실제로 실행되지 않음
+"""
+
+import os
+from unittest.mock import patch
+
+import pytest
+from submissions.utils.feature_extractor.extract_features_from_script import extract_features_from_script
+from submissions.utils.feature_extractor.feature_graph import PRODUCERS, plan_features
+from submissions.utils.inference import FEATURE_COLUMNS, required_feature_keys
+
+
+@pytest.fixture
+def test_wav_path():
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    wav_path = os.path.join(current_dir, "test_sample/test_record.wav")
+    if not os.path.exists(wav_path):
+        pytest.skip(f"테스트용 WAV 파일이 없습니다: {wav_path}")
+    return wav_path
+
+
+class TestPlanFeatures:
+    def test_every_model_column_has_producer(self):
+        outputs = {key for p in PRODUCERS for key in p.outputs}
+
+        assert set(required_feature_keys(FEATURE_COLUMNS)) <= outputs
+
+    def test_default_plan_skips_unused_producers(self):
+        plan = plan_features()
+
+        assert plan.producers == (
+            "decode",
+            "stt",
+            "silence",
+            "f0",
+            "counts",
+            "fillers",
+            "sbert",
+            "near_dup",
+            "semantic_1d",
+        )
+        assert plan.skipped == ("filler_embed_boost",)
+
+    def test_ratio_columns_pull_in_their_inputs(self):
+        plan = plan_features(["repeat_cnt_ratio"])
+
+        assert {"near_dup", "sbert", "counts"} <= set(plan.producers)
+        assert "semantic_1d" in plan.skipped
+        assert "f0" in plan.skipped
+
+    def test_acoustic_only_model_skips_sbert(self):
+        plan = plan_features(["percent_silence", "voc_speed"])
+
+        assert plan.producers == ("decode", "stt", "silence", "counts")
+        assert set(plan.skipped_expensive()) == {"f0", "sbert", "filler_embed_boost", "near_dup", "semantic_1d"}
+
+    def test_unknown_column_raises(self):
+        with pytest.raises(ValueError):
+            plan_features(["not_a_feature"])
+
+
+class TestLazyExtraction:
+    def test_script_features_only_requested_producers(self):
+        with patch("submissions.utils.feature_extractor.extract_features_from_script.SentenceTransformer") as mock_st:
+            result = extract_features_from_script(
+                {"script": "어 그러니까 음 답은 이거예요.", "total_length": 2.0}, producers=["counts", "fillers"]
+            )
+
+        mock_st.assert_not_called()
+        assert result["word_cnt"] > 0
+        assert result["filler_words_cnt"] > 0
+        assert "repeat_cnt" not in result
+        assert "adj_sim_mean" not in result
+
+    @patch("submissions.utils.feature_extractor.extract_all_features.get_sbert_model")
+    @patch("submissions.utils.feature_extractor.extract_all_features.wave_to_text.speech_to_text")
+    def test_extract_all_features_computes_only_model_columns(self, mock_stt, mock_get_sbert, test_wav_path):
+        from submissions.utils.feature_extractor.extract_all_features import extract_all_features
+
+        mock_stt.return_value = "첫 번째 문장입니다. 두 번째 문장입니다."
+
+        with patch("submissions.utils.feature_extractor.extract_acoustic_features.compute_f0") as mock_f0:
+            result = extract_all_features(test_wav_path, columns=["percent_silence", "voc_speed"])
+
+        mock_get_sbert.assert_not_called()
+        mock_f0.assert_not_called()
+        assert result["voc_speed"] > 0
+        assert "percent_silence" in result
+        assert "min_f0_hz" not in result
+        assert "adj_sim_mean" not in result
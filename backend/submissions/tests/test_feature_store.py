@@ -0,0 +1,148 @@
+"""
+feature_store / regrade_answers 테스트
+- 특징 dict <-> float32 벡터 변환, 계산하지 않은 특징은 NaN(None)
+- 저장된 벡터로 만든 모델 입력이 build_feature_matrix 결과와 같은지
+- regrade_answers 커맨드가 청크 단위로 예측해 eval_grade를 갱신하는지
+"""
+
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+from assignments.models import Assignment
+from catalog.models import Subject
+from courses.models import CourseClass
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.utils import timezone
+from questions.models import Question
+from submissions.models import Answer, AnswerFeatures, PersonalAssignment
+from submissions.utils.feature_extractor.feature_graph import PRODUCERS
+from submissions.utils.feature_store import (
+    FEATURE_SCHEMA_VERSION,
+    FEATURE_SCHEMAS,
+    decode_features,
+    decode_matrix,
+    encode_features,
+    model_input_matrix,
+    save_answer_features,
+)
+from submissions.utils.inference import build_feature_matrix
+
+Account = get_user_model()
+
+
+def _features(seed):
+    rng = np.random.default_rng(seed)
+    features = {key: float(rng.uniform(0, 20)) for key in FEATURE_SCHEMAS[FEATURE_SCHEMA_VERSION]}
+    features["word_cnt"] = int(rng.integers(0, 40))
+    features["script"] = "전사 결과"
+    del features["adj_sim_mean"]
+    return features
+
+
+class TestFeatureVector:
+    def test_schema_covers_all_numeric_graph_outputs(self):
+        outputs = {key for p in PRODUCERS for key in p.outputs} - {"audio", "script", "sbert_model"}
+
+        assert outputs == set(FEATURE_SCHEMAS[FEATURE_SCHEMA_VERSION])
+
+    def test_roundtrip_keeps_float32_values_and_missing(self):
+        features = {"word_cnt": 12, "voc_speed": 3.25, "percent_silence": None, "script": "텍스트"}
+        row = AnswerFeatures(schema_version=FEATURE_SCHEMA_VERSION, vector=encode_features(features))
+
+        decoded = decode_features(row)
+
+        assert decoded["word_cnt"] == 12.0
+        assert decoded["voc_speed"] == 3.25
+        assert decoded["percent_silence"] is None
+        assert decoded["adj_sim_mean"] is None
+        assert len(row.vector) == 4 * len(FEATURE_SCHEMAS[FEATURE_SCHEMA_VERSION])
+
+    def test_unknown_schema_version(self):
+        with pytest.raises(ValueError):
+            decode_matrix([b""], 999)
+
+    def test_model_input_matches_feature_dicts(self):
+        features = [_features(seed) for seed in range(20)]
+        rows = [AnswerFeatures(schema_version=FEATURE_SCHEMA_VERSION, vector=encode_features(f)) for f in features]
+
+        # 저장 시 float32로 줄어드는 것만 반영해 비교
+        as_float32 = [{k: float(np.float32(v)) for k, v in f.items() if k != "script"} for f in features]
+        np.testing.assert_allclose(model_input_matrix(rows), build_feature_matrix(as_float32), rtol=1e-6)
+
+
+@pytest.mark.django_db
+class TestRegradeAnswers:
+    @pytest.fixture
+    def answers(self):
+        student = Account.objects.create_user(
+            email="student@test.com", password="testpass123", display_name="Student", is_student=True
+        )
+        teacher = Account.objects.create_user(
+            email="teacher@test.com", password="testpass123", display_name="Teacher", is_student=False
+        )
+        subject = Subject.objects.create(name="Math")
+        course_class = CourseClass.objects.create(teacher=teacher, subject=subject, name="Algebra 1", description="")
+        assignment = Assignment.objects.create(
+            course_class=course_class,
+            subject=subject,
+            title="HW 1",
+            description="",
+            total_questions=5,
+            due_at=timezone.now() + timedelta(days=7),
+            grade="",
+        )
+        personal_assignment = PersonalAssignment.objects.create(student=student, assignment=assignment)
+        answers = []
+        for i in range(5):
+            question = Question.objects.create(
+                personal_assignment=personal_assignment, number=i + 1, content=f"Q{i}", model_answer="A", recalled_num=0
+            )
+            answer = Answer.objects.create(question=question, student=student, eval_grade=1.0)
+            save_answer_features(answer, _features(i))
+            answers.append(answer)
+        return answers
+
+    def test_save_overwrites_on_resubmit(self, answers):
+        save_answer_features(answers[0], {"word_cnt": 3})
+
+        assert AnswerFeatures.objects.filter(answer=answers[0]).count() == 1
+        assert decode_features(AnswerFeatures.objects.get(answer=answers[0]))["word_cnt"] == 3.0
+
+    @patch("submissions.utils.inference.joblib.load")
+    def test_regrades_in_chunks(self, mock_load, answers):
+        model = Mock()
+        model.predict.side_effect = lambda X: np.full(len(X), 6.5)
+        mock_load.return_value = model
+        out = StringIO()
+
+        call_command("regrade_answers", "--chunk-size", "2", stdout=out)
+
+        assert model.predict.call_count == 3  # 5개 답안 / 청크 2
+        assert set(Answer.objects.values_list("eval_grade", flat=True)) == {6.5}
+        assert "5개 중 5개" in out.getvalue()
+
+    @patch("submissions.utils.inference.joblib.load")
+    def test_dry_run_does_not_update(self, mock_load, answers):
+        model = Mock()
+        model.predict.side_effect = lambda X: np.full(len(X), 6.5)
+        mock_load.return_value = model
+
+        call_command("regrade_answers", "--dry-run", stdout=StringIO())
+
+        assert set(Answer.objects.values_list("eval_grade", flat=True)) == {1.0}
+
+    def test_real_model_matches_run_inference(self, answers):
+        from submissions.utils.inference import run_inference
+
+        call_command("regrade_answers", stdout=StringIO())
+
+        for i, answer in enumerate(answers):
+            answer.refresh_from_db()
+            stored = {k: v for k, v in decode_features(answer.features).items() if v is not None}
+            assert answer.eval_grade == pytest.approx(
+                run_inference("submissions/machine/model.joblib", stored)["pred_cont"]
+            )
@@ -0,0 +1,318 @@
+"""
+generate_questions_routed 테스트 (LLM은 mock)
+"""
+
+import json
+from unittest.mock import Mock, patch
+
+import pytest
+from langchain_core.messages import AIMessageChunk
+from submissions.utils.tail_question_generator import generate_questions_routed as gqr
+from submissions.utils.tail_question_generator.llm_usage import usage_ledger
+
+
+def _llm_reply(content):
+    reply = Mock()
+    reply.content = content
+    return reply
+
+
+class TestPooledChatModels:
+    def test_role_models_come_from_client_pool(self):
+        from core import clients
+
+        planner, actor = gqr.planner_llm.client(), gqr.actor_llm.client()
+
+        assert gqr.planner_llm.client() is planner
+        assert (planner.temperature, actor.temperature) == (0, 0.7)
+        assert planner.model_kwargs == gqr.JSON_MODE
+        assert planner.http_client is actor.http_client is clients.get_openai_http_client()
+
+        clients._reset_after_fork()
+        assert gqr.planner_llm.client() is not planner
+
+    def test_bounded_calls_disable_sdk_retries(self):
+        assert gqr.actor_llm.client().max_retries != 0  # SDK 기본 재시도
+        assert gqr.actor_llm.client(bounded=True).max_retries == 0
+
+        with patch.object(gqr.PooledChatModel, "client") as client:
+            gqr.actor_llm.invoke([], timeout=3)
+            gqr.actor_llm.invoke([])
+        assert [call.args for call in client.call_args_list] == [(True,), (False,)]
+
+
+class TestGenerateTailQuestion:
+    @patch.object(gqr, "planner_llm")
+    def test_judge_correctness(self, mock_planner):
+        mock_planner.invoke.return_value = _llm_reply('{"is_correct": true}')
+
+        assert gqr.judge_correctness("Q", "A", "student") is True
+        mock_planner.invoke.assert_called_once()
+
+    @patch.object(gqr, "actor_llm")
+    @patch.object(gqr, "planner_llm")
+    def test_precomputed_is_correct_skips_planner(self, mock_planner, mock_actor):
+        payload = gqr.generate_tail_question(
+            question="Q", model_answer="A", student_answer="student", eval_grade=5.0, recalled_time=3, is_correct=True
+        )
+
+        mock_planner.invoke.assert_not_called()
+        mock_actor.invoke.assert_not_called()
+        assert payload["is_correct"] is True
+        assert payload["plan"] == "ONLY_CORRECT"
+        assert payload["recalled_time"] == 4
+
+    @patch.object(gqr, "actor_llm")
+    @patch.object(gqr, "planner_llm")
+    def test_planner_called_without_precomputed_verdict(self, mock_planner, mock_actor):
+        mock_planner.invoke.return_value = _llm_reply('{"is_correct": false}')
+        mock_actor.invoke.return_value = _llm_reply('{"response": {"question": "왜 그런가요?"}}')
+
+        payload = gqr.generate_tail_question(
+            question="Q", model_answer="A", student_answer="student", eval_grade=1.0, recalled_time=0
+        )
+
+        mock_planner.invoke.assert_called_once()
+        assert payload["is_correct"] is False
+        assert payload["plan"] == "ASK"
+        assert payload["tail_question"]["question"] == "왜 그런가요?"
+
+    @patch.object(gqr, "actor_llm")
+    @patch.object(gqr, "planner_llm")
+    def test_timeout_passed_to_llm_calls(self, mock_planner, mock_actor):
+        mock_planner.invoke.return_value = _llm_reply('{"is_correct": false}')
+        mock_actor.invoke.return_value = _llm_reply('{"response": {"question": "왜 그런가요?"}}')
+
+        gqr.generate_tail_question(
+            question="Q", model_answer="A", student_answer="student", eval_grade=1.0, recalled_time=0, timeout=4.5
+        )
+
+        # 요청 제한 시간 = 호출 시점까지 남은 예산
+        assert mock_planner.invoke.call_args.kwargs == {"timeout": pytest.approx(4.5, abs=0.5)}
+        assert mock_actor.invoke.call_args.kwargs == {"timeout": pytest.approx(4.5, abs=0.5)}
+
+    @patch.object(gqr, "actor_llm")
+    def test_bucket_tail_question_uses_bucket_strategy(self, mock_actor):
+        mock_actor.invoke.return_value = _llm_reply('{"response": {"question": "기초 질문"}}')
+
+        response = gqr.generate_bucket_tail_question("Q", "모범답안", "D")
+
+        assert response["question"] == "기초 질문"
+        system, user = mock_actor.invoke.call_args[0][0]
+        assert "scaffolding" in system.content
+        assert "잘 모르겠어요." in user.content
+
+    @patch.object(gqr, "actor_llm")
+    def test_bucket_c_misconception_is_instruction_not_student_answer(self, mock_actor):
+        mock_actor.invoke.return_value = _llm_reply('{"response": {"question": "오개념 질문"}}')
+
+        gqr.generate_bucket_tail_question("Q", "모범답안", "C")
+
+        system, user = mock_actor.invoke.call_args[0][0]
+        assert "misconception" in system.content
+        assert gqr.PRECOMPUTE_STRATEGY_NOTE in system.content
+        assert "misconception" not in user.content
+
+
+FUSED_REPLY = """{
+  "is_correct": %s,
+  "if_correct": {"topic": "심화", "question": "심화 질문", "model_answer": "MA", "explanation": "EX", "difficulty": "hard"},
+  "if_incorrect": {"topic": "기초", "question": "기초 질문", "model_answer": "MA", "explanation": "EX", "difficulty": "easy"}
+}"""
+
+
+class TestFusedTailQuestion:
+    @patch.object(gqr, "actor_llm")
+    @patch.object(gqr, "planner_llm")
+    @patch.object(gqr, "fused_llm")
+    def test_single_call_picks_branch_locally(self, mock_fused, mock_planner, mock_actor):
+        mock_fused.invoke.return_value = _llm_reply(FUSED_REPLY % "true")
+
+        payload = gqr.generate_tail_question_fused("Q", "A", "student", eval_grade=5.0, recalled_time=0)
+
+        mock_fused.invoke.assert_called_once()
+        mock_planner.invoke.assert_not_called()
+        mock_actor.invoke.assert_not_called()
+        assert payload["fused"] is True
+        assert payload["is_correct"] is True
+        assert payload["bucket"] == "A"
+        assert payload["plan"] == "ASK"
+        assert payload["recalled_time"] == 1
+        assert payload["tail_question"]["question"] == "심화 질문"
+        # 두 branch의 전략이 모두 프롬프트에 들어감 (정답+high -> A, 오답+high -> C)
+        system = mock_fused.invoke.call_args[0][0][0].content
+        assert gqr.strategy_A.strip() in system
+        assert gqr.strategy_C.strip() in system
+
+    @patch.object(gqr, "fused_llm")
+    def test_incorrect_branch_and_cache_put(self, mock_fused):
+        mock_fused.invoke.return_value = _llm_reply(FUSED_REPLY % "false")
+        cache = Mock()
+        cache.peek.return_value = None
+
+        payload = gqr.generate_tail_question_fused(
+            "Q", "A", "student", eval_grade=1.0, recalled_time=0, tail_cache=cache
+        )
+
+        cache.get.assert_not_called()  # the shortcut check must not count as cache lookups
+
+        assert payload["is_correct"] is False
+        assert payload["bucket"] == "D"
+        assert payload["tail_question"]["question"] == "기초 질문"
+        cache.put.assert_called_once_with("Q", "A", "student", "D", payload["tail_question"])
+
+    @patch.object(gqr, "actor_llm")
+    @patch.object(gqr, "planner_llm")
+    @patch.object(gqr, "fused_llm")
+    def test_falls_back_to_two_calls_on_bad_output(self, mock_fused, mock_planner, mock_actor):
+        mock_fused.invoke.return_value = _llm_reply('{"is_correct": true, "if_correct": {"question": "심화"}}')
+        mock_planner.invoke.return_value = _llm_reply('{"is_correct": true}')
+        mock_actor.invoke.return_value = _llm_reply('{"response": {"question": "두 번 호출"}}')
+
+        payload = gqr.generate_tail_question_fused("Q", "A", "student", eval_grade=5.0, recalled_time=0)
+
+        mock_planner.invoke.assert_called_once()
+        mock_actor.invoke.assert_called_once()
+        assert payload["fused"] is False
+        assert payload["tail_question"]["question"] == "두 번 호출"
+
+    @patch.object(gqr, "planner_llm")
+    @patch.object(gqr, "fused_llm")
+    def test_plan_may_skip_tail_uses_planner_only(self, mock_fused, mock_planner):
+        mock_planner.invoke.return_value = _llm_reply('{"is_correct": true}')
+
+        payload = gqr.generate_tail_question_fused("Q", "A", "student", eval_grade=5.0, recalled_time=1)
+
+        mock_fused.invoke.assert_not_called()
+        assert payload["fused"] is False
+        assert payload["plan"] == "ONLY_CORRECT"
+
+    def test_plan_always_asks(self):
+        assert gqr.plan_always_asks(0) is True
+        assert gqr.plan_always_asks(1) is False
+        assert gqr.plan_always_asks(3) is False
+
+
+class TestActorPromptExamples:
+    @patch.object(gqr, "example_selector", gqr.ExampleSelector(gqr.EXAMPLES, encoder=None, k=2))
+    @patch.object(gqr, "actor_llm")
+    def test_actor_prompt_has_top_k_compact_examples(self, mock_actor):
+        mock_actor.invoke.return_value = _llm_reply('{"response": {"question": "심화 질문"}}')
+
+        gqr.generate_tail_question(
+            question="Q", model_answer="A", student_answer="student", eval_grade=5.0, recalled_time=0, is_correct=True
+        )
+
+        system = mock_actor.invoke.call_args[0][0][0].content
+        examples = system.split("Few-shot examples (multiple):\n", 1)[1]
+        assert json.loads(examples) == gqr.EXAMPLES["A"][:2]
+
+
+def _rendered(prompt, **kwargs):
+    return "\n".join(m.content for m in prompt.format_messages(**kwargs))
+
+
+def _static_prefix(prompt, variant_a, variant_b):
+    """두 호출에서 렌더링한 프롬프트의 공통 prefix (처음으로 달라지는 위치 직전까지)"""
+    a, b = _rendered(prompt, **variant_a), _rendered(prompt, **variant_b)
+    n = 0
+    while n < min(len(a), len(b)) and a[n] == b[n]:
+        n += 1
+    return a[:n]
+
+
+class TestPromptPrefix:
+    """provider prefix 캐시: 정적인 지침은 호출마다 byte 단위로 같은 prefix여야 함"""
+
+    def test_actor_static_prefix(self):
+        call_a = dict(question="Q1", model_answer="M1", student_answer="S1", strategy=gqr.strategy_A, example="[1]")
+        call_b = dict(question="Q2", model_answer="M2", student_answer="S2", strategy=gqr.strategy_D, example="[2]")
+
+        prefix = _static_prefix(gqr.ACTOR_PROMPT, call_a, call_b)
+
+        assert "Strategy:\n" in prefix
+        assert gqr.ACTOR_OUTPUT_REQUIREMENTS in prefix
+        assert prefix == _static_prefix(gqr.ACTOR_PROMPT, call_b, call_a)
+
+    def test_fused_static_prefix(self):
+        call_a = dict(
+            question="Q1",
+            model_answer="M1",
+            student_answer="S1",
+            strategy_correct=gqr.strategy_A,
+            strategy_incorrect=gqr.strategy_C,
+            example_correct="[1]",
+            example_incorrect="[2]",
+        )
+        call_b = dict(
+            question="Q2",
+            model_answer="M2",
+            student_answer="S2",
+            strategy_correct=gqr.strategy_B,
+            strategy_incorrect=gqr.strategy_D,
+            example_correct="[3]",
+            example_incorrect="[4]",
+        )
+
+        prefix = _static_prefix(gqr.FUSED_PROMPT, call_a, call_b)
+
+        assert gqr.GRADING_POLICY in prefix
+        assert gqr.ACTOR_OUTPUT_REQUIREMENTS in prefix
+        assert '"if_incorrect"' in prefix
+
+    def test_planner_system_message_is_static(self):
+        call_a = dict(question="Q1", model_answer="M1", student_answer="S1")
+        call_b = dict(question="Q2", model_answer="M2", student_answer="S2")
+
+        system_a = gqr.PLANNER_PROMPT.format_messages(**call_a)[0].content
+        system_b = gqr.PLANNER_PROMPT.format_messages(**call_b)[0].content
+
+        assert system_a.encode("utf-8") == system_b.encode("utf-8")
+
+
+class TestStreamingActor:
+    @patch.object(gqr, "actor_llm")
+    def test_question_text_streamed_incrementally(self, mock_actor):
+        content = '{"response": {"topic": "T", "question": "왜 그런가요?", "difficulty": "easy"}}'
+        chunks = [AIMessageChunk(content=content[i : i + 4]) for i in range(0, len(content), 4)]
+        chunks.append(
+            AIMessageChunk(content="", usage_metadata={"input_tokens": 900, "output_tokens": 30, "total_tokens": 930})
+        )
+        mock_actor.stream.return_value = iter(chunks)
+        deltas = []
+        usage_ledger.clear()
+
+        payload = gqr.generate_tail_question(
+            question="Q",
+            model_answer="A",
+            student_answer="student",
+            eval_grade=1.0,
+            recalled_time=0,
+            is_correct=False,
+            on_question_delta=deltas.append,
+        )
+
+        mock_actor.invoke.assert_not_called()
+        assert len(deltas) > 1
+        assert "".join(deltas) == payload["tail_question"]["question"] == "왜 그런가요?"
+        assert usage_ledger.entries("actor")[-1].prompt_tokens == 900
+
+    @patch.object(gqr, "actor_llm")
+    def test_cached_question_sent_in_one_piece(self, mock_actor):
+        cache = Mock()
+        cache.get.return_value = {"question": "캐시 질문"}
+        deltas = []
+
+        gqr.generate_tail_question(
+            question="Q",
+            model_answer="A",
+            student_answer="student",
+            eval_grade=1.0,
+            recalled_time=0,
+            is_correct=False,
+            tail_cache=cache,
+            on_question_delta=deltas.append,
+        )
+
+        mock_actor.stream.assert_not_called()
+        assert deltas == ["캐시 질문"]
@@ -0,0 +1,141 @@
+"""
+채점 체크포인트 유틸 테스트
+- audio_content_hash: 업로드 파일 / 파일 객체 / 경로 해시, 파일 위치 복원
+- save / load / clear_checkpoint: JSON 변환, TTL 만료
+- call_with_retry: 지수 백오프 재시도
+"""
+
+import hashlib
+import io
+from datetime import timedelta
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from assignments.models import Assignment
+from catalog.models import Subject
+from courses.models import CourseClass
+from django.contrib.auth import get_user_model
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.utils import timezone
+from questions.models import Question
+from submissions.models import GradingCheckpoint, PersonalAssignment
+from submissions.utils.audio_buffer import AudioBuffer
+from submissions.utils.grading_checkpoint import (
+    audio_content_hash,
+    call_with_retry,
+    clear_checkpoint,
+    load_checkpoint,
+    save_checkpoint,
+    to_json_safe,
+)
+
+Account = get_user_model()
+
+DATA = b"RIFF" + b"\x07" * 2048
+DIGEST = hashlib.sha256(DATA).hexdigest()
+
+
+class TestAudioContentHash:
+    def test_uploaded_file_rewound(self):
+        upload = SimpleUploadedFile("a.wav", DATA)
+
+        assert audio_content_hash(upload) == DIGEST
+        assert upload.read() == DATA
+
+    def test_file_object(self):
+        f = io.BytesIO(DATA)
+        f.read(10)
+
+        assert audio_content_hash(f) == DIGEST
+        assert f.tell() == 0
+
+    def test_path(self, tmp_path):
+        path = tmp_path / "a.wav"
+        path.write_bytes(DATA)
+
+        assert audio_content_hash(str(path)) == DIGEST
+
+    def test_decoded_buffer_has_no_hash(self):
+        assert audio_content_hash(AudioBuffer(np.zeros(10), 16000)) is None
+
+
+def test_to_json_safe():
+    value = {"a": np.float32(1.5), "b": float("nan"), "c": np.array([1, 2]), "d": [np.int64(3), float("inf")]}
+
+    assert to_json_safe(value) == {"a": 1.5, "b": None, "c": [1, 2], "d": [3, None]}
+
+
+@pytest.fixture
+def student():
+    return Account.objects.create_user(email="s@test.com", password="pw", display_name="S", is_student=True)
+
+
+@pytest.fixture
+def question(student):
+    teacher = Account.objects.create_user(email="t@test.com", password="pw", display_name="T", is_student=False)
+    subject = Subject.objects.create(name="Math")
+    course_class = CourseClass.objects.create(teacher=teacher, subject=subject, name="C", description="")
+    assignment = Assignment.objects.create(
+        course_class=course_class,
+        subject=subject,
+        title="HW",
+        description="",
+        total_questions=1,
+        due_at=timezone.now() + timedelta(days=1),
+        grade="",
+    )
+    personal_assignment = PersonalAssignment.objects.create(student=student, assignment=assignment)
+    return Question.objects.create(
+        personal_assignment=personal_assignment,
+        number=1,
+        content="Q",
+        model_answer="A",
+        explanation="E",
+        recalled_num=0,
+    )
+
+
+@pytest.mark.django_db
+class TestCheckpointStore:
+    def test_save_updates_same_audio(self, student, question):
+        save_checkpoint(question, student, DIGEST, transcript="t", features={"x": np.float64(np.nan)})
+        save_checkpoint(question, student, DIGEST, eval_grade=3.5)
+
+        checkpoint = load_checkpoint(question, student, DIGEST)
+        assert (checkpoint.transcript, checkpoint.features, checkpoint.eval_grade) == ("t", {"x": None}, 3.5)
+        assert load_checkpoint(question, student, "other") is None
+
+        clear_checkpoint(checkpoint)
+        assert not GradingCheckpoint.objects.exists()
+
+    def test_expired_checkpoint_dropped(self, student, question, settings):
+        settings.GRADING_CHECKPOINT_TTL_SECONDS = 60
+        save_checkpoint(question, student, DIGEST, transcript="t")
+        GradingCheckpoint.objects.update(updated_at=timezone.now() - timedelta(seconds=120))
+
+        assert load_checkpoint(question, student, DIGEST) is None
+        assert not GradingCheckpoint.objects.exists()
+
+
+class TestCallWithRetry:
+    def test_backoff_doubles_until_success(self):
+        func = Mock(side_effect=[RuntimeError("a"), RuntimeError("b"), "ok"])
+        sleep = Mock()
+
+        assert call_with_retry("inference", func, max_attempts=3, backoff=0.5, sleep=sleep) == "ok"
+        assert [c.args[0] for c in sleep.call_args_list] == [0.5, 1.0]
+
+    def test_last_error_raised(self):
+        func = Mock(side_effect=RuntimeError("down"))
+
+        with pytest.raises(RuntimeError, match="down"):
+            call_with_retry("actor", func, max_attempts=2, backoff=0, sleep=Mock())
+        assert func.call_count == 2
+
+    def test_no_retry_without_budget(self):
+        func = Mock(side_effect=RuntimeError("down"))
+
+        with pytest.raises(RuntimeError):
+            call_with_retry("actor", func, max_attempts=3, backoff=1.0, can_retry=lambda delay: False, sleep=Mock())
+        assert func.call_count == 1
@@ -0,0 +1,455 @@
+"""
+비동기 채점 작업 큐 테스트
+- POST /api/personal_assignments/answer/ (ASYNC_GRADING_ENABLED=True): 202 + job_id
+- GET /api/personal_assignments/answer/jobs/<job_id>/: 작업 상태 / 결과 조회
+- run_grading_worker 커맨드, 작업 선점(claim) 및 오래된 작업 / 작업 없이 남은 PROCESSING 답안 정리
+- 중복 답안 제출(Idempotency-Key 또는 같은 음성): 저장된 결과 반환, 처리 중인 요청 대기
+"""
+
+import io
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from assignments.models import Assignment
+from catalog.models import Subject
+from courses.models import CourseClass
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from questions.models import Question
+from rest_framework import status
+from rest_framework.test import APIClient
+from submissions.models import Answer, GradingJob, PersonalAssignment
+from submissions.utils.grading_queue import claim_next_job, process_job, reclaim_orphaned_answers, reclaim_stale_jobs
+
+Account = get_user_model()
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def mock_parallel_stages():
+    """planner LLM(정오답 판정)과 스크립트 특징 단계는 외부 API / SBERT 없이 통과시킴"""
+    with (
+        patch("submissions.views.judge_correctness", return_value=True) as mock_judge,
+        patch("submissions.views.extract_script_features", side_effect=lambda features: features),
+    ):
+        yield mock_judge
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def student():
+    return Account.objects.create_user(
+        email="student@test.com", password="testpass123", display_name="Student", is_student=True
+    )
+
+
+@pytest.fixture
+def personal_assignment(student):
+    teacher = Account.objects.create_user(
+        email="teacher@test.com", password="testpass123", display_name="Teacher", is_student=False
+    )
+    subject = Subject.objects.create(name="Math")
+    course_class = CourseClass.objects.create(teacher=teacher, subject=subject, name="Algebra 1", description="")
+    assignment = Assignment.objects.create(
+        course_class=course_class,
+        subject=subject,
+        title="HW 1",
+        description="",
+        total_questions=1,
+        due_at=timezone.now() + timedelta(days=7),
+        grade="",
+    )
+    return PersonalAssignment.objects.create(student=student, assignment=assignment)
+
+
+@pytest.fixture
+def question(personal_assignment):
+    return Question.objects.create(
+        personal_assignment=personal_assignment,
+        number=1,
+        content="Q1",
+        model_answer="A1",
+        explanation="E1",
+        difficulty=Question.Difficulty.MEDIUM,
+        recalled_num=0,
+    )
+
+
+@pytest.fixture
+def mock_audio_file():
+    f = io.BytesIO(b"RIFF" + b"\x00" * 4 + b"WAVE" + b"\x00" * 1024)
+    f.name = "test.wav"
+    return f
+
+
+def _submit(api_client, student, question, audio):
+    return api_client.post(
+        reverse("answer"),
+        {"studentId": student.id, "questionId": question.id, "audioFile": audio},
+        format="multipart",
+    )
+
+
+def _make_job(student, question, **kwargs):
+    answer = Answer.objects.create(question=question, student=student, state=Answer.State.PROCESSING)
+    return GradingJob.objects.create(answer=answer, question=question, student=student, audio=b"RIFF", **kwargs)
+
+
+class TestAsyncAnswerSubmit:
+    @pytest.fixture(autouse=True)
+    def async_grading(self, settings):
+        settings.ASYNC_GRADING_ENABLED = True
+
+    @patch("submissions.views.extract_all_features")
+    def test_post_returns_202_and_queues_job(self, mock_extract, api_client, student, question, mock_audio_file):
+        resp = _submit(api_client, student, question, mock_audio_file)
+
+        assert resp.status_code == status.HTTP_202_ACCEPTED
+        job = GradingJob.objects.get(id=resp.data["data"]["job_id"])
+        assert job.status == GradingJob.Status.QUEUED
+        assert bytes(job.audio).startswith(b"RIFF")
+        assert job.answer.state == Answer.State.PROCESSING
+        mock_extract.assert_not_called()
+
+    def test_poll_while_queued(self, api_client, student, question, mock_audio_file):
+        job_id = _submit(api_client, student, question, mock_audio_file).data["data"]["job_id"]
+
+        resp = api_client.get(reverse("answer-job", kwargs={"job_id": job_id}))
+
+        assert resp.status_code == status.HTTP_202_ACCEPTED
+        assert resp.data["data"]["status"] == GradingJob.Status.QUEUED
+
+    def test_poll_not_found(self, api_client):
+        resp = api_client.get(reverse("answer-job", kwargs={"job_id": 9999}))
+        assert resp.status_code == status.HTTP_404_NOT_FOUND
+
+    @patch("submissions.views.generate_tail_question")
+    @patch("submissions.views.run_inference")
+    @patch("submissions.views.extract_all_features")
+    def test_worker_processes_job_and_poll_returns_tail_question(
+        self, mock_extract, mock_infer, mock_tail, api_client, student, question, mock_audio_file
+    ):
+        mock_extract.return_value = {"script": "partial answer", "total_length": 2.0}
+        mock_infer.return_value = {"pred_cont": 0.6}
+        mock_tail.return_value = {
+            "is_correct": False,
+            "plan": "ASK",
+            "recalled_time": 1,
+            "tail_question": {"question": "Follow-up?", "model_answer": "FA", "explanation": "FE"},
+        }
+        job_id = _submit(api_client, student, question, mock_audio_file).data["data"]["job_id"]
+
+        call_command("run_grading_worker", "--once")
+
+        job = GradingJob.objects.get(id=job_id)
+        assert job.status == GradingJob.Status.DONE
+        assert job.audio is None
+        assert Answer.objects.get(question=question, student=student).state == Answer.State.INCORRECT
+
+        resp = api_client.get(reverse("answer-job", kwargs={"job_id": job_id}))
+        assert resp.status_code == status.HTTP_200_OK
+        assert resp.data["data"]["is_correct"] is False
+        assert resp.data["data"]["tail_question"]["question"] == "Follow-up?"
+        assert resp.data["data"]["number_str"] == "1-1"
+
+    @patch("submissions.views.extract_all_features")
+    def test_failed_job_returns_stored_error(self, mock_extract, api_client, student, question, mock_audio_file):
+        mock_extract.return_value = {"script": "", "total_length": 1.0}
+        job_id = _submit(api_client, student, question, mock_audio_file).data["data"]["job_id"]
+
+        call_command("run_grading_worker", "--once")
+
+        resp = api_client.get(reverse("answer-job", kwargs={"job_id": job_id}))
+        assert resp.status_code == status.HTTP_400_BAD_REQUEST
+        assert resp.data["error"] == "STT failed"
+        assert not Answer.objects.filter(question=question, student=student).exists()
+
+
+class TestGradingQueue:
+    def test_claim_marks_running_and_skips_claimed(self, student, question):
+        job = _make_job(student, question)
+
+        claimed = claim_next_job("worker-1")
+
+        assert claimed.id == job.id
+        assert claimed.status == GradingJob.Status.RUNNING
+        assert claimed.attempts == 1
+        assert claimed.locked_by == "worker-1"
+        assert claim_next_job("worker-2") is None
+
+    def test_reclaim_stale_jobs(self, student, question):
+        stale_at = timezone.now() - timedelta(seconds=120)
+        retry = _make_job(student, question, status=GradingJob.Status.RUNNING, attempts=1, locked_at=stale_at)
+
+        requeued, failed = reclaim_stale_jobs(stale_seconds=60, max_attempts=3)
+
+        assert (requeued, failed) == (1, 0)
+        retry.refresh_from_db()
+        assert retry.status == GradingJob.Status.QUEUED
+        assert retry.locked_at is None
+
+    def test_reclaim_fails_job_after_max_attempts(self, student, question):
+        stale_at = timezone.now() - timedelta(seconds=120)
+        job = _make_job(student, question, status=GradingJob.Status.RUNNING, attempts=3, locked_at=stale_at)
+
+        requeued, failed = reclaim_stale_jobs(stale_seconds=60, max_attempts=3)
+
+        assert (requeued, failed) == (0, 1)
+        job.refresh_from_db()
+        assert job.status == GradingJob.Status.FAILED
+        assert job.result_status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
+        assert not Answer.objects.filter(question=question, student=student).exists()
+
+    def test_reclaim_orphaned_processing_answers(self, student, question, personal_assignment):
+        stale_at = timezone.now() - timedelta(seconds=120)
+        orphan = Answer.objects.create(
+            question=question, student=student, state=Answer.State.PROCESSING, started_at=stale_at
+        )
+        other_question = Question.objects.create(
+            personal_assignment=personal_assignment,
+            number=2,
+            content="Q2",
+            model_answer="A2",
+            explanation="E2",
+            difficulty=Question.Difficulty.MEDIUM,
+            recalled_num=0,
+        )
+        queued = _make_job(student, other_question).answer
+        Answer.objects.filter(id=queued.id).update(started_at=stale_at)
+
+        assert reclaim_orphaned_answers(stale_seconds=60) == 1
+        assert not Answer.objects.filter(id=orphan.id).exists()
+        assert Answer.objects.filter(id=queued.id).exists()  # 큐에서 채점을 기다리는 답안은 유지
+
+    def test_reclaim_processing_answers_command(self, student, question):
+        Answer.objects.create(
+            question=question,
+            student=student,
+            state=Answer.State.PROCESSING,
+            started_at=timezone.now() - timedelta(seconds=120),
+        )
+
+        call_command("reclaim_processing_answers", "--stale-seconds", "60")
+
+        assert not Answer.objects.filter(question=question, student=student).exists()
+
+    def test_recent_processing_answer_is_kept(self, student, question):
+        Answer.objects.create(
+            question=question, student=student, state=Answer.State.PROCESSING, started_at=timezone.now()
+        )
+
+        assert reclaim_orphaned_answers(stale_seconds=60) == 0
+
+    @patch("submissions.views.extract_all_features", side_effect=RuntimeError("boom"))
+    def test_process_job_unexpected_exception(self, mock_extract, student, question):
+        _make_job(student, question)
+        job = process_job(claim_next_job())
+
+        assert job.status == GradingJob.Status.FAILED
+        assert job.result["error"] == "boom"
+
+
+class TestDeadlineDegradation:
+    """ANSWER_DEADLINE_SECONDS: actor 몫의 시간이 없으면 정오답만 응답하고 꼬리 질문은 작업으로 생성"""
+
+    @pytest.fixture(autouse=True)
+    def deadline(self, settings):
+        settings.ANSWER_DEADLINE_SECONDS = 10
+        settings.ANSWER_DEADLINE_GRADE_RESERVE = 5
+        settings.ANSWER_DEADLINE_ACTOR_RESERVE = 6
+        settings.ANSWER_DEADLINE_FINALIZE_RESERVE = 1
+
+    @patch("submissions.views.generate_tail_question")
+    @patch("submissions.views.run_inference")
+    @patch("submissions.views.extract_all_features")
+    def test_exhausted_budget_defers_tail_question_to_worker(
+        self, mock_extract, mock_infer, mock_tail, settings, api_client, student, question, mock_audio_file
+    ):
+        settings.ANSWER_DEADLINE_ACTOR_RESERVE = 60  # actor 몫이 남을 수 없음
+        mock_extract.return_value = {"script": "partial answer", "total_length": 2.0}
+        mock_infer.return_value = {"pred_cont": 0.6}
+
+        resp = _submit(api_client, student, question, mock_audio_file)
+
+        assert resp.status_code == status.HTTP_201_CREATED
+        assert resp.data["data"]["is_correct"] is True
+        assert resp.data["data"]["tail_question"] is None
+        mock_tail.assert_not_called()
+        job = GradingJob.objects.get(id=resp.data["data"]["tail_question_job_id"])
+        assert (job.kind, job.status) == (GradingJob.Kind.TAIL_QUESTION, GradingJob.Status.QUEUED)
+        assert Answer.objects.get(question=question, student=student).state == Answer.State.CORRECT
+
+        mock_tail.return_value = {
+            "is_correct": True,
+            "plan": "ASK",
+            "recalled_time": 1,
+            "tail_question": {"question": "Follow-up?", "model_answer": "FA", "explanation": "FE"},
+        }
+        call_command("run_grading_worker", "--once")
+
+        assert mock_tail.call_args.kwargs["student_answer"] == "partial answer"
+        assert mock_tail.call_args.kwargs["is_correct"] is True
+        poll = api_client.get(reverse("answer-job", kwargs={"job_id": job.id}))
+        assert poll.status_code == status.HTTP_200_OK
+        assert poll.data["data"]["tail_question"]["question"] == "Follow-up?"
+        assert Question.objects.filter(base_question=question, recalled_num=1).exists()
+
+    @patch("submissions.views.generate_tail_question")
+    @patch("submissions.views.run_inference")
+    @patch("submissions.views.extract_all_features")
+    def test_stage_timeouts_and_actor_timeout_degrades(
+        self, mock_extract, mock_infer, mock_tail, mock_parallel_stages, api_client, student, question, mock_audio_file
+    ):
+        mock_extract.return_value = {"script": "partial answer", "total_length": 2.0}
+        mock_infer.return_value = {"pred_cont": 0.6}
+        mock_tail.side_effect = TimeoutError("Request timed out.")
+
+        resp = _submit(api_client, student, question, mock_audio_file)
+
+        # STT는 정오답 판정 + 응답 몫(6초)을, LLM 호출은 응답 몫(1초)을 남긴 시간만 사용
+        assert 0 < mock_extract.call_args.kwargs["stt_timeout"] <= 4
+        assert 0 < mock_parallel_stages.call_args.kwargs["timeout"] <= 9
+        assert 0 < mock_tail.call_args.kwargs["timeout"] <= 9
+        assert resp.status_code == status.HTTP_201_CREATED
+        assert resp.data["data"]["tail_question"] is None
+        assert GradingJob.objects.filter(id=resp.data["data"]["tail_question_job_id"]).exists()
+        assert Answer.objects.get(question=question, student=student).state == Answer.State.CORRECT
+
+
+def _wav(data=b"\x00" * 1024):
+    f = io.BytesIO(b"RIFF" + b"\x00" * 4 + b"WAVE" + data)
+    f.name = "test.wav"
+    return f
+
+
+class TestIdempotentSubmit:
+    """ANSWER_IDEMPOTENCY_ENABLED: 같은 답안 제출의 중복 요청은 다시 채점하지 않고 먼저 들어온 요청의 결과를 사용"""
+
+    @pytest.fixture(autouse=True)
+    def idempotency(self, settings):
+        settings.ANSWER_IDEMPOTENCY_ENABLED = True
+        settings.ANSWER_IDEMPOTENCY_WINDOW_SECONDS = 600
+
+    @pytest.fixture
+    def mock_pipeline(self):
+        with (
+            patch("submissions.views.extract_all_features") as mock_extract,
+            patch("submissions.views.run_inference", return_value={"pred_cont": 0.6}),
+            patch("submissions.views.generate_tail_question") as mock_tail,
+        ):
+            mock_extract.return_value = {"script": "partial answer", "total_length": 2.0}
+            mock_tail.return_value = {
+                "is_correct": False,
+                "plan": "ASK",
+                "recalled_time": 1,
+                "tail_question": {"question": "Follow-up?", "model_answer": "FA", "explanation": "FE"},
+            }
+            yield mock_extract
+
+    def test_duplicate_audio_returns_stored_result(self, mock_pipeline, api_client, student, question):
+        first = _submit(api_client, student, question, _wav())
+        second = _submit(api_client, student, question, _wav())
+
+        assert first.status_code == second.status_code == status.HTTP_201_CREATED
+        assert second["Idempotent-Replayed"] == "true"
+        assert second.data["data"]["tail_question"] == first.data["data"]["tail_question"]
+        assert mock_pipeline.call_count == 1
+        assert Question.objects.filter(base_question=question).count() == 1
+        assert Answer.objects.get(question=question, student=student).state == Answer.State.INCORRECT
+        assert GradingJob.objects.get().status == GradingJob.Status.DONE
+
+    def test_idempotency_key_header_wins_over_audio(self, mock_pipeline, api_client, student, question):
+        api_client.credentials(HTTP_IDEMPOTENCY_KEY="retry-1")
+        _submit(api_client, student, question, _wav(b"\x01" * 1024))
+        second = _submit(api_client, student, question, _wav(b"\x02" * 1024))
+
+        assert second.status_code == status.HTTP_201_CREATED
+        assert mock_pipeline.call_count == 1
+
+        api_client.credentials(HTTP_IDEMPOTENCY_KEY="retry-2")
+        _submit(api_client, student, question, _wav(b"\x02" * 1024))
+        assert mock_pipeline.call_count == 2
+
+    def test_failed_result_is_not_reused(self, mock_pipeline, api_client, student, question):
+        mock_pipeline.return_value = {"script": "", "total_length": 1.0}
+        assert _submit(api_client, student, question, _wav()).status_code == status.HTTP_400_BAD_REQUEST
+
+        mock_pipeline.return_value = {"script": "partial answer", "total_length": 2.0}
+        resp = _submit(api_client, student, question, _wav())
+
+        assert resp.status_code == status.HTTP_201_CREATED
+        assert not resp.has_header("Idempotent-Replayed")
+        assert mock_pipeline.call_count == 2
+
+    def test_expired_result_is_regraded(self, mock_pipeline, api_client, student, question):
+        _submit(api_client, student, question, _wav())
+        GradingJob.objects.update(finished_at=timezone.now() - timedelta(seconds=601))
+
+        _submit(api_client, student, question, _wav())
+
+        assert mock_pipeline.call_count == 2
+
+    def test_duplicate_waits_for_in_flight_request(self, mock_pipeline, api_client, student, question):
+        _submit(api_client, student, question, _wav())
+        job = GradingJob.objects.get()
+        result, finished_at = job.result, job.finished_at
+        GradingJob.objects.update(status=GradingJob.Status.RUNNING, result=None, locked_at=timezone.now())
+
+        def finish(seconds):
+            GradingJob.objects.update(
+                status=GradingJob.Status.DONE, result=result, result_status_code=201, finished_at=finished_at
+            )
+
+        with patch("submissions.utils.idempotency.time.sleep", side_effect=finish) as mock_sleep:
+            resp = _submit(api_client, student, question, _wav())
+
+        mock_sleep.assert_called_once()
+        assert resp.status_code == status.HTTP_201_CREATED
+        assert resp.data["data"]["tail_question"]["question"] == "Follow-up?"
+        assert mock_pipeline.call_count == 1
+
+    def test_in_flight_past_wait_returns_job_id(self, mock_pipeline, settings, api_client, student, question):
+        settings.ANSWER_IDEMPOTENCY_WAIT_SECONDS = 0
+        _submit(api_client, student, question, _wav())
+        job = GradingJob.objects.get()
+        GradingJob.objects.update(status=GradingJob.Status.RUNNING, locked_at=timezone.now())
+
+        resp = _submit(api_client, student, question, _wav())
+
+        assert resp.status_code == status.HTTP_202_ACCEPTED
+        assert resp.data["data"]["job_id"] == job.id
+        assert mock_pipeline.call_count == 1
+
+    def test_async_duplicate_returns_same_job(self, mock_pipeline, settings, api_client, student, question):
+        settings.ASYNC_GRADING_ENABLED = True
+
+        first = _submit(api_client, student, question, _wav())
+        second = _submit(api_client, student, question, _wav())
+
+        assert second.status_code == status.HTTP_202_ACCEPTED
+        assert second.data["data"]["job_id"] == first.data["data"]["job_id"]
+        assert GradingJob.objects.count() == 1
+
+    def test_stale_request_job_is_failed_not_requeued(self, student, question):
+        answer = Answer.objects.create(question=question, student=student, state=Answer.State.PROCESSING)
+        job = GradingJob.objects.create(
+            answer=answer,
+            question=question,
+            student=student,
+            status=GradingJob.Status.RUNNING,
+            attempts=1,
+            locked_at=timezone.now() - timedelta(seconds=120),
+            idempotency_key="k" * 64,
+        )
+
+        assert reclaim_stale_jobs(stale_seconds=60, max_attempts=3) == (0, 1)
+        job.refresh_from_db()
+        assert job.status == GradingJob.Status.FAILED
@@ -0,0 +1,174 @@
+"""
+hedging 테스트 (LLM 호출은 Event로 지연을 조절하는 가짜 함수)
+- 최근 지연 시간의 percentile을 넘기면 중복 요청을 보내고 먼저 끝난 결과 사용
+- 표본이 부족하거나 hedge 비율 상한에 걸리면 중복 요청 없음
+- rate limiter가 바로 내줄 여유가 없으면(대기 / cooldown 중) 중복 요청 없음
+"""
+
+import threading
+from unittest.mock import patch
+
+import pytest
+from langchain_core.messages import AIMessage
+from submissions.utils.tail_question_generator import generate_questions_routed as gqr
+from submissions.utils.tail_question_generator import rate_limiter as rl
+from submissions.utils.tail_question_generator.hedging import Hedger, LatencyWindow
+
+
+def _warm(hedger, name="planner", seconds=0.01, n=20):
+    for _ in range(n):
+        hedger._window(name).add(seconds)
+
+
+class SlowPrimary:
+    """The primary request blocks until released; the hedge request returns at once."""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.attempts = []
+
+    def __call__(self, attempt):
+        self.attempts.append(attempt)
+        if not attempt.endswith("_hedge"):
+            self.release.wait(5)
+            return "primary"
+        return "hedge"
+
+
+class TestLatencyWindow:
+    def test_percentile(self):
+        window = LatencyWindow(100)
+        for ms in range(1, 101):
+            window.add(ms / 1000)
+
+        assert window.percentile(95) == pytest.approx(0.095)
+        assert window.percentile(50) == pytest.approx(0.050)
+
+    def test_rolling_window_drops_old_samples(self):
+        window = LatencyWindow(3)
+        for seconds in (10.0, 0.1, 0.2, 0.3):
+            window.add(seconds)
+
+        assert len(window) == 3
+        assert window.percentile(100) == pytest.approx(0.3)
+
+
+class TestHedger:
+    def test_no_hedge_without_enough_samples(self):
+        hedger = Hedger(enabled=True, min_samples=20)
+        fn = SlowPrimary()
+        fn.release.set()
+
+        assert hedger.call("planner", fn) == "primary"
+        assert fn.attempts == ["planner"]
+        assert hedger.stats()["hedged"] == 0
+
+    def test_slow_call_is_hedged_and_first_result_wins(self):
+        hedger = Hedger(enabled=True, max_rate=1.0)
+        _warm(hedger)
+        fn = SlowPrimary()
+
+        try:
+            assert hedger.call("planner", fn) == "hedge"
+        finally:
+            fn.release.set()
+
+        assert fn.attempts == ["planner", "planner_hedge"]
+        stats = hedger.stats()
+        assert (stats["hedged"], stats["hedge_wins"]) == (1, 1)
+
+    def test_fast_call_is_not_hedged(self):
+        hedger = Hedger(enabled=True)
+        _warm(hedger, seconds=5.0)
+        fn = SlowPrimary()
+        fn.release.set()
+
+        assert hedger.call("planner", fn) == "primary"
+        assert fn.attempts == ["planner"]
+
+    def test_hedge_rate_cap(self):
+        hedger = Hedger(enabled=True, max_rate=0.0)
+        _warm(hedger)
+        fn = SlowPrimary()
+        threading.Timer(0.2, fn.release.set).start()
+
+        assert hedger.call("planner", fn) == "primary"
+        assert fn.attempts == ["planner"]
+        assert hedger.stats()["rate_capped"] == 1
+
+    def test_failed_hedge_falls_back_to_primary(self):
+        hedger = Hedger(enabled=True, max_rate=1.0)
+        _warm(hedger)
+        release = threading.Event()
+
+        def fn(attempt):
+            if attempt.endswith("_hedge"):
+                raise RuntimeError("hedge failed")
+            release.wait(0.3)
+            return "primary"
+
+        assert hedger.call("planner", fn) == "primary"
+        assert hedger.stats()["hedge_wins"] == 0
+
+    def test_no_hedge_when_not_admitted(self):
+        hedger = Hedger(enabled=True, max_rate=1.0)
+        _warm(hedger)
+        fn = SlowPrimary()
+        threading.Timer(0.2, fn.release.set).start()
+
+        assert hedger.call("planner", fn, admit=lambda: False) == "primary"
+        assert fn.attempts == ["planner"]
+        stats = hedger.stats()
+        assert (stats["hedged"], stats["throttled"]) == (0, 1)
+
+    def test_disabled_calls_through(self):
+        hedger = Hedger(enabled=False)
+        _warm(hedger)
+
+        assert hedger.call("planner", lambda attempt: attempt) == "planner"
+        assert hedger.stats()["calls"] == 0
+
+
+class TestPlannerHedging:
+    @patch.object(gqr, "planner_llm")
+    def test_judge_correctness_uses_hedged_reply(self, mock_planner):
+        release = threading.Event()
+        replies = iter([True, False])
+
+        def invoke(messages):
+            if next(replies):  # primary: slow, says incorrect
+                release.wait(5)
+                return AIMessage(content='{"is_correct": false}')
+            return AIMessage(content='{"is_correct": true}')
+
+        mock_planner.invoke.side_effect = invoke
+        hedger = Hedger(enabled=True, max_rate=1.0)
+        _warm(hedger)
+
+        try:
+            with patch.object(gqr, "hedger", hedger):
+                assert gqr.judge_correctness("Q", "A", "student") is True
+        finally:
+            release.set()
+
+        assert mock_planner.invoke.call_count == 2
+
+    @patch.object(gqr, "planner_llm")
+    def test_no_hedge_while_rate_limiter_is_full(self, mock_planner, tmp_path):
+        release = threading.Event()
+
+        def invoke(messages):
+            release.wait(0.3)
+            return AIMessage(content='{"is_correct": true}')
+
+        mock_planner.invoke.side_effect = invoke
+        hedger = Hedger(enabled=True, max_rate=1.0)
+        _warm(hedger)
+        # 분당 요청 1개: primary가 마지막 요청 몫을 가져가면 hedge는 기다리지 않고 건너뜀
+        limiter = rl.RateLimiter(path=str(tmp_path / "limit.sqlite3"), rpm=1, tpm=100000)
+
+        with patch.object(gqr, "hedger", hedger), patch.object(rl, "get_rate_limiter", return_value=limiter):
+            assert gqr.judge_correctness("Q", "A", "student") is True
+
+        assert mock_planner.invoke.call_count == 1
+        assert hedger.stats()["throttled"] == 1
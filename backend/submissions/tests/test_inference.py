@@ -0,0 +1,113 @@
+"""
+inference 배치 예측 테스트
+- build_feature_matrix가 build_feature_row와 같은 값을 FEATURE_COLUMNS 순서로 만드는지
+- run_inference_batch가 한 번의 predict로 행별 예측과 같은 결과를 내는지
+"""
+
+import time
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from submissions.utils.inference import (
+    DEFAULT_MODEL_PATH,
+    FEATURE_COLUMNS,
+    build_feature_matrix,
+    build_feature_row,
+    get_xgb_model,
+    required_feature_keys,
+    run_inference,
+    run_inference_batch,
+)
+
+
+def _random_features(n, seed=0):
+    """일부 key는 누락 / None / word_cnt 0을 섞은 feature dict 목록"""
+    rng = np.random.default_rng(seed)
+    keys = required_feature_keys(FEATURE_COLUMNS)
+    rows = []
+    for _ in range(n):
+        js = {key: float(rng.uniform(0, 50)) for key in keys}
+        js["word_cnt"] = int(rng.integers(0, 80))
+        for key in rng.choice(keys, size=3, replace=False):
+            if rng.random() < 0.5:
+                del js[key]
+            else:
+                js[key] = None
+        rows.append(js)
+    return rows
+
+
+class TestBuildFeatureMatrix:
+    def test_matches_build_feature_row(self):
+        features = _random_features(200)
+
+        X = build_feature_matrix(features)
+        expected = np.array(
+            [[build_feature_row(js)[col] for col in FEATURE_COLUMNS] for js in features], dtype=np.float32
+        )
+
+        assert X.dtype == np.float32
+        assert X.shape == (200, len(FEATURE_COLUMNS))
+        np.testing.assert_array_equal(X, expected)
+
+    def test_zero_word_count_gives_zero_ratios(self):
+        X = build_feature_matrix([{"repeat_cnt": 3, "filler_words_cnt": 2, "word_cnt": 0}])
+
+        assert X[0, FEATURE_COLUMNS.index("repeat_cnt_ratio")] == 0.0
+        assert X[0, FEATURE_COLUMNS.index("filler_words_cnt_ratio")] == 0.0
+
+    def test_array_input_fills_nan(self):
+        arr = np.ones((2, len(FEATURE_COLUMNS)))
+        arr[1, 4] = np.nan
+
+        X = build_feature_matrix(arr)
+
+        assert X.dtype == np.float32
+        assert X[1, 4] == 0.0
+
+    def test_array_with_wrong_width_raises(self):
+        with pytest.raises(ValueError):
+            build_feature_matrix(np.ones((2, 3)))
+
+
+class TestRunInferenceBatch:
+    @patch("submissions.utils.inference.joblib.load")
+    def test_single_predict_call(self, mock_load):
+        mock_model = Mock()
+        mock_model.predict.return_value = np.array([7.6, 4.4, 0.2])
+        mock_load.return_value = mock_model
+
+        results = run_inference_batch(_random_features(3))
+
+        mock_model.predict.assert_called_once()
+        assert [r["pred_rounded"] for r in results] == [8, 4, 1]
+        assert [r["pred_letter"] for r in results] == ["A", "C", "D"]
+        assert results[0]["pred_cont"] == pytest.approx(7.6)
+
+    def test_empty_input(self):
+        assert run_inference_batch([]) == []
+
+    def test_matches_per_row_dataframe_predictions(self):
+        features = _random_features(50, seed=1)
+        model = get_xgb_model(DEFAULT_MODEL_PATH)
+
+        results = run_inference_batch(features)
+
+        for js, result in zip(features, results):
+            X_row = pd.DataFrame([build_feature_row(js)], columns=FEATURE_COLUMNS)
+            expected = float(model.predict(X_row)[0])
+            assert result["pred_cont"] == pytest.approx(expected, abs=1e-4)
+            assert result == run_inference(DEFAULT_MODEL_PATH, js)
+
+    def test_thousands_of_answers_in_seconds(self):
+        features = _random_features(5000, seed=2)
+        get_xgb_model(DEFAULT_MODEL_PATH)  # 모델 로드 시간 제외
+
+        start = time.perf_counter()
+        results = run_inference_batch(features)
+        elapsed = time.perf_counter() - start
+
+        assert len(results) == 5000
+        assert elapsed < 5.0
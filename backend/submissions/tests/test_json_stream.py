@@ -0,0 +1,46 @@
+"""
+json_stream 테스트
+- 스트리밍 중인 JSON에서 "question" 문자열 값을 도착하는 대로 디코딩 (이스케이프가 chunk 경계에 걸려도 동일)
+"""
+
+import json
+
+from submissions.utils.tail_question_generator.json_stream import JsonStringFieldStream
+
+REPLY = json.dumps(
+    {"response": {"topic": "광합성", "question": '왜 "빛"이 필요할까요?\n설명해 보세요 😀', "difficulty": "easy"}}
+)
+
+
+def _feed_all(chunks):
+    stream = JsonStringFieldStream("question")
+    deltas = [stream.feed(c) for c in chunks]
+    return stream, deltas
+
+
+class TestJsonStringFieldStream:
+    def test_single_chunk(self):
+        stream, _ = _feed_all([REPLY])
+
+        assert stream.value == '왜 "빛"이 필요할까요?\n설명해 보세요 😀'
+        assert stream.done
+
+    def test_character_by_character_matches_full_parse(self):
+        stream, deltas = _feed_all(list(REPLY))
+
+        assert "".join(deltas) == json.loads(REPLY)["response"]["question"]
+        assert sum(1 for d in deltas if d) > 10  # 한 번에가 아니라 조금씩 전달
+
+    def test_ascii_escaped_reply(self):
+        reply = json.dumps({"response": {"question": "빛 에너지는?"}}, ensure_ascii=True)
+
+        stream, _ = _feed_all([reply[i : i + 3] for i in range(0, len(reply), 3)])
+
+        assert stream.value == "빛 에너지는?"
+
+    def test_ignores_text_after_value(self):
+        stream = JsonStringFieldStream("question")
+        stream.feed('{"question": "A"')
+
+        assert stream.feed(', "explanation": "B"}') == ""
+        assert stream.value == "A"
@@ -0,0 +1,90 @@
+"""
+llm_usage 테스트
+- AIMessage의 usage_metadata / response_metadata에서 prompt / cached / completion 토큰 추출
+- 호출별 ledger 기록과 이름별 prefix 캐시 비율 집계
+"""
+
+from unittest.mock import Mock, patch
+
+from langchain_core.messages import AIMessage
+from submissions.utils.tail_question_generator import generate_questions_routed as gqr
+from submissions.utils.tail_question_generator.llm_usage import UsageLedger, extract_usage
+
+
+def _reply(prompt, cached, completion):
+    return AIMessage(
+        content="{}",
+        usage_metadata={
+            "input_tokens": prompt,
+            "output_tokens": completion,
+            "total_tokens": prompt + completion,
+            "input_token_details": {"cache_read": cached},
+        },
+    )
+
+
+class TestExtractUsage:
+    def test_usage_metadata(self):
+        assert extract_usage(_reply(1500, 1024, 80)) == {
+            "prompt_tokens": 1500,
+            "cached_tokens": 1024,
+            "completion_tokens": 80,
+        }
+
+    def test_raw_token_usage(self):
+        reply = AIMessage(
+            content="{}",
+            response_metadata={
+                "token_usage": {
+                    "prompt_tokens": 1200,
+                    "completion_tokens": 50,
+                    "prompt_tokens_details": {"cached_tokens": 1152},
+                }
+            },
+        )
+
+        assert extract_usage(reply)["cached_tokens"] == 1152
+
+    def test_reply_without_usage(self):
+        assert extract_usage(Mock()) == {"prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0}
+
+
+class TestUsageLedger:
+    def test_records_calls_and_summarizes_cache_rate(self):
+        ledger = UsageLedger(max_entries=10)
+        ledger.record("actor", _reply(2000, 0, 100))
+        ledger.record("actor", _reply(2000, 1536, 100))
+        ledger.record("planner", _reply(1200, 1024, 5))
+
+        assert [c.cached_tokens for c in ledger.entries("actor")] == [0, 1536]
+        summary = ledger.summary()
+        assert summary["actor"]["calls"] == 2
+        assert summary["actor"]["cache_rate"] == 1536 / 4000
+        assert summary["planner"]["cache_rate"] == 1024 / 1200
+
+    def test_bounded(self):
+        ledger = UsageLedger(max_entries=2)
+        for prompt in (1, 2, 3):
+            ledger.record("actor", _reply(prompt, 0, 1))
+
+        assert [c.prompt_tokens for c in ledger.entries()] == [2, 3]
+
+    @patch.object(gqr, "planner_llm")
+    def test_generator_calls_are_recorded(self, mock_planner):
+        ledger = UsageLedger()
+        mock_planner.invoke.return_value = AIMessage(
+            content='{"is_correct": true}',
+            usage_metadata={
+                "input_tokens": 1300,
+                "output_tokens": 6,
+                "total_tokens": 1306,
+                "input_token_details": {"cache_read": 1280},
+            },
+        )
+
+        with patch.object(gqr, "usage_ledger", ledger):
+            gqr.judge_correctness("Q", "A", "student")
+
+        (call,) = ledger.entries("planner")
+        assert call.cached_tokens == 1280
+        assert call.latency_ms is not None
@@ -0,0 +1,199 @@
+"""
+local_grader / calibrate_local_grader 테스트
+- 모범답안 핵심어 포함률 (조사 / 어미 변화 허용)
+- 보정 임계값 밖의 확실한 답안만 로컬 판정, 중간 구간은 LLM에 위임 + LLM 생략 비율 통계
+- 저장된 LLM 판정으로 임계값 보정 (로컬 판정 답안은 제외)
+"""
+
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from assignments.models import Assignment
+from catalog.models import Subject
+from courses.models import CourseClass
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+from questions.models import Question
+from submissions.models import Answer, PersonalAssignment
+from submissions.utils.local_grader import (
+    GraderThresholds,
+    LocalGrader,
+    calibrate_thresholds,
+    decode_embedding,
+    key_term_coverage,
+    key_terms,
+    load_thresholds,
+    model_answer_embeddings,
+    save_thresholds,
+)
+
+Account = get_user_model()
+
+KEYWORDS = ("광합성", "포도당", "산소", "빛", "모르")
+MODEL_ANSWER = "광합성은 빛 에너지로 포도당을 만들고 산소를 내보냅니다."
+
+
+def keyword_encoder(texts):
+    return np.array([[t.count(k) for k in KEYWORDS] + [0.1] for t in texts], dtype=np.float32)
+
+
+class TestKeyTerms:
+    def test_particles_and_fillers_removed(self):
+        terms = key_terms("음 광합성은 포도당을 만들고 산소를 내보냅니다.")
+
+        assert {"광합성", "포도당", "산소"} <= terms
+        assert "음" not in terms
+
+    def test_coverage_allows_inflection(self):
+        assert key_term_coverage("가속도는 작아집니다", "가속도가 작아져요") == 1.0
+        assert key_term_coverage(MODEL_ANSWER, "모르겠어요") == 0.0
+        assert key_term_coverage("5", "오") == 1.0  # 핵심어가 없으면 유사도만으로 판정
+
+
+class TestLocalGrader:
+    def test_confident_cases_decided_locally_middle_deferred(self):
+        grader = LocalGrader(GraderThresholds(correct_thr=0.8, incorrect_thr=0.3), encoder=keyword_encoder)
+
+        correct = grader.grade("광합성은 빛으로 포도당과 산소를 만들어요", MODEL_ANSWER)
+        wrong = grader.grade("잘 모르겠어요", MODEL_ANSWER)
+        unsure = grader.grade("광합성은 빛을 쓰는 거요", MODEL_ANSWER)
+
+        assert correct.is_correct is True
+        assert wrong.is_correct is False
+        assert unsure.is_correct is None
+        assert 0.3 < unsure.score < 0.8
+        stats = grader.stats()
+        assert (stats["local_correct"], stats["local_incorrect"], stats["deferred"]) == (1, 1, 1)
+        assert stats["llm_skip_rate"] == pytest.approx(2 / 3)
+
+    def test_uses_stored_model_answer_embedding(self):
+        calls = []
+
+        def encoder(texts):
+            calls.append(list(texts))
+            return keyword_encoder(texts)
+
+        (stored,) = model_answer_embeddings([MODEL_ANSWER], encoder=keyword_encoder)
+        grader = LocalGrader(GraderThresholds(correct_thr=0.8, incorrect_thr=0.3), encoder=encoder)
+        grader.grade("포도당", MODEL_ANSWER, stored)
+
+        assert calls == [["포도당"]]  # 모범답안은 다시 encode하지 않음
+        np.testing.assert_allclose(decode_embedding(stored), keyword_encoder([MODEL_ANSWER])[0], rtol=1e-3)
+
+    def test_uncalibrated_grader_always_defers(self):
+        def encoder(texts):
+            raise AssertionError("보정 전에는 encode하지 않음")
+
+        verdict = LocalGrader(None, encoder=encoder).grade("광합성", MODEL_ANSWER)
+
+        assert verdict.is_correct is None
+
+    def test_predict_correct_guesses_middle_without_stats(self):
+        grader = LocalGrader(GraderThresholds(correct_thr=0.8, incorrect_thr=0.3), encoder=keyword_encoder)
+
+        assert grader.predict_correct("광합성은 빛으로 포도당과 산소를 만들어요", MODEL_ANSWER) is True
+        assert grader.predict_correct("잘 모르겠어요", MODEL_ANSWER) is False
+        assert grader.predict_correct("", MODEL_ANSWER) is None
+        assert grader.stats()["deferred"] == 0  # 추정은 판정 통계에 포함하지 않음
+
+    def test_embedding_failure_returns_none(self):
+        def broken(texts):
+            raise FileNotFoundError("로컬 SBERT 모델을 찾을 수 없습니다")
+
+        assert model_answer_embeddings(["A", "B"], encoder=broken) == [None, None]
+
+
+class TestCalibration:
+    def test_thresholds_meet_target_precision(self):
+        scores = [0.1, 0.15, 0.2, 0.25, 0.5, 0.55, 0.6, 0.85, 0.9, 0.95]
+        labels = [False, False, False, False, True, False, True, True, True, True]
+
+        thresholds, report = calibrate_thresholds(scores, labels, target_precision=1.0, min_support=2)
+
+        assert thresholds.correct_thr == 0.6
+        assert thresholds.incorrect_thr == 0.25
+        assert report["skip_rate"] == pytest.approx(0.8)
+        assert report["agreement"] == 1.0
+
+    def test_no_confident_band(self):
+        thresholds, _ = calibrate_thresholds([0.1, 0.9, 0.5, 0.5], [True, False, True, False], min_support=2)
+
+        assert thresholds is None
+
+    def test_one_sided_thresholds_round_trip(self, tmp_path):
+        path = str(tmp_path / "grader.json")
+        save_thresholds(GraderThresholds(correct_thr=0.8, incorrect_thr=float("-inf")), path, n_samples=10)
+
+        loaded = load_thresholds(path)
+
+        assert loaded.correct_thr == 0.8
+        assert loaded.incorrect_thr == float("-inf")
+
+
+@pytest.mark.django_db
+class TestCalibrateCommand:
+    @pytest.fixture
+    def graded_answers(self):
+        student = Account.objects.create_user(
+            email="student@test.com", password="testpass123", display_name="Student", is_student=True
+        )
+        teacher = Account.objects.create_user(
+            email="teacher@test.com", password="testpass123", display_name="Teacher", is_student=False
+        )
+        subject = Subject.objects.create(name="Science")
+        course_class = CourseClass.objects.create(teacher=teacher, subject=subject, name="Bio", description="")
+        assignment = Assignment.objects.create(
+            course_class=course_class,
+            subject=subject,
+            title="HW",
+            description="",
+            total_questions=8,
+            due_at=timezone.now() + timedelta(days=7),
+            grade="",
+        )
+        personal_assignment = PersonalAssignment.objects.create(student=student, assignment=assignment)
+        transcripts = [
+            ("광합성은 빛으로 포도당과 산소를 만들어요", Answer.State.CORRECT, Answer.GradedBy.LLM),
+            ("빛을 받아 포도당 산소 광합성", Answer.State.CORRECT, Answer.GradedBy.LLM),
+            ("광합성 포도당 산소 빛", Answer.State.CORRECT, Answer.GradedBy.LLM),
+            ("잘 모르겠어요", Answer.State.INCORRECT, Answer.GradedBy.LLM),
+            ("모르겠는데요", Answer.State.INCORRECT, Answer.GradedBy.LLM),
+            ("음 모르겠다", Answer.State.INCORRECT, Answer.GradedBy.LLM),
+            ("모르겠어요 정말", Answer.State.CORRECT, Answer.GradedBy.LOCAL),  # 로컬 판정은 보정에서 제외
+        ]
+        for i, (text, state, graded_by) in enumerate(transcripts):
+            question = Question.objects.create(
+                personal_assignment=personal_assignment,
+                number=i + 1,
+                content="광합성이란?",
+                model_answer=MODEL_ANSWER,
+                recalled_num=0,
+            )
+            Answer.objects.create(
+                question=question, student=student, state=state, text_answer=text, graded_by=graded_by
+            )
+
+    @patch("submissions.utils.local_grader._sbert_encode", side_effect=keyword_encoder)
+    def test_writes_thresholds(self, mock_encode, graded_answers, tmp_path):
+        path = str(tmp_path / "grader.json")
+        out = StringIO()
+
+        call_command(
+            "calibrate_local_grader", "--output", path, "--min-support", "3", "--target-precision", "1.0", stdout=out
+        )
+
+        thresholds = load_thresholds(path)
+        grader = LocalGrader(thresholds, encoder=keyword_encoder)
+        assert grader.grade("광합성 포도당 산소 빛", MODEL_ANSWER).is_correct is True
+        assert grader.grade("모르겠어요 정말", MODEL_ANSWER).is_correct is False
+        assert "LLM 호출 생략 비율 100.0%" in out.getvalue()
+        assert len(mock_encode.call_args[0][0]) == 7  # LLM 판정 답안 6개 + 모범답안 1개
+
+    def test_no_llm_verdicts(self):
+        with pytest.raises(CommandError):
+            call_command("calibrate_local_grader", "--dry-run", stdout=StringIO())
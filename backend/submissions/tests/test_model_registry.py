@@ -0,0 +1,91 @@
+"""
+model_registry 테스트
+- SBERT / XGBoost / SpeechClient를 프로세스당 한 번만 로드하는지
+- 로컬 모델이 없을 때 다운로드하지 않고 바로 실패하는지
+"""
+
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+from submissions.utils import model_registry
+from submissions.utils.feature_extractor import extract_all_features as eaf
+from submissions.utils.inference import DEFAULT_MODEL_PATH, get_xgb_model, run_inference
+from submissions.utils.wave_to_text import get_speech_client
+
+
+class TestModelRegistry:
+    def test_get_or_load_calls_loader_once(self):
+        loader = Mock(return_value=object())
+
+        first = model_registry.get_or_load("key", loader)
+        second = model_registry.get_or_load("key", loader)
+
+        assert first is second
+        loader.assert_called_once()
+        assert model_registry.is_loaded("key")
+
+    def test_fork_unsafe_entries_dropped_after_fork(self):
+        model_registry.get_or_load("safe", lambda: "sbert")
+        model_registry.get_or_load("unsafe", lambda: "grpc-client", fork_safe=False)
+
+        model_registry._reset_after_fork()
+
+        assert model_registry.is_loaded("safe")
+        assert not model_registry.is_loaded("unsafe")
+
+    @patch("submissions.utils.feature_extractor.extract_all_features.SentenceTransformer")
+    def test_sbert_loaded_once_per_process(self, mock_st, tmp_path):
+        model_a = eaf.get_sbert_model(str(tmp_path))
+        model_b = eaf.get_sbert_model(str(tmp_path))
+
+        assert model_a is model_b
+        mock_st.assert_called_once_with(str(tmp_path))
+
+    @patch("submissions.utils.feature_extractor.extract_all_features.SentenceTransformer")
+    def test_missing_local_sbert_fails_fast(self, mock_st, tmp_path, monkeypatch):
+        monkeypatch.setattr(eaf, "DEFAULT_SBERT_MODEL_PATH", str(tmp_path / "KR_SBERT_local"))
+
+        with pytest.raises(FileNotFoundError):
+            eaf.get_sbert_model()
+        mock_st.assert_not_called()
+
+    @patch("submissions.utils.inference.joblib.load")
+    def test_xgb_model_loaded_once(self, mock_load):
+        mock_model = Mock()
+        mock_model.predict.return_value = [5.2]
+        mock_load.return_value = mock_model
+
+        run_inference(DEFAULT_MODEL_PATH, {})
+        result = run_inference(DEFAULT_MODEL_PATH, {})
+
+        assert result["pred_rounded"] == 5
+        mock_load.assert_called_once()
+        assert get_xgb_model(DEFAULT_MODEL_PATH) is mock_model
+
+    @patch("submissions.utils.wave_to_text.speech.SpeechClient")
+    def test_speech_client_reused(self, mock_client_class):
+        assert get_speech_client() is get_speech_client()
+        mock_client_class.assert_called_once()
+
+    def test_warmup_fails_without_local_sbert(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(eaf, "DEFAULT_SBERT_MODEL_PATH", str(tmp_path / "KR_SBERT_local"))
+
+        with pytest.raises(ImproperlyConfigured):
+            model_registry.warmup_models()
+
+    @patch("submissions.utils.wave_to_text.speech.SpeechClient")
+    @patch("submissions.utils.feature_extractor.extract_all_features.SentenceTransformer")
+    def test_warmup_loads_and_runs_models(self, mock_st, mock_client_class, tmp_path, monkeypatch):
+        monkeypatch.setattr(eaf, "DEFAULT_SBERT_MODEL_PATH", str(tmp_path))
+
+        mock_st.return_value.encode.side_effect = lambda texts, **kwargs: np.ones((len(texts), 4), dtype=np.float32)
+
+        model_registry.warmup_models()
+
+        # 더미 문장 encode + 필러 seed 프로토타입 계산
+        assert mock_st.return_value.encode.call_count == 2
+        mock_client_class.assert_called_once()
+        assert model_registry.is_loaded(("sbert", str(tmp_path)))
+        assert model_registry.is_loaded(("xgb", DEFAULT_MODEL_PATH))
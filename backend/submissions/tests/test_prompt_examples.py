@@ -0,0 +1,92 @@
+"""
+prompt_examples 테스트
+- ExampleSelector: bucket별 few-shot 입력은 한 번만 encode, 현재 문제와 가장 비슷한 top-k 예시 선택
+- encoder 실패 시(로컬 SBERT 없음) 앞쪽 k개 예시로 대체
+- compact_json / count_prompt_tokens
+"""
+
+import json
+from unittest.mock import patch
+
+import numpy as np
+from submissions.utils.tail_question_generator import prompt_examples
+from submissions.utils.tail_question_generator.prompt_examples import ExampleSelector, compact_json
+
+KEYWORDS = ("질량", "빛", "DNA")
+
+
+def _example(question, model_answer):
+    return {"input": {"question": question, "model_answer": model_answer, "student_answer": "..."}, "output": {}}
+
+
+EXAMPLES = {
+    "A": [
+        _example("힘이 일정할 때 질량이 커지면?", "가속도는 작아집니다."),
+        _example("빛의 굴절이란?", "빛이 경계에서 꺾이는 현상입니다."),
+        _example("유전은 무엇으로 전달되나요?", "DNA로 전달됩니다."),
+    ]
+}
+
+
+class KeywordEncoder:
+    """키워드 등장 횟수 벡터 (호출 기록)"""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return np.array([[t.count(k) for k in KEYWORDS] + [0.01] for t in texts], dtype=np.float32)
+
+
+class TestExampleSelector:
+    def test_selects_most_similar_examples(self):
+        selector = ExampleSelector(EXAMPLES, encoder=KeywordEncoder(), k=1)
+
+        assert selector.select("A", "DNA 복제 과정은?", "DNA가 두 가닥으로 풀립니다.") == [EXAMPLES["A"][2]]
+        assert selector.select("A", "빛의 반사란?", "빛이 되돌아옵니다.") == [EXAMPLES["A"][1]]
+
+    def test_bucket_inputs_encoded_once(self):
+        encoder = KeywordEncoder()
+        selector = ExampleSelector(EXAMPLES, encoder=encoder, k=2)
+
+        selector.select("A", "질량", "가속도")
+        selector.select("A", "빛", "굴절")
+
+        assert len(encoder.calls[0]) == 3  # 예시 입력 전체 (한 번)
+        assert [len(c) for c in encoder.calls[1:]] == [1, 1]  # 이후에는 현재 문제만
+
+    def test_encoder_failure_falls_back_to_first_k(self):
+        calls = []
+
+        def broken(texts):
+            calls.append(texts)
+            raise FileNotFoundError("로컬 SBERT 모델을 찾을 수 없습니다")
+
+        selector = ExampleSelector(EXAMPLES, encoder=broken, k=2)
+
+        assert selector.select("A", "DNA", "DNA") == EXAMPLES["A"][:2]
+        assert selector.select("A", "DNA", "DNA") == EXAMPLES["A"][:2]
+        assert len(calls) == 1  # 실패 후에는 다시 encode하지 않음
+
+    def test_k_covering_bucket_returns_all_without_encoding(self):
+        encoder = KeywordEncoder()
+
+        assert ExampleSelector(EXAMPLES, encoder=encoder, k=5).select("A", "Q", "A") == EXAMPLES["A"]
+        assert encoder.calls == []
+
+
+class TestPromptSize:
+    def test_compact_json_has_no_indentation(self):
+        text = compact_json(EXAMPLES["A"])
+
+        assert "\n" not in text and ": " not in text
+        assert json.loads(text) == EXAMPLES["A"]
+        assert len(text) < len(json.dumps(EXAMPLES["A"], ensure_ascii=False, indent=2))
+
+    def test_count_prompt_tokens_estimates_without_tiktoken(self):
+        with patch.object(prompt_examples, "_tiktoken_encoding", return_value=None):
+            count, exact = prompt_examples.count_prompt_tokens(["가나다", "abc"], "gpt-4o-mini")
+
+        assert exact is False
+        assert count == 4  # (9 + 3) bytes / 3
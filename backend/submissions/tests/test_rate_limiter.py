@@ -0,0 +1,196 @@
+"""
+rate_limiter 테스트 (시계 / sleep은 가짜, SQLite 파일은 tmp_path)
+- RPM / TPM 버킷이 비면 refill될 때까지 대기, 같은 파일을 쓰는 다른 워커(인스턴스)와 버킷 공유
+- 백그라운드 호출은 interactive 몫의 여유분을 쓰지 못함
+- 429 응답의 서버 힌트만큼 공유 cooldown 후 재시도
+- deadline이 있으면 대기 / 재시도가 남은 예산을 넘기 전에 실패
+"""
+
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+from langchain_core.messages import AIMessage
+from submissions.utils.tail_question_generator import generate_questions_routed as gqr
+from submissions.utils.tail_question_generator import rate_limiter as rl
+from submissions.utils.tail_question_generator.rate_limiter import (
+    BACKGROUND,
+    INTERACTIVE,
+    RateLimiter,
+    RateLimitTimeout,
+    rate_limited_call,
+    retry_after_from_headers,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+        self.slept += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _limiter(tmp_path, clock, **kwargs):
+    kwargs.setdefault("rpm", 60)
+    kwargs.setdefault("tpm", 10000)
+    return RateLimiter(path=str(tmp_path / "limit.sqlite3"), clock=clock, sleep=clock.sleep, **kwargs)
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+    def __init__(self, headers):
+        super().__init__("rate limited")
+        self.response = MagicMock(status_code=429, headers=headers)
+
+
+class TestRateLimiter:
+    def test_waits_for_request_refill(self, tmp_path, clock):
+        limiter = _limiter(tmp_path, clock, rpm=2)
+
+        assert limiter.acquire(10) == 0
+        assert limiter.acquire(10) == 0
+        waited = limiter.acquire(10)
+
+        # 분당 2회 -> 요청 하나가 다시 차는 데 30초
+        assert 30 <= waited < 31
+
+    def test_token_bucket_limits_large_calls(self, tmp_path, clock):
+        limiter = _limiter(tmp_path, clock, tpm=6000)
+
+        limiter.acquire(5000)
+        waited = limiter.acquire(2000)
+
+        # 1000 토큰이 남아 있으므로 1000 토큰(10초)이 더 차야 함
+        assert 10 <= waited < 11
+
+    def test_buckets_shared_between_workers(self, tmp_path, clock):
+        worker_a = _limiter(tmp_path, clock, rpm=2)
+        worker_b = _limiter(tmp_path, clock, rpm=2)
+
+        worker_a.acquire(10)
+        worker_a.acquire(10)
+
+        assert worker_b.acquire(10) >= 30
+
+    def test_background_leaves_reserve_for_interactive(self, tmp_path, clock):
+        limiter = _limiter(tmp_path, clock, rpm=10, background_reserve=0.2)
+
+        for _ in range(8):
+            assert limiter.acquire(10, BACKGROUND) == 0
+        assert limiter._try_take(10, BACKGROUND) > 0
+        assert limiter.acquire(10, INTERACTIVE) == 0
+        assert limiter.acquire(10, INTERACTIVE) == 0
+
+    def test_settle_refunds_overestimate(self, tmp_path, clock):
+        limiter = _limiter(tmp_path, clock, tpm=10000)
+
+        limiter.acquire(4000)
+        limiter.settle(4000, 1000)
+
+        assert limiter.state()["tokens"] == pytest.approx(9000)
+
+    def test_wait_is_capped(self, tmp_path, clock):
+        limiter = _limiter(tmp_path, clock, rpm=1, max_wait=5)
+
+        limiter.acquire(10)
+        waited = limiter.acquire(10)
+
+        assert 5 <= waited < 6
+
+    def test_wait_past_deadline_raises(self, tmp_path, clock):
+        limiter = _limiter(tmp_path, clock, rpm=1)
+        limiter.acquire(10)
+
+        with pytest.raises(RateLimitTimeout):
+            limiter.acquire(10, deadline=time.monotonic() + 2)
+        assert clock.slept == 0
+
+
+class TestRetryHints:
+    @pytest.mark.parametrize(
+        "headers, expected",
+        [
+            ({"retry-after-ms": "250"}, 0.25),
+            ({"retry-after": "2"}, 2.0),
+            ({"x-ratelimit-reset-requests": "1s", "x-ratelimit-reset-tokens": "6m0s"}, 360.0),
+            ({"x-ratelimit-reset-tokens": "20ms"}, 0.02),
+            ({}, None),
+            ({"x-ratelimit-reset-tokens": "soon"}, None),
+        ],
+    )
+    def test_retry_after_from_headers(self, headers, expected):
+        assert retry_after_from_headers(headers) == (pytest.approx(expected) if expected is not None else None)
+
+    def test_429_sets_shared_cooldown_and_retries(self, tmp_path, clock):
+        limiter = _limiter(tmp_path, clock)
+        other_worker = _limiter(tmp_path, clock)
+        fn = MagicMock(side_effect=[RateLimitError({"retry-after": "3"}), "ok"])
+
+        assert rate_limited_call("planner", fn, 100, limiter=limiter) == "ok"
+        assert fn.call_count == 2
+        assert clock.slept >= 3
+
+        limiter.note_rate_limit(5)
+        assert other_worker.state()["cooldown"] == pytest.approx(5)
+
+    def test_other_errors_are_not_retried(self, tmp_path, clock):
+        limiter = _limiter(tmp_path, clock)
+        fn = MagicMock(side_effect=ValueError("bad"))
+
+        with pytest.raises(ValueError):
+            rate_limited_call("planner", fn, 100, limiter=limiter)
+        fn.assert_called_once()
+
+    def test_gives_up_after_max_attempts(self, tmp_path, clock):
+        limiter = _limiter(tmp_path, clock)
+        fn = MagicMock(side_effect=RateLimitError({"retry-after-ms": "100"}))
+
+        with pytest.raises(RateLimitError):
+            rate_limited_call("planner", fn, 100, limiter=limiter, max_attempts=2)
+        assert fn.call_count == 2
+
+    def test_backoff_past_deadline_raises(self, tmp_path, clock):
+        limiter = _limiter(tmp_path, clock)
+        fn = MagicMock(side_effect=RateLimitError({"retry-after": "10"}))
+
+        with pytest.raises(RateLimitError):
+            rate_limited_call("planner", fn, 100, limiter=limiter, deadline=time.monotonic() + 5)
+        fn.assert_called_once()
+        assert limiter.state()["cooldown"] == pytest.approx(10)  # 다른 워커는 계속 backoff
+
+
+class TestCallSites:
+    def test_disabled_limiter_calls_through(self):
+        with patch.object(rl, "LLM_RATE_LIMIT_ENABLED", False):
+            assert rate_limited_call("planner", lambda: "ok", lambda: pytest.fail("not estimated")) == "ok"
+
+    @patch.object(gqr, "actor_llm")
+    def test_precomputed_tails_use_background_priority(self, mock_actor, tmp_path, clock):
+        mock_actor.invoke.return_value = AIMessage(
+            content='{"response": {"question": "Q?"}}',
+            usage_metadata={"input_tokens": 1200, "output_tokens": 100, "total_tokens": 1300},
+        )
+        limiter = _limiter(tmp_path, clock)
+
+        with (
+            patch.object(rl, "get_rate_limiter", return_value=limiter),
+            patch.object(limiter, "acquire", wraps=limiter.acquire) as acquire,
+        ):
+            gqr.generate_bucket_tail_question("Q", "A", "C")
+            gqr.generate_actor_response("Q", "A", "student", "C")
+
+        assert [call.args[1] for call in acquire.call_args_list] == [BACKGROUND, INTERACTIVE]
+        # 실제 사용량(1300 토큰 x 2)으로 정산
+        assert limiter.state()["tokens"] == pytest.approx(10000 - 2600)
@@ -0,0 +1,156 @@
+"""
+speculative_actor 테스트 (LLM은 mock)
+- 예상 bucket이 맞으면 추측 호출 결과를 그대로 사용 (actor 재호출 없음)
+- 빗나가면 시작 전 호출은 취소, 끝난 호출은 사용한 토큰을 낭비로 집계
+- 시간 예산 요청은 추측 호출에 제한 시간을 넘기고, take는 남은 시간만큼만 기다림
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pytest
+from langchain_core.messages import AIMessage
+from submissions.utils import speculative_actor as spec
+from submissions.utils.speculative_actor import SpeculativeActor
+from submissions.utils.tail_question_generator import generate_questions_routed as gqr
+
+
+def _actor_reply(question, prompt=1200, completion=90):
+    return AIMessage(
+        content='{"response": {"question": "%s"}}' % question,
+        usage_metadata={"input_tokens": prompt, "output_tokens": completion, "total_tokens": prompt + completion},
+    )
+
+
+class TestSpeculation:
+    @patch.object(gqr, "actor_llm")
+    def test_matching_bucket_uses_speculative_result(self, mock_actor):
+        mock_actor.invoke.return_value = _actor_reply("추측 질문")
+        actor = SpeculativeActor()
+
+        speculation = actor.start("Q", "A", "student", "C")
+
+        assert speculation.take("C") == {"question": "추측 질문"}
+        assert speculation.take("C") is None  # 결과는 한 번만 사용
+        stats = actor.stats()
+        assert (stats["hits"], stats["misses"], stats["hit_rate"]) == (1, 0, 1.0)
+
+    @patch.object(gqr, "actor_llm")
+    def test_mismatch_counts_wasted_tokens(self, mock_actor):
+        mock_actor.invoke.return_value = _actor_reply("추측 질문", prompt=1500, completion=80)
+        actor = SpeculativeActor()
+
+        speculation = actor.start("Q", "A", "student", "C")
+        speculation.future.result()
+
+        assert speculation.take("D") is None
+        stats = actor.stats()
+        assert (stats["hits"], stats["misses"], stats["cancelled"]) == (0, 1, 0)
+        assert (stats["wasted_prompt_tokens"], stats["wasted_completion_tokens"]) == (1500, 80)
+
+    @patch.object(gqr, "actor_llm")
+    def test_discard_before_start_cancels_call(self, mock_actor):
+        busy = ThreadPoolExecutor(max_workers=1)
+        release = threading.Event()
+        busy.submit(release.wait)
+        actor = SpeculativeActor()
+
+        with patch.object(spec, "_get_executor", return_value=busy):
+            speculation = actor.start("Q", "A", "student", "C")
+        speculation.discard()
+        release.set()
+        busy.shutdown(wait=True)
+
+        mock_actor.invoke.assert_not_called()
+        assert actor.stats()["cancelled"] == 1
+
+    def test_timeout_passed_to_speculative_call(self):
+        actor = SpeculativeActor()
+        with patch.object(spec, "generate_actor_response", return_value=({"question": "X"}, _actor_reply("X"))) as gen:
+            speculation = actor.start("Q", "A", "student", "C", timeout=3.0)
+            speculation.future.result()
+
+        assert gen.call_args.kwargs["timeout"] == 3.0
+
+    def test_take_timeout_counts_miss_and_raises(self):
+        release = threading.Event()
+
+        def slow_actor(*args, **kwargs):
+            release.wait()
+            return {"question": "X"}, _actor_reply("X")
+
+        actor = SpeculativeActor()
+        with patch.object(spec, "generate_actor_response", side_effect=slow_actor):
+            speculation = actor.start("Q", "A", "student", "C", timeout=3.0)
+            with pytest.raises(TimeoutError):
+                speculation.take("C", timeout=0.05)
+            release.set()
+            speculation.future.result()
+
+        assert speculation.take("C") is None  # 늦게 끝난 결과는 쓰지 않음
+        stats = actor.stats()
+        assert (stats["hits"], stats["misses"]) == (0, 1)
+
+
+class TestActorNodeSpeculation:
+    @patch.object(gqr, "actor_llm")
+    def test_actor_node_takes_matching_speculation(self, mock_actor):
+        mock_actor.invoke.return_value = _actor_reply("추측 질문")
+        actor = SpeculativeActor()
+        speculation = actor.start("Q", "A", "student", "D")
+        speculation.future.result()
+
+        payload = gqr.generate_tail_question(
+            question="Q",
+            model_answer="A",
+            student_answer="student",
+            eval_grade=1.0,
+            recalled_time=0,
+            is_correct=False,
+            speculation=speculation,
+        )
+
+        assert payload["bucket"] == "D"
+        assert payload["tail_question"]["question"] == "추측 질문"
+        mock_actor.invoke.assert_called_once()  # 추측 호출만, actor 재호출 없음
+
+    @patch.object(gqr, "actor_llm")
+    def test_actor_node_regenerates_on_mismatch(self, mock_actor):
+        mock_actor.invoke.side_effect = [_actor_reply("추측 질문"), _actor_reply("실제 질문")]
+        actor = SpeculativeActor()
+        speculation = actor.start("Q", "A", "student", "C")
+        speculation.future.result()
+
+        payload = gqr.generate_tail_question(
+            question="Q",
+            model_answer="A",
+            student_answer="student",
+            eval_grade=1.0,
+            recalled_time=0,
+            is_correct=False,
+            speculation=speculation,
+        )
+
+        assert payload["tail_question"]["question"] == "실제 질문"
+        assert mock_actor.invoke.call_count == 2
+        assert actor.stats()["misses"] == 1
+
+    def test_only_correct_plan_discards_speculation(self):
+        actor = SpeculativeActor()
+        with patch.object(spec, "generate_actor_response", return_value=({"question": "X"}, _actor_reply("X"))):
+            speculation = actor.start("Q", "A", "student", "B")
+            speculation.future.result()
+
+            payload = gqr.generate_tail_question(
+                question="Q",
+                model_answer="A",
+                student_answer="student",
+                eval_grade=5.0,
+                recalled_time=3,
+                is_correct=True,
+                speculation=speculation,
+            )
+
+        assert payload["plan"] == "ONLY_CORRECT"
+        assert actor.stats()["misses"] == 1
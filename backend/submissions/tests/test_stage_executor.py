@@ -0,0 +1,93 @@
+"""
+stage_executor 테스트
+- 독립 단계 동시 실행 / 의존 단계 입력 전달 / 단계별 소요 시간 기록
+- 실패 단계 이름 전달, 풀이 가득 찬 경우에도 완료 (caller-runs)
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from submissions.utils.stage_executor import Stage, StageError, run_stages
+
+
+def _sleep_then(value, seconds=0.2):
+    def func(results):
+        time.sleep(seconds)
+        return value
+
+    return func
+
+
+class TestRunStages:
+    def test_independent_stages_run_concurrently(self):
+        run = run_stages(
+            [
+                Stage("stt", _sleep_then("transcript")),
+                Stage("acoustic", _sleep_then({"total_length": 1.0})),
+                Stage("merge", lambda r: {"script": r["stt"], **r["acoustic"]}, deps=("stt", "acoustic")),
+            ]
+        )
+
+        assert run.results["merge"] == {"script": "transcript", "total_length": 1.0}
+        # 두 단계(0.2s씩)가 순차 실행됐다면 0.4s 이상
+        assert run.total_seconds < 0.35
+        assert set(run.timings) == {"stt", "acoustic", "merge"}
+        assert run.timings["stt"]["seconds"] >= 0.2
+        assert run.timings["merge"]["start"] >= run.timings["acoustic"]["start"]
+
+    def test_dependency_inputs_only(self):
+        seen = {}
+
+        def record(results):
+            seen.update(results)
+            return "actor"
+
+        run_stages(
+            [
+                Stage("a", lambda r: 1),
+                Stage("b", lambda r: r["a"] + 1, deps=("a",)),
+                Stage("c", record, deps=("b",)),
+            ]
+        )
+
+        assert seen == {"b": 2}
+
+    def test_failed_stage_raises_stage_error(self):
+        ran = []
+
+        def boom(results):
+            raise RuntimeError("inference failed")
+
+        with pytest.raises(StageError) as exc_info:
+            run_stages(
+                [
+                    Stage("planner", _sleep_then(True, 0.05)),
+                    Stage("inference", boom),
+                    Stage("actor", lambda r: ran.append("actor"), deps=("planner", "inference")),
+                ]
+            )
+
+        assert exc_info.value.stage == "inference"
+        assert isinstance(exc_info.value.error, RuntimeError)
+        assert ran == []
+
+    def test_completes_when_pool_is_saturated(self):
+        executor = ThreadPoolExecutor(max_workers=1)
+        release = threading.Event()
+        executor.submit(release.wait, 5)  # 풀의 유일한 스레드를 점유
+
+        try:
+            run = run_stages([Stage("stt", lambda r: "a"), Stage("acoustic", lambda r: "b")], executor=executor)
+        finally:
+            release.set()
+            executor.shutdown()
+
+        assert run.results == {"stt": "a", "acoustic": "b"}
+
+    def test_invalid_graph(self):
+        with pytest.raises(ValueError):
+            run_stages([Stage("a", lambda r: 1, deps=("missing",))])
+        with pytest.raises(ValueError):
+            run_stages([Stage("a", lambda r: 1, deps=("b",)), Stage("b", lambda r: 1, deps=("a",))])
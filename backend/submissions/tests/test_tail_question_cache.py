@@ -0,0 +1,128 @@
+"""
+꼬리 질문 캐시 테스트
+- 정확 일치: 문제 내용 + bucket + 정규화한 답변(필러 / 문장부호 / 공백 차이 무시)
+- 의미 일치: 같은 문제 + 같은 bucket 안에서 임베딩 cosine이 임계값 이상이면 재사용
+  (동시에 저장해도 서로의 항목이 사라지지 않고, 문제별 최대 개수를 넘으면 오래된 slot부터 덮어씀)
+- TTL 만료, hit rate 집계, generate_tail_question 연동(캐시 hit이면 actor LLM 호출 없음)
+"""
+
+import threading
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+from django.core.cache import caches
+from submissions.utils.tail_question_cache import TailQuestionCache, normalize_answer, question_hash
+from submissions.utils.tail_question_generator import generate_questions_routed as gqr
+
+RESPONSE = {
+    "topic": "광합성의 목적",
+    "question": "식물 자신에게 가장 먼저 필요한 것은 무엇일까요?",
+    "model_answer": "양분(포도당)입니다.",
+    "explanation": "오개념 교정",
+    "difficulty": "medium",
+}
+
+
+@pytest.fixture(autouse=True)
+def clear_tail_cache():
+    caches["tail_questions"].clear()
+    yield
+    caches["tail_questions"].clear()
+
+
+class KeywordEncoder:
+    """'산소'가 들어간 답변끼리 비슷한 방향이 되는 간단한 임베딩"""
+
+    def __call__(self, texts):
+        return np.array([[1.0, 0.05 * len(t)] if "산소" in t else [0.0, 1.0] for t in texts])
+
+
+class TestTailQuestionCache:
+    def test_normalize_answer_ignores_fillers_and_punctuation(self):
+        assert normalize_answer("음... 산소를  만들어서요!") == normalize_answer("산소를 만들어서요")
+
+    def test_exact_hit_within_same_question_and_bucket(self):
+        cache = TailQuestionCache()
+        cache.put("광합성의 목적은?", "양분", "산소를 만들어서요", "C", RESPONSE)
+
+        assert cache.get("광합성의 목적은?", "양분", "어 산소를 만들어서요.", "C") == RESPONSE
+        assert cache.get("광합성의 목적은?", "양분", "산소를 만들어서요", "D") is None  # 다른 bucket
+        assert cache.get("다른 문제", "양분", "산소를 만들어서요", "C") is None
+        assert cache.stats() == {"exact_hits": 1, "semantic_hits": 0, "misses": 2, "stores": 1, "hit_rate": 1 / 3}
+
+    def test_peek_does_not_count(self):
+        cache = TailQuestionCache()
+        cache.put("Q", "A", "답", "C", RESPONSE)
+
+        assert cache.peek("Q", "A", "답", "C") == RESPONSE
+        assert cache.peek("Q", "A", "답", "D") is None
+        assert cache.stats() == {"exact_hits": 0, "semantic_hits": 0, "misses": 0, "stores": 1, "hit_rate": 0.0}
+
+    def test_empty_question_not_stored(self):
+        cache = TailQuestionCache()
+        cache.put("Q", "A", "답", "C", {"question": ""})
+
+        assert cache.get("Q", "A", "답", "C") is None
+
+    def test_semantic_hit(self):
+        cache = TailQuestionCache(encoder=KeywordEncoder(), semantic_thr=0.9)
+        cache.put("광합성의 목적은?", "양분", "산소를 만들어서요", "C", RESPONSE)
+
+        assert cache.get("광합성의 목적은?", "양분", "우리에게 산소 주려고", "C") == RESPONSE
+        assert cache.get("광합성의 목적은?", "양분", "모르겠어요", "C") is None
+        assert cache.stats()["semantic_hits"] == 1
+
+    def test_concurrent_semantic_puts_keep_every_entry(self):
+        cache = TailQuestionCache(encoder=KeywordEncoder())
+        start = threading.Barrier(8)
+
+        def put(i):
+            start.wait()
+            cache.put("Q", "A", f"답변 {i}번", "C", RESPONSE)
+
+        threads = [threading.Thread(target=put, args=(i,)) for i in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        neighbours = cache._neighbours(question_hash("Q", "A"), "C")
+        assert len({exact_key for _, exact_key in neighbours}) == 8
+
+    def test_semantic_slots_wrap_at_max_per_question(self):
+        cache = TailQuestionCache(encoder=KeywordEncoder(), semantic_max_per_question=2)
+        for i in range(3):
+            cache.put("Q", "A", f"답변 {i}번", "C", RESPONSE)
+
+        assert len(cache._neighbours(question_hash("Q", "A"), "C")) == 2
+
+    def test_ttl_expiry(self):
+        cache = TailQuestionCache()
+        with patch("django.core.cache.backends.locmem.time.time", return_value=0):
+            cache.put("Q", "A", "답", "C", RESPONSE)
+        with patch("django.core.cache.backends.locmem.time.time", return_value=10**9):
+            assert cache.get("Q", "A", "답", "C") is None
+
+
+def _llm_reply(content):
+    reply = Mock()
+    reply.content = content
+    return reply
+
+
+class TestGenerateTailQuestionWithCache:
+    @patch.object(gqr, "actor_llm")
+    def test_second_student_reuses_tail_question(self, mock_actor):
+        mock_actor.invoke.return_value = _llm_reply('{"response": {"question": "왜 그런가요?"}}')
+        cache = TailQuestionCache()
+        kwargs = dict(question="Q", model_answer="A", eval_grade=5.0, recalled_time=0, is_correct=False)
+
+        first = gqr.generate_tail_question(student_answer="산소요", tail_cache=cache, **kwargs)
+        second = gqr.generate_tail_question(student_answer="음, 산소요!", tail_cache=cache, **kwargs)
+
+        mock_actor.invoke.assert_called_once()
+        assert first["cache_hit"] is False
+        assert second["cache_hit"] is True
+        assert second["tail_question"] == first["tail_question"]
+        assert second["recalled_time"] == 1
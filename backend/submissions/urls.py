@@ -2,7 +2,9 @@ from django.urls import path
 
 from .views import (
     AnswerCorrectnessView,
+    AnswerStreamView,
     AnswerSubmitView,
+    GradingJobStatusView,
     PersonalAssignmentCompleteView,
     PersonalAssignmentListView,
     PersonalAssignmentQuestionsView,
@@ -16,6 +18,8 @@ urlpatterns = [
     path("<int:id>/questions/", PersonalAssignmentQuestionsView.as_view(), name="personal-assignment-questions"),
     path("<int:id>/complete/", PersonalAssignmentCompleteView.as_view(), name="personal-assignment-complete"),
     path("answer/", AnswerSubmitView.as_view(), name="answer"),
+    path("answer/stream/", AnswerStreamView.as_view(), name="answer-stream"),
+    path("answer/jobs/<int:job_id>/", GradingJobStatusView.as_view(), name="answer-job"),
     path("<int:id>/correctness/", AnswerCorrectnessView.as_view(), name="answer-correctness"),
     path("recentanswer/", PersonalAssignmentRecentView.as_view(), name="personal-assignment-recent"),
 ]
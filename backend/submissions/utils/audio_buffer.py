@@ -0,0 +1,68 @@
+"""
+한 번만 디코딩해서 STT / 음향 특징 추출이 함께 쓰는 메모리 상의 오디오 버퍼
+
+업로드된 WAV를 임시 파일로 복사한 뒤 STT(resample_to_16k_mono)와 음향 특징(extract_acoustic_features)이
+각각 sf.read로 다시 읽던 것을, 업로드 스트림에서 float32로 한 번만 디코딩해 공유합니다.
+
+- AudioBuffer.from_source(source): 파일 경로 / 파일 객체(UploadedFile, BytesIO) / AudioBuffer를 받아 버퍼 반환
+- first_channel: 음향 특징용 신호 (다채널이면 첫 번째 채널, 기존 extract_acoustic_features와 동일)
+- mono_16k: STT용 16kHz mono 신호 (처음 접근할 때 한 번만 계산)
+"""
+
+import os
+from functools import cached_property
+
+import numpy as np
+import soundfile as sf
+
+STT_SAMPLE_RATE = 16000
+
+
+class AudioBuffer:
+    """float32 샘플(samples: (frames,) 또는 (frames, channels))과 샘플레이트(sr)"""
+
+    def __init__(self, samples: np.ndarray, sr: int):
+        self.samples = np.asarray(samples, dtype=np.float32)
+        self.sr = int(sr)
+
+    @classmethod
+    def from_source(cls, source) -> "AudioBuffer":
+        """경로 / 파일 객체를 디코딩 (이미 AudioBuffer면 그대로 반환)"""
+        if isinstance(source, cls):
+            return source
+
+        if isinstance(source, (str, os.PathLike)):
+            if not os.path.exists(source):
+                raise FileNotFoundError(f"WAV 파일을 찾을 수 없습니다: {source}")
+            if os.path.getsize(source) == 0:
+                raise ValueError(f"Empty file: {source}")
+        else:
+            if getattr(source, "size", None) == 0:
+                raise ValueError(f"Empty file: {getattr(source, 'name', source)}")
+            if hasattr(source, "seek"):
+                source.seek(0)
+
+        samples, sr = sf.read(source, dtype="float32", always_2d=False)
+        return cls(samples, sr)
+
+    @property
+    def duration(self) -> float:
+        return len(self.samples) / self.sr if self.sr else 0.0
+
+    @property
+    def first_channel(self) -> np.ndarray:
+        return self.samples if self.samples.ndim == 1 else self.samples[:, 0]
+
+    @property
+    def mono(self) -> np.ndarray:
+        return self.samples if self.samples.ndim == 1 else self.samples.mean(axis=1, dtype=np.float32)
+
+    @cached_property
+    def mono_16k(self) -> np.ndarray:
+        """STT용 16kHz mono 신호 (resampy, 첫 접근 시 한 번만 계산)"""
+        if self.sr == STT_SAMPLE_RATE:
+            return self.mono
+
+        import resampy
+
+        return resampy.resample(self.mono, self.sr, STT_SAMPLE_RATE).astype(np.float32, copy=False)
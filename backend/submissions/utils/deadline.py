@@ -0,0 +1,50 @@
+"""
+답안 채점 요청 하나의 시간 예산 (deadline)
+
+요청이 들어온 시점부터 ANSWER_DEADLINE_SECONDS 안에 응답하도록, 각 단계(STT -> 정오답 판정 / 추론 -> 꼬리 질문 생성)는
+뒤 단계 몫(reserve)을 남긴 시간만 제한 시간으로 사용합니다.
+꼬리 질문 생성(actor LLM) 몫이 남지 않으면 정오답만 먼저 응답하고 꼬리 질문은 작업 큐에서 생성합니다.
+
+- answer_deadline(): 설정값으로 만든 Deadline (ANSWER_DEADLINE_SECONDS가 0이면 None = 제한 없음)
+- Deadline.timeout(reserve): 이 단계가 쓸 수 있는 시간 (남은 시간 - 뒤 단계 몫, 최소 MIN_STAGE_TIMEOUT초)
+- Deadline.allows(seconds): 남은 시간으로 seconds만큼의 단계를 시작할 수 있는지
+"""
+
+import time
+from typing import Callable, Optional
+
+from django.conf import settings
+
+# 예산이 거의 남지 않아도 단계 호출 자체는 바로 실패하지 않도록 주는 최소 제한 시간 (초)
+MIN_STAGE_TIMEOUT = 0.5
+
+
+class Deadline:
+    """monotonic clock 기준으로 시작 시점부터 seconds초까지의 예산"""
+
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.seconds = seconds
+        self.clock = clock
+        self.started = clock()
+
+    def elapsed(self) -> float:
+        return self.clock() - self.started
+
+    def remaining(self) -> float:
+        return max(0.0, self.seconds - self.elapsed())
+
+    def timeout(self, reserve: float = 0.0) -> float:
+        """뒤 단계 몫(reserve)을 남기고 이 단계가 쓸 수 있는 시간 (초)"""
+        return max(MIN_STAGE_TIMEOUT, self.remaining() - reserve)
+
+    def allows(self, seconds: float) -> bool:
+        return self.remaining() >= seconds
+
+    def __repr__(self) -> str:
+        return f"Deadline({self.seconds:.1f}s, remaining={self.remaining():.2f}s)"
+
+
+def answer_deadline() -> Optional[Deadline]:
+    """답안 제출 요청용 Deadline (ANSWER_DEADLINE_SECONDS <= 0이면 None)"""
+    seconds = settings.ANSWER_DEADLINE_SECONDS
+    return Deadline(seconds) if seconds > 0 else None
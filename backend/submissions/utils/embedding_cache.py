@@ -0,0 +1,207 @@
+"""
+SBERT 임베딩 캐시 (모델별, 정규화한 텍스트 해시 -> 임베딩)
+
+같은 문제에 답하는 학생들의 답변에는 "그러니까", "에너지" 같은 짧은 구절이 반복해서 나오므로,
+한 번 encode한 결과를 재사용합니다.
+
+- 메모리 tier: 프로세스 내 LRU (EMBEDDING_CACHE_SIZE개, 초과 시 가장 오래 안 쓴 항목부터 제거)
+    - 캐시 hit여도 특징 값이 바로 encode한 결과와 같도록 float32 그대로 보관
+    - 768차원 기준 항목당 3KB: 기본 4000개면 워커당 약 12MB (start_server.sh의 워커 15개 합계 약 180MB),
+      더 많은 항목을 공유하려면 디스크 tier 사용
+- 디스크 tier(선택): EMBEDDING_CACHE_DIR를 지정하면 float32 행렬(memmap) + 인덱스 파일을 gunicorn 워커들이 공유
+    - 메모리 tier와 같은 float32: 어느 워커가 먼저 encode했는지와 관계없이 특징 값이 같음 (768차원 기준 항목당 3KB)
+    - 디스크 읽기 / 쓰기는 메모리 tier lock 밖에서 (디스크 tier 자체 lock), memmap 읽기가 메모리 조회를 막지 않음
+    - 추가는 파일 잠금(fcntl.flock) 하에 append only, 최대 EMBEDDING_DISK_CACHE_MAX_ROWS행까지만 저장
+    - 다른 워커가 추가한 항목은 인덱스 파일에서 새로 추가된 부분만 읽어 반영
+- stats(): 메모리/디스크 hit, miss 횟수
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+try:
+    from . import model_registry
+except ImportError:  # 스크립트로 직접 실행하는 경우
+    import model_registry
+
+EMBEDDING_CACHE_SIZE = int(os.getenv("EMBEDDING_CACHE_SIZE", "4000"))
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", "")
+EMBEDDING_DISK_CACHE_MAX_ROWS = int(os.getenv("EMBEDDING_DISK_CACHE_MAX_ROWS", "1000000"))
+
+_SPACE_RE = re.compile(r"\s+")
+
+
+def text_key(text: str) -> str:
+    """NFC 정규화 + 공백 정리한 텍스트의 sha1 (SBERT 토크나이저는 공백 차이를 구분하지 않음)"""
+    norm = _SPACE_RE.sub(" ", unicodedata.normalize("NFC", text).strip())
+    return hashlib.sha1(norm.encode("utf-8")).hexdigest()
+
+
+class _DiskTier:
+    """여러 프로세스가 공유하는 append-only float32 임베딩 파일 (vectors.f32 + index.tsv, 스레드 안전)"""
+
+    def __init__(self, directory: str, max_rows: int):
+        os.makedirs(directory, exist_ok=True)
+        self.meta_path = os.path.join(directory, "meta.json")
+        self.vectors_path = os.path.join(directory, "vectors.f32")
+        self.index_path = os.path.join(directory, "index.tsv")
+        self.lock_path = os.path.join(directory, ".lock")
+        self.max_rows = max_rows
+        self.dim = None
+        self._index: Dict[str, int] = {}
+        self._index_offset = 0
+        self._matrix = None
+        self._lock = threading.Lock()  # 프로세스 내 스레드 간 (_index / _matrix), 프로세스 간은 파일 잠금
+
+    def _load_meta(self):
+        if self.dim is None and os.path.exists(self.meta_path):
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                self.dim = int(json.load(f)["dim"])
+
+    def _refresh_index(self):
+        """다른 프로세스가 추가한 인덱스 줄만 읽어서 반영"""
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, "rb") as f:
+            f.seek(self._index_offset)
+            data = f.read()
+        complete = data[: data.rfind(b"\n") + 1]
+        for line in complete.decode("utf-8").splitlines():
+            key, row = line.split("\t")
+            self._index[key] = int(row)
+        self._index_offset += len(complete)
+
+    def _n_rows(self) -> int:
+        if not self.dim or not os.path.exists(self.vectors_path):
+            return 0
+        return os.path.getsize(self.vectors_path) // (self.dim * 4)
+
+    def _rows(self, needed: int):
+        if self._matrix is None or len(self._matrix) < needed:
+            self._matrix = np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(self._n_rows(), self.dim))
+        return self._matrix
+
+    def get_many(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        with self._lock:
+            self._load_meta()
+            if self.dim is None:
+                return {}
+            if any(k not in self._index for k in keys):
+                self._refresh_index()
+            found = {k: self._index[k] for k in keys if k in self._index}
+            if not found:
+                return {}
+            matrix = self._rows(max(found.values()) + 1)
+            return {k: np.array(matrix[row], dtype=np.float32) for k, row in found.items()}
+
+    def put_many(self, keys: List[str], vectors: np.ndarray):
+        with self._lock, open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._load_meta()
+                if self.dim is None:
+                    self.dim = int(vectors.shape[1])
+                    with open(self.meta_path, "w", encoding="utf-8") as f:
+                        json.dump({"dim": self.dim}, f)
+                self._refresh_index()
+
+                start = self._n_rows()
+                new = [i for i, k in enumerate(keys) if k not in self._index][: max(0, self.max_rows - start)]
+                if not new:
+                    return
+                # 행렬을 먼저 쓰고 인덱스를 나중에 써서, 인덱스에 있는 행은 항상 읽을 수 있게 함
+                with open(self.vectors_path, "ab") as f:
+                    f.write(np.asarray(vectors[new], dtype=np.float32).tobytes())
+                with open(self.index_path, "a", encoding="utf-8") as f:
+                    f.write("".join(f"{keys[i]}\t{start + n}\n" for n, i in enumerate(new)))
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+class EmbeddingCache:
+    """모델 하나에 대한 임베딩 캐시 (메모리 LRU + 선택적 디스크 tier, 스레드 안전)"""
+
+    def __init__(
+        self, model_id: str, max_entries: int = None, disk_dir: Optional[str] = None, disk_max_rows: int = None
+    ):
+        self.model_id = model_id
+        self.max_entries = EMBEDDING_CACHE_SIZE if max_entries is None else max_entries
+        self._memory: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk = None
+        if disk_dir:
+            model_dir = os.path.join(disk_dir, hashlib.sha1(model_id.encode("utf-8")).hexdigest()[:16])
+            max_rows = EMBEDDING_DISK_CACHE_MAX_ROWS if disk_max_rows is None else disk_max_rows
+            self._disk = _DiskTier(model_dir, max_rows)
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def get_many(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        """캐시에 있는 텍스트만 {text: 임베딩(float32)}로 반환"""
+        keys = {t: text_key(t) for t in texts}
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            for text, key in keys.items():
+                vec = self._memory.get(key)
+                if vec is not None:
+                    self._memory.move_to_end(key)
+                    found[text] = vec
+            self.memory_hits += len(found)
+
+        missing = [t for t in keys if t not in found]
+        from_disk = {}
+        if missing and self._disk is not None:
+            from_disk = self._disk.get_many([keys[t] for t in missing])
+
+        with self._lock:
+            for text in missing:
+                vec = from_disk.get(keys[text])
+                if vec is not None:
+                    found[text] = vec
+                    self._remember(keys[text], vec)
+                    self.disk_hits += 1
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(self, texts: List[str], vectors: np.ndarray):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        keys = [text_key(t) for t in texts]
+        with self._lock:
+            for key, vec in zip(keys, vectors):
+                self._remember(key, vec.copy())  # 배치 행렬 전체가 캐시에 붙잡히지 않도록 행 단위 복사
+        if self._disk is not None and len(keys):
+            self._disk.put_many(keys, vectors)
+
+    def _remember(self, key: str, vec: np.ndarray):
+        self._memory[key] = vec
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> dict:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "model_id": self.model_id,
+            "entries": len(self._memory),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+        }
+
+
+def get_embedding_cache(model_id: str) -> EmbeddingCache:
+    """모델별 캐시를 프로세스당 하나만 생성 (model_registry 사용)"""
+    return model_registry.get_or_load(
+        ("embedding_cache", model_id), lambda: EmbeddingCache(model_id, disk_dir=EMBEDDING_CACHE_DIR or None)
+    )
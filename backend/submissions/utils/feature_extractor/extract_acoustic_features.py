@@ -5,7 +5,11 @@ import time
 import librosa
 import numpy as np
 import pyworld as pw
-import soundfile as sf
+
+try:
+    from ..audio_buffer import AudioBuffer
+except ImportError:  # feature_extractor를 최상위 패키지로 import하거나 스크립트로 직접 실행하는 경우
+    from audio_buffer import AudioBuffer
 
 
 def moving_average(x, k):
@@ -32,13 +36,23 @@ def interp_internal_nans(x: np.ndarray) -> np.ndarray:
     return xi
 
 
-def compute_f0(y, sr, fmin=50.0, fmax=600.0, hop=256, smooth_ms=30.0):
+def _as_signal(y, sr):
+    """sr 없이 AudioBuffer가 들어오면 (첫 번째 채널, 샘플레이트)로 풀어서 반환"""
+    if sr is None:
+        return y.first_channel, y.sr
+    return y, sr
+
+
+def compute_f0(y, sr=None, fmin=50.0, fmax=600.0, hop=256, smooth_ms=30.0):
+    y, sr = _as_signal(y, sr)
+
     # hop(ms) 변환
     frame_period = hop / sr * 1000.0
 
     # pyworld dio + stonemask
-    _f0, t = pw.dio(y.astype(np.float64), sr, f0_floor=fmin, f0_ceil=fmax, frame_period=frame_period)
-    f0 = pw.stonemask(y.astype(np.float64), _f0, t, sr)
+    y64 = y.astype(np.float64)
+    _f0, t = pw.dio(y64, sr, f0_floor=fmin, f0_ceil=fmax, frame_period=frame_period)
+    f0 = pw.stonemask(y64, _f0, t, sr)
 
     # 0인 구간은 무성으로 보고 NaN 처리
     f0 = np.where(f0 > 0, f0, np.nan)
@@ -97,8 +111,9 @@ def _binary_open_close(mask: np.ndarray, min_speech_frames: int, min_silence_fra
 
 
 def silence_features_fast(
-    y, sr, frame_length=1024, hop_length=512, top_db=40, min_speech_sec=0.12, min_silence_sec=0.16
+    y, sr=None, frame_length=1024, hop_length=512, top_db=40, min_speech_sec=0.12, min_silence_sec=0.16
 ):
+    y, sr = _as_signal(y, sr)
     if len(y) < frame_length:  # if audio is shorter than one frame
         total = len(y) / sr
         return dict(
@@ -231,7 +246,7 @@ def count_pauses_from_intervals(
 
 
 def extract_acoustic_features(
-    path,
+    audio,
     fmin=50.0,
     fmax=600.0,
     hop=256,
@@ -240,28 +255,25 @@ def extract_acoustic_features(
     top_db=40,
     robust=False,
     pause_secs=(0.5, 1.0, 2.0),
+    include_f0=True,
 ):
+    # include_f0=False면 pyworld f0 추출(가장 무거운 단계)을 건너뛰고 침묵/쉼 특징만 반환
+    # audio: WAV 파일 경로 또는 이미 디코딩된 AudioBuffer (STT와 공유하면 다시 읽지 않음)
     start_time = time.time()
-    y, sr = sf.read(path, dtype="float32", always_2d=False)
-    if y.ndim > 1:
-        y = y[:, 0]
+    buffer = AudioBuffer.from_source(audio)
+    sr = buffer.sr
 
     end_time = time.time()
     print(f"Audio loaded in {end_time - start_time:.4f}sec")
 
     start_time = time.time()
-    sil = silence_features_fast(y, sr, hop_length=hop, top_db=top_db)  # use only fast VAD
+    sil = silence_features_fast(buffer, hop_length=hop, top_db=top_db)  # use only fast VAD
     end_time = time.time()
     print(f"VAD in {end_time - start_time:.4f}sec")
 
     # # skip rms features
     # rms = rms_features(y, sr, intervals=intervals, hop=hop, robust=robust)
 
-    start_time = time.time()
-    f = compute_f0(y, sr, fmin=fmin, fmax=fmax, hop=hop, smooth_ms=smooth_ms)
-    end_time = time.time()
-    print(f"f0 in {end_time - start_time:.4f}sec")
-
     out = dict(**{k: v for k, v in sil.items() if k != "intervals"}, sr=int(sr))
 
     pause_dict = count_pauses_from_intervals(
@@ -270,6 +282,14 @@ def extract_acoustic_features(
         thresholds_sec=pause_secs,
     )
     out.update(pause_dict)
+    if not include_f0:
+        return out
+
+    start_time = time.time()
+    f = compute_f0(buffer, fmin=fmin, fmax=fmax, hop=hop, smooth_ms=smooth_ms)
+    end_time = time.time()
+    print(f"f0 in {end_time - start_time:.4f}sec")
+
     if f.get("f0") is None or len(f["f0"]) < 2:
         out.update(
             dict(
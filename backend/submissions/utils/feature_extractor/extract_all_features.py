@@ -1,68 +1,152 @@
 import argparse
+import logging
 import os
-import sys
+import time
 import traceback
 import warnings
 from pprint import pprint
+from typing import List
 
-sys.path.append(os.path.dirname(os.path.dirname(__file__)))
-
-
-from feature_extractor import extract_acoustic_features
-from feature_extractor.extract_features_from_script import extract_features_from_script
+import numpy as np
 from sentence_transformers import SentenceTransformer
 
-from .. import wave_to_text
+from .. import model_registry, wave_to_text
+from ..audio_buffer import AudioBuffer
+from ..embedding_cache import get_embedding_cache
+from ..stage_executor import Stage, StageError, run_stages
+from .extract_acoustic_features import extract_acoustic_features
+from .extract_features_from_script import BatchedEncoder, extract_features_from_script
+from .feature_graph import FeaturePlan, plan_features
 
 warnings.filterwarnings("ignore")
+logger = logging.getLogger(__name__)
 
+# 로컬 SBERT 모델 경로 (submissions/utils/KR_SBERT_local)
+DEFAULT_SBERT_MODEL_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "KR_SBERT_local"))
 
-def extract_all_features(wav_path: str, model_name: str = None) -> dict:
-    """
-    WAV 파일에서 STT, 음향, 스크립트 기반, 의미론적 특징을 모두 추출합니다.
-    수정된 extract_features_from_script.enrich_json_file 함수를 활용하여
-    딕셔너리를 직접 전달하고 인-메모리에서 모든 특징을 통합합니다.
 
-    Args:
-        wav_path: WAV 파일 경로
-        model_name: SentenceTransformer 모델 경로. None이면 로컬 모델 사용.
+def get_sbert_model(model_name: str = None) -> SentenceTransformer:
     """
-    if not os.path.exists(wav_path):
-        raise FileNotFoundError(f"WAV 파일을 찾을 수 없습니다: {wav_path}")
+    프로세스 단위로 캐시된 SentenceTransformer 반환 (model_registry 사용)
 
-    # 기본값으로 로컬 모델 경로 사용
+    로컬 경로가 존재하지 않으면 SentenceTransformer가 HuggingFace Hub에서 받으려 하므로,
+    기본 로컬 모델이 없을 때는 다운로드 대신 FileNotFoundError를 발생시킵니다.
+    """
     if model_name is None:
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        model_name = os.path.join(current_dir, "..", "KR_SBERT_local")
+        model_name = DEFAULT_SBERT_MODEL_PATH
+        if not os.path.isdir(model_name):
+            raise FileNotFoundError(f"로컬 SBERT 모델을 찾을 수 없습니다: {model_name}")
+
+    return model_registry.get_or_load(("sbert", model_name), lambda: SentenceTransformer(model_name))
+
 
+def encode_texts(texts: List[str], model_name: str = None) -> np.ndarray:
+    """채점용 SBERT 모델 + 임베딩 캐시로 텍스트를 encode (정규화된 float32 행렬, 캐시에 있는 텍스트는 재사용)"""
+    cache = get_embedding_cache(model_name or DEFAULT_SBERT_MODEL_PATH)
+    return BatchedEncoder(get_sbert_model(model_name), texts, cache=cache).encode(texts)
+
+
+# STT 호출이 실패했을 때 transcript 자리에 넣는 문구 (채점 체크포인트에는 저장하지 않음)
+STT_FAILED_SCRIPT = "음성 인식 실패"
+
+
+def transcribe(audio, timeout: float = None) -> str:
+    """STT 변환 (실패하거나 제한 시간을 넘기거나 결과가 비어 있어도 기본 문구로 계속 진행)"""
     try:
-        script = wave_to_text.speech_to_text(wav_path)
+        script = wave_to_text.speech_to_text(audio, timeout=timeout)
 
         # STT 결과가 비어있으면 기본값 설정
         if not script or script.strip() == "":
             script = "음성 인식 결과 없음"
     except Exception as e:
         # STT 실패 시에도 기본값으로 계속 진행
-        script = "음성 인식 실패"
+        script = STT_FAILED_SCRIPT
+    return script
 
+
+SCRIPT_PRODUCERS = ("counts", "fillers", "near_dup", "semantic_1d")
+
+
+def extract_script_features(features_dict: dict, model_name: str = None, plan: FeaturePlan = None) -> dict:
+    """
+    STT + 음향 특징 dict에 스크립트 기반 / 의미론적 특징을 더한 dict 반환
+    plan(기본값: 모델 FEATURE_COLUMNS 기준)에 포함된 단계만 계산하고, SBERT가 필요 없으면 로드하지 않습니다.
+    SBERT 로드나 특징 계산에 실패하면 입력 dict를 그대로 반환합니다.
+    """
+    plan = plan or plan_features()
+    producers = [name for name in SCRIPT_PRODUCERS if plan.needs(name)]
+    if not producers:
+        return features_dict
+
+    # SBERT 모델은 레지스트리에서 재사용 (프로세스당 한 번만 로드), 임베딩은 모델별 캐시에서 재사용
     try:
-        acoustic_feats = extract_acoustic_features(wav_path)
+        model, cache = None, None
+        if plan.needs("sbert"):
+            model = get_sbert_model(model_name)
+            cache = get_embedding_cache(model_name or DEFAULT_SBERT_MODEL_PATH)
+        updated = extract_features_from_script(
+            features_dict, shared_model=model, producers=producers, embedding_cache=cache
+        )
+        if cache is not None:
+            logger.debug(f"[extract_script_features] 임베딩 캐시: {cache.stats()}")
+        return updated
     except Exception as e:
-        raise
+        traceback.print_exc()
+        return features_dict
 
-    # below stores integrated features
-    features_dict = {"script": script, **acoustic_feats}
 
-    # load SBERT model once
+def extract_all_features(
+    wav_path,
+    model_name: str = None,
+    include_script_features: bool = True,
+    columns: list = None,
+    stt_timeout: float = None,
+) -> dict:
+    """
+    WAV 파일에서 모델 입력 컬럼(columns, 기본값 FEATURE_COLUMNS)에 필요한 STT, 음향, 스크립트 기반,
+    의미론적 특징만 추출합니다 (feature_graph.plan_features로 필요한 producer만 실행).
+    음성은 AudioBuffer로 한 번만 디코딩하고, STT(Google API 왕복)와 음향 특징(pyworld/VAD)은
+    서로 독립이므로 같은 버퍼를 받아 stage_executor로 동시에 실행합니다.
+    두 결과를 합친 dict에 extract_features_from_script로 스크립트/의미론적 특징을 더합니다.
+
+    Args:
+        wav_path: WAV 파일 경로, 업로드 파일 객체(UploadedFile / BytesIO) 또는 AudioBuffer
+        model_name: SentenceTransformer 모델 경로. None이면 로컬 모델 사용. (프로세스당 한 번만 로드)
+        include_script_features: False면 STT + 음향 특징만 반환 (스크립트 특징은 호출 측에서 별도 단계로 계산)
+        columns: 모델 입력 컬럼. None이면 inference.FEATURE_COLUMNS
+        stt_timeout: STT 요청 제한 시간(초, 요청의 남은 시간 예산). None이면 클라이언트 기본값
+    """
+    if isinstance(wav_path, (str, os.PathLike)) and not os.path.exists(wav_path):
+        raise FileNotFoundError(f"WAV 파일을 찾을 수 없습니다: {wav_path}")
+
+    plan = plan_features(columns)
+    logger.info(f"[extract_all_features] 건너뛴 producer: {', '.join(plan.skipped) or '없음'}")
+
     try:
-        model = SentenceTransformer(model_name)
-        script_feats = extract_features_from_script(features_dict, shared_model=model)
+        run = run_stages(
+            [
+                Stage("decode", lambda r: AudioBuffer.from_source(wav_path)),
+                Stage("stt", lambda r: transcribe(r["decode"], timeout=stt_timeout), deps=("decode",)),
+                Stage(
+                    "acoustic",
+                    lambda r: extract_acoustic_features(r["decode"], include_f0=plan.needs("f0")),
+                    deps=("decode",),
+                ),
+            ]
+        )
+    except StageError as e:
+        raise e.error
 
-    except Exception as e:
-        traceback.print_exc()
-        # 기본값으로 빈 딕셔너리 반환
-        script_feats = {}
+    # below stores integrated features
+    features_dict = {"script": run.results["stt"], **run.results["acoustic"]}
+
+    if include_script_features:
+        start = time.perf_counter()
+        features_dict = extract_script_features(features_dict, model_name, plan=plan)
+        run.timings["script_features"] = {"start": run.total_seconds, "seconds": time.perf_counter() - start}
+        run.total_seconds += run.timings["script_features"]["seconds"]
 
+    logger.info(f"[extract_all_features] 단계별 소요 시간: {run.format_timings()}")
     return features_dict
 
 
@@ -21,9 +21,14 @@ import json
 import os
 import re
 import unicodedata
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Set, Tuple, Union
+import weakref
+from collections import Counter
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Collection, Dict, FrozenSet, List, Optional, Set, Tuple, Union
 
 import numpy as np
+from scipy.sparse import coo_matrix
+from scipy.sparse.csgraph import connected_components
 
 if TYPE_CHECKING:
     from sentence_transformers import SentenceTransformer
@@ -115,35 +120,92 @@ FILLER_MULTI = {
 }
 
 
+class FillerMatcher:
+    """
+    미리 컴파일해 둔 필러 매처 (답변마다 lexicon 전체를 difflib로 훑지 않도록)
+
+    - 단일 필러: 길이별 lexicon 인덱스 + 글자 교집합 상한으로 후보를 거른 뒤, 남은 후보만
+      difflib.SequenceMatcher.ratio()로 확인 → 기존 전수 비교와 같은 판정
+        * ratio = 2M / (len(a) + len(b)), M(일치 글자 수) <= min(len) 및 글자 multiset 교집합 크기
+    - 토큰별 판정 결과는 memo에 저장 (같은 토큰이 여러 답변에 반복해서 나옴)
+    - 다중어 필러: FILLER_MULTI 전체를 하나의 정규식 alternation으로 컴파일
+    """
+
+    MEMO_MAX = 100_000
+
+    def __init__(self, base: Collection[str], multi: Collection[str], ratio_thr: float = 0.86):
+        self.base = frozenset(base)
+        self.ratio_thr = ratio_thr
+        self._by_len: Dict[int, List[Tuple[str, Counter]]] = {}
+        for w in sorted(self.base):
+            self._by_len.setdefault(len(w), []).append((w, Counter(w)))
+        self._memo: Dict[str, bool] = {}
+
+        # 긴 구절을 먼저 두어 같은 위치에서 더 긴 필러가 우선 매칭되도록 함
+        phrases = sorted(set(multi), key=lambda p: (-len(p), p))
+        alts = [r"\s*".join(map(re.escape, p.split())) for p in phrases]
+        self._multi_re = re.compile(r"\b(?:" + "|".join(alts) + r")\b") if alts else None
+
+    def _fuzzy_match(self, tok: str) -> bool:
+        la = len(tok)
+        tok_chars = None
+        for lb, entries in self._by_len.items():
+            if 2.0 * min(la, lb) / (la + lb) < self.ratio_thr:
+                continue
+            if tok_chars is None:
+                tok_chars = Counter(tok)
+            for w, w_chars in entries:
+                common = sum((tok_chars & w_chars).values())
+                if 2.0 * common / (la + lb) < self.ratio_thr:
+                    continue
+                if difflib.SequenceMatcher(None, tok, w).ratio() >= self.ratio_thr:
+                    return True
+        return False
+
+    def is_filler(self, tok: str) -> bool:
+        hit = self._memo.get(tok)
+        if hit is None:
+            hit = tok in self.base or self._fuzzy_match(tok)
+            if len(self._memo) >= self.MEMO_MAX:
+                self._memo.clear()
+            self._memo[tok] = hit
+        return hit
+
+    def count_multi(self, text: str) -> int:
+        if self._multi_re is None:
+            return 0
+        return sum(1 for _ in self._multi_re.finditer(normalize_text_basic(text)))
+
+
+@lru_cache(maxsize=16)
+def _filler_matcher(base: FrozenSet[str], multi: FrozenSet[str], ratio_thr: float) -> FillerMatcher:
+    return FillerMatcher(base, multi, ratio_thr)
+
+
+def get_filler_matcher(
+    base: Collection[str] = FILLER_BASE, multi: Collection[str] = FILLER_MULTI, ratio_thr: float = 0.86
+) -> FillerMatcher:
+    """lexicon/임계값 조합별로 한 번만 만든 FillerMatcher 반환"""
+    return _filler_matcher(frozenset(base), frozenset(multi), ratio_thr)
+
+
 def fuzzy_in_lexicon(tok: str, lex: set, ratio_thr: float = 0.86) -> bool:
-    for w in lex:
-        if difflib.SequenceMatcher(None, tok, w).ratio() >= ratio_thr:
-            return True
-    return False
+    return get_filler_matcher(lex, (), ratio_thr).is_filler(tok)
 
 
 def find_multiword_fillers(text: str, multi: set) -> int:
-    norm = normalize_text_basic(text)
-    count = 0
-    for phrase in multi:
-        # "그 뭐지" → r"\b그\s*뭐지\b" (공백 유연 매칭)
-        pat = r"\b" + r"\s*".join(map(re.escape, phrase.split())) + r"\b"
-        count += len(re.findall(pat, norm))
-    return count
+    # "그 뭐지" → r"\b그\s*뭐지\b" (공백 유연 매칭), 전체 구절을 하나의 alternation으로 탐색
+    return get_filler_matcher((), multi).count_multi(text)
 
 
 def rule_fuzzy_fillers(
     text: str, base: set = FILLER_BASE, multi: set = FILLER_MULTI, token_ratio_thr: float = 0.86
 ) -> Dict[str, int]:
-    norm = normalize_text_basic(text)
-    toks = tokenize_ko(norm)
+    matcher = get_filler_matcher(base, multi, token_ratio_thr)
+    toks = tokenize_ko(normalize_text_basic(text))
 
-    single_cnt = 0
-    for tk in toks:
-        if tk in base or fuzzy_in_lexicon(tk, base, ratio_thr=token_ratio_thr):
-            single_cnt += 1
-
-    multi_cnt = find_multiword_fillers(text, multi)  # 원문으로 탐색
+    single_cnt = sum(1 for tk in toks if matcher.is_filler(tk))
+    multi_cnt = matcher.count_multi(text)  # 원문으로 탐색
     return {"filler_single_cnt": single_cnt, "filler_multi_cnt": multi_cnt, "filler_words_cnt": single_cnt + multi_cnt}
 
 
@@ -173,26 +235,52 @@ def sbert_helper_load(model_name: str) -> Optional[SentenceTransformer]:
         return None
 
 
-def embeddings_boost_count(
-    text: str, model: Optional[SentenceTransformer], seeds: List[str], emb_thr: float = 0.78, ngram_max: int = 2
-) -> int:
-    if model is None:
-        return 0
-    norm = normalize_text_basic(text)
-    toks = tokenize_ko(norm)
-
+def _filler_candidate_spans(text: str, ngram_max: int = 2) -> List[str]:
+    """필러 임베딩 보조에서 seed와 비교할 1~ngram_max 어절 구절 (2~8글자)"""
+    toks = tokenize_ko(normalize_text_basic(text))
     spans = []
     for n in range(1, ngram_max + 1):
         for i in range(len(toks) - n + 1):
             s = " ".join(toks[i : i + n])
             if 2 <= len(s) <= 8:
                 spans.append(s)
-    if not spans:
-        return 0
+    return spans
+
 
+def _seed_prototype(model, seeds: List[str]) -> np.ndarray:
     seed_embs = model.encode(seeds, normalize_embeddings=True)
     proto = np.mean(seed_embs, axis=0)
-    proto /= np.linalg.norm(proto) + 1e-12
+    return proto / (np.linalg.norm(proto) + 1e-12)
+
+
+_SEED_PROTOTYPES = weakref.WeakKeyDictionary()  # 모델 -> DEFAULT_SEED_PHRASES 프로토타입
+
+
+def filler_seed_prototype(model: SentenceTransformer) -> np.ndarray:
+    """DEFAULT_SEED_PHRASES 프로토타입 (모델 객체당 한 번만 계산, 모델이 해제되면 같이 제거)"""
+    proto = _SEED_PROTOTYPES.get(model)
+    if proto is None:
+        proto = _seed_prototype(model, DEFAULT_SEED_PHRASES)
+        _SEED_PROTOTYPES[model] = proto
+    return proto
+
+
+def embeddings_boost_count(
+    text: str,
+    model: Optional[SentenceTransformer],
+    seeds: List[str],
+    emb_thr: float = 0.78,
+    ngram_max: int = 2,
+    proto: Optional[np.ndarray] = None,
+) -> int:
+    if model is None:
+        return 0
+    spans = _filler_candidate_spans(text, ngram_max)
+    if not spans:
+        return 0
+
+    if proto is None:
+        proto = _seed_prototype(model, seeds)
 
     span_embs = model.encode(spans, normalize_embeddings=True)
     span_embs = np.asarray(span_embs, dtype=np.float32)
@@ -200,6 +288,53 @@ def embeddings_boost_count(
     return int(np.sum(sims >= emb_thr))
 
 
+class BatchedEncoder:
+    """
+    한 transcript에 필요한 텍스트(필러 seed/구절, near-dup 구절, 문장)를 모아 한 번에 encode하는 SBERT 래퍼
+
+    - 중복 텍스트는 한 번만 encode, 길이순으로 정렬해서 배치 내 padding 최소화
+    - 각 특징 함수에는 model 대신 이 객체를 넘기면 encode()가 미리 계산한 임베딩 행렬에서 행을 꺼내 반환
+    - 미리 모으지 않은 텍스트가 들어오면 원래 모델로 encode (결과는 동일, 배치만 추가)
+    - cache(get_many/put_many, 예: embedding_cache.EmbeddingCache)를 주면 캐시에 없는 텍스트만 encode
+    """
+
+    def __init__(self, model: SentenceTransformer, texts: List[str], batch_size: int = 32, cache=None):
+        self.model = model
+        unique = sorted(dict.fromkeys(texts), key=len)
+        self.index = {t: i for i, t in enumerate(unique)}
+        self.n_requested = len(texts)
+        self.n_unique = len(unique)
+
+        cached = cache.get_many(unique) if cache is not None and unique else {}
+        missing = [t for t in unique if t not in cached]
+        self.n_encoded = len(missing)
+        encoded = (
+            np.asarray(model.encode(missing, batch_size=batch_size, normalize_embeddings=True), dtype=np.float32)
+            if missing
+            else None
+        )
+        if encoded is not None and cache is not None:
+            cache.put_many(missing, encoded)
+
+        if not unique:
+            self.matrix = np.zeros((0, 0), dtype=np.float32)
+        elif not cached:
+            self.matrix = encoded
+        else:
+            dim = encoded.shape[1] if encoded is not None else len(next(iter(cached.values())))
+            self.matrix = np.empty((len(unique), dim), dtype=np.float32)
+            for t, vec in cached.items():
+                self.matrix[self.index[t]] = vec
+            for t, vec in zip(missing, encoded if encoded is not None else []):
+                self.matrix[self.index[t]] = vec
+
+    def encode(self, texts, **kwargs) -> np.ndarray:
+        texts = [texts] if isinstance(texts, str) else list(texts)
+        if any(t not in self.index for t in texts):
+            return np.asarray(self.model.encode(texts, normalize_embeddings=True), dtype=np.float32)
+        return self.matrix[[self.index[t] for t in texts]]
+
+
 # =========================================================
 # (B) 의미 근접 중복(near-dup) — SBERT 임베딩 + 클러스터(k-1)
 # =========================================================
@@ -221,29 +356,6 @@ _STOP_NEARDUP_DEFAULT: Set[str] = {
 }
 
 
-class _DSU:
-    def __init__(self, n: int):
-        self.p = list(range(n))
-        self.r = [0] * n
-
-    def find(self, x: int) -> int:
-        while self.p[x] != x:
-            self.p[x] = self.p[self.p[x]]
-            x = self.p[x]
-        return x
-
-    def union(self, a: int, b: int) -> bool:
-        pa, pb = self.find(a), self.find(b)
-        if pa == pb:
-            return False
-        if self.r[pa] < self.r[pb]:
-            pa, pb = pb, pa
-        self.p[pb] = pa
-        if self.r[pa] == self.r[pb]:
-            self.r[pa] += 1
-        return True
-
-
 def _make_spans(
     tokens: List[str], n_min: int = 1, n_max: int = 2, min_char_len: int = 2, skip_words: Set[str] = None
 ) -> List[Tuple[str, Tuple[int, int]]]:
@@ -283,39 +395,41 @@ def semantic_near_dup_count(
     embs = np.asarray(embs, dtype=np.float32)
 
     n = len(spans)
-    dsu = _DSU(n)
-    kept_pairs = []
-
-    for i in range(n):
-        j_end = min(i + 1 + window, n)
-        for j in range(i + 1, j_end):
-            (li, ri), (lj, rj) = spans[i][1], spans[j][1]
-            # 겹치는 구간은 제외 (완전/부분 포함 모두)
-            if lj < ri and li < rj:
-                continue
-            sim = float((embs[i] * embs[j]).sum())  # cosine (정규화 가정)
-            if sim >= thr:
-                dsu.union(i, j)
-                if return_pairs:
-                    kept_pairs.append(
-                        {
-                            "i": i,
-                            "j": j,
-                            "span_i": (spans[i][0], spans[i][1]),
-                            "span_j": (spans[j][0], spans[j][1]),
-                            "sim": round(sim, 3),
-                        }
-                    )
-
-    comp_size: Dict[int, int] = {}
-    for i in range(n):
-        root = dsu.find(i)
-        comp_size[root] = comp_size.get(root, 0) + 1
-
-    events = sum(max(0, sz - 1) for sz in comp_size.values())
-    out = {"sem_near_dup_cnt": int(events)}
+    bounds = np.array([b for _, b in spans], dtype=np.int64).reshape(n, 2)
+    starts, ends = bounds[:, 0], bounds[:, 1]
+
+    # 띠(band) 유사도: offset k(1..window)마다 (i, i+k) 쌍의 cosine을 한 번에 계산
+    rows, cols, sims = [], [], []
+    for k in range(1, min(window, n - 1) + 1):
+        sim_k = np.sum(embs[:-k] * embs[k:], axis=1)  # cosine (정규화 가정)
+        # 겹치는 구간은 제외 (완전/부분 포함 모두)
+        overlap = (starts[k:] < ends[:-k]) & (starts[:-k] < ends[k:])
+        idx = np.nonzero(~overlap & (sim_k >= thr))[0]
+        rows.append(idx)
+        cols.append(idx + k)
+        sims.append(sim_k[idx])
+
+    i_idx = np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+    j_idx = np.concatenate(cols) if cols else np.empty(0, dtype=np.int64)
+
+    # 임계값 이상 쌍으로 만든 희소 그래프의 연결 요소 -> 요소마다 (크기 - 1)개 중복
+    graph = coo_matrix((np.ones(len(i_idx), dtype=np.int8), (i_idx, j_idx)), shape=(n, n))
+    n_components, _ = connected_components(graph, directed=False)
+    out = {"sem_near_dup_cnt": int(n - n_components)}
+
     if return_pairs:
-        out["sem_near_dup_pairs"] = kept_pairs
+        sim_all = np.concatenate(sims) if sims else np.empty(0, dtype=np.float32)
+        order = np.lexsort((j_idx, i_idx))
+        out["sem_near_dup_pairs"] = [
+            {
+                "i": int(i_idx[o]),
+                "j": int(j_idx[o]),
+                "span_i": (spans[i_idx[o]][0], spans[i_idx[o]][1]),
+                "span_j": (spans[j_idx[o]][0], spans[j_idx[o]][1]),
+                "sim": round(float(sim_all[o]), 3),
+            }
+            for o in order
+        ]
         out["spans"] = spans
     return out
 
@@ -486,8 +600,16 @@ def extract_features_from_script(
     sem_low_thr: float = 0.50,
     # 옵션: 미리 로드한 모델 주입
     shared_model: Optional[SentenceTransformer] = None,
+    # 옵션: 계산할 producer 이름 (None이면 전부, feature_graph.plan_features 참고)
+    producers: Optional[Collection[str]] = None,
+    # 옵션: 임베딩 캐시 (get_many/put_many, 예: embedding_cache.EmbeddingCache)
+    embedding_cache=None,
 ) -> dict:
-    """파일 I/O 없이 data(dict)를 직접 갱신해서 (updated_data, summary) 반환"""
+    """
+    파일 I/O 없이 data(dict)를 직접 갱신해서 (updated_data, summary) 반환
+
+    producers를 주면 해당 단계만 계산합니다 ("counts", "fillers", "near_dup", "semantic_1d").
+    """
     if not isinstance(data, dict):
         raise TypeError("data must be a dict")
 
@@ -500,81 +622,98 @@ def extract_features_from_script(
     if not isinstance(total_length, (int, float)) or total_length <= 0:
         raise ValueError("'total_length' not found or invalid in provided dict")
 
-    # --- 기본 카운트(음절/단어/문장)
-    syllable_cnt = count_syllables_ko(script)
-    word_cnt_calc = count_words_ko(script)
-    sentence_cnt = count_sentences_ko(script)
-    updated["syllable_cnt"] = int(syllable_cnt)
-    updated["word_cnt"] = int(word_cnt_calc)
-    updated["sentence_cnt"] = int(sentence_cnt)
-
-    # 파생 카운트
-    updated["voc_speed"] = float(syllable_cnt) / float(total_length)
-    updated["word_speed"] = float(word_cnt_calc) / float(total_length)
-    updated["avg_word_len"] = float(syllable_cnt) / float(word_cnt_calc) if word_cnt_calc > 0 else 0.0
-    updated["avg_sentence_len"] = float(word_cnt_calc) / float(sentence_cnt) if sentence_cnt > 0 else 0.0
+    def wanted(name):
+        return producers is None or name in producers
 
-    # (1) 필러
-    rule_counts = rule_fuzzy_fillers(script, token_ratio_thr=token_ratio_thr)
-    embed_model = None
-    if use_embeddings:
-        embed_model = shared_model if shared_model is not None else sbert_helper_load(embed_model_name)
-        if embed_model is None:
-            print("[WARN] SBERT load failed; disable embedding-based boosters.")
-            use_embeddings = False
-
-    filler_extra = (
-        embeddings_boost_count(script, embed_model, DEFAULT_SEED_PHRASES, emb_thr=emb_thr) if use_embeddings else 0
-    )
-    filler_total = rule_counts["filler_words_cnt"] + filler_extra
+    # --- 기본 카운트(음절/단어/문장)
+    if wanted("counts"):
+        syllable_cnt = count_syllables_ko(script)
+        word_cnt_calc = count_words_ko(script)
+        sentence_cnt = count_sentences_ko(script)
+        updated["syllable_cnt"] = int(syllable_cnt)
+        updated["word_cnt"] = int(word_cnt_calc)
+        updated["sentence_cnt"] = int(sentence_cnt)
+
+        # 파생 카운트
+        updated["voc_speed"] = float(syllable_cnt) / float(total_length)
+        updated["word_speed"] = float(word_cnt_calc) / float(total_length)
+        updated["avg_word_len"] = float(syllable_cnt) / float(word_cnt_calc) if word_cnt_calc > 0 else 0.0
+        updated["avg_sentence_len"] = float(word_cnt_calc) / float(sentence_cnt) if sentence_cnt > 0 else 0.0
 
     def put(k, v):
         updated[(prefix + k) if prefix else k] = v
 
-    put("filler_words_cnt", int(filler_total))
-    put("filler_single_cnt", int(rule_counts["filler_single_cnt"]))
-    put("filler_multi_cnt", int(rule_counts["filler_multi_cnt"]))
-    if use_embeddings:
-        put("filler_embed_boost_cnt", int(filler_extra))
+    # SBERT 모델: 필러 임베딩 보조 / near-dup / semantic 1D가 같은 모델을 공유
+    use_embeddings = use_embeddings and wanted("fillers")
+    sbert = None
+    if use_embeddings or wanted("near_dup") or wanted("semantic_1d"):
+        sbert = shared_model if shared_model is not None else sbert_helper_load(embed_model_name)
+    if use_embeddings and sbert is None:
+        print("[WARN] SBERT load failed; disable embedding-based boosters.")
+        use_embeddings = False
+
+    # 세 단계에서 encode할 텍스트를 미리 모아 한 번에 encode
+    neardup_skip = _STOP_NEARDUP_DEFAULT if neardup_skip_fillers else set()
+    encoder = None
+    if sbert is not None:
+        texts: List[str] = []
+        if use_embeddings:
+            texts += _filler_candidate_spans(script)
+        if wanted("near_dup"):
+            spans = _make_spans(
+                tokenize_ko(script), 1, neardup_ngram_max, min_char_len=neardup_min_char_len, skip_words=neardup_skip
+            )
+            texts += [span for span, _ in spans]
+        if wanted("semantic_1d"):
+            sents = _split_sentences_ko(script)
+            if len(sents) > 1:
+                texts += sents
+        encoder = BatchedEncoder(sbert, texts, cache=embedding_cache)
 
-    # (2) near-dup
-    neardup_model = embed_model if embed_model is not None else shared_model
-    if neardup_model is None and SentenceTransformer is not None:
-        try:
-            neardup_model = SentenceTransformer(embed_model_name)
-        except Exception:
-            neardup_model = None
-
-    nd = semantic_near_dup_count(
-        script,
-        model=neardup_model,
-        thr=neardup_thr,
-        window=neardup_window,
-        ngram_max=neardup_ngram_max,
-        return_pairs=store_pairs,
-        min_char_len=neardup_min_char_len,
-        skip_words=(_STOP_NEARDUP_DEFAULT if neardup_skip_fillers else set()),
-    )
-    put("repeat_cnt", int(nd["sem_near_dup_cnt"]))
-    if store_pairs and "sem_near_dup_pairs" in nd:
-        put("near_dup_pairs", nd["sem_near_dup_pairs"])
+    # (1) 필러
+    if wanted("fillers"):
+        rule_counts = rule_fuzzy_fillers(script, token_ratio_thr=token_ratio_thr)
+        filler_extra = (
+            embeddings_boost_count(
+                script, encoder, DEFAULT_SEED_PHRASES, emb_thr=emb_thr, proto=filler_seed_prototype(sbert)
+            )
+            if use_embeddings
+            else 0
+        )
+        filler_total = rule_counts["filler_words_cnt"] + filler_extra
 
-    # (3) semantic 1D
+        put("filler_words_cnt", int(filler_total))
+        put("filler_single_cnt", int(rule_counts["filler_single_cnt"]))
+        put("filler_multi_cnt", int(rule_counts["filler_multi_cnt"]))
+        if use_embeddings:
+            put("filler_embed_boost_cnt", int(filler_extra))
 
-    sem_model = neardup_model if neardup_model is not None else shared_model
-    if sem_model is None and SentenceTransformer is not None:
-        try:
-            sem_model = SentenceTransformer(embed_model_name)
-        except Exception:
-            sem_model = None
-    if sem_model is not None:
-        sem_feats = _semantic_1d_features_from_script(
-            script_text=script, model=sem_model, high_thr=sem_high_thr, low_thr=sem_low_thr
+    # (2) near-dup
+    if wanted("near_dup"):
+        nd = semantic_near_dup_count(
+            script,
+            model=encoder,
+            thr=neardup_thr,
+            window=neardup_window,
+            ngram_max=neardup_ngram_max,
+            return_pairs=store_pairs,
+            min_char_len=neardup_min_char_len,
+            skip_words=neardup_skip,
         )
-        for k, v in sem_feats.items():
-            put(k, v)
-    else:
-        print("[WARN] semantic 1D skipped: SentenceTransformer not available")
+        put("repeat_cnt", int(nd["sem_near_dup_cnt"]))
+        if store_pairs and "sem_near_dup_pairs" in nd:
+            put("near_dup_pairs", nd["sem_near_dup_pairs"])
+
+    # (3) semantic 1D
+    if wanted("semantic_1d"):
+        if encoder is not None:
+            sem_feats = _semantic_1d_features_from_script(
+                script_text=script, model=encoder, high_thr=sem_high_thr, low_thr=sem_low_thr
+            )
+            for k, v in sem_feats.items():
+                put(k, v)
+        else:
+            print("[WARN] semantic 1D skipped: SentenceTransformer not available")
 
     return updated
 
@@ -0,0 +1,152 @@
+"""
+선언형 특징(feature) 그래프
+
+각 producer(특징 계산 단계)가 어떤 입력을 받아 어떤 특징 key를 만드는지 선언해 두고,
+모델이 실제로 사용하는 컬럼(inference.FEATURE_COLUMNS)에 필요한 producer만 골라 실행합니다.
+계산만 하고 버려지는 비싼 작업(SBERT 로드/encode, pyworld f0 등)이 생기지 않도록 하는 것이 목적입니다.
+
+- plan_features(columns): 필요한 producer(실행 순서) / 건너뛴 producer를 담은 FeaturePlan 반환
+- 모델 컬럼 -> 원본 특징 key 변환(*_ratio 등)은 inference.required_feature_keys 사용
+"""
+
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+
+from ..inference import FEATURE_COLUMNS, required_feature_keys
+
+# 모델 입력과 관계없이 서비스가 항상 사용하는 값 (LLM에 넘기는 transcript, 답변 시작 시각 계산용 음성 길이)
+BASE_KEYS = ("script", "total_length")
+
+
+@dataclass(frozen=True)
+class FeatureProducer:
+    """
+    name: producer 이름
+    inputs: 필요한 key (다른 producer의 출력이거나, 호출 측이 넣어주는 외부 입력)
+    outputs: 만들어내는 key
+    expensive: 모델 로드 / 외부 API / 무거운 신호 처리 여부 (건너뛴 producer 보고용)
+    """
+
+    name: str
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+    expensive: bool = False
+
+
+# 선언 순서 = 실행 가능한 순서 (입력을 만드는 producer가 항상 먼저 선언됨)
+PRODUCERS: Tuple[FeatureProducer, ...] = (
+    FeatureProducer("decode", inputs=("audio_source",), outputs=("audio",)),
+    FeatureProducer("stt", inputs=("audio",), outputs=("script",), expensive=True),
+    FeatureProducer(
+        "silence",
+        inputs=("audio",),
+        outputs=(
+            "sr",
+            "total_length",
+            "total_silence_sec",
+            "percent_silence",
+            "pause_0_5_cnt",
+            "pause_1_cnt",
+            "pause_2_cnt",
+        ),
+    ),
+    FeatureProducer(
+        "f0",
+        inputs=("audio",),
+        outputs=(
+            "min_f0_hz",
+            "max_f0_hz",
+            "range_f0_hz",
+            "tot_slope_f0_st_per_s",
+            "end_slope_f0_st_per_s",
+            "n_f0_used",
+        ),
+        expensive=True,
+    ),
+    FeatureProducer(
+        "counts",
+        inputs=("script", "total_length"),
+        outputs=(
+            "syllable_cnt",
+            "word_cnt",
+            "sentence_cnt",
+            "voc_speed",
+            "word_speed",
+            "avg_word_len",
+            "avg_sentence_len",
+        ),
+    ),
+    FeatureProducer(
+        "fillers", inputs=("script",), outputs=("filler_words_cnt", "filler_single_cnt", "filler_multi_cnt")
+    ),
+    FeatureProducer("sbert", inputs=(), outputs=("sbert_model",), expensive=True),
+    FeatureProducer(
+        "filler_embed_boost", inputs=("script", "sbert_model"), outputs=("filler_embed_boost_cnt",), expensive=True
+    ),
+    FeatureProducer("near_dup", inputs=("script", "sbert_model"), outputs=("repeat_cnt",), expensive=True),
+    FeatureProducer(
+        "semantic_1d",
+        inputs=("script", "sbert_model"),
+        outputs=(
+            "adj_sim_mean",
+            "adj_sim_std",
+            "adj_sim_p10",
+            "adj_sim_p50",
+            "adj_sim_p90",
+            "adj_sim_frac_high",
+            "adj_sim_frac_low",
+            "topic_path_len",
+            "dist_to_centroid_mean",
+            "dist_to_centroid_std",
+            "coherence_score",
+            "intra_coh",
+            "inter_div",
+        ),
+        expensive=True,
+    ),
+)
+
+_PRODUCER_BY_OUTPUT = {key: p for p in PRODUCERS for key in p.outputs}
+
+
+@dataclass(frozen=True)
+class FeaturePlan:
+    targets: Tuple[str, ...]
+    producers: Tuple[str, ...]  # 실행할 producer (실행 순서)
+    skipped: Tuple[str, ...]  # 필요 없어서 건너뛴 producer
+
+    def needs(self, name: str) -> bool:
+        return name in self.producers
+
+    def skipped_expensive(self) -> List[str]:
+        expensive = {p.name for p in PRODUCERS if p.expensive}
+        return [name for name in self.skipped if name in expensive]
+
+
+def plan_features(columns: Optional[Iterable[str]] = None, extra: Iterable[str] = BASE_KEYS) -> FeaturePlan:
+    """
+    모델 컬럼(columns, 기본값 FEATURE_COLUMNS)과 extra key를 만드는 데 필요한 producer만 선택
+
+    어떤 producer도 만들지 않는 key가 있으면 ValueError (모델 컬럼 이름이 바뀌었는데 그래프를 갱신하지 않은 경우)
+    """
+    columns = FEATURE_COLUMNS if columns is None else list(columns)
+    targets = tuple(dict.fromkeys([*required_feature_keys(columns), *extra]))
+
+    needed = set()
+    pending = list(targets)
+    while pending:
+        key = pending.pop()
+        producer = _PRODUCER_BY_OUTPUT.get(key)
+        if producer is None:
+            if key == "audio_source":  # 호출 측이 넣어주는 외부 입력
+                continue
+            raise ValueError(f"'{key}' 특징을 만드는 producer가 없습니다.")
+        if producer.name not in needed:
+            needed.add(producer.name)
+            pending.extend(producer.inputs)
+
+    return FeaturePlan(
+        targets=targets,
+        producers=tuple(p.name for p in PRODUCERS if p.name in needed),
+        skipped=tuple(p.name for p in PRODUCERS if p.name not in needed),
+    )
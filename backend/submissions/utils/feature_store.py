@@ -0,0 +1,118 @@
+"""
+답안별 특징 저장소 (AnswerFeatures)
+
+채점 때 계산한 특징을 float32 벡터로 저장해 두고, 새 모델로 재채점할 때
+STT / 음향 분석 없이 바로 모델 입력 행렬을 만듭니다.
+
+- FEATURE_SCHEMAS: schema_version -> 벡터 열 순서 (열을 바꾸면 새 버전을 추가하고 기존 버전은 그대로 둠)
+- save_answer_features: 특징 dict -> AnswerFeatures (update_or_create)
+- decode_matrix: 같은 버전 벡터 여러 개 -> (n, 열 수) float32 행렬
+- model_input_matrix: AnswerFeatures 목록 -> FEATURE_COLUMNS 순서 모델 입력 행렬
+"""
+
+import math
+from collections import defaultdict
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+from ..models import AnswerFeatures
+from .inference import FEATURE_COLUMNS, feature_matrix_from_raw
+
+# feature_graph의 숫자형 특징 전체 (모델이 쓰지 않아 계산하지 않은 특징은 NaN으로 저장)
+FEATURE_SCHEMAS: Dict[int, Sequence[str]] = {
+    1: (
+        "sr",
+        "total_length",
+        "total_silence_sec",
+        "percent_silence",
+        "pause_0_5_cnt",
+        "pause_1_cnt",
+        "pause_2_cnt",
+        "min_f0_hz",
+        "max_f0_hz",
+        "range_f0_hz",
+        "tot_slope_f0_st_per_s",
+        "end_slope_f0_st_per_s",
+        "n_f0_used",
+        "syllable_cnt",
+        "word_cnt",
+        "sentence_cnt",
+        "voc_speed",
+        "word_speed",
+        "avg_word_len",
+        "avg_sentence_len",
+        "filler_words_cnt",
+        "filler_single_cnt",
+        "filler_multi_cnt",
+        "filler_embed_boost_cnt",
+        "repeat_cnt",
+        "adj_sim_mean",
+        "adj_sim_std",
+        "adj_sim_p10",
+        "adj_sim_p50",
+        "adj_sim_p90",
+        "adj_sim_frac_high",
+        "adj_sim_frac_low",
+        "topic_path_len",
+        "dist_to_centroid_mean",
+        "dist_to_centroid_std",
+        "coherence_score",
+        "intra_coh",
+        "inter_div",
+    ),
+}
+FEATURE_SCHEMA_VERSION = max(FEATURE_SCHEMAS)
+
+_DTYPE = np.dtype("<f4")
+
+
+def _as_float(value) -> float:
+    try:
+        return float(value) if value is not None else math.nan
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def encode_features(features: dict, schema_version: int = FEATURE_SCHEMA_VERSION) -> bytes:
+    """특징 dict -> schema 순서의 float32 바이트열 (누락 / 숫자가 아닌 값은 NaN)"""
+    keys = FEATURE_SCHEMAS[schema_version]
+    return np.array([_as_float(features.get(key)) for key in keys], dtype=_DTYPE).tobytes()
+
+
+def decode_matrix(vectors: List[bytes], schema_version: int) -> np.ndarray:
+    """같은 schema_version으로 저장된 벡터들을 (n, 열 수) float32 행렬로 변환"""
+    keys = FEATURE_SCHEMAS.get(schema_version)
+    if keys is None:
+        raise ValueError(f"알 수 없는 특징 schema_version입니다: {schema_version}")
+    matrix = np.frombuffer(b"".join(bytes(v) for v in vectors), dtype=_DTYPE)
+    return matrix.reshape(len(vectors), len(keys))
+
+
+def decode_features(row: AnswerFeatures) -> dict:
+    """저장된 벡터 하나를 {특징 key: 값} dict로 변환 (NaN은 None)"""
+    values = decode_matrix([row.vector], row.schema_version)[0]
+    keys = FEATURE_SCHEMAS[row.schema_version]
+    return {key: None if np.isnan(v) else float(v) for key, v in zip(keys, values)}
+
+
+def save_answer_features(answer, features: dict) -> AnswerFeatures:
+    """채점 때 계산한 특징을 현재 schema로 저장 (재제출 시 덮어씀)"""
+    row, _ = AnswerFeatures.objects.update_or_create(
+        answer=answer,
+        defaults={"schema_version": FEATURE_SCHEMA_VERSION, "vector": encode_features(features)},
+    )
+    return row
+
+
+def model_input_matrix(rows: List[AnswerFeatures]) -> np.ndarray:
+    """AnswerFeatures 목록 -> 모델 입력 행렬 (FEATURE_COLUMNS 순서, 행 순서 = rows 순서)"""
+    by_version = defaultdict(list)
+    for i, row in enumerate(rows):
+        by_version[row.schema_version].append(i)
+
+    X = np.empty((len(rows), len(FEATURE_COLUMNS)), dtype=np.float32)
+    for version, idx in by_version.items():
+        raw = decode_matrix([rows[i].vector for i in idx], version)
+        X[idx] = feature_matrix_from_raw(raw, FEATURE_SCHEMAS[version])
+    return X
@@ -0,0 +1,146 @@
+"""
+음성 답안 채점 체크포인트 (GradingCheckpoint)
+
+추론 / 꼬리 질문 생성이 실패하면 Answer가 삭제되어 학생이 다시 제출해야 하는데, 같은 음성이라도
+STT / VAD / F0 / SBERT를 처음부터 다시 계산하지 않도록 성공한 단계의 결과를 (문제, 학생, 음성 sha256)별로 저장합니다.
+같은 음성을 다시 제출하면 저장된 단계는 건너뛰고 마지막으로 성공한 단계 다음부터 채점합니다.
+
+- audio_content_hash(audio): 업로드 파일 / 파일 객체 / 경로의 sha256 (AudioBuffer 등 원본 바이트가 없으면 None)
+- load_checkpoint: 만료(GRADING_CHECKPOINT_TTL_SECONDS)되지 않은 체크포인트 (없으면 None)
+- save_checkpoint: 성공한 단계 결과 저장 (update_or_create, numpy 값 / NaN은 JSON으로 바꿔 저장)
+- clear_checkpoint: 채점이 끝난 뒤 삭제
+- call_with_retry: 실패한 단계를 지수 백오프로 재시도 (GRADING_STAGE_MAX_ATTEMPTS / GRADING_STAGE_RETRY_BACKOFF)
+
+DB 저장 / 조회는 요청 스레드에서만 호출합니다 (단계 스레드에서 끝난 결과는 StageError.results로 전달받음).
+"""
+
+import hashlib
+import logging
+import math
+import os
+import time
+from datetime import timedelta
+from typing import Callable, Optional, TypeVar
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+
+from ..models import GradingCheckpoint
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_HASH_BLOCK_SIZE = 1 << 20
+
+
+def audio_content_hash(audio) -> Optional[str]:
+    """음성 원본 바이트의 sha256 hex (읽은 뒤 파일 위치는 처음으로 되돌림)"""
+    digest = hashlib.sha256()
+    if isinstance(audio, (str, os.PathLike)):
+        with open(audio, "rb") as f:
+            for block in iter(lambda: f.read(_HASH_BLOCK_SIZE), b""):
+                digest.update(block)
+        return digest.hexdigest()
+
+    if hasattr(audio, "chunks"):
+        # Django UploadedFile (큰 파일은 임시 파일에 있으므로 한 번에 읽지 않음)
+        for chunk in audio.chunks():
+            digest.update(chunk)
+        audio.seek(0)
+        return digest.hexdigest()
+
+    if hasattr(audio, "read") and hasattr(audio, "seek"):
+        audio.seek(0)
+        for block in iter(lambda: audio.read(_HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+        audio.seek(0)
+        return digest.hexdigest()
+
+    return None
+
+
+def to_json_safe(value):
+    """numpy 값 / NaN / inf가 섞인 특징 dict를 JSONField에 저장할 수 있는 값으로 변환 (NaN, inf -> None)"""
+    if isinstance(value, dict):
+        return {str(k): to_json_safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [to_json_safe(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return to_json_safe(value.tolist())
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def load_checkpoint(question, student, audio_hash: Optional[str]) -> Optional[GradingCheckpoint]:
+    """만료되지 않은 체크포인트 (만료된 것은 삭제)"""
+    if not audio_hash:
+        return None
+    checkpoint = GradingCheckpoint.objects.filter(question=question, student=student, audio_hash=audio_hash).first()
+    if checkpoint is None:
+        return None
+    if checkpoint.updated_at < timezone.now() - timedelta(seconds=settings.GRADING_CHECKPOINT_TTL_SECONDS):
+        checkpoint.delete()
+        return None
+    return checkpoint
+
+
+def save_checkpoint(question, student, audio_hash: Optional[str], **fields) -> Optional[GradingCheckpoint]:
+    """
+    성공한 단계 결과를 저장 (fields: transcript / features / script_features / eval_grade / is_correct / graded_by)
+    저장 실패는 채점에 영향을 주지 않도록 로그만 남깁니다.
+    """
+    if not audio_hash or not fields:
+        return None
+    for name in ("features", "script_features"):
+        if name in fields:
+            fields[name] = to_json_safe(fields[name])
+    try:
+        checkpoint, _ = GradingCheckpoint.objects.update_or_create(
+            question=question, student=student, audio_hash=audio_hash, defaults=fields
+        )
+    except Exception as e:
+        logger.warning(f"[GradingCheckpoint] 체크포인트 저장 실패 ({', '.join(fields)}): {e}")
+        return None
+    logger.info(f"[GradingCheckpoint] 체크포인트 저장 - {audio_hash[:12]} ({', '.join(fields)})")
+    return checkpoint
+
+
+def clear_checkpoint(checkpoint: Optional[GradingCheckpoint]):
+    if checkpoint is None or checkpoint.pk is None:
+        return
+    try:
+        checkpoint.delete()
+    except Exception as e:
+        logger.warning(f"[GradingCheckpoint] 체크포인트 삭제 실패: {e}")
+
+
+def call_with_retry(
+    name: str,
+    func: Callable[[], T],
+    max_attempts: int = None,
+    backoff: float = None,
+    can_retry: Callable[[float], bool] = None,
+    sleep: Callable[[float], None] = time.sleep,
+) -> T:
+    """
+    func()를 실패하면 backoff, 2 * backoff, ... 초 뒤 다시 호출 (최대 max_attempts회, 마지막 예외는 그대로 발생)
+    can_retry(delay)가 False를 반환하면 (예: 시간 예산 부족) 더 기다리지 않고 바로 예외를 발생시킵니다.
+    """
+    max_attempts = settings.GRADING_STAGE_MAX_ATTEMPTS if max_attempts is None else max_attempts
+    delay = settings.GRADING_STAGE_RETRY_BACKOFF if backoff is None else backoff
+    for attempt in range(1, max_attempts + 1):
+        try:
+            return func()
+        except Exception as e:
+            if attempt >= max_attempts or (can_retry is not None and not can_retry(delay)):
+                raise
+            logger.warning(
+                f"[GradingCheckpoint] {name} 단계 실패, {delay:.1f}초 후 재시도 ({attempt}/{max_attempts}): {e}"
+            )
+            sleep(delay)
+            delay *= 2
@@ -0,0 +1,225 @@
+"""
+DB 기반 음성 답안 채점 작업 큐
+
+- enqueue_grading_job: 업로드된 음성 파일을 GradingJob(QUEUED)으로 저장
+- enqueue_tail_question_job: 시간 예산 초과로 미룬 꼬리 질문 생성을 GradingJob(kind=TAIL_QUESTION)으로 등록
+- start_request_job: 요청 스레드에서 바로 채점하는 답안 제출을 RUNNING 작업으로 기록 (중복 요청이 기다릴 수 있도록)
+- claim_next_job: QUEUED 작업 하나를 RUNNING으로 선점
+    - Postgres 등: SELECT ... FOR UPDATE SKIP LOCKED (워커 여러 개가 동시에 가져가도 겹치지 않음)
+    - SQLite 등 미지원 DB: status 조건부 UPDATE로 선점 (갱신된 row가 1개일 때만 성공)
+- reclaim_stale_jobs: 워커가 죽어서 오래 RUNNING으로 남은 작업을 다시 QUEUED로 되돌림
+- reclaim_orphaned_answers: 처리 중인 작업 없이 오래 PROCESSING으로 남은 Answer 삭제
+    (작업 상태는 GradingJob이 따로 관리하므로, 작업 없이 요청 스레드에서 채점하다 프로세스가 죽은 답안은 여기서 정리)
+    run_grading_worker가 매 루프마다 수행하고, 워커 없이 동기 채점만 쓰는 배포는
+    python manage.py reclaim_processing_answers를 cron 등으로 주기 실행해야 합니다.
+- process_job: 작업 하나를 채점(또는 꼬리 질문 생성)하고 응답(create_api_response 본문)을 결과로 저장
+- finish_job / fail_job: 채점 응답(또는 예외)을 작업 결과로 저장
+"""
+
+import io
+import logging
+import os
+import socket
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from rest_framework import status
+
+from ..models import Answer, GradingJob
+
+logger = logging.getLogger(__name__)
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue_grading_job(answer, audio_file, idempotency_key=""):
+    """업로드된 음성 파일(UploadedFile)을 채점 작업으로 등록"""
+    audio = b"".join(audio_file.chunks())
+    job = GradingJob.objects.create(
+        answer=answer,
+        question_id=answer.question_id,
+        student_id=answer.student_id,
+        audio=audio,
+        idempotency_key=idempotency_key or "",
+    )
+    logger.info(f"[GradingQueue] 작업 등록 - job_id={job.id}, answer_id={answer.id}, size={len(audio)}B")
+    return job
+
+
+def enqueue_tail_question_job(answer):
+    """채점이 끝난 답안의 꼬리 질문 생성을 작업으로 등록 (음성 없음)"""
+    job = GradingJob.objects.create(
+        answer=answer,
+        question_id=answer.question_id,
+        student_id=answer.student_id,
+        kind=GradingJob.Kind.TAIL_QUESTION,
+    )
+    logger.info(f"[GradingQueue] 꼬리 질문 작업 등록 - job_id={job.id}, answer_id={answer.id}")
+    return job
+
+
+def start_request_job(answer, idempotency_key, worker_id=None):
+    """
+    요청 스레드에서 바로 채점하는 답안 제출을 RUNNING 작업으로 기록 (음성은 저장하지 않음)
+    같은 키로 들어온 중복 요청은 이 작업이 끝나기를 기다리거나 작업 조회 API로 결과를 받습니다.
+    """
+    job = GradingJob.objects.create(
+        answer=answer,
+        question_id=answer.question_id,
+        student_id=answer.student_id,
+        status=GradingJob.Status.RUNNING,
+        attempts=1,
+        locked_by=f"request:{worker_id or default_worker_id()}",
+        locked_at=timezone.now(),
+        idempotency_key=idempotency_key,
+    )
+    logger.info(f"[GradingQueue] 요청 채점 작업 기록 - job_id={job.id}, answer_id={answer.id}")
+    return job
+
+
+def claim_next_job(worker_id=None):
+    """가장 오래된 QUEUED 작업을 RUNNING으로 선점해서 반환 (없으면 None)"""
+    worker_id = worker_id or default_worker_id()
+    queued = GradingJob.objects.filter(status=GradingJob.Status.QUEUED).order_by("created_at", "id")
+
+    if connection.features.has_select_for_update_skip_locked:
+        with transaction.atomic():
+            job = queued.select_for_update(skip_locked=True).first()
+            if job is None:
+                return None
+            job.status = GradingJob.Status.RUNNING
+            job.attempts += 1
+            job.locked_by = worker_id
+            job.locked_at = timezone.now()
+            job.save(update_fields=["status", "attempts", "locked_by", "locked_at"])
+            return job
+
+    # SKIP LOCKED 미지원 DB (SQLite): 조건부 UPDATE로 선점, 다른 워커가 먼저 가져갔으면 다음 후보 시도
+    for job_id in list(queued.values_list("id", flat=True)[:10]):
+        claimed = GradingJob.objects.filter(id=job_id, status=GradingJob.Status.QUEUED).update(
+            status=GradingJob.Status.RUNNING,
+            attempts=F("attempts") + 1,
+            locked_by=worker_id,
+            locked_at=timezone.now(),
+        )
+        if claimed:
+            return GradingJob.objects.get(id=job_id)
+    return None
+
+
+def finish_job(job, response):
+    """채점 응답(create_api_response)을 작업 결과로 저장 (2xx면 DONE, 아니면 FAILED)"""
+    if job.answer is not None and job.answer.pk is None:
+        # 채점 실패로 Answer가 삭제된 경우 (on_delete=SET_NULL)
+        job.answer = None
+
+    job.result_status_code = response.status_code
+    job.result = response.data
+    job.status = GradingJob.Status.DONE if status.is_success(response.status_code) else GradingJob.Status.FAILED
+    job.audio = None
+    job.finished_at = timezone.now()
+    job.save()
+
+
+def fail_job(job, error, message, status_code=status.HTTP_500_INTERNAL_SERVER_ERROR):
+    """작업을 FAILED로 마무리하고, PROCESSING으로 남은 Answer는 동기 처리와 동일하게 삭제"""
+    answer = job.answer
+    if answer is not None and answer.state == Answer.State.PROCESSING:
+        answer.delete()
+        logger.info(f"[GradingQueue] 작업 실패로 PROCESSING Answer 삭제 - job_id={job.id}")
+    if answer is not None and answer.pk is None:
+        # 삭제된 Answer (on_delete=SET_NULL)
+        job.answer = None
+
+    job.status = GradingJob.Status.FAILED
+    job.result_status_code = status_code
+    job.result = {"success": False, "data": None, "message": message, "error": error}
+    job.audio = None
+    job.finished_at = timezone.now()
+    job.save()
+
+
+def reclaim_stale_jobs(stale_seconds=None, max_attempts=None):
+    """
+    locked_at 이후 stale_seconds가 지나도록 RUNNING인 작업 정리
+
+    Returns:
+        (requeued, failed): 다시 QUEUED로 돌린 개수, 재시도 횟수 초과로 FAILED 처리한 개수
+    """
+    stale_seconds = stale_seconds if stale_seconds is not None else settings.GRADING_JOB_STALE_SECONDS
+    max_attempts = max_attempts if max_attempts is not None else settings.GRADING_JOB_MAX_ATTEMPTS
+    cutoff = timezone.now() - timedelta(seconds=stale_seconds)
+    stale = GradingJob.objects.filter(status=GradingJob.Status.RUNNING, locked_at__lt=cutoff)
+
+    failed = 0
+    # 요청 스레드에서 채점하던 작업(음성 없음)은 다시 실행할 수 없으므로 바로 실패 처리
+    no_audio = stale.filter(kind=GradingJob.Kind.GRADE, audio__isnull=True)
+    for job in (stale.filter(attempts__gte=max_attempts) | no_audio).select_related("answer"):
+        fail_job(job, error="Grading job timed out", message="채점 작업이 시간 내에 완료되지 않았습니다.")
+        failed += 1
+
+    requeued = stale.filter(attempts__lt=max_attempts).update(
+        status=GradingJob.Status.QUEUED, locked_by="", locked_at=None
+    )
+    if requeued or failed:
+        logger.warning(f"[GradingQueue] 오래된 작업 정리 - requeued={requeued}, failed={failed}")
+    return requeued, failed
+
+
+def reclaim_orphaned_answers(answers=None, stale_seconds=None):
+    """
+    채점을 시작(started_at)한 지 stale_seconds가 지나도록 PROCESSING인데 처리 중인(QUEUED / RUNNING) 작업이 없는
+    Answer를 동기 처리 실패와 동일하게 삭제 (answers: 대상 queryset, 기본은 전체)
+
+    Returns:
+        삭제한 Answer 개수
+    """
+    stale_seconds = stale_seconds if stale_seconds is not None else settings.GRADING_JOB_STALE_SECONDS
+    cutoff = timezone.now() - timedelta(seconds=stale_seconds)
+    answers = answers if answers is not None else Answer.objects.all()
+    orphaned = list(
+        answers.filter(state=Answer.State.PROCESSING)
+        .filter(Q(started_at__lt=cutoff) | Q(started_at__isnull=True, created_at__lt=cutoff))
+        .exclude(grading_jobs__status__in=(GradingJob.Status.QUEUED, GradingJob.Status.RUNNING))
+        .values_list("id", flat=True)
+    )
+    if not orphaned:
+        return 0
+    Answer.objects.filter(id__in=orphaned, state=Answer.State.PROCESSING).delete()
+    logger.warning(f"[GradingQueue] 작업 없이 오래 PROCESSING으로 남은 Answer 삭제 - answer_ids={orphaned}")
+    return len(orphaned)
+
+
+def process_job(job):
+    """
+    선점한 작업 하나를 처리
+    - GRADE: AnswerSubmitView와 같은 grade_answer_submission으로 채점
+    - TAIL_QUESTION: complete_deferred_tail_question으로 꼬리 질문만 생성
+    """
+    # views -> grading_queue import 순환을 피하기 위해 지연 import
+    from ..views import complete_deferred_tail_question, grade_answer_submission
+
+    answer = job.answer
+    if answer is None:
+        fail_job(job, error="Answer not found", message="채점할 답안을 찾을 수 없습니다.")
+        return job
+
+    try:
+        logger.info(f"[GradingQueue] 작업 시작 - job_id={job.id}, kind={job.kind}, answer_id={answer.id}")
+        if job.kind == GradingJob.Kind.TAIL_QUESTION:
+            response = complete_deferred_tail_question(answer, job.question)
+        else:
+            # 저장된 음성 bytes를 메모리에서 바로 디코딩 (임시 파일 없음)
+            response = grade_answer_submission(answer, job.question, io.BytesIO(bytes(job.audio or b"")))
+        finish_job(job, response)
+        logger.info(f"[GradingQueue] 채점 완료 - job_id={job.id}, status={job.status}")
+    except Exception as e:
+        logger.error(f"[GradingQueue] 채점 중 예외 - job_id={job.id}: {e}", exc_info=True)
+        fail_job(job, error=str(e), message="답안 제출 중 오류가 발생했습니다.")
+
+    return job
@@ -0,0 +1,120 @@
+"""
+답안 제출 중복 요청 처리 (idempotency)
+
+모바일 네트워크가 불안정하면 클라이언트가 같은 음성으로 답안 제출을 다시 보내는데, 요청마다 채점 파이프라인을
+새로 돌리면 꼬리 질문이 두 번 만들어질 수 있습니다. 요청 키가 같은 답안 제출은 GradingJob 하나로 묶고,
+중복 요청에는 그 작업의 결과를 돌려줍니다.
+
+- submission_key(request): Idempotency-Key 헤더(없으면 음성 sha256)와 questionId / studentId로 만든 sha256
+- find_submission_job(key): 같은 키로 등록된 작업 (실패했거나 ANSWER_IDEMPOTENCY_WINDOW_SECONDS가 지난 작업은
+  키를 풀고 None -> 새로 채점)
+- register_submission_job(key, create_job): 같은 키의 작업을 하나만 등록 (동시에 들어온 요청은 unique 제약으로 구분)
+- wait_for_job(job): 처리 중인 작업이 끝날 때까지 DB 조회 (최대 ANSWER_IDEMPOTENCY_WAIT_SECONDS)
+"""
+
+import hashlib
+import logging
+import time
+from datetime import timedelta
+from typing import Callable, Optional, Tuple
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from ..models import GradingJob
+from .grading_checkpoint import audio_content_hash
+
+logger = logging.getLogger(__name__)
+
+IN_FLIGHT = (GradingJob.Status.QUEUED, GradingJob.Status.RUNNING)
+
+
+def submission_key(request) -> Optional[str]:
+    """답안 제출 요청 키 (studentId / questionId가 없거나, 헤더도 음성 파일도 없으면 None)"""
+    student_id = request.data.get("studentId")
+    question_id = request.data.get("questionId")
+    if not student_id or not question_id:
+        return None
+
+    header = request.headers.get("Idempotency-Key", "").strip()
+    if header:
+        source = f"key:{header}"
+    else:
+        audio_file = request.FILES.get("audioFile")
+        audio_hash = audio_content_hash(audio_file) if audio_file is not None else None
+        if audio_hash is None:
+            return None
+        source = f"audio:{audio_hash}"
+    # 다른 학생 / 문제의 요청과 키가 겹치지 않도록 항상 studentId / questionId를 함께 해시
+    return hashlib.sha256(f"{student_id}:{question_id}:{source}".encode("utf-8")).hexdigest()
+
+
+def _release(job: GradingJob, reason: str):
+    GradingJob.objects.filter(id=job.id).update(idempotency_key="")
+    logger.info(f"[Idempotency] 요청 키 해제 - job_id={job.id} ({reason})")
+
+
+def find_submission_job(key: str) -> Optional[GradingJob]:
+    """
+    같은 키로 등록된 작업 (처리 중이거나 ANSWER_IDEMPOTENCY_WINDOW_SECONDS 안에 완료된 작업만)
+    실패한 작업 / 기간이 지난 결과 / 오래 멈춘 요청 채점 작업은 키를 풀어서 다음 요청이 새로 채점하도록 합니다.
+    """
+    job = GradingJob.objects.filter(idempotency_key=key).first()
+    if job is None:
+        return None
+
+    now = timezone.now()
+    if job.status == GradingJob.Status.FAILED:
+        _release(job, "실패한 작업")
+        return None
+    if job.status == GradingJob.Status.DONE and job.finished_at is not None:
+        if job.finished_at < now - timedelta(seconds=settings.ANSWER_IDEMPOTENCY_WINDOW_SECONDS):
+            _release(job, "결과 보관 기간 만료")
+            return None
+    if (
+        job.status == GradingJob.Status.RUNNING
+        and job.locked_at is not None
+        and job.locked_at < now - timedelta(seconds=settings.GRADING_JOB_STALE_SECONDS)
+    ):
+        _release(job, "오래 멈춘 작업")
+        return None
+    return job
+
+
+def register_submission_job(key: str, create_job: Callable[[], GradingJob]) -> Tuple[GradingJob, bool]:
+    """
+    create_job()으로 키가 붙은 작업 등록
+
+    Returns:
+        (job, created): 동시에 들어온 같은 키의 요청이 먼저 등록했으면 (그 작업, False)
+    """
+    try:
+        with transaction.atomic():
+            return create_job(), True
+    except IntegrityError:
+        job = GradingJob.objects.filter(idempotency_key=key).first()
+        if job is None:
+            raise
+        logger.info(f"[Idempotency] 같은 요청이 먼저 등록됨 - job_id={job.id}")
+        return job, False
+
+
+def wait_for_job(
+    job: GradingJob,
+    timeout: float = None,
+    poll: float = None,
+    sleep: Callable[[float], None] = None,
+) -> GradingJob:
+    """처리 중인 작업이 끝날 때까지 poll초 간격으로 다시 조회 (timeout초가 지나면 처리 중인 상태 그대로 반환)"""
+    timeout = settings.ANSWER_IDEMPOTENCY_WAIT_SECONDS if timeout is None else timeout
+    poll = settings.ANSWER_IDEMPOTENCY_POLL_SECONDS if poll is None else poll
+    sleep = sleep or time.sleep
+    started = time.monotonic()
+    while job.status in IN_FLIGHT:
+        remaining = timeout - (time.monotonic() - started)
+        if remaining <= 0:
+            break
+        sleep(min(poll, remaining))
+        job.refresh_from_db()
+    return job
@@ -5,10 +5,17 @@ import warnings
 
 import joblib
 import numpy as np
-import pandas as pd
+
+try:
+    from . import model_registry
+except ImportError:  # 스크립트로 직접 실행하는 경우 (python inference.py ...)
+    import model_registry
 
 warnings.filterwarnings("ignore")
 
+# 서비스에서 사용하는 XGBoost 모델 경로 (submissions/machine/model.joblib)
+DEFAULT_MODEL_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "machine", "model.joblib"))
+
 # 훈련 때 사용한 FEATURE_COLUMNS와 동일하게 유지
 FEATURE_COLUMNS = [
     "repeat_cnt_ratio",
@@ -38,6 +45,23 @@ FEATURE_COLUMNS = [
     "inter_div",
 ]
 
+# FEATURE_COLUMNS 중 build_feature_row에서 다른 특징으로 계산하는 컬럼 -> 필요한 원본 특징 key
+DERIVED_COLUMN_INPUTS = {
+    "repeat_cnt_ratio": ("repeat_cnt", "word_cnt"),
+    "filler_words_cnt_ratio": ("filler_words_cnt", "word_cnt"),
+    "pause_cnt_ratio": ("pause_0_5_cnt", "word_cnt"),
+}
+
+
+def required_feature_keys(columns=FEATURE_COLUMNS):
+    """모델 입력 컬럼을 만들기 위해 추출해야 하는 원본 특징 key 목록 (순서 유지, 중복 제거)"""
+    keys = []
+    for col in columns:
+        for key in DERIVED_COLUMN_INPUTS.get(col, (col,)):
+            if key not in keys:
+                keys.append(key)
+    return keys
+
 
 def to_letter_grade(num):
     # 학습 스크립트와 동일한 매핑 (A: 7~8, B: 5~6, C: 3~4, D: 1~2)
@@ -102,22 +126,86 @@ def build_feature_row(js: dict):
     return row
 
 
-def run_inference(model_path: str, js: dict) -> dict:
-    """모델 경로와 feature dict(js)를 입력받아 단일 예측 결과 반환"""
-    model = joblib.load(model_path)
+# 반올림한 예측값(1~8) -> 등급 문자 (to_letter_grade와 같은 매핑, 0번은 사용하지 않음)
+_LETTER_BY_ROUNDED = np.array(["D", "D", "D", "C", "C", "B", "B", "A", "A"])
 
-    feat_row = build_feature_row(js)
-    X = pd.DataFrame([feat_row], columns=FEATURE_COLUMNS)
 
-    y_pred = model.predict(X)[0]
-    y_round = int(np.clip(np.round(y_pred), 1, 8))
-    y_letter = to_letter_grade(y_round)
+def build_feature_matrix(features) -> np.ndarray:
+    """
+    여러 답변의 feature를 FEATURE_COLUMNS 순서의 float32 행렬(n, len(FEATURE_COLUMNS))로 변환
 
-    return {
-        "pred_cont": float(y_pred),
-        "pred_rounded": y_round,
-        "pred_letter": y_letter,
-    }
+    - features가 dict 목록이면 build_feature_row와 같은 규칙을 열 단위로 적용
+        * 원본 key를 미리 할당한 행렬에 한 번에 채운 뒤 *_ratio는 word_cnt로 나눔 (분모가 0/누락이면 0.0)
+        * 누락 / None / NaN은 0.0
+    - np.ndarray면 이미 FEATURE_COLUMNS 순서라고 보고 NaN만 0.0으로 바꿈
+    """
+    if isinstance(features, np.ndarray):
+        X = np.array(features, dtype=np.float32, ndmin=2)
+        if X.shape[1] != len(FEATURE_COLUMNS):
+            raise ValueError(f"feature 행렬의 열 수가 {len(FEATURE_COLUMNS)}개가 아닙니다: {X.shape}")
+        return np.nan_to_num(X, nan=0.0, copy=False)
+
+    raw_keys = required_feature_keys(FEATURE_COLUMNS) + ["word_cnt"]
+    raw = np.full((len(features), len(raw_keys)), np.nan, dtype=np.float64)
+    for i, js in enumerate(features):
+        raw[i] = [js.get(key) for key in raw_keys]  # None -> NaN
+    return feature_matrix_from_raw(raw, raw_keys)
+
+
+def feature_matrix_from_raw(raw: np.ndarray, keys) -> np.ndarray:
+    """
+    원본 특징 행렬(raw, 열 순서 = keys)을 모델 입력 행렬(FEATURE_COLUMNS 순서, float32)로 변환
+    - keys에 없는 특징 / NaN은 0.0, *_ratio는 word_cnt로 나눔 (분모가 0/누락이면 0.0)
+    """
+    raw = np.nan_to_num(np.asarray(raw, dtype=np.float64), nan=0.0)
+    index = {key: i for i, key in enumerate(keys)}
+    zeros = np.zeros(len(raw), dtype=np.float64)
+
+    def column(key):
+        return raw[:, index[key]] if key in index else zeros
+
+    X = np.empty((len(raw), len(FEATURE_COLUMNS)), dtype=np.float32)
+    word_cnt = column("word_cnt")
+    for j, col in enumerate(FEATURE_COLUMNS):
+        inputs = DERIVED_COLUMN_INPUTS.get(col)
+        if inputs is None:
+            X[:, j] = column(col)
+        else:
+            X[:, j] = np.divide(column(inputs[0]), word_cnt, out=np.zeros_like(word_cnt), where=word_cnt != 0)
+    return X
+
+
+def get_xgb_model(model_path: str = DEFAULT_MODEL_PATH):
+    """joblib 모델을 프로세스당 한 번만 로드해서 재사용 (model_registry 사용)"""
+    model_path = os.path.abspath(model_path)
+    return model_registry.get_or_load(("xgb", model_path), lambda: joblib.load(model_path))
+
+
+def run_inference_batch(features, model_path: str = DEFAULT_MODEL_PATH) -> list:
+    """
+    여러 답변을 한 번의 model.predict로 예측 (저장된 답변 재채점 등)
+
+    features: feature dict 목록 또는 FEATURE_COLUMNS 순서의 행렬
+    반환: 입력 순서대로 run_inference와 같은 형식의 dict 목록
+    """
+    X = build_feature_matrix(features)
+    if len(X) == 0:
+        return []
+
+    model = get_xgb_model(model_path)
+    y_pred = np.asarray(model.predict(X), dtype=np.float64).reshape(-1)
+    y_round = np.clip(np.round(y_pred), 1, 8).astype(int)
+    y_letter = _LETTER_BY_ROUNDED[y_round]
+
+    return [
+        {"pred_cont": float(cont), "pred_rounded": int(rounded), "pred_letter": str(letter)}
+        for cont, rounded, letter in zip(y_pred, y_round, y_letter)
+    ]
+
+
+def run_inference(model_path: str, js: dict) -> dict:
+    """모델 경로와 feature dict(js)를 입력받아 단일 예측 결과 반환"""
+    return run_inference_batch([js], model_path)[0]
 
 
 if __name__ == "__main__":  # pragma: no cover
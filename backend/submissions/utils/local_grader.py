@@ -0,0 +1,320 @@
+"""
+로컬 정오답 판정기 (planner LLM fast path)
+
+정오답 boolean 하나를 얻으려고 모든 제출마다 planner LLM을 호출하는 대신,
+모범답안 SBERT 임베딩과 학생 transcript의 cosine 유사도 + 모범답안 핵심어 포함률로 점수를 매겨
+확실한 정답 / 확실한 오답은 로컬에서 판정하고, 애매한 중간 구간만 LLM(judge_correctness)에 넘깁니다.
+
+- score = sim_weight * cosine + (1 - sim_weight) * 핵심어 포함률
+    * score >= correct_thr -> 정답, score <= incorrect_thr -> 오답, 그 사이 -> LLM에 위임
+- 임계값은 저장된 LLM 판정(Answer.graded_by == llm)으로 보정한 값을 사용 (python manage.py calibrate_local_grader)
+    * 보정 파일(LOCAL_GRADER_CALIBRATION_PATH)이 없으면 항상 LLM에 위임
+- 모범답안 임베딩은 문제 생성 시 Question.model_answer_embedding(float16)에 저장, 없으면 그때 encode
+- stats(): 로컬 정답 / 로컬 오답 / 위임 횟수와 LLM 호출 생략 비율 (프로세스 단위)
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+from dataclasses import asdict, dataclass
+from typing import Callable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from . import model_registry
+from .feature_extractor.extract_features_from_script import FILLER_BASE, normalize_text_basic, tokenize_ko
+
+logger = logging.getLogger(__name__)
+
+LOCAL_GRADER_CALIBRATION_PATH = os.getenv("LOCAL_GRADER_CALIBRATION_PATH", "submissions/machine/local_grader.json")
+DEFAULT_SIM_WEIGHT = 0.7
+
+# 핵심어에서 제외할 기능어 / 서술어 (조사를 뗀 뒤 비교)
+_STOPWORDS = {
+    "그리고",
+    "그래서",
+    "하지만",
+    "때문",
+    "때문에",
+    "있습니다",
+    "합니다",
+    "됩니다",
+    "입니다",
+    "있다",
+    "한다",
+    "된다",
+    "이다",
+    "것",
+    "것은",
+    "것이",
+    "수",
+    "등",
+    "더",
+    "및",
+}
+_JOSA = sorted(
+    ["은", "는", "이", "가", "을", "를", "에", "의", "로", "으로", "와", "과", "도", "에서", "에게", "까지", "부터"]
+    + ["보다", "처럼", "만", "이나", "나", "이며", "이고"],
+    key=len,
+    reverse=True,
+)
+
+
+def _strip_josa(token: str) -> str:
+    for josa in _JOSA:
+        if len(token) > len(josa) + 1 and token.endswith(josa):
+            return token[: -len(josa)]
+    return token
+
+
+def key_terms(text: str) -> Set[str]:
+    """모범답안 핵심어: 토큰에서 조사를 떼고 필러 / 기능어 / 한 글자 토큰 제외"""
+    terms = set()
+    for token in tokenize_ko(normalize_text_basic(text or "")):
+        if token in FILLER_BASE or token in _STOPWORDS:
+            continue
+        term = _strip_josa(token.lower())
+        if len(term) >= 2 and term not in _STOPWORDS:
+            terms.add(term)
+    return terms
+
+
+def key_term_coverage(model_answer: str, transcript: str) -> float:
+    """
+    모범답안 핵심어 중 transcript에 나온 비율 (어미 변화를 고려해 앞 2글자 이상이 같으면 포함으로 봄)
+
+    핵심어가 없는 모범답안(숫자 하나 등)은 1.0 (유사도만으로 판정)
+    """
+    terms = key_terms(model_answer)
+    if not terms:
+        return 1.0
+    spoken = {_strip_josa(t.lower()) for t in tokenize_ko(normalize_text_basic(transcript or ""))}
+    covered = 0
+    for term in terms:
+        if term in spoken or any(len(os.path.commonprefix([term, word])) >= 2 for word in spoken):
+            covered += 1
+    return covered / len(terms)
+
+
+def encode_embedding(vector: np.ndarray) -> bytes:
+    return np.asarray(vector, dtype="<f2").tobytes()
+
+
+def decode_embedding(data) -> Optional[np.ndarray]:
+    if not data:
+        return None
+    return np.frombuffer(bytes(data), dtype="<f2").astype(np.float32)
+
+
+def _sbert_encode(texts: List[str]) -> np.ndarray:
+    from .feature_extractor.extract_all_features import encode_texts
+
+    return encode_texts(texts)
+
+
+def model_answer_embeddings(model_answers: Sequence[str], encoder: Callable = None) -> List[Optional[bytes]]:
+    """
+    모범답안 목록 -> Question.model_answer_embedding 값 (중복은 한 번만 encode)
+
+    SBERT 모델을 쓸 수 없으면(로컬 모델 없음 등) 전부 None을 반환하고 판정 시점에 다시 시도합니다.
+    """
+    encoder = encoder or _sbert_encode
+    unique = [t for t in dict.fromkeys(model_answers) if t]
+    if not unique:
+        return [None] * len(model_answers)
+    try:
+        vectors = dict(zip(unique, np.asarray(encoder(unique), dtype=np.float32)))
+    except Exception as e:
+        logger.warning(f"[local_grader] 모범답안 임베딩 생성 실패 (판정 시점에 다시 계산): {e}")
+        return [None] * len(model_answers)
+    return [encode_embedding(vectors[t]) if t in vectors else None for t in model_answers]
+
+
+def _cosine(a: np.ndarray, b: np.ndarray) -> float:
+    denom = float(np.linalg.norm(a) * np.linalg.norm(b))
+    return float(a @ b) / denom if denom > 0 else 0.0
+
+
+@dataclass(frozen=True)
+class GraderThresholds:
+    correct_thr: float
+    incorrect_thr: float
+    sim_weight: float = DEFAULT_SIM_WEIGHT
+
+
+@dataclass(frozen=True)
+class LocalVerdict:
+    is_correct: Optional[bool]  # None이면 LLM에 위임
+    similarity: float
+    coverage: float
+    score: float
+
+
+def combined_score(similarity: float, coverage: float, sim_weight: float = DEFAULT_SIM_WEIGHT) -> float:
+    return sim_weight * similarity + (1.0 - sim_weight) * coverage
+
+
+def score_answers(
+    transcripts: Sequence[str],
+    model_answers: Sequence[str],
+    embeddings: Sequence[Optional[bytes]] = None,
+    encoder: Callable = None,
+) -> List[Tuple[float, float]]:
+    """(cosine, 핵심어 포함률) 목록. transcript와 저장 임베딩이 없는 모범답안은 한 번에 encode"""
+    encoder = encoder or _sbert_encode
+    embeddings = list(embeddings) if embeddings is not None else [None] * len(model_answers)
+    answer_vecs = [decode_embedding(e) for e in embeddings]
+    missing = [m for m, v in zip(model_answers, answer_vecs) if v is None]
+    texts = list(dict.fromkeys([*transcripts, *missing]))
+    encoded = dict(zip(texts, np.asarray(encoder(texts), dtype=np.float32))) if texts else {}
+
+    scores = []
+    for transcript, model_answer, vec in zip(transcripts, model_answers, answer_vecs):
+        vec = encoded[model_answer] if vec is None else vec
+        scores.append((_cosine(encoded[transcript], vec), key_term_coverage(model_answer, transcript)))
+    return scores
+
+
+class LocalGrader:
+    """보정된 임계값으로 확실한 경우만 로컬 판정 (스레드 안전한 통계)"""
+
+    def __init__(self, thresholds: Optional[GraderThresholds], encoder: Callable = None):
+        self.thresholds = thresholds
+        self.encoder = encoder or _sbert_encode
+        self._lock = threading.Lock()
+        self.local_correct = 0
+        self.local_incorrect = 0
+        self.deferred = 0
+
+    def grade(self, transcript: str, model_answer: str, model_answer_embedding=None) -> LocalVerdict:
+        is_correct, similarity, coverage, score = None, 0.0, 0.0, 0.0
+        if self.thresholds is not None and transcript and model_answer:
+            try:
+                ((similarity, coverage),) = score_answers(
+                    [transcript], [model_answer], [model_answer_embedding], encoder=self.encoder
+                )
+                score = combined_score(similarity, coverage, self.thresholds.sim_weight)
+                if score >= self.thresholds.correct_thr:
+                    is_correct = True
+                elif score <= self.thresholds.incorrect_thr:
+                    is_correct = False
+            except Exception as e:
+                logger.warning(f"[local_grader] 로컬 판정 실패, LLM에 위임: {e}")
+
+        with self._lock:
+            if is_correct is True:
+                self.local_correct += 1
+            elif is_correct is False:
+                self.local_incorrect += 1
+            else:
+                self.deferred += 1
+        return LocalVerdict(is_correct=is_correct, similarity=similarity, coverage=coverage, score=score)
+
+    def predict_correct(self, transcript: str, model_answer: str, model_answer_embedding=None) -> Optional[bool]:
+        """
+        애매한 구간까지 포함한 정오답 추정 (통계 미집계, 추측 실행용)
+        임계값 구간의 중간값(보정 전이면 0.5) 기준, 점수를 계산할 수 없으면 None
+        """
+        if not transcript or not model_answer:
+            return None
+        thresholds = self.thresholds
+        sim_weight = thresholds.sim_weight if thresholds is not None else DEFAULT_SIM_WEIGHT
+        midpoint = 0.5
+        if thresholds is not None and math.isfinite(thresholds.correct_thr) and math.isfinite(thresholds.incorrect_thr):
+            midpoint = (thresholds.correct_thr + thresholds.incorrect_thr) / 2
+        try:
+            ((similarity, coverage),) = score_answers(
+                [transcript], [model_answer], [model_answer_embedding], encoder=self.encoder
+            )
+        except Exception as e:
+            logger.warning(f"[local_grader] 정오답 추정 실패: {e}")
+            return None
+        return combined_score(similarity, coverage, sim_weight) >= midpoint
+
+    def stats(self) -> dict:
+        with self._lock:
+            local = self.local_correct + self.local_incorrect
+            total = local + self.deferred
+            return {
+                "local_correct": self.local_correct,
+                "local_incorrect": self.local_incorrect,
+                "deferred": self.deferred,
+                "llm_skip_rate": local / total if total else 0.0,
+            }
+
+
+def load_thresholds(path: str = None) -> Optional[GraderThresholds]:
+    path = path or LOCAL_GRADER_CALIBRATION_PATH
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    # 보정에서 한쪽 구간을 만들지 못했으면 null로 저장됨 (그쪽은 로컬 판정하지 않음)
+    correct_thr, incorrect_thr = data.get("correct_thr"), data.get("incorrect_thr")
+    return GraderThresholds(
+        correct_thr=float("inf") if correct_thr is None else float(correct_thr),
+        incorrect_thr=float("-inf") if incorrect_thr is None else float(incorrect_thr),
+        sim_weight=float(data.get("sim_weight", DEFAULT_SIM_WEIGHT)),
+    )
+
+
+def save_thresholds(thresholds: GraderThresholds, path: str = None, **report):
+    path = path or LOCAL_GRADER_CALIBRATION_PATH
+    data = {k: (None if isinstance(v, float) and np.isinf(v) else v) for k, v in asdict(thresholds).items()}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({**data, **report}, f, ensure_ascii=False, indent=2)
+
+
+def get_local_grader() -> LocalGrader:
+    """프로세스당 하나의 LocalGrader (보정 파일은 처음 한 번만 읽음, model_registry 사용)"""
+    return model_registry.get_or_load("local_grader", lambda: LocalGrader(load_thresholds()))
+
+
+def calibrate_thresholds(
+    scores: Sequence[float],
+    labels: Sequence[bool],
+    target_precision: float = 0.97,
+    min_support: int = 20,
+    sim_weight: float = DEFAULT_SIM_WEIGHT,
+) -> Tuple[Optional[GraderThresholds], dict]:
+    """
+    LLM 판정(labels)과의 일치율이 target_precision 이상인 범위에서 로컬 판정 구간을 최대한 넓게 잡음
+
+    - correct_thr: score >= thr 인 답안 중 LLM 정답 비율 >= target인 가장 낮은 thr (해당 답안 min_support개 이상)
+    - incorrect_thr: score <= thr 인 답안 중 LLM 오답 비율 >= target인 가장 높은 thr
+    - 조건을 만족하지 못하는 쪽은 로컬 판정하지 않음 (correct_thr=inf / incorrect_thr=-inf)
+
+    Returns: (임계값 또는 None(양쪽 모두 불가), 보정 데이터 기준 보고서)
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    labels = np.asarray(labels, dtype=bool)
+    candidates = np.unique(scores)
+
+    correct_thr = float("inf")
+    for thr in candidates:  # 낮은 임계값부터: 처음 만족하는 값이 가장 넓은 구간
+        mask = scores >= thr
+        if mask.sum() >= min_support and labels[mask].mean() >= target_precision:
+            correct_thr = float(thr)
+            break
+
+    incorrect_thr = float("-inf")
+    for thr in candidates[::-1]:
+        mask = scores <= thr
+        if thr < correct_thr and mask.sum() >= min_support and (~labels[mask]).mean() >= target_precision:
+            incorrect_thr = float(thr)
+            break
+
+    accept = scores >= correct_thr
+    reject = scores <= incorrect_thr
+    decided = accept | reject
+    report = {
+        "n_samples": int(len(scores)),
+        "target_precision": target_precision,
+        "skip_rate": float(decided.mean()) if len(scores) else 0.0,
+        "agreement": float(((accept & labels) | (reject & ~labels)).sum() / decided.sum()) if decided.any() else None,
+    }
+    if np.isinf(correct_thr) and np.isinf(incorrect_thr):
+        return None, report
+    return GraderThresholds(correct_thr=correct_thr, incorrect_thr=incorrect_thr, sim_weight=sim_weight), report
@@ -0,0 +1,101 @@
+"""
+프로세스 단위 모델 레지스트리
+
+답안 제출마다 SentenceTransformer / XGBoost(joblib)를 새로 만들지 않도록
+프로세스당 한 번만 로드해서 재사용합니다. (SpeechClient 등 외부 API 클라이언트는 core.clients 풀)
+
+- get_or_load(key, loader): key에 해당하는 객체가 없을 때만 loader()를 호출 (스레드 안전, gthread 대응)
+- fork_safe=False로 등록한 객체(gRPC 채널 / 소켓을 가진 객체)는 fork된 자식 프로세스에서 버리고 다시 생성
+  (gunicorn --preload: 마스터에서 로드한 SBERT/XGBoost는 워커들이 copy-on-write로 공유)
+- warmup_models(): 서버 시작 시 모델 로드 + 더미 encode/predict + 필러 seed 프로토타입 계산, 로컬 모델이 없으면 바로 실패
+"""
+
+import logging
+import os
+import threading
+import time
+
+from django.core.exceptions import ImproperlyConfigured
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.RLock()
+_models = {}
+_fork_unsafe_keys = set()
+
+
+def get_or_load(key, loader, fork_safe=True):
+    """key로 등록된 객체를 반환, 없으면 loader()로 로드해서 등록"""
+    model = _models.get(key)
+    if model is not None:
+        return model
+
+    with _lock:
+        model = _models.get(key)
+        if model is None:
+            start = time.perf_counter()
+            model = loader()
+            _models[key] = model
+            if not fork_safe:
+                _fork_unsafe_keys.add(key)
+            logger.info(f"[ModelRegistry] 로드 완료 - key={key}, {time.perf_counter() - start:.2f}s")
+    return model
+
+
+def is_loaded(key):
+    return key in _models
+
+
+def clear():
+    """등록된 모든 객체 제거 (테스트 / 모델 교체용)"""
+    with _lock:
+        _models.clear()
+        _fork_unsafe_keys.clear()
+
+
+def _reset_after_fork():
+    global _lock
+    _lock = threading.RLock()
+    for key in list(_fork_unsafe_keys):
+        _models.pop(key, None)
+    _fork_unsafe_keys.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def warmup_models(include_speech_client=True):
+    """
+    SBERT / XGBoost / SpeechClient를 미리 로드하고 더미 입력으로 한 번씩 실행
+
+    로컬 SBERT(KR_SBERT_local)나 XGBoost 모델 파일이 없으면 ImproperlyConfigured를 발생시켜
+    첫 요청에서 조용히 다운로드/실패하는 대신 서버 시작 단계에서 실패합니다.
+    """
+    # 순환 import 방지 (각 모듈이 이 레지스트리를 import함)
+    from .feature_extractor.extract_all_features import DEFAULT_SBERT_MODEL_PATH, get_sbert_model
+    from .feature_extractor.extract_features_from_script import filler_seed_prototype
+    from .inference import DEFAULT_MODEL_PATH, FEATURE_COLUMNS, build_feature_row, get_xgb_model
+
+    if not os.path.isdir(DEFAULT_SBERT_MODEL_PATH):
+        raise ImproperlyConfigured(f"로컬 SBERT 모델을 찾을 수 없습니다: {DEFAULT_SBERT_MODEL_PATH}")
+    if not os.path.isfile(DEFAULT_MODEL_PATH):
+        raise ImproperlyConfigured(f"XGBoost 모델 파일을 찾을 수 없습니다: {DEFAULT_MODEL_PATH}")
+
+    start = time.perf_counter()
+
+    sbert = get_sbert_model()
+    sbert.encode(["워밍업 문장입니다."], normalize_embeddings=True)
+    filler_seed_prototype(sbert)  # 필러 seed 프로토타입은 모델 로드당 한 번만 계산
+
+    import pandas as pd
+
+    xgb = get_xgb_model(DEFAULT_MODEL_PATH)
+    xgb.predict(pd.DataFrame([build_feature_row({})], columns=FEATURE_COLUMNS))
+
+    if include_speech_client:
+        from .wave_to_text import get_speech_client
+
+        get_speech_client()
+
+    logger.info(f"[ModelRegistry] 워밍업 완료 - {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,151 @@
+"""
+꼬리 질문 actor LLM 추측 실행 (speculative execution)
+
+actor 호출은 planner(정오답 판정)가 끝나야 bucket이 정해져 시작할 수 있습니다.
+transcript와 eval_grade가 나오면 정오답을 싸게 추정(로컬 판정기 점수, 없으면 eval_grade)해서
+예상 bucket으로 actor 호출을 planner와 동시에 시작하고,
+planner 결과로 정해진 bucket이 같으면 그 결과를 그대로 사용, 다르면 취소(아직 시작 전) 또는 버립니다.
+
+- SpeculativeActor.start(...): 예상 bucket으로 actor 호출을 전용 스레드 풀에 제출하고 Speculation 반환
+- Speculation.take(bucket, timeout) / discard(): generate_tail_question(speculation=...)의 actor / only_correct 노드에서 호출
+  (시간 예산이 있는 요청은 추측 호출도 같은 제한 시간을 쓰고, take는 남은 시간만큼만 기다림)
+- stats(): hit / miss / 취소 횟수, hit rate, 버려진 호출이 쓴 prompt / completion 토큰 (프로세스 단위)
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+from . import model_registry
+from .tail_question_generator.generate_questions_routed import generate_actor_response
+from .tail_question_generator.llm_usage import extract_usage
+
+logger = logging.getLogger(__name__)
+
+SPECULATIVE_ACTOR_MAX_WORKERS = int(os.getenv("SPECULATIVE_ACTOR_MAX_WORKERS", "4"))
+
+# 추측 실행 전용 풀 (파이프라인 풀에서 기다리는 단계가 추측 호출 때문에 밀리지 않도록 분리)
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=SPECULATIVE_ACTOR_MAX_WORKERS, thread_name_prefix="spec")
+    return _executor
+
+
+def _reset_after_fork():
+    global _executor, _executor_lock
+    _executor = None
+    _executor_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class Speculation:
+    """예상 bucket으로 시작한 actor 호출 하나 (take / discard 중 한 번만 처리)"""
+
+    def __init__(self, owner: "SpeculativeActor", bucket: str, future: Future):
+        self.owner = owner
+        self.bucket = bucket
+        self.future = future
+        self._resolved = False
+
+    def take(self, bucket: str, timeout: Optional[float] = None) -> Optional[dict]:
+        """
+        실제 bucket이 예상과 같으면 추측 호출 결과(꼬리 질문), 다르거나 호출이 실패했으면 None
+        timeout초 안에 끝나지 않으면 miss로 집계하고 TimeoutError 발생 (시간 예산 요청은 꼬리 질문을 작업 큐로 미룸)
+        """
+        if self._resolved:
+            return None
+        if bucket != self.bucket:
+            self.discard()
+            return None
+        self._resolved = True
+        try:
+            response, _ = self.future.result(timeout=timeout)
+        except Exception as e:
+            if not self.future.done():
+                # 남은 시간 예산 안에 끝나지 않음: actor를 다시 호출할 시간도 없으므로 그대로 예외 전달
+                logger.warning(f"[speculative_actor] 추측 actor 호출이 {timeout:.1f}초 안에 끝나지 않음")
+                self.owner._count("misses")
+                self.future.add_done_callback(self.owner._record_wasted)
+                raise
+            logger.warning(f"[speculative_actor] 추측 actor 호출 실패, 다시 호출: {e}")
+            self.owner._count("errors")
+            return None
+        self.owner._count("hits")
+        return response
+
+    def discard(self):
+        """결과를 쓰지 않음: 아직 시작 전이면 취소, 이미 실행 중이면 끝난 뒤 사용한 토큰을 낭비로 집계"""
+        if self._resolved:
+            return
+        self._resolved = True
+        self.owner._count("misses")
+        if self.future.cancel():
+            self.owner._count("cancelled")
+        else:
+            self.future.add_done_callback(self.owner._record_wasted)
+
+
+class SpeculativeActor:
+    """추측 actor 호출 제출 + hit rate / 낭비 토큰 집계 (스레드 안전)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {"started": 0, "hits": 0, "misses": 0, "cancelled": 0, "errors": 0}
+        self.wasted_prompt_tokens = 0
+        self.wasted_completion_tokens = 0
+
+    def start(
+        self, question: str, model_answer: str, student_answer: str, bucket: str, timeout: Optional[float] = None
+    ) -> Speculation:
+        future = _get_executor().submit(
+            generate_actor_response,
+            question,
+            model_answer,
+            student_answer,
+            bucket,
+            "actor_speculative",
+            timeout=timeout,
+        )
+        self._count("started")
+        return Speculation(self, bucket, future)
+
+    def _count(self, key: str):
+        with self._lock:
+            self.counts[key] += 1
+
+    def _record_wasted(self, future: Future):
+        try:
+            _, reply = future.result()
+        except Exception:
+            return
+        usage = extract_usage(reply)
+        with self._lock:
+            self.wasted_prompt_tokens += usage["prompt_tokens"]
+            self.wasted_completion_tokens += usage["completion_tokens"]
+
+    def stats(self) -> dict:
+        with self._lock:
+            resolved = self.counts["hits"] + self.counts["misses"]
+            return {
+                **self.counts,
+                "hit_rate": self.counts["hits"] / resolved if resolved else 0.0,
+                "wasted_prompt_tokens": self.wasted_prompt_tokens,
+                "wasted_completion_tokens": self.wasted_completion_tokens,
+            }
+
+
+def get_speculative_actor() -> SpeculativeActor:
+    """프로세스당 하나의 SpeculativeActor (model_registry 사용)"""
+    return model_registry.get_or_load("speculative_actor", SpeculativeActor)
@@ -0,0 +1,166 @@
+"""
+답안 처리 파이프라인용 단계(Stage) DAG 실행기
+
+서로 의존하지 않는 단계(예: STT와 음향 특징 추출, 스크립트 특징과 planner LLM)를
+프로세스 공용 스레드 풀에서 동시에 실행하고, 단계별 소요 시간을 기록합니다.
+
+- run_stages(stages): 의존성이 모두 끝난 단계부터 스레드 풀에 제출, 전체 결과와 timings 반환
+- 스레드 풀은 프로세스당 하나(PIPELINE_MAX_WORKERS)로 제한 (gunicorn 워커 x 스레드 수만큼 늘어나지 않도록)
+- 풀이 가득 찬 상태(요청이 몰리거나 중첩 실행)에서도 멈추지 않도록, 아직 시작되지 않은 단계는
+  호출한 스레드가 직접 가져와 실행 (caller-runs)
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+PIPELINE_MAX_WORKERS = int(os.getenv("PIPELINE_MAX_WORKERS", "8"))
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """프로세스 공용 스레드 풀 (fork 이후 자식 프로세스에서는 새로 생성)"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=PIPELINE_MAX_WORKERS, thread_name_prefix="pipeline")
+    return _executor
+
+
+def _reset_after_fork():
+    global _executor, _executor_lock
+    _executor = None
+    _executor_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+@dataclass
+class Stage:
+    """
+    name: 단계 이름 (결과 dict의 key)
+    func: 의존 단계 결과 dict({dep_name: result})를 받아 결과를 반환하는 함수
+    deps: 먼저 끝나야 하는 단계 이름들
+    """
+
+    name: str
+    func: Callable[[Dict[str, Any]], Any]
+    deps: Tuple[str, ...] = ()
+
+
+@dataclass
+class StageRun:
+    results: Dict[str, Any] = field(default_factory=dict)
+    timings: Dict[str, Dict[str, float]] = field(
+        default_factory=dict
+    )  # {name: {"start": 오프셋(s), "seconds": 소요(s)}}
+    total_seconds: float = 0.0
+
+    def format_timings(self) -> str:
+        parts = [f"{name}={t['seconds']:.2f}s" for name, t in sorted(self.timings.items(), key=lambda x: x[1]["start"])]
+        return ", ".join(parts) + f" (total={self.total_seconds:.2f}s)"
+
+
+class StageError(Exception):
+    """특정 단계에서 발생한 예외 (원본 예외는 error / __cause__, 실패 전까지 끝난 단계 결과는 results)"""
+
+    def __init__(self, stage: str, error: BaseException, results: Dict[str, Any] = None):
+        super().__init__(f"[{stage}] {error}")
+        self.stage = stage
+        self.error = error
+        self.results = results or {}
+
+
+def _validate(stages: List[Stage]):
+    names = [s.name for s in stages]
+    if len(set(names)) != len(names):
+        raise ValueError(f"중복된 단계 이름이 있습니다: {names}")
+    for s in stages:
+        missing = [d for d in s.deps if d not in names]
+        if missing:
+            raise ValueError(f"'{s.name}' 단계의 의존 단계가 없습니다: {missing}")
+
+
+def run_stages(stages: Iterable[Stage], executor: ThreadPoolExecutor = None) -> StageRun:
+    """
+    DAG 순서대로 단계를 실행 (독립적인 단계는 동시에)
+
+    하나라도 실패하면 아직 시작되지 않은 단계는 취소하고 StageError를 발생시킵니다.
+    """
+    stages = list(stages)
+    _validate(stages)
+    executor = executor or get_executor()
+
+    run = StageRun()
+    t0 = time.perf_counter()
+    remaining = {s.name: s for s in stages}
+    running = {}  # future -> stage
+
+    def execute(stage: Stage, inputs: Dict[str, Any]):
+        start = time.perf_counter()
+        try:
+            return stage.func(inputs)
+        finally:
+            run.timings[stage.name] = {"start": start - t0, "seconds": time.perf_counter() - start}
+
+    def ready_stages():
+        return [s for s in remaining.values() if all(d in run.results for d in s.deps)]
+
+    def fail(stage, error):
+        for f in running:
+            f.cancel()
+        raise StageError(stage.name, error, dict(run.results)) from error
+
+    def run_inline(stage):
+        try:
+            run.results[stage.name] = execute(stage, {d: run.results[d] for d in stage.deps})
+        except Exception as e:
+            fail(stage, e)
+
+    while remaining or running:
+        ready = ready_stages()
+        for stage in ready:
+            del remaining[stage.name]
+
+        if len(ready) == 1 and not running:
+            # 동시에 실행할 단계가 없으면 호출 스레드에서 바로 실행 (스레드 전환 비용 절약)
+            run_inline(ready[0])
+            continue
+
+        for stage in ready:
+            running[executor.submit(execute, stage, {d: run.results[d] for d in stage.deps})] = stage
+
+        if not running:
+            if remaining:
+                raise ValueError(f"순환 의존성으로 실행할 수 없는 단계: {list(remaining)}")
+            break
+
+        # 아직 시작되지 않은 단계가 있으면 짧게 기다렸다가 직접 가져와 실행할지 확인
+        not_started = any(not f.running() and not f.done() for f in running)
+        done, _ = wait(list(running), timeout=0.05 if not_started else None, return_when=FIRST_COMPLETED)
+        if not done:
+            # 풀이 가득 차서 아직 시작되지 않은 단계는 직접 실행 (caller-runs)
+            for future, stage in list(running.items()):
+                if future.cancel():
+                    del running[future]
+                    run_inline(stage)
+                    break
+            continue
+
+        for future in done:
+            stage = running.pop(future)
+            try:
+                run.results[stage.name] = future.result()
+            except Exception as e:
+                fail(stage, e)
+
+    run.total_seconds = time.perf_counter() - t0
+    return run
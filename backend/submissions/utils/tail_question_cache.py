@@ -0,0 +1,196 @@
+"""
+꼬리 질문 캐시 (같은 base 문제에 답하는 학생들 사이에서 공유)
+
+QuestionCreateView가 같은 base 문제를 반 학생 모두의 PersonalAssignment에 복사하므로,
+비슷한 오개념을 가진 학생들은 거의 같은 (문제, 모범답안, 학생 답변, bucket) 입력으로 actor LLM을 호출합니다.
+한 번 생성한 꼬리 질문을 저장해 두고 같은 입력이면 LLM 호출 없이 바로 재사용합니다.
+
+- 정확 일치 tier: key = 문제 내용 해시(question + model_answer) + bucket + 정규화한 학생 답변
+    * 정규화: 공백/문장부호/대소문자 차이와 필러(어, 음, 그러니까 ...) 제거
+- 의미 일치 tier(선택): 같은 문제 + 같은 bucket 안에서 SBERT cosine이 임계값 이상인 답변의 꼬리 질문 재사용
+    * 문제별로 (임베딩, 정확 일치 key)를 최대 TAIL_QUESTION_SEMANTIC_MAX_PER_QUESTION개 slot에 순환 저장
+    * slot 번호는 문제별 counter key의 incr로 받고 slot마다 별도 key에 저장 (목록 하나를 읽고 고쳐 쓰지 않으므로
+      동시에 저장해도 서로의 항목을 지우지 않음, FileBasedCache의 incr는 프로세스 간 원자적이지 않아 드물게 slot이 겹칠 수 있음)
+- 저장소: Django cache alias "tail_questions" (settings.CACHES, TTL / 최대 개수 초과 시 cull)
+    * 기본 LocMemCache(프로세스 내), TAIL_QUESTION_CACHE_DIR를 지정하면 FileBasedCache로 워커 간 공유
+- stats(): 정확 / 의미 hit, miss, 저장 횟수와 hit rate (프로세스 단위)
+    * peek()은 hit/miss를 세지 않는 조회 (실제 actor 호출을 대신하지 않는 사전 확인용)
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import Callable, List, Optional
+
+import numpy as np
+from django.core.cache import caches
+
+from . import model_registry
+from .feature_extractor.extract_features_from_script import FILLER_BASE, normalize_text_basic, tokenize_ko
+
+logger = logging.getLogger(__name__)
+
+TAIL_QUESTION_CACHE_ALIAS = "tail_questions"
+TAIL_QUESTION_SEMANTIC_THRESHOLD = float(os.getenv("TAIL_QUESTION_SEMANTIC_THRESHOLD", "0.92"))
+TAIL_QUESTION_SEMANTIC_MAX_PER_QUESTION = int(os.getenv("TAIL_QUESTION_SEMANTIC_MAX_PER_QUESTION", "200"))
+
+# 캐시 값 형식 / 프롬프트가 바뀌면 올려서 이전 항목을 무효화
+_KEY_VERSION = "v1"
+
+
+def question_hash(question: str, model_answer: str) -> str:
+    """문제 내용 해시 (학생마다 복사된 Question이라도 내용이 같으면 같은 값)"""
+    text = normalize_text_basic(question or "") + "\x1f" + normalize_text_basic(model_answer or "")
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+def normalize_answer(student_answer: str) -> str:
+    """학생 답변 정규화: 토큰만 남기고 소문자화, 필러 토큰 제거"""
+    tokens = tokenize_ko(normalize_text_basic(student_answer or "").lower())
+    return " ".join(tok for tok in tokens if tok not in FILLER_BASE)
+
+
+class TailQuestionCache:
+    """
+    꼬리 질문 캐시 (정확 일치 + 선택적 의미 일치, 스레드 안전한 hit/miss 집계)
+
+    encoder: 텍스트 목록 -> 임베딩 행렬. None이면 의미 일치 tier를 쓰지 않음
+    """
+
+    def __init__(
+        self,
+        alias: str = TAIL_QUESTION_CACHE_ALIAS,
+        encoder: Optional[Callable[[List[str]], np.ndarray]] = None,
+        semantic_thr: float = TAIL_QUESTION_SEMANTIC_THRESHOLD,
+        semantic_max_per_question: int = TAIL_QUESTION_SEMANTIC_MAX_PER_QUESTION,
+    ):
+        self.store = caches[alias]
+        self.encoder = encoder
+        self.semantic_thr = semantic_thr
+        self.semantic_max_per_question = semantic_max_per_question
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def _exact_key(self, qhash: str, bucket: str, answer_norm: str) -> str:
+        answer_hash = hashlib.sha256(answer_norm.encode("utf-8")).hexdigest()[:32]
+        return f"tailq:{_KEY_VERSION}:{qhash}:{bucket}:{answer_hash}"
+
+    def _semantic_counter_key(self, qhash: str, bucket: str) -> str:
+        return f"tailq-sem-n:{_KEY_VERSION}:{qhash}:{bucket}"
+
+    def _semantic_slot_key(self, qhash: str, bucket: str, slot: int) -> str:
+        return f"tailq-sem:{_KEY_VERSION}:{qhash}:{bucket}:{slot}"
+
+    def _neighbours(self, qhash: str, bucket: str) -> list:
+        """같은 문제 + bucket으로 저장된 (float16 임베딩 bytes, 정확 일치 key) 목록"""
+        stored = int(self.store.get(self._semantic_counter_key(qhash, bucket)) or 0)
+        slots = range(min(stored, self.semantic_max_per_question))
+        keys = [self._semantic_slot_key(qhash, bucket, slot) for slot in slots]
+        return list(self.store.get_many(keys).values()) if keys else []
+
+    def _next_slot(self, qhash: str, bucket: str) -> int:
+        counter_key = self._semantic_counter_key(qhash, bucket)
+        # incr가 get + set으로 구현된 backend(FileBasedCache)도 프로세스 안에서는 겹치지 않도록 lock
+        with self._lock:
+            self.store.add(counter_key, 0)
+            try:
+                stored = self.store.incr(counter_key)
+            except ValueError:  # add와 incr 사이에 만료 / cull된 경우
+                self.store.set(counter_key, 1)
+                stored = 1
+        return (stored - 1) % self.semantic_max_per_question
+
+    def _embed(self, text: str) -> Optional[np.ndarray]:
+        try:
+            vec = np.asarray(self.encoder([text]), dtype=np.float32).reshape(-1)
+        except Exception as e:
+            logger.warning(f"[TailQuestionCache] 임베딩 계산 실패, 의미 일치 tier 건너뜀: {e}")
+            return None
+        norm = float(np.linalg.norm(vec))
+        return vec / norm if norm > 0 else None
+
+    def _count(self, counter: str):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, question: str, model_answer: str, student_answer: str, bucket: str) -> Optional[dict]:
+        """저장된 꼬리 질문(actor response dict) 반환, 없으면 None"""
+        response, counter = self._lookup(question, model_answer, student_answer, bucket)
+        self._count(counter)
+        return response
+
+    def peek(self, question: str, model_answer: str, student_answer: str, bucket: str) -> Optional[dict]:
+        """get과 같은 조회지만 hit/miss 집계에 넣지 않음"""
+        return self._lookup(question, model_answer, student_answer, bucket)[0]
+
+    def _lookup(self, question: str, model_answer: str, student_answer: str, bucket: str):
+        """(저장된 꼬리 질문 또는 None, 집계할 counter 이름)"""
+        qhash = question_hash(question, model_answer)
+        answer_norm = normalize_answer(student_answer)
+
+        entry = self.store.get(self._exact_key(qhash, bucket, answer_norm))
+        if entry is not None:
+            return entry["response"], "exact_hits"
+
+        if self.encoder is not None and answer_norm:
+            neighbours = self._neighbours(qhash, bucket)
+            vec = self._embed(answer_norm) if neighbours else None
+            if vec is not None:
+                sims = np.array([float(np.dot(vec, np.frombuffer(emb, dtype=np.float16))) for emb, _ in neighbours])
+                best = int(np.argmax(sims))
+                if sims[best] >= self.semantic_thr:
+                    entry = self.store.get(neighbours[best][1])
+                    if entry is not None:  # 가리키는 항목이 TTL로 만료되었을 수 있음
+                        return entry["response"], "semantic_hits"
+
+        return None, "misses"
+
+    def put(self, question: str, model_answer: str, student_answer: str, bucket: str, response: dict):
+        """검증된 꼬리 질문만 저장 (question이 비어 있는 응답은 저장하지 않음)"""
+        if not response or not str(response.get("question", "")).strip():
+            return
+        qhash = question_hash(question, model_answer)
+        answer_norm = normalize_answer(student_answer)
+        exact_key = self._exact_key(qhash, bucket, answer_norm)
+
+        self.store.set(exact_key, {"response": response, "stored_at": time.time()})
+        self._count("stores")
+
+        if self.encoder is not None and answer_norm:
+            vec = self._embed(answer_norm)
+            if vec is not None:
+                slot = self._next_slot(qhash, bucket)
+                self.store.set(
+                    self._semantic_slot_key(qhash, bucket, slot), (vec.astype(np.float16).tobytes(), exact_key)
+                )
+
+    def stats(self) -> dict:
+        with self._lock:
+            hits = self.exact_hits + self.semantic_hits
+            lookups = hits + self.misses
+            return {
+                "exact_hits": self.exact_hits,
+                "semantic_hits": self.semantic_hits,
+                "misses": self.misses,
+                "stores": self.stores,
+                "hit_rate": hits / lookups if lookups else 0.0,
+            }
+
+
+def _sbert_encoder(texts: List[str]) -> np.ndarray:
+    """채점에 쓰는 SBERT 모델 + 임베딩 캐시 재사용 (같은 답변은 다시 encode하지 않음)"""
+    from .feature_extractor.extract_all_features import encode_texts
+
+    return encode_texts(texts)
+
+
+def get_tail_question_cache(semantic: bool = False) -> TailQuestionCache:
+    """프로세스당 하나의 TailQuestionCache (semantic=True면 SBERT 의미 일치 tier 사용)"""
+    return model_registry.get_or_load(
+        ("tail_question_cache", semantic), lambda: TailQuestionCache(encoder=_sbert_encoder if semantic else None)
+    )
@@ -1,14 +1,17 @@
 """
 Tail-question generator with planner-only correctness grading,
 rule-based bucket routing, and few-shot actor prompts. (No ReAct/tools)
+Actor prompts carry only the top-k few-shot examples closest to the question (prompt_examples.ExampleSelector).
 CLI: python generate_tail_questions.py --help
 """
 
 import argparse
+import functools
 import json
+import logging
 import os
 import time
-from typing import Literal, Optional, Tuple, TypedDict
+from typing import Any, Callable, Literal, Optional, Tuple, TypedDict
 
 from dotenv import load_dotenv
 from langchain_core.output_parsers import JsonOutputParser
@@ -16,23 +19,60 @@ from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 from langgraph.graph import END, StateGraph
 
+try:
+    from .hedging import hedger
+    from .json_stream import JsonStringFieldStream
+    from .llm_usage import usage_ledger
+    from .prompt_examples import ExampleSelector, compact_json, count_prompt_tokens
+    from .rate_limiter import BACKGROUND, INTERACTIVE, estimate_tokens, rate_limited_call, try_acquire
+except ImportError:  # run as a script
+    from hedging import hedger
+    from json_stream import JsonStringFieldStream
+    from llm_usage import usage_ledger
+    from prompt_examples import ExampleSelector, compact_json, count_prompt_tokens
+    from rate_limiter import BACKGROUND, INTERACTIVE, estimate_tokens, rate_limited_call, try_acquire
+
 # Environment & Models
 load_dotenv()
 if "OPENAI_API_KEY" not in os.environ:
     raise ValueError("OPENAI_API_KEY is not set")
 
 LLM_MODEL = "gpt-4o-mini"
-planner_llm = ChatOpenAI(
-    model=LLM_MODEL,
-    temperature=0,
-    model_kwargs={"response_format": {"type": "json_object"}},
-)
-actor_llm = ChatOpenAI(
-    model=LLM_MODEL,
-    temperature=0.7,
-    model_kwargs={"response_format": {"type": "json_object"}},
-)
+JSON_MODE = {"response_format": {"type": "json_object"}}
+
+
+class PooledChatModel:
+    """
+    ChatOpenAI settings for one role, resolved on every call through core.clients.get_chat_model: the client shares
+    the process-wide httpx pool (CLIENT_* limits / timeouts, keep-alive) and is re-created after fork, so nothing is
+    built at import time (gunicorn --preload master).
+    Calls given a timeout (deadline-bound answer path) use a client without SDK retries: retrying 429s is left to the
+    rate limiter, which knows the deadline, and nothing else retries past the timeout.
+    """
+
+    def __init__(self, temperature: float):
+        self.temperature = temperature
+
+    def client(self, bounded: bool = False) -> ChatOpenAI:
+        from core.clients import get_chat_model
+
+        retries = {"max_retries": 0} if bounded else {}
+        return get_chat_model(model=LLM_MODEL, temperature=self.temperature, model_kwargs=JSON_MODE, **retries)
+
+    def invoke(self, messages, **kwargs):
+        return self.client("timeout" in kwargs).invoke(messages, **kwargs)
+
+    def stream(self, messages, **kwargs):
+        return self.client("timeout" in kwargs).stream(messages, **kwargs)
+
+
+planner_llm = PooledChatModel(temperature=0)
+actor_llm = PooledChatModel(temperature=0.7)
+# Fused planner+actor call: grading needs to be deterministic, so temperature 0 like the planner. Deliberate trade-off:
+# the follow-up questions it writes are therefore less varied than the two-call actor's (temperature 0.7).
+fused_llm = PooledChatModel(temperature=0)
 parser = JsonOutputParser()
+logger = logging.getLogger(__name__)
 
 
 # ---- Few-shot examples (per strategy) ----
@@ -385,16 +425,10 @@ EXAMPLES = {
 
 
 # Prompts : English instructions; model must output Korean-only where specified
-PLANNER_PROMPT = ChatPromptTemplate.from_messages(
-    [
-        (
-            "system",
-            """You are a semantic grader for short answers that may include Korean ASR (speech-to-text) noise.
-
-Output one JSON object ONLY:
-{{"is_correct": true|false}}
-
-Decision policy (VERY IMPORTANT):
+# Layout: static instructions first, per-call content (strategy, examples, user message) last, so the provider
+# can cache the identical prefix across calls.
+# Shared by the planner and the fused planner+actor prompt (no braces: used inside prompt templates)
+GRADING_POLICY = """Decision policy (VERY IMPORTANT):
 - Judge MEANING, not wording. You may internally normalize and translate.
 - TREAT as NOISE and IGNORE: fillers ("음", "어", "그…"), hesitations, repetitions, spacing/punctuation/case, particles/josa errors, honorifics, common ASR confusions (e.g., ㄴ/ㄹ omission, spacing variants), minor morphological errors.
 - Consider SYNONYMS, paraphrases, and concise restatements as correct if they entail the model answer.
@@ -408,7 +442,20 @@ Decision policy (VERY IMPORTANT):
 - Conjunctive Requirements (AND): If the model answer requires multiple essential parts
    ("A와 B 모두/각각/동시에/둘 다"), ALL essential parts must be present → otherwise false.
 - For open-ended '방법' questions, a single correct representative method suffices unless it contradicts the model answer.
+"""
+
+PLANNER_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        (
+            "system",
+            """You are a semantic grader for short answers that may include Korean ASR (speech-to-text) noise.
 
+Output one JSON object ONLY:
+{{"is_correct": true|false}}
+
+"""
+            + GRADING_POLICY
+            + """
 Output rules:
 - No extra text or keys. Only the JSON above.
 
@@ -528,14 +575,24 @@ strategy_D = """
 """
 
 
+# Shared by the actor and the fused planner+actor prompt
+ACTOR_OUTPUT_REQUIREMENTS = """Output Requirements:
+- question ≤ 50 Korean words
+- explanation ≤ 30 Korean words
+- All fields MUST be in Korean. No extra text.
+- Do NOT use any backslash-based notation.
+- Write math in plain text only, e.g., "x > 4", "y = 2x + 1".
+- Ensure the question is conceptually aligned with the original topic.
+- Include a clear model answer and concise explanation.
+- The question should help the student **progress** from their current understanding state.
+"""
+
 ACTOR_PROMPT = ChatPromptTemplate.from_messages(
     [
         (
             "system",
-            """You are an educational follow-up question generator. Produce ONE concise Korean question.
-
-Strategy: 
-{strategy}
+            """You are an educational follow-up question generator. Produce ONE concise Korean question
+following the strategy given below.
 
 Return ONLY this JSON:
 {{
@@ -548,15 +605,11 @@ Return ONLY this JSON:
   }}
 }}
 
-Output Requirements:
-- question ≤ 50 Korean words
-- explanation ≤ 30 Korean words
-- All fields MUST be in Korean. No extra text.
-- Do NOT use any backslash-based notation.
-- Write math in plain text only, e.g., "x > 4", "y = 2x + 1".
-- Ensure the question is conceptually aligned with the original topic.
-- Include a clear model answer and concise explanation.
-- The question should help the student **progress** from their current understanding state.
+"""
+            + ACTOR_OUTPUT_REQUIREMENTS
+            + """
+Strategy:
+{strategy}
 
 Few-shot examples (multiple):
 {example}""",
@@ -566,6 +619,142 @@ Few-shot examples (multiple):
 )
 
 
+# Fused planner + actor: one call returns correctness and a follow-up for each correctness branch.
+# Confidence comes from eval_grade (known before the call), so each branch already has a fixed strategy.
+FUSED_PROMPT = ChatPromptTemplate.from_messages(
+    [
+        (
+            "system",
+            """You are a semantic grader for short answers that may include Korean ASR (speech-to-text) noise,
+and an educational follow-up question generator.
+
+Step 1. Decide whether the student answer is correct.
+"""
+            + GRADING_POLICY
+            + """
+Step 2. Write TWO concise Korean follow-up questions, one per verdict, following the strategies given below.
+Only the one matching your verdict will be shown, but BOTH must be complete.
+
+Return ONLY this JSON:
+{{
+  "is_correct": true|false,
+  "if_correct": {{
+    "topic": "<short topic name>",
+    "question": "<the follow-up question>",
+    "model_answer": "<ideal answer>",
+    "explanation": "<why this question matters and what concept it tests>",
+    "difficulty": "easy | medium | hard"
+  }},
+  "if_incorrect": {{ same keys as if_correct }}
+}}
+
+"""
+            + ACTOR_OUTPUT_REQUIREMENTS
+            + """
+Strategy if the student is correct ("if_correct"):
+{strategy_correct}
+
+Strategy if the student is incorrect ("if_incorrect"):
+{strategy_incorrect}
+
+Few-shot examples for "if_correct":
+{example_correct}
+
+Few-shot examples for "if_incorrect":
+{example_incorrect}""",
+        ),
+        ("user", "Original Question: {question}\nModel Answer: {model_answer}\nStudent Answer: {student_answer}"),
+    ]
+)
+TAIL_FIELDS = ("topic", "question", "model_answer", "explanation", "difficulty")
+
+# Few-shot inputs are embedded once per bucket; each prompt gets the top-k closest examples
+example_selector = ExampleSelector(EXAMPLES)
+
+
+# Answer-path calls that get a duplicate request when slower than their recent latency percentile (hedging.py)
+HEDGED_CALLS = ("planner", "actor")
+
+
+def _deadline(timeout: Optional[float]) -> Optional[float]:
+    # absolute end (time.monotonic()) of a call bounded by timeout: rate-limit waits and 429 backoff count against it
+    return time.monotonic() + timeout if timeout is not None else None
+
+
+def _timeout_kwargs(deadline: Optional[float]) -> dict:
+    # per-request timeout of the OpenAI client (what is left until deadline); omitted so the client default applies
+    return {"timeout": max(0.0, deadline - time.monotonic())} if deadline is not None else {}
+
+
+def _invoke_llm(
+    name: str, llm: PooledChatModel, messages, priority: str = INTERACTIVE, timeout: Optional[float] = None
+) -> Any:
+    """
+    Invoke through the shared rate limiter and record token usage (incl. provider prefix-cache hits) in the usage
+    ledger; returns the reply. Planner / actor calls are hedged when LLM_HEDGING_ENABLED is set.
+    timeout bounds the whole call (the caller's remaining deadline budget): waiting for rate-limit capacity,
+    429 backoff and the request itself.
+    Hedging runs inside the limiter, so only the request is timed / hedged, and the hedge needs free capacity.
+    """
+    deadline = _deadline(timeout)
+
+    @functools.lru_cache(maxsize=None)
+    def estimated() -> int:
+        return estimate_tokens(messages, model=LLM_MODEL)
+
+    def request(attempt: str):
+        started = time.perf_counter()
+        reply = llm.invoke(messages, **_timeout_kwargs(deadline))
+        usage_ledger.record(attempt, reply, started)
+        return reply
+
+    def call():
+        if name in HEDGED_CALLS:
+            return hedger.call(name, request, admit=lambda: try_acquire(estimated, priority))
+        return request(name)
+
+    return rate_limited_call(name, call, estimated, priority, deadline=deadline)
+
+
+def _stream_llm(
+    name: str,
+    llm: PooledChatModel,
+    messages,
+    on_question_delta: Callable[[str], None],
+    priority: str = INTERACTIVE,
+    timeout: Optional[float] = None,
+) -> Any:
+    """Streaming variant of _invoke_llm: passes the "question" field to on_question_delta as it is generated."""
+    deadline = _deadline(timeout)
+
+    def stream():
+        started = time.perf_counter()
+        field = JsonStringFieldStream("question")
+        reply = None
+        for chunk in llm.stream(messages, stream_usage=True, **_timeout_kwargs(deadline)):
+            reply = chunk if reply is None else reply + chunk
+            delta = field.feed(chunk.content if isinstance(chunk.content, str) else "")
+            if delta:
+                on_question_delta(delta)
+        usage_ledger.record(name, reply, started)
+        return reply
+
+    return rate_limited_call(
+        name, stream, lambda: estimate_tokens(messages, model=LLM_MODEL), priority, deadline=deadline
+    )
+
+
+def _log_prompt_tokens(kind: str, messages, full_example_messages: Callable[[], Any], started: float):
+    """Log prompt tokens with selected examples vs. the whole indented example list, plus LLM latency."""
+    if not logger.isEnabledFor(logging.INFO):
+        return
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    after, exact = count_prompt_tokens(messages, LLM_MODEL)
+    before, _ = count_prompt_tokens(full_example_messages(), LLM_MODEL)
+    approx = "" if exact else "~"
+    logger.info(f"{kind} prompt tokens {approx}{before} -> {approx}{after} (LLM latency {elapsed_ms:.0f}ms)")
+
+
 # Rule-based policy
 def decide_bucket_confidence(is_correct: bool, eval_grade: float, high_thr: float = 4) -> Tuple[str, str, str, dict]:
     """Return (bucket, confidence, strategy, example) from correctness & eval_grade."""
@@ -589,6 +778,33 @@ def decide_bucket_confidence(is_correct: bool, eval_grade: float, high_thr: floa
     return bucket, confidence, strategy, example
 
 
+BUCKET_STRATEGIES = {
+    "A": (strategy_A, EXAMPLES["A"]),
+    "B": (strategy_B, EXAMPLES["B"]),
+    "C": (strategy_C, EXAMPLES["C"]),
+    "D": (strategy_D, EXAMPLES["D"]),
+}
+
+# Stand-in student answers for precomputing a tail question before anyone has answered
+# (the bucket strategy, not the wording, drives the follow-up). Bucket C has no realistic stand-in:
+# the wrong answer it targets is described in the strategy instead, never shown as something the student said.
+PRECOMPUTE_STUDENT_ANSWERS = {
+    "A": "{model_answer}",
+    "B": "{model_answer} …맞나요?",
+    "C": "",
+    "D": "잘 모르겠어요.",
+}
+# Appended to the bucket strategy: a precomputed follow-up is served to every student in the bucket
+PRECOMPUTE_STRATEGY_NOTE = (
+    "This follow-up is reused for every student in this group, so do not quote or react to the wording of the "
+    "student answer."
+)
+PRECOMPUTE_BUCKET_NOTES = {
+    "C": "No student answer is given: assume the student confidently stated the most common misconception about "
+    "this question, and target that misconception.",
+}
+
+
 def decide_plan(bucket: str, recalled_time: int) -> Literal["ASK", "ONLY_CORRECT"]:
     """Route by recalled_time & bucket."""
     if recalled_time == 0:
@@ -616,19 +832,38 @@ class ReplanState(TypedDict):
     plan: Optional[str]
     # final result including tail question
     result: Optional[dict]
+    # optional shared cache of generated tail questions (get(...) / put(...), see tail_question_cache)
+    tail_cache: Optional[Any]
+    cache_hit: Optional[bool]
+    # optional actor call started early for a predicted bucket (take(bucket) / discard(), see speculative_actor)
+    speculation: Optional[Any]
+    # optional callback receiving the tail question text incrementally (streaming actor call)
+    on_question_delta: Optional[Callable[[str], None]]
+    # optional per-request timeout (seconds) of the planner / actor LLM calls (remaining deadline budget)
+    llm_timeout: Optional[float]
+
+
+def judge_correctness(question: str, model_answer: str, student_answer: str, timeout: Optional[float] = None) -> bool:
+    """Planner LLM call only: needs just the transcript, so it can run alongside feature extraction."""
+    msg = PLANNER_PROMPT.format_messages(
+        question=question,
+        model_answer=model_answer,
+        student_answer=student_answer,
+    )
+    out = _invoke_llm("planner", planner_llm, msg, timeout=timeout).content
+    data = parser.parse(out)  # {"is_correct": true|false}
+    return bool(data["is_correct"])
 
 
 # Nodes
 def planner_node(state: ReplanState) -> ReplanState:
     """Return only is_correct from LLM; everything else is rule-based."""
-    msg = PLANNER_PROMPT.format_messages(
-        question=state["question"],
-        model_answer=state["model_answer"],
-        student_answer=state["student_answer"],
+    if state.get("is_correct") is not None:
+        # already judged upstream (judge_correctness ran in parallel with feature extraction)
+        return state
+    is_correct = judge_correctness(
+        state["question"], state["model_answer"], state["student_answer"], timeout=state.get("llm_timeout")
     )
-    out = planner_llm.invoke(msg).content
-    data = parser.parse(out)  # {"is_correct": true|false}
-    is_correct = bool(data["is_correct"])
     return {**state, "is_correct": is_correct}
 
 
@@ -643,18 +878,72 @@ def derive_and_route_node(state: ReplanState) -> ReplanState:
     return {**state, "bucket": bucket, "confidence": confidence, "strategy": strategy, "example": example, "plan": plan}
 
 
+def generate_actor_response(
+    question: str,
+    model_answer: str,
+    student_answer: str,
+    bucket: str,
+    name: str = "actor",
+    on_question_delta: Optional[Callable[[str], None]] = None,
+    priority: str = INTERACTIVE,
+    timeout: Optional[float] = None,
+    strategy_note: str = "",
+) -> Tuple[dict, Any]:
+    """
+    One actor call with the bucket's strategy; returns (tail question, raw LLM reply carrying token usage).
+    With on_question_delta the call is streamed and the question text is passed on as it is generated.
+    priority is the rate-limiter class of the call (BACKGROUND for precomputed tails); timeout bounds the request.
+    strategy_note is appended to the strategy (instructions that must not pose as the student's answer).
+    """
+    strategy, bucket_examples = BUCKET_STRATEGIES[bucket]
+    if strategy_note:
+        strategy = f"{strategy}\n{strategy_note}"
+    prompt_args = dict(question=question, model_answer=model_answer, student_answer=student_answer, strategy=strategy)
+    examples = example_selector.select(bucket, question, model_answer)
+    msg = ACTOR_PROMPT.format_messages(**prompt_args, example=compact_json(examples))
+    started = time.perf_counter()
+    if on_question_delta is None:
+        reply = _invoke_llm(name, actor_llm, msg, priority, timeout)
+    else:
+        reply = _stream_llm(name, actor_llm, msg, on_question_delta, priority, timeout)
+    _log_prompt_tokens(
+        f"{name}[{bucket}]",
+        msg,
+        lambda: ACTOR_PROMPT.format_messages(
+            **prompt_args, example=json.dumps(bucket_examples, ensure_ascii=False, indent=2)
+        ),
+        started,
+    )
+    return parser.parse(reply.content)["response"], reply
+
+
 def actor_node(state: ReplanState) -> ReplanState:
-    """Generate the tail question; increment recalled_time in result."""
+    """Generate the tail question (or reuse a cached / speculative one); increment recalled_time in result."""
     next_rt = int(state["recalled_time"]) + 1
-    msg = ACTOR_PROMPT.format_messages(
-        question=state["question"],
-        model_answer=state["model_answer"],
-        student_answer=state["student_answer"],
-        strategy=state["strategy"],
-        example=json.dumps(state["example"], ensure_ascii=False, indent=2),
-    )
-    out = actor_llm.invoke(msg).content
-    response = parser.parse(out)["response"]
+    cache = state.get("tail_cache")
+    speculation = state.get("speculation")
+    on_delta = state.get("on_question_delta")
+    cache_args = (state["question"], state["model_answer"], state["student_answer"], state["bucket"])
+
+    response = cache.get(*cache_args) if cache is not None else None
+    cache_hit = response is not None
+    streamed = False
+    if cache_hit:
+        if speculation is not None:
+            speculation.discard()
+    else:
+        response = (
+            speculation.take(state["bucket"], timeout=state.get("llm_timeout")) if speculation is not None else None
+        )
+        if response is None:
+            response, _ = generate_actor_response(
+                *cache_args, on_question_delta=on_delta, timeout=state.get("llm_timeout")
+            )
+            streamed = on_delta is not None
+        if cache is not None:
+            cache.put(*cache_args, response)
+    if on_delta is not None and not streamed and response and response.get("question"):
+        on_delta(response["question"])  # cached / speculative question arrives in one piece
     # final result
     result = {
         "plan": "ASK",
@@ -664,11 +953,13 @@ def actor_node(state: ReplanState) -> ReplanState:
         "recalled_time": next_rt,
         "response": response,
     }
-    return {**state, "result": result}
+    return {**state, "result": result, "cache_hit": cache_hit}
 
 
 def only_correct_node(state: ReplanState) -> ReplanState:
     """Return only correctness (and counters); no generation."""
+    if state.get("speculation") is not None:
+        state["speculation"].discard()
     next_rt = int(state["recalled_time"]) + 1
     result = {
         "plan": "ONLY_CORRECT",
@@ -681,6 +972,22 @@ def only_correct_node(state: ReplanState) -> ReplanState:
     return {**state, "result": result}
 
 
+def generate_bucket_tail_question(question: str, model_answer: str, bucket: str) -> dict:
+    """Actor call for a bucket without a real student answer (precomputed at question-creation time)."""
+    student_answer = PRECOMPUTE_STUDENT_ANSWERS[bucket].format(model_answer=model_answer)
+    note = " ".join(filter(None, (PRECOMPUTE_STRATEGY_NOTE, PRECOMPUTE_BUCKET_NOTES.get(bucket))))
+    response, _ = generate_actor_response(
+        question,
+        model_answer,
+        student_answer,
+        bucket,
+        name="actor_precompute",
+        priority=BACKGROUND,
+        strategy_note=note,
+    )
+    return response
+
+
 # Conditional routing
 def route_after_derive(state: ReplanState) -> Literal["ASK", "ONLY_CORRECT"]:
     return state["plan"] or "ASK"
@@ -710,7 +1017,28 @@ app = graph.compile()
 
 
 # returns final output (return empty tail question if not generated)
-def generate_tail_question(question, model_answer, student_answer, eval_grade, recalled_time, high_thr=4):
+def generate_tail_question(
+    question,
+    model_answer,
+    student_answer,
+    eval_grade,
+    recalled_time,
+    high_thr=4,
+    is_correct=None,
+    tail_cache=None,
+    speculation=None,
+    on_question_delta=None,
+    timeout=None,
+):
+    """
+    is_correct: pass a precomputed judge_correctness() verdict to skip the planner LLM call.
+    tail_cache: optional TailQuestionCache; a hit reuses a stored tail question instead of calling the actor LLM.
+    speculation: optional actor call already started for a predicted bucket; used if the bucket matches,
+        discarded otherwise.
+    on_question_delta: optional callback; the actor call is streamed and the tail question text is passed to it
+        incrementally (in one piece when it comes from the cache or a speculative call).
+    timeout: optional per-request timeout (seconds) of the LLM calls; the error propagates when it is exceeded.
+    """
     init: ReplanState = {
         "question": question,
         "model_answer": model_answer,
@@ -718,11 +1046,16 @@ def generate_tail_question(question, model_answer, student_answer, eval_grade, r
         "eval_grade": float(eval_grade),
         "recalled_time": int(recalled_time),
         "high_thr": float(high_thr),
-        "is_correct": None,
+        "is_correct": is_correct,
         "bucket": None,
         "confidence": None,
         "plan": None,
         "result": None,
+        "tail_cache": tail_cache,
+        "cache_hit": None,
+        "speculation": speculation,
+        "on_question_delta": on_question_delta,
+        "llm_timeout": timeout,
     }
 
     out = app.invoke(init)
@@ -741,10 +1074,111 @@ def generate_tail_question(question, model_answer, student_answer, eval_grade, r
         "plan": res.get("plan"),
         "recalled_time": res.get("recalled_time"),
         "tail_question": res.get("response") or empty_tail,
+        "cache_hit": bool(out.get("cache_hit")),
     }
     return payload
 
 
+def plan_always_asks(recalled_time: int) -> bool:
+    """True if decide_plan() returns ASK for every bucket (correctness cannot change the plan)."""
+    return all(decide_plan(bucket, recalled_time) == "ASK" for bucket in BUCKET_STRATEGIES)
+
+
+def _parse_fused_output(out: str) -> Tuple[bool, dict, dict]:
+    """Return (is_correct, if_correct, if_incorrect); ValueError if a branch is missing or incomplete."""
+    data = parser.parse(out)
+    is_correct = data["is_correct"]
+    if not isinstance(is_correct, bool):
+        raise ValueError(f"is_correct is not a boolean: {is_correct!r}")
+    branches = []
+    for key in ("if_correct", "if_incorrect"):
+        branch = data.get(key)
+        if not isinstance(branch, dict) or not str(branch.get("question") or "").strip():
+            raise ValueError(f"fused output has no '{key}' question")
+        branches.append({field: branch.get(field, "") for field in TAIL_FIELDS})
+    return is_correct, branches[0], branches[1]
+
+
+def generate_tail_question_fused(
+    question, model_answer, student_answer, eval_grade, recalled_time, high_thr=4, tail_cache=None
+):
+    """
+    Planner + actor in a single LLM call, for plans that are ASK whatever the correctness (recalled_time == 0).
+
+    The call returns correctness plus one follow-up per correctness branch; decide_bucket_confidence then picks
+    the branch locally. Falls back to the two-call generate_tail_question() when the plan may be ONLY_CORRECT,
+    when both candidate buckets are already cached (the planner call alone is enough), or when the fused call
+    fails or returns incomplete JSON. Same payload as generate_tail_question() plus "fused".
+    The single call runs at the planner's temperature 0 (correctness must be deterministic), so its follow-up
+    questions are less varied than the two-call path's actor at temperature 0.7.
+    """
+    fallback = dict(
+        question=question,
+        model_answer=model_answer,
+        student_answer=student_answer,
+        eval_grade=eval_grade,
+        recalled_time=recalled_time,
+        high_thr=high_thr,
+        tail_cache=tail_cache,
+    )
+    if not plan_always_asks(int(recalled_time)):
+        return {**generate_tail_question(**fallback), "fused": False}
+
+    branch_buckets = {verdict: decide_bucket_confidence(verdict, eval_grade, high_thr)[0] for verdict in (True, False)}
+    # peek: this is only a routing check; actor_node does the counted lookup if we fall back
+    if tail_cache is not None and all(
+        tail_cache.peek(question, model_answer, student_answer, bucket) is not None
+        for bucket in branch_buckets.values()
+    ):
+        return {**generate_tail_question(**fallback), "fused": False}
+
+    try:
+        correct_bucket, incorrect_bucket = branch_buckets[True], branch_buckets[False]
+        prompt_args = dict(
+            question=question,
+            model_answer=model_answer,
+            student_answer=student_answer,
+            strategy_correct=BUCKET_STRATEGIES[correct_bucket][0],
+            strategy_incorrect=BUCKET_STRATEGIES[incorrect_bucket][0],
+        )
+        msg = FUSED_PROMPT.format_messages(
+            **prompt_args,
+            example_correct=compact_json(example_selector.select(correct_bucket, question, model_answer)),
+            example_incorrect=compact_json(example_selector.select(incorrect_bucket, question, model_answer)),
+        )
+        started = time.perf_counter()
+        out = _invoke_llm("fused", fused_llm, msg).content
+        _log_prompt_tokens(
+            f"fused[{correct_bucket}/{incorrect_bucket}]",
+            msg,
+            lambda: FUSED_PROMPT.format_messages(
+                **prompt_args,
+                example_correct=json.dumps(EXAMPLES[correct_bucket], ensure_ascii=False, indent=2),
+                example_incorrect=json.dumps(EXAMPLES[incorrect_bucket], ensure_ascii=False, indent=2),
+            ),
+            started,
+        )
+        is_correct, if_correct, if_incorrect = _parse_fused_output(out)
+    except Exception as e:
+        logger.warning(f"fused planner+actor call failed, falling back to two calls: {e}")
+        return {**generate_tail_question(**fallback), "fused": False}
+
+    bucket, confidence, _, _ = decide_bucket_confidence(is_correct, eval_grade, high_thr)
+    response = if_correct if is_correct else if_incorrect
+    if tail_cache is not None:
+        tail_cache.put(question, model_answer, student_answer, bucket, response)
+    return {
+        "is_correct": is_correct,
+        "confidence": confidence,
+        "bucket": bucket,
+        "plan": "ASK",
+        "recalled_time": int(recalled_time) + 1,
+        "tail_question": response,
+        "cache_hit": False,
+        "fused": True,
+    }
+
+
 if __name__ == "__main__":  # pragma: no cover
     ap = argparse.ArgumentParser(description="Planner-only correctness; rule-based routing; always output correctness.")
     ap.add_argument("--question", "-q", type=str, default="호흡 운동에서 가슴이 부풀어 오르는 이유는 무엇인가요?")
@@ -755,10 +1189,11 @@ if __name__ == "__main__":  # pragma: no cover
     ap.add_argument("--confidence", "-c", type=float, default=2, help="eval_grade")
     ap.add_argument("--recalled-time", "-r", type=int, default=0)
     ap.add_argument("--high-thr", type=float, default=4, help="confidence high threshold")
+    ap.add_argument("--fused", action="store_true", help="single planner+actor call when the plan is always ASK")
     args = ap.parse_args()
 
     t0_total = time.perf_counter()
-    payload = generate_tail_question(
+    payload = (generate_tail_question_fused if args.fused else generate_tail_question)(
         question=args.question,
         model_answer=args.model_answer,
         student_answer=args.student_answer,
@@ -0,0 +1,201 @@
+"""
+Hedged LLM requests for the answer path (planner / actor).
+
+gpt-4o-mini latency has a long tail: most calls return in about a second, a few take several. When a call has not
+returned by the LLM_HEDGE_PERCENTILE of its recent latencies, a duplicate request is sent and whichever finishes first
+is used. The other one is cancelled if it has not started yet; a request already on the wire cannot be aborted from
+the sync client, so its result is dropped (its tokens still show up in the usage ledger as "<name>_hedge").
+
+- Per-call-name rolling latency window (LLM_HEDGE_WINDOW samples); no hedging until LLM_HEDGE_MIN_SAMPLES are seen
+- Hedge rate cap: at most LLM_HEDGE_MAX_RATE of the recent calls may be hedged, so a slow provider does not double load
+- Errors are not hedged (retries are left to the rate limiter / SDK); if the first finisher failed, the other is used
+- Only the request itself is timed and hedged: callers run hedger.call() after the rate limiter admitted the call, and
+  the duplicate is sent only if admit() gets it capacity right away (no hedge while the limiter throttles)
+- Opt-in with LLM_HEDGING_ENABLED; hedger.stats() reports calls, hedges and how often the hedge won
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FuturesTimeoutError
+from concurrent.futures import wait
+from typing import Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+LLM_HEDGING_ENABLED = os.getenv("LLM_HEDGING_ENABLED", "False").lower() in ("true", "1")
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "95"))
+LLM_HEDGE_MAX_RATE = float(os.getenv("LLM_HEDGE_MAX_RATE", "0.1"))
+LLM_HEDGE_WINDOW = int(os.getenv("LLM_HEDGE_WINDOW", "200"))
+LLM_HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+LLM_HEDGE_MAX_WORKERS = int(os.getenv("LLM_HEDGE_MAX_WORKERS", "16"))
+
+T = TypeVar("T")
+
+# Primary and hedge both run here so the caller can take whichever finishes first
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=LLM_HEDGE_MAX_WORKERS, thread_name_prefix="hedge")
+    return _executor
+
+
+def _reset_after_fork():
+    global _executor, _executor_lock
+    _executor = None
+    _executor_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+class LatencyWindow:
+    """The last `size` successful latencies (seconds) of one call name."""
+
+    def __init__(self, size: int):
+        self._samples: "deque[float]" = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, p: float) -> Optional[float]:
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        return samples[min(len(samples), max(1, math.ceil(p / 100 * len(samples)))) - 1]
+
+
+class Hedger:
+    """Runs a call, and a duplicate of it once the call is slower than the recent percentile (thread safe)."""
+
+    def __init__(
+        self,
+        enabled: bool = LLM_HEDGING_ENABLED,
+        percentile: float = LLM_HEDGE_PERCENTILE,
+        max_rate: float = LLM_HEDGE_MAX_RATE,
+        window: int = LLM_HEDGE_WINDOW,
+        min_samples: int = LLM_HEDGE_MIN_SAMPLES,
+    ):
+        self.enabled = enabled
+        self.percentile = percentile
+        self.max_rate = max_rate
+        self.window = window
+        self.min_samples = min_samples
+        self._latency: Dict[str, LatencyWindow] = {}
+        self._decisions: "deque[bool]" = deque(maxlen=window)  # True for each recent call that was hedged
+        self._lock = threading.Lock()
+        self.counts = {"calls": 0, "hedged": 0, "hedge_wins": 0, "rate_capped": 0, "throttled": 0}
+
+    def _window(self, name: str) -> LatencyWindow:
+        with self._lock:
+            return self._latency.setdefault(name, LatencyWindow(self.window))
+
+    def threshold(self, name: str) -> Optional[float]:
+        """Seconds to wait before hedging `name`, or None while there are too few samples."""
+        window = self._window(name)
+        if len(window) < self.min_samples:
+            return None
+        return window.percentile(self.percentile)
+
+    def _timed(self, name: str, fn: Callable[[str], T], attempt: str) -> T:
+        started = time.perf_counter()
+        result = fn(attempt)
+        self._window(name).add(time.perf_counter() - started)
+        return result
+
+    def _decide(self, hedge: bool, admit: Optional[Callable[[], bool]] = None) -> bool:
+        """
+        Record the call; a hedge is only allowed while the recent hedge rate is under max_rate
+        and admit() (run outside the lock) grants it capacity.
+        """
+        with self._lock:
+            self.counts["calls"] += 1
+            if hedge and sum(self._decisions) >= self.max_rate * max(len(self._decisions), 1):
+                self.counts["rate_capped"] += 1
+                hedge = False
+        if hedge and admit is not None and not admit():
+            hedge = False
+            with self._lock:
+                self.counts["throttled"] += 1
+        with self._lock:
+            self._decisions.append(hedge)
+            if hedge:
+                self.counts["hedged"] += 1
+        return hedge
+
+    def call(self, name: str, fn: Callable[[str], T], admit: Optional[Callable[[], bool]] = None) -> T:
+        """
+        fn(attempt_name) performs one request: attempt_name is `name` for the primary and f"{name}_hedge" for the
+        duplicate (used as the usage-ledger name). Returns the first successful result.
+        admit() is asked before sending the duplicate (e.g. rate-limiter capacity without waiting); False skips it.
+        """
+        delay = self.threshold(name) if self.enabled else None
+        if delay is None:
+            if self.enabled:
+                self._decide(False)
+            return self._timed(name, fn, name) if self.enabled else fn(name)
+
+        primary = _get_executor().submit(self._timed, name, fn, name)
+        try:
+            result = primary.result(timeout=delay)
+        except FuturesTimeoutError:
+            pass
+        else:
+            self._decide(False)
+            return result
+
+        if not self._decide(True, admit):
+            return primary.result()
+
+        logger.info(f"[hedging] {name} slower than p{self.percentile:g} ({delay * 1000:.0f}ms), sending hedge request")
+        hedge = _get_executor().submit(self._timed, name, fn, f"{name}_hedge")
+        done, _ = wait([primary, hedge], return_when=FIRST_COMPLETED)
+        first = primary if primary in done else hedge
+        other = hedge if first is primary else primary
+        if first.exception() is not None:
+            # the first finisher failed: fall back to the other request (if both fail, the later error is raised)
+            first, other = other, first
+        other.cancel()
+        if first is hedge and first.exception() is None:
+            with self._lock:
+                self.counts["hedge_wins"] += 1
+        return first.result()
+
+    def stats(self) -> dict:
+        with self._lock:
+            calls = self.counts["calls"]
+            return {
+                **self.counts,
+                "hedge_rate": self.counts["hedged"] / calls if calls else 0.0,
+                "thresholds_ms": {
+                    name: round(p * 1000)
+                    for name, window in self._latency.items()
+                    if len(window) >= self.min_samples and (p := window.percentile(self.percentile)) is not None
+                },
+            }
+
+    def clear(self):
+        with self._lock:
+            self._latency.clear()
+            self._decisions.clear()
+            self.counts = dict.fromkeys(self.counts, 0)
+
+
+hedger = Hedger()
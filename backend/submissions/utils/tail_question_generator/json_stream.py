@@ -0,0 +1,69 @@
+"""
+Incremental decoding of one string field from a JSON object that is still being streamed by the LLM.
+
+The actor replies with {"response": {"topic": ..., "question": "...", ...}}; JsonStringFieldStream returns the
+decoded characters of "question" as they arrive, so the follow-up question can be shown before the reply is
+complete. The full reply is still parsed with JsonOutputParser once the stream ends.
+"""
+
+import re
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class JsonStringFieldStream:
+    """feed(chunk) -> newly decoded characters of the first `"key": "..."` string value (empty until it starts)."""
+
+    def __init__(self, key: str = "question"):
+        self._start = re.compile(r'"%s"\s*:\s*"' % re.escape(key))
+        self.buffer = ""
+        self.value = ""
+        self.done = False
+        self._pos = None  # index of the next undecoded character of the value
+
+    def feed(self, chunk: str) -> str:
+        self.buffer += chunk or ""
+        if self.done:
+            return ""
+        if self._pos is None:
+            match = self._start.search(self.buffer)
+            if match is None:
+                return ""
+            self._pos = match.end()
+
+        buf, i, out = self.buffer, self._pos, []
+        while i < len(buf):
+            c = buf[i]
+            if c == '"':
+                self.done = True
+                i += 1
+                break
+            if c != "\\":
+                out.append(c)
+                i += 1
+                continue
+            # escape sequences may be split across chunks: wait for the rest
+            if i + 1 >= len(buf):
+                break
+            if buf[i + 1] != "u":
+                out.append(_ESCAPES.get(buf[i + 1], buf[i + 1]))
+                i += 2
+                continue
+            if i + 6 > len(buf):
+                break
+            code = int(buf[i + 2 : i + 6], 16)
+            if 0xD800 <= code < 0xDC00:  # surrogate pair (emoji etc.)
+                if i + 12 > len(buf):
+                    break
+                if buf[i + 6 : i + 8] == "\\u":
+                    low = int(buf[i + 8 : i + 12], 16)
+                    out.append(chr(0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)))
+                    i += 12
+                    continue
+            out.append(chr(code))
+            i += 6
+        self._pos = i
+
+        delta = "".join(out)
+        self.value += delta
+        return delta
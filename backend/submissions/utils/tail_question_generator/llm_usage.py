@@ -0,0 +1,101 @@
+"""
+Per-call LLM usage ledger (prompt / cached / completion tokens, latency).
+
+OpenAI-compatible endpoints report how many prompt tokens were served from the provider-side prefix cache
+(usage.prompt_tokens_details.cached_tokens). Every planner / actor / fused / base-quiz call is recorded here so the
+cache hit rate of the static prompt prefixes can be measured.
+
+- usage_ledger.record(name, reply, started): extract usage from a LangChain AIMessage and append an LLMCall
+- usage_ledger.entries(name) / summary(): recent calls and per-name totals (process-local, bounded)
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+LLM_USAGE_LEDGER_SIZE = int(os.getenv("LLM_USAGE_LEDGER_SIZE", "1000"))
+
+
+@dataclass(frozen=True)
+class LLMCall:
+    name: str
+    prompt_tokens: int
+    cached_tokens: int
+    completion_tokens: int
+    latency_ms: Optional[float]
+    recorded_at: float
+
+
+def _as_int(value) -> int:
+    return int(value) if isinstance(value, (int, float)) else 0
+
+
+def extract_usage(reply: Any) -> Dict[str, int]:
+    """(prompt, cached, completion) token counts from an AIMessage; zeros when the reply carries no usage."""
+    usage = getattr(reply, "usage_metadata", None)
+    if isinstance(usage, dict):
+        details = usage.get("input_token_details")
+        return {
+            "prompt_tokens": _as_int(usage.get("input_tokens")),
+            "cached_tokens": _as_int(details.get("cache_read")) if isinstance(details, dict) else 0,
+            "completion_tokens": _as_int(usage.get("output_tokens")),
+        }
+    metadata = getattr(reply, "response_metadata", None)
+    token_usage = metadata.get("token_usage") if isinstance(metadata, dict) else None
+    if isinstance(token_usage, dict):
+        details = token_usage.get("prompt_tokens_details")
+        return {
+            "prompt_tokens": _as_int(token_usage.get("prompt_tokens")),
+            "cached_tokens": _as_int(details.get("cached_tokens")) if isinstance(details, dict) else 0,
+            "completion_tokens": _as_int(token_usage.get("completion_tokens")),
+        }
+    return {"prompt_tokens": 0, "cached_tokens": 0, "completion_tokens": 0}
+
+
+class UsageLedger:
+    """Bounded, thread-safe list of recent LLM calls."""
+
+    def __init__(self, max_entries: int = LLM_USAGE_LEDGER_SIZE):
+        self._calls: "deque[LLMCall]" = deque(maxlen=max_entries)
+        self._lock = threading.Lock()
+
+    def record(self, name: str, reply: Any, started: Optional[float] = None) -> LLMCall:
+        latency_ms = (time.perf_counter() - started) * 1000 if started is not None else None
+        call = LLMCall(name=name, latency_ms=latency_ms, recorded_at=time.time(), **extract_usage(reply))
+        with self._lock:
+            self._calls.append(call)
+        if call.prompt_tokens:
+            logger.info(
+                f"LLM {name}: prompt {call.prompt_tokens} tokens (cached {call.cached_tokens}), "
+                f"completion {call.completion_tokens}" + (f", {latency_ms:.0f}ms" if latency_ms is not None else "")
+            )
+        return call
+
+    def entries(self, name: Optional[str] = None) -> List[LLMCall]:
+        with self._lock:
+            return [c for c in self._calls if name is None or c.name == name]
+
+    def summary(self) -> Dict[str, dict]:
+        """Per-name totals over the recorded calls, with the share of prompt tokens served from the prefix cache."""
+        totals: Dict[str, dict] = {}
+        for call in self.entries():
+            t = totals.setdefault(call.name, {"calls": 0, "prompt_tokens": 0, "cached_tokens": 0})
+            t["calls"] += 1
+            t["prompt_tokens"] += call.prompt_tokens
+            t["cached_tokens"] += call.cached_tokens
+        for t in totals.values():
+            t["cache_rate"] = t["cached_tokens"] / t["prompt_tokens"] if t["prompt_tokens"] else 0.0
+        return totals
+
+    def clear(self):
+        with self._lock:
+            self._calls.clear()
+
+
+usage_ledger = UsageLedger()
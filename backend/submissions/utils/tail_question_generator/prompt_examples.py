@@ -0,0 +1,114 @@
+"""
+Few-shot example selection and prompt-size accounting for the tail-question prompts.
+
+- ExampleSelector: embeds each bucket's few-shot inputs once (question + model answer) and returns the top-k
+  examples closest to the current question, instead of sending the whole bucket list every call.
+  Falls back to the first k examples when no encoder is available (e.g. the local SBERT model is missing).
+- compact_json: serialize examples without indentation.
+- count_prompt_tokens: prompt token count for logging (tiktoken; byte-based estimate if the encoding is unavailable).
+"""
+
+import json
+import logging
+import os
+import threading
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+TAIL_EXAMPLE_TOP_K = int(os.getenv("TAIL_EXAMPLE_TOP_K", "2"))
+
+
+def sbert_encoder(texts: List[str]) -> np.ndarray:
+    """Grading SBERT model + shared embedding cache (only importable inside the Django app)."""
+    from ..feature_extractor.extract_all_features import encode_texts
+
+    return encode_texts(texts)
+
+
+def _example_text(question: str, model_answer: str) -> str:
+    return f"{question}\n{model_answer}"
+
+
+class ExampleSelector:
+    """Top-k few-shot examples per bucket by cosine similarity to the current question (thread-safe)."""
+
+    def __init__(
+        self,
+        examples: Dict[str, List[dict]],
+        encoder: Optional[Callable[[List[str]], np.ndarray]] = sbert_encoder,
+        k: int = TAIL_EXAMPLE_TOP_K,
+    ):
+        self.examples = examples
+        self.encoder = encoder
+        self.k = k
+        self._matrices: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        vectors = np.asarray(self.encoder(texts), dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def _bucket_matrix(self, bucket: str) -> np.ndarray:
+        matrix = self._matrices.get(bucket)
+        if matrix is None:
+            with self._lock:
+                matrix = self._matrices.get(bucket)
+                if matrix is None:
+                    texts = [
+                        _example_text(ex["input"]["question"], ex["input"]["model_answer"])
+                        for ex in self.examples[bucket]
+                    ]
+                    matrix = self._matrices[bucket] = self._encode(texts)
+        return matrix
+
+    def select(self, bucket: str, question: str, model_answer: str, k: Optional[int] = None) -> List[dict]:
+        """Return the k examples of `bucket` most similar to (question, model_answer), most similar first."""
+        examples = self.examples[bucket]
+        k = self.k if k is None else k
+        if k >= len(examples):
+            return list(examples)
+        if self.encoder is None:
+            return examples[:k]
+        try:
+            matrix = self._bucket_matrix(bucket)
+            query = self._encode([_example_text(question, model_answer)])[0]
+        except Exception as e:
+            # missing model is permanent: stop trying and keep the static first-k order
+            logger.warning(f"few-shot example retrieval disabled, using the first {k} examples: {e}")
+            self.encoder = None
+            return examples[:k]
+        top = np.argsort(-(matrix @ query), kind="stable")[:k]
+        return [examples[i] for i in top]
+
+
+def compact_json(obj) -> str:
+    """JSON without indentation or spaces after separators (Korean kept as-is)."""
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+@lru_cache(maxsize=None)
+def _tiktoken_encoding(model: str):
+    try:
+        import tiktoken
+
+        return tiktoken.encoding_for_model(model)
+    except Exception as e:  # encoding files are downloaded on first use; unavailable offline
+        logger.info(f"tiktoken encoding for {model} unavailable, estimating prompt tokens: {e}")
+        return None
+
+
+def count_prompt_tokens(messages: Sequence, model: str) -> Tuple[int, bool]:
+    """
+    (token count of the message contents, exact?) -- exact with tiktoken, otherwise about UTF-8 bytes / 3
+    (Korean syllables are 3 bytes and roughly one token each). Per-message overhead is not counted.
+    """
+    text = "".join(str(getattr(m, "content", m)) for m in messages)
+    encoding = _tiktoken_encoding(model)
+    if encoding is None:
+        return len(text.encode("utf-8")) // 3, False
+    return len(encoding.encode(text)), True
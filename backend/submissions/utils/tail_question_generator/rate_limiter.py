@@ -0,0 +1,346 @@
+"""
+Cross-process token-bucket limiter for OpenAI calls (requests per minute + tokens per minute).
+
+Every gunicorn worker keeps its own clients, so per-process throttling cannot keep the account under its RPM / TPM
+limits; bursts (10 PDF pages summarized in parallel, achievement-code matching for a whole assignment, base-quiz
+retries) end up as 429s that slow down interactive answer grading too. The bucket levels live in one SQLite file that
+all workers on the host share; every acquire is a short BEGIN IMMEDIATE transaction.
+
+- Two buckets refilled continuously: requests (OPENAI_RPM_LIMIT) and tokens (OPENAI_TPM_LIMIT, estimated before the
+  call and settled with the real usage afterwards)
+- Priority: background work (PDF summaries, base quizzes, precomputed tails, achievement codes) may not take the last
+  LLM_RATE_LIMIT_BACKGROUND_RESERVE share of either bucket, which stays available to interactive answer grading
+- 429 responses: the server retry hint (retry-after-ms / retry-after / x-ratelimit-reset-*) becomes a shared cooldown,
+  so every worker backs off, then the call is retried
+- Fail-open: waits are capped at LLM_RATE_LIMIT_MAX_WAIT seconds and SQLite errors only log a warning
+- Deadlines: a call given an absolute deadline (time.monotonic()) never waits or backs off past it; it raises
+  RateLimitTimeout (or the last 429) instead so the caller can fall back (e.g. defer the tail question)
+- Opt-in with LLM_RATE_LIMIT_ENABLED; when it is off rate_limited_call() just calls the function
+"""
+
+import logging
+import os
+import random
+import re
+import sqlite3
+import tempfile
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Mapping, Optional, Sequence, Union
+
+try:
+    from .llm_usage import extract_usage
+    from .prompt_examples import count_prompt_tokens
+except ImportError:  # run as a script
+    from llm_usage import extract_usage
+    from prompt_examples import count_prompt_tokens
+
+logger = logging.getLogger(__name__)
+
+LLM_RATE_LIMIT_ENABLED = os.getenv("LLM_RATE_LIMIT_ENABLED", "False").lower() in ("true", "1")
+LLM_RATE_LIMIT_DB = os.getenv(
+    "LLM_RATE_LIMIT_DB", os.path.join(tempfile.gettempdir(), "voicetutor-llm-rate-limit.sqlite3")
+)
+OPENAI_RPM_LIMIT = float(os.getenv("OPENAI_RPM_LIMIT", "500"))
+OPENAI_TPM_LIMIT = float(os.getenv("OPENAI_TPM_LIMIT", "200000"))
+LLM_RATE_LIMIT_BACKGROUND_RESERVE = float(os.getenv("LLM_RATE_LIMIT_BACKGROUND_RESERVE", "0.2"))
+LLM_RATE_LIMIT_MAX_WAIT = float(os.getenv("LLM_RATE_LIMIT_MAX_WAIT", "30"))
+LLM_RATE_LIMIT_MAX_ATTEMPTS = int(os.getenv("LLM_RATE_LIMIT_MAX_ATTEMPTS", "3"))
+
+INTERACTIVE = "interactive"
+BACKGROUND = "background"
+
+# completion budget assumed before the call (settled with the real count afterwards)
+DEFAULT_COMPLETION_TOKENS = 500
+# a vision page at detail=auto costs at most ~1100 prompt tokens for gpt-4o-mini sized images
+IMAGE_TOKENS = 1100
+
+
+class RateLimitTimeout(TimeoutError):
+    """The call's deadline would pass before the limiter admits it."""
+
+
+def _remaining(deadline: Optional[float]) -> Optional[float]:
+    return None if deadline is None else deadline - time.monotonic()
+
+
+_SCHEMA = "CREATE TABLE IF NOT EXISTS bucket (name TEXT PRIMARY KEY, level REAL NOT NULL, updated REAL NOT NULL)"
+
+
+class RateLimiter:
+    """Token buckets stored in a SQLite file; safe to use from many threads and processes at once."""
+
+    def __init__(
+        self,
+        path: str = LLM_RATE_LIMIT_DB,
+        rpm: float = OPENAI_RPM_LIMIT,
+        tpm: float = OPENAI_TPM_LIMIT,
+        background_reserve: float = LLM_RATE_LIMIT_BACKGROUND_RESERVE,
+        max_wait: float = LLM_RATE_LIMIT_MAX_WAIT,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.path = path
+        self.capacity = {"requests": float(rpm), "tokens": float(tpm)}
+        self.background_reserve = background_reserve
+        self.max_wait = max_wait
+        self.clock = clock
+        self.sleep = sleep
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        # one connection per thread and process (sqlite connections must not cross threads or a fork)
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(_SCHEMA)
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _transaction(self, update: Callable[[dict, float], Any]) -> Any:
+        """Run update(levels, now) under the cross-process write lock and store the levels it leaves behind."""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = self.clock()
+            stored = {name: (level, updated) for name, level, updated in conn.execute("SELECT * FROM bucket")}
+            levels = {}
+            for name, capacity in self.capacity.items():
+                level, updated = stored.get(name, (capacity, now))
+                levels[name] = min(capacity, level + max(0.0, now - updated) * capacity / 60.0)
+            levels["cooldown"] = stored.get("cooldown", (0.0, now))[0]
+            result = update(levels, now)
+            conn.executemany(
+                "INSERT OR REPLACE INTO bucket (name, level, updated) VALUES (?, ?, ?)",
+                [(name, level, now) for name, level in levels.items()],
+            )
+            conn.execute("COMMIT")
+            return result
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _try_take(self, tokens: float, priority: str) -> float:
+        """Take one request and `tokens` tokens if allowed; otherwise return how long to wait before trying again."""
+        reserve = self.background_reserve if priority == BACKGROUND else 0.0
+        floor = {name: capacity * reserve for name, capacity in self.capacity.items()}
+        # a single call larger than the usable bucket would never fit: let it through when the bucket is full
+        need = {"requests": 1.0, "tokens": min(float(tokens), self.capacity["tokens"] - floor["tokens"])}
+
+        def update(levels, now):
+            if levels["cooldown"] > now:
+                return levels["cooldown"] - now
+            missing = {name: floor[name] + need[name] - levels[name] for name in self.capacity}
+            if all(m <= 0 for m in missing.values()):
+                for name in self.capacity:
+                    levels[name] -= need[name]
+                return 0.0
+            return max(m * 60.0 / self.capacity[name] for name, m in missing.items() if m > 0)
+
+        return self._transaction(update)
+
+    def acquire(self, tokens: float, priority: str = INTERACTIVE, deadline: Optional[float] = None) -> float:
+        """
+        Block until the call fits in both buckets (at most max_wait seconds); returns the time spent waiting.
+        Raises RateLimitTimeout instead of waiting past deadline (absolute time.monotonic() value).
+        """
+        started = self.clock()
+        while True:
+            try:
+                wait = self._try_take(tokens, priority)
+            except sqlite3.Error as e:
+                logger.warning(f"[rate_limiter] bucket unavailable, proceeding without limit: {e}")
+                return self.clock() - started
+            if wait <= 0:
+                return self.clock() - started
+            waited = self.clock() - started
+            if waited >= self.max_wait:
+                logger.warning(f"[rate_limiter] {priority} call waited {waited:.1f}s, proceeding over the limit")
+                return waited
+            remaining = _remaining(deadline)
+            if remaining is not None and wait > remaining:
+                raise RateLimitTimeout(
+                    f"{priority} call needs {wait:.1f}s for capacity, only {max(0.0, remaining):.1f}s left"
+                )
+            sleep = min(wait, 1.0, self.max_wait - waited)
+            if remaining is not None:
+                sleep = min(sleep, remaining)
+            # small jitter so workers woken by the same refill do not all retry the lock at once
+            self.sleep(sleep + random.uniform(0, 0.05))
+
+    def try_acquire(self, tokens: float, priority: str = INTERACTIVE) -> bool:
+        """Take capacity only if it is available right now (no wait, no cooldown); False when the bucket is busy."""
+        try:
+            return self._try_take(tokens, priority) <= 0
+        except sqlite3.Error as e:
+            logger.warning(f"[rate_limiter] bucket unavailable, refusing optional call: {e}")
+            return False
+
+    def settle(self, estimated_tokens: float, actual_tokens: float):
+        """Correct the token bucket once the real usage is known (refund or extra charge)."""
+        if not actual_tokens:
+            return
+
+        def update(levels, now):
+            levels["tokens"] = min(self.capacity["tokens"], levels["tokens"] + estimated_tokens - actual_tokens)
+
+        try:
+            self._transaction(update)
+        except sqlite3.Error as e:
+            logger.warning(f"[rate_limiter] failed to settle token usage: {e}")
+
+    def note_rate_limit(self, retry_after: float):
+        """Shared cooldown after a 429: no worker starts a call for `retry_after` seconds."""
+
+        def update(levels, now):
+            levels["cooldown"] = max(levels["cooldown"], now + retry_after)
+
+        try:
+            self._transaction(update)
+        except sqlite3.Error as e:
+            logger.warning(f"[rate_limiter] failed to record cooldown: {e}")
+
+    def state(self) -> dict:
+        """Current bucket levels and remaining cooldown (seconds)."""
+        return self._transaction(
+            lambda levels, now: {
+                "requests": levels["requests"],
+                "tokens": levels["tokens"],
+                "cooldown": max(0.0, levels["cooldown"] - now),
+            }
+        )
+
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+def _parse_duration(value: str) -> Optional[float]:
+    """OpenAI reset headers look like "20ms", "1s", "6m0s"."""
+    parts = _DURATION_PART.findall(value)
+    if not parts or "".join(n + u for n, u in parts) != value.strip():
+        return None
+    return sum(float(n) * _DURATION_UNITS[u] for n, u in parts)
+
+
+def retry_after_from_headers(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """Seconds to wait according to the server hints of a 429 response, or None when it gives none."""
+    if not headers:
+        return None
+    value = headers.get("retry-after-ms")
+    if value:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if value:
+        try:
+            return float(value)
+        except ValueError:
+            try:
+                return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+            except (TypeError, ValueError):
+                pass
+    resets = [
+        _parse_duration(headers.get(name) or "") for name in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens")
+    ]
+    resets = [r for r in resets if r is not None]
+    return max(resets) if resets else None
+
+
+def _rate_limit_headers(error: BaseException) -> Optional[Mapping[str, str]]:
+    """Headers of the response when `error` is a 429 (openai.RateLimitError, requests.HTTPError ...), else None."""
+    response = getattr(error, "response", None)
+    status = getattr(error, "status_code", None) or getattr(response, "status_code", None)
+    if status != 429:
+        return None
+    return getattr(response, "headers", None) or {}
+
+
+def estimate_tokens(
+    messages: Sequence, completion_tokens: int = DEFAULT_COMPLETION_TOKENS, images: int = 0, model: str = "gpt-4o-mini"
+) -> int:
+    """Tokens charged against TPM before the call: prompt text + images + the expected completion."""
+    if isinstance(messages, str):
+        messages = [messages]
+    prompt_tokens, _ = count_prompt_tokens(messages, model)
+    return prompt_tokens + images * IMAGE_TOKENS + completion_tokens
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """Process-wide limiter on the shared SQLite file, or None when LLM_RATE_LIMIT_ENABLED is off."""
+    global _limiter
+    if not LLM_RATE_LIMIT_ENABLED:
+        return None
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = RateLimiter()
+    return _limiter
+
+
+def try_acquire(
+    estimated_tokens: Union[int, Callable[[], int]], priority: str = INTERACTIVE, limiter: Optional[RateLimiter] = None
+) -> bool:
+    """Non-blocking admission for optional extra calls (hedges); always True when the limiter is off."""
+    limiter = limiter or get_rate_limiter()
+    if limiter is None:
+        return True
+    if callable(estimated_tokens):
+        estimated_tokens = estimated_tokens()
+    return limiter.try_acquire(estimated_tokens, priority)
+
+
+def rate_limited_call(
+    name: str,
+    fn: Callable[[], Any],
+    estimated_tokens: Union[int, Callable[[], int]],
+    priority: str = INTERACTIVE,
+    limiter: Optional[RateLimiter] = None,
+    max_attempts: int = LLM_RATE_LIMIT_MAX_ATTEMPTS,
+    deadline: Optional[float] = None,
+) -> Any:
+    """
+    Run fn() once the limiter admits it (estimated_tokens may be a callable, evaluated only when the limiter is on).
+    On a 429 the server hint (or exponential backoff) becomes a shared cooldown
+    and the call is retried up to max_attempts times; the last error is re-raised.
+    With a deadline (absolute time.monotonic() value) neither the wait for capacity nor the backoff runs past it:
+    RateLimitTimeout / the 429 is raised as soon as the remaining budget cannot cover them.
+    """
+    limiter = limiter or get_rate_limiter()
+    if limiter is None:
+        return fn()
+    if callable(estimated_tokens):
+        estimated_tokens = estimated_tokens()
+
+    for attempt in range(max_attempts):
+        waited = limiter.acquire(estimated_tokens, priority, deadline)
+        if waited >= 0.5:
+            logger.info(f"[rate_limiter] {name} ({priority}) waited {waited:.1f}s for capacity")
+        try:
+            result = fn()
+        except Exception as e:
+            headers = _rate_limit_headers(e)
+            if headers is None or attempt == max_attempts - 1:
+                raise
+            retry_after = retry_after_from_headers(headers)
+            if retry_after is None:
+                retry_after = 2.0**attempt
+            limiter.note_rate_limit(retry_after)
+            remaining = _remaining(deadline)
+            if remaining is not None and retry_after >= remaining:
+                logger.warning(f"[rate_limiter] {name} got 429, backoff {retry_after:.2f}s exceeds the deadline")
+                raise
+            logger.warning(f"[rate_limiter] {name} got 429, backing off {retry_after:.2f}s (attempt {attempt + 1})")
+            continue
+
+        usage = extract_usage(result)
+        limiter.settle(estimated_tokens, usage["prompt_tokens"] + usage["completion_tokens"])
+        return result
@@ -3,57 +3,54 @@ import io
 import os
 
 import numpy as np
-import resampy
 import soundfile as sf
 from dotenv import load_dotenv
 from google.cloud import speech
 
-load_dotenv()
-
-
-def resample_to_16k_mono(filepath: str) -> bytes:
-    """WAV 파일을 메모리 상에서 16kHz mono PCM16으로 변환"""
+try:
+    from .audio_buffer import STT_SAMPLE_RATE, AudioBuffer
+except ImportError:  # 스크립트로 직접 실행하는 경우 (python wave_to_text.py ...)
+    from audio_buffer import STT_SAMPLE_RATE, AudioBuffer
 
-    file_size = os.path.getsize(filepath)
+load_dotenv()
 
-    if file_size == 0:
-        raise ValueError(f"Empty file: {filepath}")
 
-    try:
-        data, samplerate = sf.read(filepath)
+def get_speech_client() -> speech.SpeechClient:
+    """프로세스당 하나의 SpeechClient 재사용 (core.clients 풀, gRPC 채널은 fork 후 다시 생성)"""
+    from core.clients import get_speech_client as pooled_speech_client
 
-        if len(data.shape) > 1:
-            data = np.mean(data, axis=1)
+    return pooled_speech_client()
 
-        if np.max(np.abs(data)) > 0:
-            data = data / np.max(np.abs(data))
 
-        threshold = 0.01
-        data = np.where(np.abs(data) < threshold, 0, data)
+def resample_to_16k_mono(audio) -> bytes:
+    """
+    WAV 파일(또는 이미 디코딩된 AudioBuffer)을 메모리 상에서 16kHz mono PCM16으로 변환
 
-        if samplerate != 16000:
-            data = resampy.resample(data, samplerate, 16000)
-            samplerate = 16000
+    AudioBuffer의 16kHz mono 신호를 정규화 / 작은 값 제거한 뒤 PCM16 WAV bytes로 만듭니다.
+    """
+    buffer = AudioBuffer.from_source(audio)
+    data = buffer.mono_16k
 
-        # 메모리 버퍼에 16bit PCM WAV 저장
-        buffer = io.BytesIO()
-        sf.write(buffer, data, samplerate, format="WAV", subtype="PCM_16")
-        buffer.seek(0)
+    peak = np.max(np.abs(data)) if data.size else 0.0
+    if peak > 0:
+        data = data / peak
 
-        wav_bytes = buffer.read()
+    threshold = 0.01
+    data = np.where(np.abs(data) < threshold, 0, data)
 
-        return wav_bytes, samplerate
+    # 메모리 버퍼에 16bit PCM WAV 저장
+    wav_buffer = io.BytesIO()
+    sf.write(wav_buffer, data, STT_SAMPLE_RATE, format="WAV", subtype="PCM_16")
 
-    except Exception as e:
-        raise
+    return wav_buffer.getvalue(), STT_SAMPLE_RATE
 
 
-def speech_to_text(filepath: str, language_code: str = "ko-KR") -> str:
-    """Google Cloud STT 요청"""
+def speech_to_text(audio, language_code: str = "ko-KR", timeout: float = None) -> str:
+    """Google Cloud STT 요청 (audio: WAV 파일 경로 또는 AudioBuffer, timeout: 요청 제한 시간(초), None이면 기본값)"""
 
-    client = speech.SpeechClient()
+    client = get_speech_client()
 
-    wav_bytes, sr = resample_to_16k_mono(filepath)
+    wav_bytes, sr = resample_to_16k_mono(audio)
 
     audio = speech.RecognitionAudio(content=wav_bytes)
 
@@ -70,7 +67,9 @@ def speech_to_text(filepath: str, language_code: str = "ko-KR") -> str:
         alternative_language_codes=["ko-KR", "en-US"],
     )
 
-    response = client.recognize(config=config, audio=audio)
+    # timeout=None은 "제한 없음"이므로 값이 있을 때만 전달 (없으면 클라이언트 기본 timeout)
+    timeout_kwargs = {"timeout": timeout} if timeout is not None else {}
+    response = client.recognize(config=config, audio=audio, **timeout_kwargs)
 
     if not response.results:
         return ""
@@ -1,29 +1,61 @@
+import json
 import logging
-import os
-import tempfile
+import queue
+import threading
 from datetime import timedelta
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.http import StreamingHttpResponse
 from django.utils import timezone
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from questions.models import Question
 from questions.serializers import TailQuestionSerializer
+from questions.utils.tail_precompute import load_precomputed_tails, precomputed_tail_payload
 from rest_framework import status
 from rest_framework.parsers import FormParser, MultiPartParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from .models import Answer, PersonalAssignment
+from .models import Answer, GradingJob, PersonalAssignment
 from .serializers import (
     AnswerCorrectnessSerializer,
     PersonalAssignmentRecentSerializer,
     PersonalAssignmentSerializer,
     PersonalAssignmentStatisticsSerializer,
 )
-from .utils.feature_extractor.extract_all_features import extract_all_features
+from .utils.deadline import answer_deadline
+from .utils.feature_extractor.extract_all_features import (
+    STT_FAILED_SCRIPT,
+    extract_all_features,
+    extract_script_features,
+)
+from .utils.feature_store import save_answer_features
+from .utils.grading_checkpoint import (
+    audio_content_hash,
+    call_with_retry,
+    clear_checkpoint,
+    load_checkpoint,
+    save_checkpoint,
+)
+from .utils.grading_queue import enqueue_grading_job, enqueue_tail_question_job, fail_job, finish_job, start_request_job
+from .utils.idempotency import IN_FLIGHT, find_submission_job, register_submission_job, submission_key, wait_for_job
 from .utils.inference import run_inference
-from .utils.tail_question_generator.generate_questions_routed import generate_tail_question
+from .utils.local_grader import get_local_grader, model_answer_embeddings
+from .utils.speculative_actor import get_speculative_actor
+from .utils.stage_executor import Stage, StageError, run_stages
+from .utils.tail_question_cache import get_tail_question_cache
+from .utils.tail_question_generator.generate_questions_routed import (
+    decide_bucket_confidence,
+    decide_plan,
+    generate_tail_question,
+    generate_tail_question_fused,
+    judge_correctness,
+    plan_always_asks,
+)
 
 logger = logging.getLogger(__name__)
 Account = get_user_model()
@@ -34,6 +66,783 @@ def create_api_response(success=True, data=None, message="성공", error=None, s
     return Response({"success": success, "data": data, "message": message, "error": error}, status=status_code)
 
 
+# SSE 스트림에서 이벤트가 한동안 없을 때 프록시가 연결을 끊지 않도록 keep-alive 주석을 보내는 간격(초)
+SSE_KEEPALIVE_SECONDS = 15
+
+
+def sse_event(event, data):
+    """Server-Sent Events 메시지 하나 (data는 JSON)"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Accept: text/event-stream 요청의 스트림 시작 전 오류 응답을 error 이벤트 하나로 렌더링"""
+
+    media_type = "text/event-stream"
+    format = "sse"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return sse_event("error", data).encode(self.charset)
+
+
+def grade_answer_submission(answer, question, audio, on_event=None, deadline=None):
+    """
+    음성 답안 채점 파이프라인 (STT/Feature 추출 -> ML 추론 -> 꼬리 질문 생성 -> DB 반영)
+
+    AnswerSubmitView(동기 처리)와 채점 워커(run_grading_worker, 비동기 처리)가 함께 사용합니다.
+    answer는 PROCESSING 상태로 미리 생성되어 있어야 하며, 실패 시 해당 Answer는 삭제됩니다.
+    audio는 WAV 파일 경로 / 업로드 파일 객체 / AudioBuffer 중 하나입니다 (임시 파일 불필요).
+    on_event(name, data)를 주면 중간 결과를 바로 전달합니다 (AnswerStreamView):
+    transcript -> correctness -> tail_question_delta(꼬리 질문 텍스트 조각, actor LLM 스트리밍)
+    deadline(Deadline)을 주면 STT / planner / actor 호출에 남은 시간 예산을 제한 시간으로 넘기고,
+    actor 몫이 남지 않으면(또는 actor 호출이 실패하면) 정오답만 응답한 뒤 꼬리 질문은 작업 큐에서 생성합니다.
+    GRADING_CHECKPOINT_ENABLED이면 실패한 단계는 백오프로 재시도하고, 성공한 단계 결과는 GradingCheckpoint에 남겨
+    같은 음성을 다시 제출했을 때 STT / 특징 추출 / 추론 / 정오답 판정을 건너뜁니다.
+
+    Returns:
+        Response: create_api_response로 만든 응답 (status_code / data를 그대로 작업 결과로 저장 가능)
+    """
+    # 체크포인트: 같은 음성으로 다시 제출한 답안은 마지막으로 성공한 단계 다음부터 채점
+    checkpointing = settings.GRADING_CHECKPOINT_ENABLED
+    audio_hash = audio_content_hash(audio) if checkpointing else None
+    checkpoint = load_checkpoint(question, answer.student, audio_hash) if audio_hash else None
+
+    # Step 1-4: STT 변환 및 음향 Feature 추출 (extract_all_features 사용, STT와 음향 특징은 동시에 실행)
+    if checkpoint is not None and checkpoint.features:
+        logger.info(f"[AnswerSubmitView] 체크포인트의 STT / 음향 Feature 사용 - Question ID: {question.id}")
+        features = checkpoint.features
+    else:
+        logger.info(f"[AnswerSubmitView] Feature 추출 시작 - Question ID: {question.id}")
+        # STT는 정오답 판정 + 응답 몫을 남긴 시간 안에 끝나야 함 (actor 몫은 부족하면 꼬리 질문을 미룸)
+        stt_timeout = (
+            deadline.timeout(settings.ANSWER_DEADLINE_GRADE_RESERVE + settings.ANSWER_DEADLINE_FINALIZE_RESERVE)
+            if deadline is not None
+            else None
+        )
+        features = extract_all_features(audio, include_script_features=False, stt_timeout=stt_timeout)
+        logger.info("[AnswerSubmitView] Feature 추출 완료")
+        script = (features.get("script") or "").strip()
+        if audio_hash and script and script != STT_FAILED_SCRIPT:
+            checkpoint = save_checkpoint(
+                question, answer.student, audio_hash, transcript=features.get("script"), features=features
+            )
+
+    # features 에서 음성 파일 길이 구해서 timezone.now()에 빼는 로직
+    audio_duration_sec = features.get("total_length", 0.0)
+    if audio_duration_sec is None or audio_duration_sec <= 0:
+        # fallback: 현재 시간 사용
+        started_at = timezone.now()
+    else:
+        started_at = timezone.now() - timedelta(seconds=audio_duration_sec)
+    logger.info(f"[AnswerSubmitView] 음성 길이: {audio_duration_sec:.2f}초, 시작 시간: {started_at}")
+
+    # STT 결과 (transcript) 확인
+    transcript = features.get("script", "")
+    if not transcript or transcript.strip() == "":
+        if answer is not None:
+            try:
+                logger.info(f"[AnswerSubmitView] STT 실패로 Answer 삭제 - id={answer.id}")
+                answer.delete()
+                answer = None
+            except Exception as del_err:
+                logger.error(f"[AnswerSubmitView] STT 실패 시 Answer 삭제 중 에러: {del_err}", exc_info=True)
+        return create_api_response(
+            success=False,
+            error="STT failed",
+            message="음성 인식 결과가 없습니다. 다시 녹음해주세요.",
+            status_code=status.HTTP_400_BAD_REQUEST,
+        )
+
+    logger.info(f"[AnswerSubmitView] STT 결과: {transcript[:100]}...")  # 처음 100자만 로깅
+
+    def emit(event, data):
+        if on_event is not None:
+            on_event(event, data)
+
+    emit("transcript", {"transcript": transcript})
+    on_question_delta = (lambda text: emit("tail_question_delta", {"text": text})) if on_event is not None else None
+
+    # Step 2~3: 스크립트 특징 -> ML 추론 -> Tail Question 생성
+    # planner LLM(정오답 판정)은 transcript만 있으면 되므로 스크립트 특징 / ML 추론과 동시에 실행
+    xgbmodel_path = "submissions/machine/model.joblib"
+    logger.info("[AnswerSubmitView] ML 추론 및 Tail Question 생성 시작")
+
+    def with_retry(name, func):
+        # 체크포인트 사용 시 실패한 단계는 백오프로 재시도 (시간 예산이 있으면 응답 몫을 남길 수 있을 때만)
+        if not checkpointing:
+            return func()
+        can_retry = (
+            (lambda delay: deadline.allows(delay + settings.ANSWER_DEADLINE_FINALIZE_RESERVE))
+            if deadline is not None
+            else None
+        )
+        return call_with_retry(name, func, can_retry=can_retry)
+
+    def script_features_stage(results):
+        if checkpoint is not None and checkpoint.script_features is not None:
+            logger.info("[AnswerSubmitView] 체크포인트의 스크립트 Feature 사용")
+            return checkpoint.script_features
+        return with_retry("script_features", lambda: extract_script_features(features))
+
+    def infer(results):
+        if checkpoint is not None and checkpoint.eval_grade is not None:
+            logger.info(f"[AnswerSubmitView] 체크포인트의 ML 추론 결과 사용 - Confidence: {checkpoint.eval_grade}")
+            return checkpoint.eval_grade
+        inference_results = with_retry("inference", lambda: run_inference(xgbmodel_path, results["script_features"]))
+        confidence = inference_results.get("pred_cont")
+        if confidence is None:
+            raise ValueError("Inference result does not contain 'pred_cont'")
+        logger.info(f"[AnswerSubmitView] ML 추론 완료 - Confidence: {confidence}")
+        return confidence
+
+    tail_cache = (
+        get_tail_question_cache(semantic=settings.TAIL_QUESTION_SEMANTIC_CACHE_ENABLED)
+        if settings.TAIL_QUESTION_CACHE_ENABLED
+        else None
+    )
+
+    # 확실한 정답/오답은 로컬 판정기로 planner LLM 호출 생략 (애매한 답안만 LLM에 위임)
+    local_grader = get_local_grader() if settings.LOCAL_GRADER_ENABLED else None
+    graded_by = {"source": Answer.GradedBy.LLM}
+
+    def judge_locally():
+        if local_grader is None:
+            return None
+        verdict = local_grader.grade(transcript, question.model_answer, question.model_answer_embedding)
+        if verdict.is_correct is not None:
+            graded_by["source"] = Answer.GradedBy.LOCAL
+            logger.info(
+                f"[AnswerSubmitView] 로컬 정오답 판정: {verdict.is_correct} "
+                f"(score {verdict.score:.3f}, 유사도 {verdict.similarity:.3f}, 핵심어 {verdict.coverage:.2f})"
+            )
+        return verdict.is_correct
+
+    def llm_timeout():
+        # LLM 호출 제한 시간: 응답(DB 저장) 몫만 남기고 남은 예산 전부
+        return deadline.timeout(settings.ANSWER_DEADLINE_FINALIZE_RESERVE) if deadline is not None else None
+
+    def judge(results):
+        if checkpoint is not None and checkpoint.is_correct is not None:
+            graded_by["source"] = checkpoint.graded_by or Answer.GradedBy.LLM
+            logger.info(f"[AnswerSubmitView] 체크포인트의 정오답 판정 사용: {checkpoint.is_correct}")
+            emit("correctness", {"is_correct": checkpoint.is_correct, "graded_by": graded_by["source"]})
+            return checkpoint.is_correct
+        is_correct = judge_locally()
+        if is_correct is None:
+            # 시간 예산이 없으면 제한 시간 인자 없이 호출 (클라이언트 기본 timeout)
+            is_correct = with_retry(
+                "planner",
+                lambda: judge_correctness(
+                    question.content,
+                    question.model_answer,
+                    transcript,
+                    **({"timeout": llm_timeout()} if deadline is not None else {}),
+                ),
+            )
+        emit("correctness", {"is_correct": is_correct, "graded_by": graded_by["source"]})
+        return is_correct
+
+    # base 문제는 미리 만들어 둔 bucket별 꼬리 질문이 있으면 actor LLM 호출 없이 사용 (DB 조회는 요청 스레드에서)
+    precomputed_tails = load_precomputed_tails(question)
+
+    # planner 결과를 기다리지 않고 예상 bucket으로 actor LLM을 먼저 시작 (planner와 같은 bucket이면 그대로 사용)
+    speculative_actor = get_speculative_actor() if settings.SPECULATIVE_ACTOR_ENABLED else None
+
+    def speculate(results):
+        # 추측 실패는 채점에 영향 없음 (actor가 평소처럼 planner 뒤에 호출됨)
+        try:
+            predictor = local_grader or get_local_grader()
+            predicted = predictor.predict_correct(transcript, question.model_answer, question.model_answer_embedding)
+            if predicted is None:
+                predicted = results["inference"] >= 3.45
+            bucket, _, _, _ = decide_bucket_confidence(
+                is_correct=predicted, eval_grade=results["inference"], high_thr=3.45
+            )
+            if decide_plan(bucket, question.recalled_num) != "ASK":
+                return None
+            logger.info(f"[AnswerSubmitView] actor 추측 실행 시작 - 예상 bucket={bucket}")
+            return speculative_actor.start(
+                question.content,
+                question.model_answer,
+                transcript,
+                bucket,
+                **({"timeout": llm_timeout()} if deadline is not None else {}),
+            )
+        except Exception as e:
+            logger.warning(f"[AnswerSubmitView] actor 추측 실행 건너뜀: {e}")
+            return None
+
+    def defer_tail(results, reason):
+        # 시간 예산 초과: 정오답만 응답하고 꼬리 질문은 작업 큐에서 생성 (Step 5에서 작업 등록)
+        bucket, confidence, _, _ = decide_bucket_confidence(
+            is_correct=results["planner"], eval_grade=results["inference"], high_thr=3.45
+        )
+        logger.warning(f"[AnswerSubmitView] 꼬리 질문 생성을 작업 큐로 미룸 - {reason}, {deadline}")
+        if results.get("speculate") is not None:
+            results["speculate"].discard()
+        return {
+            "is_correct": bool(results["planner"]),
+            "confidence": confidence,
+            "bucket": bucket,
+            "plan": "ASK",
+            "recalled_time": question.recalled_num + 1,
+            "tail_question": None,
+            "deferred": True,
+        }
+
+    def generate_tail(results):
+        speculation = results.get("speculate")
+        if precomputed_tails:
+            bucket, confidence, _, _ = decide_bucket_confidence(
+                is_correct=results["planner"], eval_grade=results["inference"], high_thr=3.45
+            )
+            row = precomputed_tails.get(bucket)
+            if row is not None:
+                logger.info(f"[AnswerSubmitView] 미리 생성된 꼬리 질문 사용 - bucket={bucket}")
+                if speculation is not None:
+                    speculation.discard()
+                emit("tail_question_delta", {"text": row.content})
+                return precomputed_tail_payload(row, results["planner"], confidence)
+
+        if deadline is not None:
+            bucket, _, _, _ = decide_bucket_confidence(
+                is_correct=results["planner"], eval_grade=results["inference"], high_thr=3.45
+            )
+            actor_budget = settings.ANSWER_DEADLINE_ACTOR_RESERVE + settings.ANSWER_DEADLINE_FINALIZE_RESERVE
+            if decide_plan(bucket, question.recalled_num) == "ASK" and not deadline.allows(actor_budget):
+                return defer_tail(results, "actor 시작 전 시간 예산 부족")
+
+        pending_speculation = [speculation]
+
+        def call_actor():
+            # 추측 실행 결과는 첫 시도에서만 사용 (재시도는 actor를 직접 호출)
+            attempt_speculation, pending_speculation[0] = pending_speculation[0], None
+            return generate_tail_question(
+                question=question.content,
+                model_answer=question.model_answer,
+                student_answer=transcript,
+                eval_grade=results["inference"],
+                recalled_time=question.recalled_num,
+                high_thr=3.45,
+                is_correct=results["planner"],
+                tail_cache=tail_cache,
+                speculation=attempt_speculation,
+                on_question_delta=on_question_delta,
+                timeout=llm_timeout(),
+            )
+
+        try:
+            # 스트리밍 응답은 이미 보낸 꼬리 질문 텍스트 조각이 중복되지 않도록 재시도하지 않음
+            payload = call_actor() if on_question_delta is not None else with_retry("actor", call_actor)
+        except Exception as e:
+            if deadline is None:
+                raise
+            # 시간 예산이 있는 요청은 actor 실패(제한 시간 초과 등)로 채점 결과까지 버리지 않음
+            return defer_tail(results, f"actor 호출 실패: {e}")
+        if not payload:
+            raise ValueError("Tail question generation returned None")
+        logger.info(f"[AnswerSubmitView] Tail Question 생성 완료 - Plan: {payload.get('plan')}")
+        if tail_cache is not None and payload.get("plan") == "ASK":
+            stats = tail_cache.stats()
+            logger.info(
+                f"[AnswerSubmitView] 꼬리 질문 캐시 {'hit' if payload.get('cache_hit') else 'miss'} - "
+                f"hit rate {stats['hit_rate']:.2f} (정확 {stats['exact_hits']}, 의미 {stats['semantic_hits']}, "
+                f"miss {stats['misses']})"
+            )
+        return payload
+
+    def generate_tail_fused(results):
+        is_correct = judge_locally()
+        if is_correct is not None:
+            # 로컬 판정으로 정오답을 이미 알면 actor만 호출
+            return generate_tail({"planner": is_correct, "inference": results["inference"]})
+        payload = with_retry(
+            "actor",
+            lambda: generate_tail_question_fused(
+                question=question.content,
+                model_answer=question.model_answer,
+                student_answer=transcript,
+                eval_grade=results["inference"],
+                recalled_time=question.recalled_num,
+                high_thr=3.45,
+                tail_cache=tail_cache,
+            ),
+        )
+        logger.info(
+            f"[AnswerSubmitView] Tail Question 생성 완료 (단일 호출: {payload.get('fused')}) - Plan: {payload.get('plan')}"
+        )
+        return payload
+
+    # 정오답과 관계없이 꼬리 질문을 만드는 경우(첫 풀이)에는 planner + actor를 LLM 1회로 합침
+    # (미리 생성된 꼬리 질문이 있으면 actor 호출이 없으므로 planner만 호출하는 기존 경로가 더 빠름)
+    # 스트리밍 응답은 정오답을 먼저 보내야 하므로 planner -> actor 경로 사용
+    # 시간 예산이 있으면 정오답만 먼저 응답할 수 있도록 planner / actor를 나눠서 호출
+    use_fused = (
+        settings.FUSED_TAIL_GENERATION_ENABLED
+        and on_event is None
+        and deadline is None
+        and not precomputed_tails
+        and plan_always_asks(question.recalled_num)
+    )
+    if use_fused:
+        stages = [
+            Stage("script_features", script_features_stage),
+            Stage("inference", infer, deps=("script_features",)),
+            Stage("actor", generate_tail_fused, deps=("inference",)),
+        ]
+    else:
+        stages = [
+            Stage("script_features", script_features_stage),
+            Stage("planner", judge),
+            Stage("inference", infer, deps=("script_features",)),
+            Stage("actor", generate_tail, deps=("planner", "inference")),
+        ]
+        # 미리 생성된 꼬리 질문이 있으면 actor 호출 자체가 없으므로 추측 실행하지 않음
+        if speculative_actor is not None and not precomputed_tails:
+            stages.insert(3, Stage("speculate", speculate, deps=("inference",)))
+            stages[-1] = Stage("actor", generate_tail, deps=("planner", "inference", "speculate"))
+
+    def checkpoint_stage_results(results):
+        # 실패 전까지 끝난 단계 결과를 체크포인트에 저장 (DB 저장은 요청 스레드에서)
+        if checkpoint is None:
+            return
+        fields = {}
+        if "script_features" in results and checkpoint.script_features is None:
+            fields["script_features"] = results["script_features"]
+        if "inference" in results and checkpoint.eval_grade is None:
+            fields["eval_grade"] = results["inference"]
+        if "planner" in results and checkpoint.is_correct is None:
+            fields["is_correct"] = bool(results["planner"])
+            fields["graded_by"] = graded_by["source"]
+        save_checkpoint(question, answer.student, audio_hash, **fields)
+
+    try:
+        run = run_stages(stages)
+    except StageError as stage_error:
+        checkpoint_stage_results(stage_error.results)
+        if stage_error.stage in ("script_features", "inference"):
+            logger.error(f"[AnswerSubmitView] ML 추론 실패: {stage_error.error}", exc_info=True)
+            error, message, label = "Inference failed", "답변 평가 중 오류가 발생했습니다.", "Inference"
+        else:
+            logger.error(f"[AnswerSubmitView] Tail Question 생성 실패: {stage_error.error}", exc_info=True)
+            error, message, label = "Tail question generation failed", "꼬리 질문 생성 중 오류가 발생했습니다.", "Tail"
+        if answer is not None:
+            try:
+                logger.info(f"[AnswerSubmitView] {label} 실패로 Answer 삭제 - id={answer.id}")
+                answer.delete()
+                answer = None
+            except Exception as del_err:
+                logger.error(f"[AnswerSubmitView] {label} 실패 시 Answer 삭제 중 에러: {del_err}", exc_info=True)
+        return create_api_response(
+            success=False,
+            error=error,
+            message=message,
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+    confidence_score = run.results["inference"]
+    tail_payload = run.results["actor"]
+    logger.info(f"[AnswerSubmitView] 단계별 소요 시간: {run.format_timings()}")
+    if speculative_actor is not None:
+        stats = speculative_actor.stats()
+        logger.info(
+            f"[AnswerSubmitView] actor 추측 실행 hit rate {stats['hit_rate']:.2f} (hit {stats['hits']}, "
+            f"miss {stats['misses']}, 취소 {stats['cancelled']}) - 낭비 토큰 prompt {stats['wasted_prompt_tokens']}, "
+            f"completion {stats['wasted_completion_tokens']}"
+        )
+    if local_grader is not None:
+        stats = local_grader.stats()
+        logger.info(
+            f"[AnswerSubmitView] 정오답 판정 주체: {graded_by['source']} - LLM 생략 비율 {stats['llm_skip_rate']:.2f} "
+            f"(로컬 정답 {stats['local_correct']}, 로컬 오답 {stats['local_incorrect']}, LLM 위임 {stats['deferred']})"
+        )
+
+    # Step 4: Answer 레코드 생성
+    is_correct = tail_payload.get("is_correct", False)
+    answer_state = Answer.State.CORRECT if is_correct else Answer.State.INCORRECT
+
+    logger.info("[AnswerSubmitView] Answer 레코드 생성 시작")
+
+    try:
+        # PersonalAssignment 가져오기
+        personal_assignment = question.personal_assignment
+
+        # personal_assignment의 STATUS: NOT_STARTED 이면 personal_assignment의 STATUS: IN_PROGRESS로 변경
+        # plan 이 ONLY_CORRECT 면 STATUS: SUBMITTED 로 변경, solved_num +1
+        if personal_assignment.status == PersonalAssignment.Status.NOT_STARTED:
+            personal_assignment.status = PersonalAssignment.Status.IN_PROGRESS
+            personal_assignment.started_at = started_at
+
+        plan = tail_payload.get("plan")
+        old_solved_num = personal_assignment.solved_num
+
+        if plan == "ONLY_CORRECT":
+            personal_assignment.solved_num += 1
+            logger.info(
+                f"[AnswerSubmitView] solved_num updated: {old_solved_num} -> {personal_assignment.solved_num} "
+                f"(question_id={question.id}, plan={plan})"
+            )
+        else:
+            logger.info(
+                f"[AnswerSubmitView] solved_num NOT updated: {old_solved_num} (question_id={question.id}, plan={plan})"
+            )
+
+        personal_assignment.save()
+        logger.info(
+            f"[AnswerSubmitView] PersonalAssignment saved: "
+            f"id={personal_assignment.id}, solved_num={personal_assignment.solved_num}"
+        )
+
+        # Answer 생성 또는 업데이트
+        answer.text_answer = transcript
+        answer.eval_grade = confidence_score
+        answer.started_at = started_at
+        answer.submitted_at = timezone.now()
+
+        logger.info(f"[AnswerSubmitView] Answer 레코드 생성 완료 - Answer ID: {answer.id}")
+    except Exception as answer_error:
+        logger.error(f"[AnswerSubmitView] Answer 레코드 생성 실패: {answer_error}", exc_info=True)
+        checkpoint_stage_results(run.results)
+        if answer is not None:
+            try:
+                logger.info(f"[AnswerSubmitView] Answer 생성 실패로 Answer 삭제 - id={answer.id}")
+                answer.delete()
+            except Exception as del_err:
+                logger.error(
+                    f"[AnswerSubmitView] Answer 생성 실패 시 Answer 삭제 중 에러: {del_err}",
+                    exc_info=True,
+                )
+        return create_api_response(
+            success=False,
+            error="Answer creation failed",
+            message="답변 저장 중 오류가 발생했습니다.",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+    # Step 5: Tail Question 객체 생성 (plan이 "ASK"인 경우만)
+    tail_question_obj = None
+    tail_question_deferred = False
+    plan = tail_payload.get("plan")
+
+    if plan == "ASK" and tail_payload.get("recalled_time") < 4:
+        if tail_payload.get("deferred"):
+            # 시간 예산 초과로 꼬리 질문은 답안 저장 후 작업 큐에 등록
+            tail_question_deferred = True
+        else:
+            tail_question_obj = create_tail_question_record(question, personal_assignment, tail_payload)
+    else:
+        logger.info(f"[AnswerSubmitView] Plan이 '{plan}'이므로 Tail Question 생성하지 않고 다음 base 문제로 이동")
+        try:
+            tail_question_obj = Question.objects.get(
+                personal_assignment=personal_assignment,
+                number=question.number + 1,
+                recalled_num=0,
+            )
+        except Question.DoesNotExist:
+            logger.info(
+                f"[AnswerSubmitView] 다음 base Question이 존재하지 않음 - PersonalAssignment ID: {personal_assignment.id}, Number: {question.number + 1}"
+            )
+            tail_question_obj = None
+            personal_assignment.status = PersonalAssignment.Status.SUBMITTED
+            personal_assignment.submitted_at = timezone.now()
+            personal_assignment.save()
+            logger.info(f"[AnswerSubmitView] PersonalAssignment 상태를 SUBMITTED로 변경 - ID: {personal_assignment.id}")
+    answer.state = answer_state
+    answer.graded_by = graded_by["source"]
+    answer.save()
+    clear_checkpoint(checkpoint)
+
+    tail_question_job = None
+    if tail_question_deferred:
+        try:
+            tail_question_job = enqueue_tail_question_job(answer)
+        except Exception as job_error:
+            logger.error(f"[AnswerSubmitView] 꼬리 질문 작업 등록 실패 - Answer ID: {answer.id}, {job_error}")
+
+    # 재채점용 특징 벡터 저장 (실패해도 채점 결과 응답에는 영향 없음)
+    try:
+        save_answer_features(answer, run.results["script_features"])
+    except Exception as store_error:
+        logger.warning(f"[AnswerSubmitView] 특징 벡터 저장 실패 - Answer ID: {answer.id}, {store_error}")
+    # Step 6: 응답 데이터 준비
+    if tail_question_obj:
+        response_data = tail_question_response_data(tail_question_obj, is_correct)
+    else:
+        # tail_question이 없는 경우 (plan이 "PASS" 또는 "STOP")
+        response_data = {
+            "is_correct": is_correct,
+            "tail_question": None,
+        }
+    if tail_question_job is not None:
+        # 꼬리 질문은 작업 조회 API(answer/jobs/<job_id>/)로 받음
+        response_data["tail_question_job_id"] = tail_question_job.id
+        return create_api_response(
+            data=response_data,
+            message="답안이 제출되었습니다. 꼬리 질문은 생성 중이며 작업 조회 API로 확인해주세요.",
+            status_code=status.HTTP_201_CREATED,
+        )
+
+    # 최종 응답 반환
+    return create_api_response(
+        data=response_data,
+        message="답안이 성공적으로 제출되었습니다.",
+        status_code=status.HTTP_201_CREATED,
+    )
+
+
+def create_tail_question_record(question, personal_assignment, tail_payload):
+    """
+    plan이 ASK인 꼬리 질문 payload로 Question 생성 (같은 번호 / recalled_num의 Question이 이미 있으면 재사용)
+    생성에 실패하면 None (꼬리 질문 없이 진행)
+    """
+    tail_question_data = tail_payload.get("tail_question", {})
+    if not tail_question_data:
+        logger.warning("[AnswerSubmitView] Plan이 ASK이지만 tail_question 데이터가 없습니다.")
+        return None
+
+    logger.info("[AnswerSubmitView] Tail Question 객체 생성 시작")
+
+    try:
+        recalled_time = tail_payload.get("recalled_time", question.recalled_num + 1)
+
+        # 먼저 동일한 조합의 Question이 이미 존재하는지 확인
+        existing_tail_question = Question.objects.filter(
+            personal_assignment=personal_assignment,
+            number=question.number,
+            recalled_num=recalled_time,
+        ).first()
+
+        if existing_tail_question:
+            logger.info(
+                f"[AnswerSubmitView] 동일한 Tail Question이 이미 존재함 - Question ID: {existing_tail_question.id}"
+            )
+            return existing_tail_question
+
+        # Tail Question 생성
+        tail_question_obj = Question.objects.create(
+            personal_assignment=personal_assignment,
+            number=question.number,  # 원본 질문과 동일한 번호 사용 (base question number)
+            content=tail_question_data.get("question", ""),
+            model_answer=tail_question_data.get("model_answer", ""),
+            model_answer_embedding=(
+                model_answer_embeddings([tail_question_data.get("model_answer", "")])[0]
+                if settings.LOCAL_GRADER_ENABLED
+                else None
+            ),
+            explanation=tail_question_data.get("explanation", ""),
+            difficulty=tail_question_data.get("difficulty", Question.Difficulty.MEDIUM),
+            recalled_num=recalled_time,
+            base_question=question,  # 원본 질문 연결
+        )
+        logger.info(f"[AnswerSubmitView] Tail Question 객체 생성 완료 - Question ID: {tail_question_obj.id}")
+        return tail_question_obj
+    except Exception as tq_error:
+        logger.error(f"[AnswerSubmitView] Tail Question 객체 생성 실패: {tq_error}", exc_info=True)
+        # 이 경우 에러를 반환하지 않고 계속 진행 (tail question 없이)
+        return None
+
+
+def tail_question_response_data(tail_question_obj, is_correct):
+    """답안 제출 응답 본문 (TailQuestionSerializer)"""
+    # Question 객체를 QuestionSerializer 형식에 맞게 변환
+    tail_question_data = {
+        "id": tail_question_obj.id,
+        "number": tail_question_obj.number,
+        "question": tail_question_obj.content,  # content -> question
+        "answer": tail_question_obj.model_answer,  # model_answer -> answer
+        "explanation": tail_question_obj.explanation,
+        "difficulty": tail_question_obj.difficulty,
+    }
+
+    # TailQuestionSerializer에 전달할 데이터에는 recalled_num과 number가 필요
+    tail_serializer = TailQuestionSerializer(
+        {
+            "tail_question": tail_question_data,
+            "is_correct": is_correct,
+            "number": tail_question_obj.number,
+            "recalled_num": tail_question_obj.recalled_num,
+        }
+    )
+    return tail_serializer.data
+
+
+def complete_deferred_tail_question(answer, question):
+    """
+    시간 예산 초과로 미룬 꼬리 질문 생성 (채점 워커의 TAIL_QUESTION 작업)
+
+    답안은 이미 채점되어 저장된 상태(text_answer / eval_grade / state)이며,
+    완료되면 답안 제출 API와 같은 응답(TailQuestionSerializer)을 반환합니다.
+    """
+    is_correct = answer.state == Answer.State.CORRECT
+    logger.info(f"[AnswerSubmitView] 미룬 꼬리 질문 생성 시작 - answer_id={answer.id}, question_id={question.id}")
+    tail_cache = (
+        get_tail_question_cache(semantic=settings.TAIL_QUESTION_SEMANTIC_CACHE_ENABLED)
+        if settings.TAIL_QUESTION_CACHE_ENABLED
+        else None
+    )
+    payload = generate_tail_question(
+        question=question.content,
+        model_answer=question.model_answer,
+        student_answer=answer.text_answer,
+        eval_grade=answer.eval_grade,
+        recalled_time=question.recalled_num,
+        high_thr=3.45,
+        is_correct=is_correct,
+        tail_cache=tail_cache,
+    )
+
+    tail_question_obj = None
+    if payload and payload.get("plan") == "ASK":
+        tail_question_obj = create_tail_question_record(question, question.personal_assignment, payload)
+    if tail_question_obj is None:
+        return create_api_response(
+            success=False,
+            error="Tail question generation failed",
+            message="꼬리 질문 생성 중 오류가 발생했습니다.",
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+    return create_api_response(
+        data=tail_question_response_data(tail_question_obj, is_correct),
+        message="답안이 성공적으로 제출되었습니다.",
+        status_code=status.HTTP_201_CREATED,
+    )
+
+
+def prepare_answer_submission(request):
+    """
+    답안 제출 요청 검증 + Answer를 PROCESSING 상태로 생성 (AnswerSubmitView / AnswerStreamView 공용)
+
+    Returns:
+        (answer, question, audio_file, None), 검증 실패 시 (None, None, None, 오류 응답)
+    """
+
+    def reject(error, message, status_code):
+        return (
+            None,
+            None,
+            None,
+            create_api_response(success=False, error=error, message=message, status_code=status_code),
+        )
+
+    # Step 1-1: 요청 데이터 검증
+    student_id = request.data.get("studentId")
+    question_id = request.data.get("questionId")
+    audio_file = request.FILES.get("audioFile")
+
+    # 필수 파라미터 체크
+    if not student_id:
+        return reject("Missing studentId", "studentId는 필수 파라미터입니다.", status.HTTP_400_BAD_REQUEST)
+
+    if not question_id:
+        return reject("Missing questionId", "questionId는 필수 파라미터입니다.", status.HTTP_400_BAD_REQUEST)
+
+    if not audio_file:
+        return reject("Missing audioFile", "audioFile은 필수 파라미터입니다.", status.HTTP_400_BAD_REQUEST)
+
+    # 파일 확장자 검증
+    if not audio_file.name.endswith(".wav"):
+        return reject("Invalid file format", "audioFile은 .wav 파일이어야 합니다.", status.HTTP_400_BAD_REQUEST)
+
+    # Step 1-2: DB에서 학생과 문제 확인
+    try:
+        student = Account.objects.get(id=student_id, is_student=True)
+    except Account.DoesNotExist:
+        return reject("Student not found", f"ID가 {student_id}인 학생을 찾을 수 없습니다.", status.HTTP_404_NOT_FOUND)
+
+    try:
+        question = Question.objects.get(id=question_id)
+    except Question.DoesNotExist:
+        return reject("Question not found", f"ID가 {question_id}인 문제를 찾을 수 없습니다.", status.HTTP_404_NOT_FOUND)
+    answer, _ = Answer.objects.update_or_create(
+        question=question,
+        student=student,
+        defaults={
+            "state": Answer.State.PROCESSING,
+            "text_answer": "",
+            "eval_grade": None,
+            "started_at": timezone.now(),  # 임시값, 나중에 audio_duration 기반으로 덮어씀
+            "submitted_at": None,
+        },
+    )
+    logger.info(f"[AnswerSubmitView] Answer를 PROCESSING 상태로 설정 - id={answer.id}")
+    return answer, question, audio_file, None
+
+
+def replay_submission_job(job):
+    """
+    같은 답안 제출의 중복 요청 응답 (Idempotent-Replayed: true)
+    - 끝난 작업: 저장된 응답 그대로
+    - 처리 중인 작업: 동기 채점이면 끝날 때까지 기다렸다가 결과, 시간 안에 끝나지 않으면(또는 비동기 채점) 202 + job_id
+    """
+    if job.status in IN_FLIGHT and not settings.ASYNC_GRADING_ENABLED:
+        job = wait_for_job(job)
+
+    if job.status in IN_FLIGHT:
+        logger.info(f"[AnswerSubmitView] 중복 요청 - 처리 중인 작업 안내 job_id={job.id}")
+        response = create_api_response(
+            data={"job_id": job.id, "answer_id": job.answer_id, "status": job.status},
+            message="같은 답안을 채점하고 있습니다. 채점 결과는 작업 조회 API로 확인해주세요.",
+            status_code=status.HTTP_202_ACCEPTED,
+        )
+    else:
+        logger.info(f"[AnswerSubmitView] 중복 요청 - 저장된 결과 반환 job_id={job.id}, status={job.status}")
+        response = Response(job.result, status=job.result_status_code or status.HTTP_500_INTERNAL_SERVER_ERROR)
+    response["Idempotent-Replayed"] = "true"
+    return response
+
+
+def stream_answer_grading(answer, question, audio, deadline=None):
+    """
+    grade_answer_submission을 별도 스레드에서 실행하면서 단계 이벤트를 SSE 메시지로 내보내는 generator
+
+    transcript -> correctness -> tail_question_delta ... -> result(답안 제출 API와 같은 응답 본문) 또는 error
+    클라이언트 연결이 끊겨도 채점은 끝까지 진행되어 DB에 반영됩니다.
+    """
+    events = queue.Queue()
+
+    def run():
+        try:
+            response = grade_answer_submission(
+                answer, question, audio, on_event=lambda e, d: events.put((e, d)), deadline=deadline
+            )
+            event = "result" if status.is_success(response.status_code) else "error"
+            events.put((event, {**response.data, "status_code": response.status_code}))
+        except Exception as e:
+            logger.error(f"[AnswerStreamView] {e}", exc_info=True)
+            if answer.pk is not None and answer.state == Answer.State.PROCESSING:
+                answer.delete()
+                logger.info(f"[AnswerStreamView] 예외 발생으로 PROCESSING Answer 삭제 - question_id={question.id}")
+            events.put(
+                (
+                    "error",
+                    {
+                        "success": False,
+                        "data": None,
+                        "message": "답안 제출 중 오류가 발생했습니다.",
+                        "error": str(e),
+                        "status_code": status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    },
+                )
+            )
+        finally:
+            connection.close()  # 스레드별 DB 연결 정리
+            events.put(None)
+
+    threading.Thread(target=run, name=f"answer-stream-{answer.id}", daemon=True).start()
+    while True:
+        try:
+            item = events.get(timeout=SSE_KEEPALIVE_SECONDS)
+        except queue.Empty:
+            yield ": keep-alive\n\n"
+            continue
+        if item is None:
+            return
+        yield sse_event(*item)
+
+
 # 개인 과제 조회
 class PersonalAssignmentListView(APIView):
     @swagger_auto_schema(
@@ -371,8 +1180,22 @@ class AnswerSubmitView(APIView):
         - studentId (integer): 제출하는 학생의 ID
         - questionId (integer): 제출한 문제의 ID
         - audioFile (file): 음성 답변 파일 (.wav)
+
+        ANSWER_DEADLINE_SECONDS 안에 꼬리 질문까지 만들 수 없으면 정오답만 응답하고(tail_question: null),
+        꼬리 질문은 tail_question_job_id 작업 조회 API(answer/jobs/<job_id>/)로 전달합니다.
+
+        ANSWER_IDEMPOTENCY_ENABLED이면 Idempotency-Key 헤더(없으면 음성 파일 내용) + questionId + studentId가 같은
+        중복 요청은 다시 채점하지 않고 먼저 들어온 요청의 결과를 돌려줍니다 (Idempotent-Replayed: true).
+        먼저 들어온 요청이 아직 채점 중이면 끝날 때까지 기다리고, 오래 걸리면 202 + job_id를 반환합니다.
         """,
         manual_parameters=[
+            openapi.Parameter(
+                "Idempotency-Key",
+                openapi.IN_HEADER,
+                description="같은 답안 제출의 재전송을 구분하는 키 (선택)",
+                type=openapi.TYPE_STRING,
+                required=False,
+            ),
             openapi.Parameter(
                 "studentId",
                 openapi.IN_FORM,
@@ -397,6 +1220,7 @@ class AnswerSubmitView(APIView):
         ],
         responses={
             201: "답안 제출 성공",
+            202: "답안 접수 (ASYNC_GRADING_ENABLED=True이거나 같은 답안이 채점 중일 때, 채점 작업 ID 반환)",
             400: "잘못된 요청",
             404: "학생 또는 문제를 찾을 수 없음",
             500: "서버 오류",
@@ -411,376 +1235,198 @@ class AnswerSubmitView(APIView):
         """
 
         answer = None
+        job = None
+        # 시간 예산은 요청이 들어온 시점부터 (업로드 파싱 포함)
+        deadline = answer_deadline()
 
         try:
-            # Step 1-1: 요청 데이터 검증
-            student_id = request.data.get("studentId")
-            question_id = request.data.get("questionId")
-            audio_file = request.FILES.get("audioFile")
-
-            # 필수 파라미터 체크
-            if not student_id:
-                return create_api_response(
-                    success=False,
-                    error="Missing studentId",
-                    message="studentId는 필수 파라미터입니다.",
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                )
-
-            if not question_id:
+            # 중복 요청(같은 Idempotency-Key 또는 같은 음성)은 Answer를 건드리기 전에 먼저 들어온 요청의 작업 결과를 사용
+            key = submission_key(request) if settings.ANSWER_IDEMPOTENCY_ENABLED else None
+            if key is not None:
+                existing_job = find_submission_job(key)
+                if existing_job is not None:
+                    return replay_submission_job(existing_job)
+
+            answer, question, audio_file, error_response = prepare_answer_submission(request)
+            if error_response is not None:
+                return error_response
+
+            if settings.ASYNC_GRADING_ENABLED:
+                # 비동기 채점: 음성 파일을 작업 큐에 등록하고 job id를 바로 반환 (채점은 run_grading_worker가 수행)
+                if key is not None:
+                    job, created = register_submission_job(
+                        key, lambda: enqueue_grading_job(answer, audio_file, idempotency_key=key)
+                    )
+                    if not created:
+                        return replay_submission_job(job)
+                else:
+                    job = enqueue_grading_job(answer, audio_file)
+                logger.info(f"[AnswerSubmitView] 채점 작업 등록 - job_id={job.id}, answer_id={answer.id}")
                 return create_api_response(
-                    success=False,
-                    error="Missing questionId",
-                    message="questionId는 필수 파라미터입니다.",
-                    status_code=status.HTTP_400_BAD_REQUEST,
+                    data={"job_id": job.id, "answer_id": answer.id, "status": job.status},
+                    message="답안이 접수되었습니다. 채점 결과는 작업 조회 API로 확인해주세요.",
+                    status_code=status.HTTP_202_ACCEPTED,
                 )
 
-            if not audio_file:
-                return create_api_response(
-                    success=False,
-                    error="Missing audioFile",
-                    message="audioFile은 필수 파라미터입니다.",
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                )
+            if key is None:
+                # 업로드 스트림을 그대로 넘김 (extract_all_features에서 AudioBuffer로 한 번만 디코딩, 임시 파일 없음)
+                return grade_answer_submission(answer, question, audio_file, deadline=deadline)
 
-            # 파일 확장자 검증
-            if not audio_file.name.endswith(".wav"):
-                return create_api_response(
-                    success=False,
-                    error="Invalid file format",
-                    message="audioFile은 .wav 파일이어야 합니다.",
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                )
+            # 중복 요청이 기다릴 수 있도록 채점 중인 요청을 작업으로 기록하고 결과를 저장
+            request_job, created = register_submission_job(key, lambda: start_request_job(answer, key))
+            if not created:
+                return replay_submission_job(request_job)
+            job = request_job
+            response = grade_answer_submission(answer, question, audio_file, deadline=deadline)
+            finish_job(job, response)
+            return response
 
-            # Step 1-2: DB에서 학생과 문제 확인
-            try:
-                student = Account.objects.get(id=student_id, is_student=True)
-            except Account.DoesNotExist:
-                return create_api_response(
-                    success=False,
-                    error="Student not found",
-                    message=f"ID가 {student_id}인 학생을 찾을 수 없습니다.",
-                    status_code=status.HTTP_404_NOT_FOUND,
-                )
-
-            try:
-                question = Question.objects.get(id=question_id)
-            except Question.DoesNotExist:
-                return create_api_response(
-                    success=False,
-                    error="Question not found",
-                    message=f"ID가 {question_id}인 문제를 찾을 수 없습니다.",
-                    status_code=status.HTTP_404_NOT_FOUND,
+        except Exception as e:
+            logger.error(f"[AnswerSubmitView] {e}", exc_info=True)
+            if job is not None and job.status == GradingJob.Status.RUNNING:
+                # 요청 채점 작업도 실패로 기록 (PROCESSING Answer는 fail_job에서 삭제)
+                fail_job(job, error=str(e), message="답안 제출 중 오류가 발생했습니다.")
+            if answer and answer.pk is not None and answer.state == Answer.State.PROCESSING:
+                answer.delete()
+                logger.info(
+                    f"[AnswerSubmitView] 전역 예외 발생으로 PROCESSING Answer 삭제 - "
+                    f"question_id={getattr(answer, 'question_id', None)}, "
+                    f"student_id={getattr(answer, 'student_id', None)}"
                 )
-            answer, _ = Answer.objects.update_or_create(
-                question=question,
-                student=student,
-                defaults={
-                    "state": Answer.State.PROCESSING,
-                    "text_answer": "",
-                    "eval_grade": None,
-                    "started_at": timezone.now(),  # 임시값, 나중에 audio_duration 기반으로 덮어씀
-                    "submitted_at": None,
-                },
+            return create_api_response(
+                success=False,
+                error=str(e),
+                message="답안 제출 중 오류가 발생했습니다.",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
-            logger.info(f"[AnswerSubmitView] Answer를 PROCESSING 상태로 설정 - id={answer.id}")
-            # 임시 파일 생성 (extract_all_features 함수용)
-            with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as temp_file:
-                # 업로드된 파일 내용을 임시 파일에 쓰기
-                for chunk in audio_file.chunks():
-                    temp_file.write(chunk)
-                temp_file_path = temp_file.name
-
-            logger.info(f"[AnswerSubmitView] 임시 파일 생성: {temp_file_path}")
-
-            try:
-                # Step 1-4: STT 변환 및 Feature 추출 (extract_all_features 사용)
-                logger.info(f"[AnswerSubmitView] Feature 추출 시작 - Question ID: {question_id}")
-                features = extract_all_features(temp_file_path)
-                logger.info("[AnswerSubmitView] Feature 추출 완료")
-
-                # features 에서 음성 파일 길이 구해서 timezone.now()에 빼는 로직
-                audio_duration_sec = features.get("total_length", 0.0)
-                if audio_duration_sec is None or audio_duration_sec <= 0:
-                    # fallback: 현재 시간 사용
-                    started_at = timezone.now()
-                else:
-                    started_at = timezone.now() - timedelta(seconds=audio_duration_sec)
-                logger.info(f"[AnswerSubmitView] 음성 길이: {audio_duration_sec:.2f}초, 시작 시간: {started_at}")
-
-                # STT 결과 (transcript) 확인
-                transcript = features.get("script", "")
-                if not transcript or transcript.strip() == "":
-                    if answer is not None:
-                        try:
-                            logger.info(f"[AnswerSubmitView] STT 실패로 Answer 삭제 - id={answer.id}")
-                            answer.delete()
-                            answer = None
-                        except Exception as del_err:
-                            logger.error(
-                                f"[AnswerSubmitView] STT 실패 시 Answer 삭제 중 에러: {del_err}", exc_info=True
-                            )
-                    return create_api_response(
-                        success=False,
-                        error="STT failed",
-                        message="음성 인식 결과가 없습니다. 다시 녹음해주세요.",
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                    )
-
-                logger.info(f"[AnswerSubmitView] STT 결과: {transcript[:100]}...")  # 처음 100자만 로깅
-
-                # Step 2: ML 추론 (Inference)
-                xgbmodel_path = "submissions/machine/model.joblib"
-                logger.info("[AnswerSubmitView] ML 추론 시작")
-
-                try:
-                    inference_results = run_inference(xgbmodel_path, features)
-                    confidence_score = inference_results.get("pred_cont")
-
-                    if confidence_score is None:
-                        raise ValueError("Inference result does not contain 'pred_cont'")
-
-                    logger.info(f"[AnswerSubmitView] ML 추론 완료 - Confidence: {confidence_score}")
-                except Exception as inf_error:
-                    logger.error(f"[AnswerSubmitView] ML 추론 실패: {inf_error}", exc_info=True)
-                    if answer is not None:
-                        try:
-                            logger.info(f"[AnswerSubmitView] Inference 실패로 Answer 삭제 - id={answer.id}")
-                            answer.delete()
-                            answer = None
-                        except Exception as del_err:
-                            logger.error(
-                                f"[AnswerSubmitView] Inference 실패 시 Answer 삭제 중 에러: {del_err}", exc_info=True
-                            )
-                    return create_api_response(
-                        success=False,
-                        error="Inference failed",
-                        message="답변 평가 중 오류가 발생했습니다.",
-                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    )
-
-                # Step 3: Tail Question 생성
-                logger.info("[AnswerSubmitView] Tail Question 생성 시작")
 
-                try:
-                    tail_payload = generate_tail_question(
-                        question=question.content,
-                        model_answer=question.model_answer,
-                        student_answer=transcript,
-                        eval_grade=confidence_score,
-                        recalled_time=question.recalled_num,
-                        high_thr=3.45,
-                    )
 
-                    if not tail_payload:
-                        raise ValueError("Tail question generation returned None")
-
-                    logger.info(f"[AnswerSubmitView] Tail Question 생성 완료 - Plan: {tail_payload.get('plan')}")
-                except Exception as tail_error:
-                    logger.error(f"[AnswerSubmitView] Tail Question 생성 실패: {tail_error}", exc_info=True)
-                    if answer is not None:
-                        try:
-                            logger.info(f"[AnswerSubmitView] Tail 생성 실패로 Answer 삭제 - id={answer.id}")
-                            answer.delete()
-                            answer = None
-                        except Exception as del_err:
-                            logger.error(
-                                f"[AnswerSubmitView] Tail 실패 시 Answer 삭제 중 에러: {del_err}", exc_info=True
-                            )
-                    return create_api_response(
-                        success=False,
-                        error="Tail question generation failed",
-                        message="꼬리 질문 생성 중 오류가 발생했습니다.",
-                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    )
+class AnswerStreamView(APIView):
+    parser_classes = [MultiPartParser, FormParser]
+    renderer_classes = [JSONRenderer, EventStreamRenderer]
 
-                # Step 4: Answer 레코드 생성
-                is_correct = tail_payload.get("is_correct", False)
-                answer_state = Answer.State.CORRECT if is_correct else Answer.State.INCORRECT
+    @swagger_auto_schema(
+        operation_id="답안 제출 (스트리밍)",
+        operation_description="""
+        답안 제출 API와 같은 요청(multipart/form-data: studentId, questionId, audioFile)을 받아
+        채점 진행 상황을 Server-Sent Events(text/event-stream)로 전달합니다.
 
-                logger.info("[AnswerSubmitView] Answer 레코드 생성 시작")
+        **Events**:
+        - transcript: {"transcript"} STT 결과
+        - correctness: {"is_correct", "graded_by"} 정오답 판정
+        - tail_question_delta: {"text"} 꼬리 질문 텍스트 조각 (이어 붙이면 전체 질문)
+        - result: 답안 제출 API와 같은 응답 본문 (data는 TailQuestionSerializer) + status_code
+        - error: 실패 응답 본문 + status_code
 
-                try:
-                    # PersonalAssignment 가져오기
-                    personal_assignment = question.personal_assignment
-
-                    # personal_assignment의 STATUS: NOT_STARTED 이면 personal_assignment의 STATUS: IN_PROGRESS로 변경
-                    # plan 이 ONLY_CORRECT 면 STATUS: SUBMITTED 로 변경, solved_num +1
-                    if personal_assignment.status == PersonalAssignment.Status.NOT_STARTED:
-                        personal_assignment.status = PersonalAssignment.Status.IN_PROGRESS
-                        personal_assignment.started_at = started_at
+        ASYNC_GRADING_ENABLED와 관계없이 항상 바로 채점합니다.
+        """,
+        responses={
+            200: "채점 이벤트 스트림 (text/event-stream)",
+            400: "잘못된 요청",
+            404: "학생 또는 문제를 찾을 수 없음",
+            500: "서버 오류",
+        },
+    )
+    def post(self, request):
+        """
+        음성 답안 제출 API (SSE 스트리밍)
 
-                    plan = tail_payload.get("plan")
-                    old_solved_num = personal_assignment.solved_num
+        요청 검증과 Answer 생성은 AnswerSubmitView와 같고, 채점은 stream_answer_grading에서 진행
+        """
+        answer = None
+        deadline = answer_deadline()
 
-                    if plan == "ONLY_CORRECT":
-                        personal_assignment.solved_num += 1
-                        logger.info(
-                            f"[AnswerSubmitView] solved_num updated: {old_solved_num} -> {personal_assignment.solved_num} "
-                            f"(question_id={question_id}, plan={plan})"
-                        )
-                    else:
-                        logger.info(
-                            f"[AnswerSubmitView] solved_num NOT updated: {old_solved_num} "
-                            f"(question_id={question_id}, plan={plan})"
-                        )
+        try:
+            answer, question, audio_file, error_response = prepare_answer_submission(request)
+            if error_response is not None:
+                return error_response
 
-                    personal_assignment.save()
-                    logger.info(
-                        f"[AnswerSubmitView] PersonalAssignment saved: "
-                        f"id={personal_assignment.id}, solved_num={personal_assignment.solved_num}"
-                    )
+            logger.info(f"[AnswerStreamView] 스트리밍 채점 시작 - answer_id={answer.id}")
+            response = StreamingHttpResponse(
+                stream_answer_grading(answer, question, audio_file, deadline=deadline), content_type="text/event-stream"
+            )
+            response["Cache-Control"] = "no-cache"
+            response["X-Accel-Buffering"] = "no"  # nginx 버퍼링 비활성화
+            return response
 
-                    # Answer 생성 또는 업데이트
-                    answer.text_answer = transcript
-                    answer.eval_grade = confidence_score
-                    answer.started_at = started_at
-                    answer.submitted_at = timezone.now()
-
-                    logger.info(f"[AnswerSubmitView] Answer 레코드 생성 완료 - Answer ID: {answer.id}")
-                except Exception as answer_error:
-                    logger.error(f"[AnswerSubmitView] Answer 레코드 생성 실패: {answer_error}", exc_info=True)
-                    if answer is not None:
-                        try:
-                            logger.info(f"[AnswerSubmitView] Answer 생성 실패로 Answer 삭제 - id={answer.id}")
-                            answer.delete()
-                        except Exception as del_err:
-                            logger.error(
-                                f"[AnswerSubmitView] Answer 생성 실패 시 Answer 삭제 중 에러: {del_err}",
-                                exc_info=True,
-                            )
-                    return create_api_response(
-                        success=False,
-                        error="Answer creation failed",
-                        message="답변 저장 중 오류가 발생했습니다.",
-                        status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    )
+        except Exception as e:
+            logger.error(f"[AnswerStreamView] {e}", exc_info=True)
+            if answer and answer.state == Answer.State.PROCESSING:
+                answer.delete()
+                logger.info(
+                    f"[AnswerStreamView] 전역 예외 발생으로 PROCESSING Answer 삭제 - "
+                    f"question_id={getattr(answer, 'question_id', None)}, "
+                    f"student_id={getattr(answer, 'student_id', None)}"
+                )
+            return create_api_response(
+                success=False,
+                error=str(e),
+                message="답안 제출 중 오류가 발생했습니다.",
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
 
-                # Step 5: Tail Question 객체 생성 (plan이 "ASK"인 경우만)
-                tail_question_obj = None
-                plan = tail_payload.get("plan")
 
-                if plan == "ASK" and tail_payload.get("recalled_time") < 4:
-                    tail_question_data = tail_payload.get("tail_question", {})
+class GradingJobStatusView(APIView):
+    @swagger_auto_schema(
+        operation_id="답안 채점 작업 조회",
+        operation_description=(
+            "비동기 채점 작업(답안 제출 시 202로 받은 job_id)의 상태를 조회합니다. "
+            "완료되면 답안 제출 API와 동일한 응답(TailQuestionSerializer)을 반환합니다."
+        ),
+        responses={
+            200: "채점 완료 (답안 제출 응답과 동일)",
+            202: "채점 대기/진행 중",
+            404: "작업을 찾을 수 없음",
+        },
+    )
+    def get(self, request, job_id):
+        """
+        채점 작업 상태 조회
 
-                    if not tail_question_data:
-                        logger.warning("[AnswerSubmitView] Plan이 ASK이지만 tail_question 데이터가 없습니다.")
-                    else:
-                        logger.info("[AnswerSubmitView] Tail Question 객체 생성 시작")
-
-                        try:
-                            recalled_time = tail_payload.get("recalled_time", question.recalled_num + 1)
-
-                            # 먼저 동일한 조합의 Question이 이미 존재하는지 확인
-                            existing_tail_question = Question.objects.filter(
-                                personal_assignment=personal_assignment,
-                                number=question.number,
-                                recalled_num=recalled_time,
-                            ).first()
-
-                            if existing_tail_question:
-                                logger.info(
-                                    f"[AnswerSubmitView] 동일한 Tail Question이 이미 존재함 - Question ID: {existing_tail_question.id}"
-                                )
-                                tail_question_obj = existing_tail_question
-                            else:
-                                # Tail Question 생성
-                                tail_question_obj = Question.objects.create(
-                                    personal_assignment=personal_assignment,
-                                    number=question.number,  # 원본 질문과 동일한 번호 사용 (base question number)
-                                    content=tail_question_data.get("question", ""),
-                                    model_answer=tail_question_data.get("model_answer", ""),
-                                    explanation=tail_question_data.get("explanation", ""),
-                                    difficulty=tail_question_data.get("difficulty", Question.Difficulty.MEDIUM),
-                                    recalled_num=recalled_time,
-                                    base_question=question,  # 원본 질문 연결
-                                )
-                                logger.info(
-                                    f"[AnswerSubmitView] Tail Question 객체 생성 완료 - Question ID: {tail_question_obj.id}"
-                                )
-                        except Exception as tq_error:
-                            logger.error(f"[AnswerSubmitView] Tail Question 객체 생성 실패: {tq_error}", exc_info=True)
-                            # 이 경우 에러를 반환하지 않고 계속 진행 (tail question 없이)
-                            tail_question_obj = None
-                else:
-                    logger.info(
-                        f"[AnswerSubmitView] Plan이 '{plan}'이므로 Tail Question 생성하지 않고 다음 base 문제로 이동"
-                    )
-                    try:
-                        tail_question_obj = Question.objects.get(
-                            personal_assignment=personal_assignment,
-                            number=question.number + 1,
-                            recalled_num=0,
-                        )
-                    except Question.DoesNotExist:
-                        logger.info(
-                            f"[AnswerSubmitView] 다음 base Question이 존재하지 않음 - PersonalAssignment ID: {personal_assignment.id}, Number: {question.number + 1}"
-                        )
-                        tail_question_obj = None
-                        personal_assignment.status = PersonalAssignment.Status.SUBMITTED
-                        personal_assignment.submitted_at = timezone.now()
-                        personal_assignment.save()
-                        logger.info(
-                            f"[AnswerSubmitView] PersonalAssignment 상태를 SUBMITTED로 변경 - ID: {personal_assignment.id}"
-                        )
-                answer.state = answer_state
-                answer.save()
-                # Step 6: 응답 데이터 준비
-                # TailQuestionSerializer 사용
-                if tail_question_obj:
-                    # Question 객체를 QuestionSerializer 형식에 맞게 변환
-                    tail_question_data = {
-                        "id": tail_question_obj.id,
-                        "number": tail_question_obj.number,
-                        "question": tail_question_obj.content,  # content -> question
-                        "answer": tail_question_obj.model_answer,  # model_answer -> answer
-                        "explanation": tail_question_obj.explanation,
-                        "difficulty": tail_question_obj.difficulty,
-                    }
+        - QUEUED / RUNNING: 202 + {"job_id", "status", "answer_id"}
+        - DONE: 200 + 답안 제출 응답 본문 (tail_question, is_correct ...)
+        - FAILED: 저장된 실패 응답 (답안 제출 API의 400/500과 동일)
+        """
+        try:
+            try:
+                job = GradingJob.objects.get(id=job_id)
+            except GradingJob.DoesNotExist:
+                return create_api_response(
+                    success=False,
+                    error="Grading job not found",
+                    message=f"ID가 {job_id}인 채점 작업을 찾을 수 없습니다.",
+                    status_code=status.HTTP_404_NOT_FOUND,
+                )
 
-                    # TailQuestionSerializer에 전달할 데이터에는 recalled_num과 number가 필요
-                    tail_serializer = TailQuestionSerializer(
-                        {
-                            "tail_question": tail_question_data,
-                            "is_correct": is_correct,
-                            "number": tail_question_obj.number,
-                            "recalled_num": tail_question_obj.recalled_num,
-                        }
-                    )
-                    response_data = tail_serializer.data
-                else:
-                    # tail_question이 없는 경우 (plan이 "PASS" 또는 "STOP")
-                    response_data = {
-                        "is_correct": is_correct,
-                        "tail_question": None,
-                    }
+            if job.status in (GradingJob.Status.QUEUED, GradingJob.Status.RUNNING):
+                return create_api_response(
+                    data={"job_id": job.id, "status": job.status, "answer_id": job.answer_id},
+                    message="채점 중입니다.",
+                    status_code=status.HTTP_202_ACCEPTED,
+                )
 
-                # 최종 응답 반환
+            result = job.result or {}
+            if job.status == GradingJob.Status.DONE:
                 return create_api_response(
-                    data=response_data,
-                    message="답안이 성공적으로 제출되었습니다.",
-                    status_code=status.HTTP_201_CREATED,
+                    data=result.get("data"),
+                    message=result.get("message", "답안이 성공적으로 제출되었습니다."),
+                    status_code=status.HTTP_200_OK,
                 )
 
-            finally:
-                # 임시 파일 삭제 (성공/실패 여부와 관계없이 항상 실행)
-                if os.path.exists(temp_file_path):
-                    os.unlink(temp_file_path)
-                    logger.info(f"[AnswerSubmitView] 임시 파일 삭제: {temp_file_path}")
+            return create_api_response(
+                success=False,
+                data=result.get("data"),
+                error=result.get("error", "Grading failed"),
+                message=result.get("message", "답안 채점 중 오류가 발생했습니다."),
+                status_code=job.result_status_code or status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
 
         except Exception as e:
-            logger.error(f"[AnswerSubmitView] {e}", exc_info=True)
-            if answer and answer.state == Answer.State.PROCESSING:
-                answer.delete()
-                logger.info(
-                    f"[AnswerSubmitView] 전역 예외 발생으로 PROCESSING Answer 삭제 - "
-                    f"question_id={getattr(answer, 'question_id', None)}, "
-                    f"student_id={getattr(answer, 'student_id', None)}"
-                )
+            logger.error(f"[GradingJobStatusView] {e}", exc_info=True)
             return create_api_response(
                 success=False,
                 error=str(e),
-                message="답안 제출 중 오류가 발생했습니다.",
+                message="채점 작업 조회 중 오류가 발생했습니다.",
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
@@ -198,6 +198,77 @@ AWS_REGION = os.getenv("AWS_REGION", "ap-northeast-2")
 AWS_STORAGE_BUCKET_NAME = os.getenv("AWS_STORAGE_BUCKET_NAME")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 
+# 답안 채점 비동기 처리 (DB 기반 작업 큐, 워커: python manage.py run_grading_worker)
+ASYNC_GRADING_ENABLED = os.getenv("ASYNC_GRADING_ENABLED", "False").lower() in ("true", "1")
+# 이 시간(초) 넘게 RUNNING인 작업 / 처리 중인 작업 없이 PROCESSING인 답안을 정리
+# (워커 없이 동기 채점만 쓰면 python manage.py reclaim_processing_answers를 주기 실행)
+GRADING_JOB_STALE_SECONDS = int(os.getenv("GRADING_JOB_STALE_SECONDS", "600"))
+GRADING_JOB_MAX_ATTEMPTS = int(os.getenv("GRADING_JOB_MAX_ATTEMPTS", "3"))
+
+# 서버 시작 시 SBERT / XGBoost / STT 클라이언트 미리 로드 (로컬 모델이 없으면 시작 단계에서 실패)
+MODEL_WARMUP_ENABLED = os.getenv("MODEL_WARMUP_ENABLED", "False").lower() in ("true", "1")
+
+# 꼬리 질문 캐시 (같은 base 문제 + bucket + 정규화한 답변이면 생성된 꼬리 질문 재사용)
+TAIL_QUESTION_CACHE_ENABLED = os.getenv("TAIL_QUESTION_CACHE_ENABLED", "True").lower() in ("true", "1")
+# SBERT cosine 기반 의미 일치 tier (같은 문제 안에서 비슷한 답변이면 재사용)
+TAIL_QUESTION_SEMANTIC_CACHE_ENABLED = os.getenv("TAIL_QUESTION_SEMANTIC_CACHE_ENABLED", "False").lower() in (
+    "true",
+    "1",
+)
+# 지정하면 파일 기반 캐시로 gunicorn 워커 간 공유, 없으면 프로세스 내 메모리 캐시
+TAIL_QUESTION_CACHE_DIR = os.getenv("TAIL_QUESTION_CACHE_DIR", "")
+
+# base 문제 생성 직후 문제별 bucket(A~D) 꼬리 질문을 백그라운드에서 미리 생성 (제출 시 actor LLM 호출 생략)
+TAIL_PRECOMPUTE_ENABLED = os.getenv("TAIL_PRECOMPUTE_ENABLED", "False").lower() in ("true", "1")
+
+# 첫 풀이(recalled_num == 0)처럼 정오답과 관계없이 꼬리 질문을 만드는 경우, 정오답 판정 + 꼬리 질문 생성을 LLM 1회로 처리
+# 정오답 판정이 흔들리지 않도록 temperature 0으로 호출하므로, 켜면 첫 꼬리 질문의 다양성이 actor(0.7)보다 낮아짐 (의도한 trade-off)
+FUSED_TAIL_GENERATION_ENABLED = os.getenv("FUSED_TAIL_GENERATION_ENABLED", "False").lower() in ("true", "1")
+
+# 모범답안 임베딩 유사도 + 핵심어 포함률로 확실한 정답/오답은 planner LLM 없이 판정 (임계값: calibrate_local_grader)
+LOCAL_GRADER_ENABLED = os.getenv("LOCAL_GRADER_ENABLED", "False").lower() in ("true", "1")
+
+# 정오답을 싸게 추정(로컬 판정기 점수 / eval_grade)해서 예상 bucket의 actor LLM을 planner와 동시에 시작 (빗나가면 버림)
+SPECULATIVE_ACTOR_ENABLED = os.getenv("SPECULATIVE_ACTOR_ENABLED", "False").lower() in ("true", "1")
+
+# 답안 채점 요청 하나의 시간 예산 (초, 0이면 제한 없음)
+# 꼬리 질문 생성(actor LLM) 몫이 남지 않으면 정오답만 먼저 응답하고 꼬리 질문은 작업 큐(run_grading_worker)에서 생성
+ANSWER_DEADLINE_SECONDS = float(os.getenv("ANSWER_DEADLINE_SECONDS", "0"))
+# 뒤 단계를 위해 남겨 두는 시간 (초): 정오답 판정(planner + 추론) / actor LLM / DB 저장 및 응답
+ANSWER_DEADLINE_GRADE_RESERVE = float(os.getenv("ANSWER_DEADLINE_GRADE_RESERVE", "5"))
+ANSWER_DEADLINE_ACTOR_RESERVE = float(os.getenv("ANSWER_DEADLINE_ACTOR_RESERVE", "6"))
+ANSWER_DEADLINE_FINALIZE_RESERVE = float(os.getenv("ANSWER_DEADLINE_FINALIZE_RESERVE", "1"))
+
+# 채점 중간 결과(STT / 음향·스크립트 특징 / eval_grade / 정오답) 체크포인트
+# 실패한 단계는 백오프로 재시도하고, 같은 음성을 다시 제출하면 마지막으로 성공한 단계부터 이어서 채점
+GRADING_CHECKPOINT_ENABLED = os.getenv("GRADING_CHECKPOINT_ENABLED", "False").lower() in ("true", "1")
+GRADING_CHECKPOINT_TTL_SECONDS = int(os.getenv("GRADING_CHECKPOINT_TTL_SECONDS", "86400"))
+# 단계(스크립트 특징 / 추론 / planner / actor)별 최대 시도 횟수와 첫 재시도 대기 시간 (초, 시도마다 2배)
+GRADING_STAGE_MAX_ATTEMPTS = int(os.getenv("GRADING_STAGE_MAX_ATTEMPTS", "3"))
+GRADING_STAGE_RETRY_BACKOFF = float(os.getenv("GRADING_STAGE_RETRY_BACKOFF", "0.5"))
+
+# 답안 제출 중복 요청 처리: Idempotency-Key 헤더(없으면 음성 sha256) + questionId + studentId가 같은 요청은 한 번만 채점
+ANSWER_IDEMPOTENCY_ENABLED = os.getenv("ANSWER_IDEMPOTENCY_ENABLED", "False").lower() in ("true", "1")
+# 완료된 채점 결과를 중복 요청에 그대로 돌려주는 기간 (초)
+ANSWER_IDEMPOTENCY_WINDOW_SECONDS = int(os.getenv("ANSWER_IDEMPOTENCY_WINDOW_SECONDS", "600"))
+# 처리 중인 같은 요청을 기다리는 최대 시간과 조회 간격 (초, 넘으면 202 + job_id로 작업 조회 API 안내)
+ANSWER_IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("ANSWER_IDEMPOTENCY_WAIT_SECONDS", "30"))
+ANSWER_IDEMPOTENCY_POLL_SECONDS = float(os.getenv("ANSWER_IDEMPOTENCY_POLL_SECONDS", "0.5"))
+
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "tail_questions": {
+        "BACKEND": (
+            "django.core.cache.backends.filebased.FileBasedCache"
+            if TAIL_QUESTION_CACHE_DIR
+            else "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": TAIL_QUESTION_CACHE_DIR or "tail-questions",
+        "TIMEOUT": int(os.getenv("TAIL_QUESTION_CACHE_TTL_SECONDS", str(7 * 24 * 3600))),
+        "OPTIONS": {"MAX_ENTRIES": int(os.getenv("TAIL_QUESTION_CACHE_MAX_ENTRIES", "5000"))},
+    },
+}
+
 # CORS 설정
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
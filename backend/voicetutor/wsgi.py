@@ -14,3 +14,12 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "voicetutor.settings")
 
 application = get_wsgi_application()
+
+# 모델 워밍업: gunicorn --preload이면 마스터에서 한 번 로드하고 워커들이 공유
+# (SpeechClient는 gRPC 채널이 fork 후 안전하지 않으므로 워커에서 첫 요청 시 생성)
+from django.conf import settings  # noqa: E402
+
+if settings.MODEL_WARMUP_ENABLED:
+    from submissions.utils.model_registry import warmup_models  # noqa: E402
+
+    warmup_models(include_speech_client=False)
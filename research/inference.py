@@ -1,11 +1,12 @@
 import argparse
+import glob
 import json
 import os
+import time
 import warnings
 
 import joblib
 import numpy as np
-import pandas as pd
 
 warnings.filterwarnings("ignore")
 
@@ -102,37 +103,126 @@ def build_feature_row(js: dict):
     return row
 
 
+# 등급 문자열을 숫자로 변환하는 맵 (train.py와 동일, 리포트에서 정답 비교용)
+GRADE_MAP = {"A+": 8, "A0": 7, "B+": 6, "B0": 5, "C+": 4, "C0": 3, "D+": 2, "D0": 1}
+
+# 반올림한 예측값(1~8) -> 등급 문자 (to_letter_grade와 같은 매핑, 0번은 사용하지 않음)
+_LETTER_BY_ROUNDED = np.array(["D", "D", "D", "C", "C", "B", "B", "A", "A"])
+
+# *_ratio 컬럼 -> 분자 key (분모는 word_cnt)
+RATIO_NUMERATORS = {
+    "repeat_cnt_ratio": "repeat_cnt",
+    "filler_words_cnt_ratio": "filler_words_cnt",
+    "pause_cnt_ratio": "pause_0_5_cnt",
+}
+
+
+def build_feature_matrix(items) -> np.ndarray:
+    """
+    여러 JSON의 피처를 FEATURE_COLUMNS 순서의 float32 행렬로 변환 (build_feature_row와 같은 규칙)
+    - 원본 key를 미리 할당한 행렬에 채운 뒤 *_ratio는 열 단위로 word_cnt로 나눔 (분모 0/누락이면 0.0)
+    - 누락 / None / NaN은 0.0
+    """
+    raw_keys = [RATIO_NUMERATORS.get(col, col) for col in FEATURE_COLUMNS] + ["word_cnt"]
+    raw = np.full((len(items), len(raw_keys)), np.nan, dtype=np.float64)
+    for i, js in enumerate(items):
+        raw[i] = [js.get(key) for key in raw_keys]  # None -> NaN
+    raw = np.nan_to_num(raw, nan=0.0)
+
+    X = raw[:, : len(FEATURE_COLUMNS)].astype(np.float32)
+    word_cnt = raw[:, -1]
+    for j, col in enumerate(FEATURE_COLUMNS):
+        if col in RATIO_NUMERATORS:
+            X[:, j] = np.divide(raw[:, j], word_cnt, out=np.zeros_like(word_cnt), where=word_cnt != 0)
+    return X
+
+
+def run_inference_batch(model, items) -> list:
+    """로드한 모델로 여러 JSON을 한 번의 predict로 예측 (입력 순서대로 결과 dict 목록)"""
+    if not items:
+        return []
+    y_pred = np.asarray(model.predict(build_feature_matrix(items)), dtype=np.float64).reshape(-1)
+    y_round = np.clip(np.round(y_pred), 1, 8).astype(int)
+    return [
+        {"pred_cont": float(cont), "pred_rounded": int(rounded), "pred_letter": str(letter)}
+        for cont, rounded, letter in zip(y_pred, y_round, _LETTER_BY_ROUNDED[y_round])
+    ]
+
+
 def run_inference(model_path: str, js: dict) -> dict:
     """모델 경로와 feature dict(js)를 입력받아 단일 예측 결과 반환"""
-    model = joblib.load(model_path)
+    return run_inference_batch(joblib.load(model_path), [js])[0]
+
+
+def load_items(path: str):
+    """
+    예측할 입력을 (이름, dict) 목록으로 로드
+    - 디렉토리: 하위의 모든 *.json (재귀)
+    - .jsonl: 한 줄에 JSON 하나
+    - 그 외: JSON 파일 하나
+    반환: (items, 실패한 (이름, 사유) 목록)
+    """
+    items, failed = [], []
+    if os.path.isdir(path):
+        for file_path in sorted(glob.glob(os.path.join(path, "**", "*.json"), recursive=True)):
+            try:
+                with open(file_path, "r", encoding="utf-8") as f:
+                    items.append((os.path.relpath(file_path, path), json.load(f)))
+            except (OSError, json.JSONDecodeError) as e:
+                failed.append((file_path, str(e)))
+    elif path.endswith(".jsonl"):
+        with open(path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    items.append((f"{os.path.basename(path)}:{line_no}", json.loads(line)))
+                except json.JSONDecodeError as e:
+                    failed.append((f"{path}:{line_no}", str(e)))
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            items.append((os.path.basename(path), json.load(f)))
+    return items, failed
 
-    feat_row = build_feature_row(js)
-    X = pd.DataFrame([feat_row], columns=FEATURE_COLUMNS)
 
-    y_pred = model.predict(X)[0]
-    y_round = int(np.clip(np.round(y_pred), 1, 8))
-    y_letter = to_letter_grade(y_round)
+def print_report(loaded, results, failed):
+    """예측 분포 요약 + (eval_grade가 있는 경우) 정답 대비 MAE / 등급 정확도 출력"""
+    pred = np.array([r["pred_cont"] for r in results])
+    letters = [r["pred_letter"] for r in results]
 
-    return {
-        "pred_cont": float(y_pred),
-        "pred_rounded": y_round,
-        "pred_letter": y_letter,
-    }
+    print(f"예측 {len(results)}건, 로드 실패 {len(failed)}건")
+    for name, reason in failed:
+        print(f"  [ERROR] {name}: {reason}")
+    if not results:
+        return
+
+    print(f"pred_cont: mean={pred.mean():.4f}, std={pred.std():.4f}, min={pred.min():.4f}, max={pred.max():.4f}")
+    print("등급 분포: " + ", ".join(f"{g}={letters.count(g)}" for g in ("A", "B", "C", "D")))
+
+    truth = [(i, GRADE_MAP.get(js.get("eval_grade"))) for i, (_, js) in enumerate(loaded)]
+    truth = [(i, g) for i, g in truth if g is not None]
+    if truth:
+        idx = np.array([i for i, _ in truth])
+        y_true = np.array([g for _, g in truth], dtype=np.float64)
+        mae = np.abs(pred[idx] - y_true).mean()
+        acc = np.mean([letters[i] == to_letter_grade(g) for i, g in truth])
+        print(f"정답(eval_grade) {len(truth)}건: MAE={mae:.4f}, 등급(A~D) 정확도={acc:.4f}")
 
 
 def main():
-    ap = argparse.ArgumentParser(description="XGBoost 회귀 모델 inference (단일 JSON 파일)")
+    ap = argparse.ArgumentParser(description="XGBoost 회귀 모델 inference (JSON 파일 / 디렉토리 / JSONL 일괄 예측)")
     ap.add_argument("--model_path", type=str, required=True, help="joblib로 저장된 XGBoost 모델 경로")
-    ap.add_argument("--json_path", type=str, required=True, help="예측할 JSON 파일 경로")
+    ap.add_argument(
+        "--json_path", type=str, required=True, help="예측할 JSON 파일, JSON 파일들이 있는 디렉토리, 또는 JSONL 파일"
+    )
+    ap.add_argument("--per_item", action="store_true", help="항목별 예측 결과도 출력")
     args = ap.parse_args()
 
+    json_path = args.json_path
     try:
-        json_path = args.json_path
         if not os.path.exists(json_path):
-            raise FileNotFoundError(f"JSON 파일을 찾을 수 없습니다: {json_path}")
-
-        with open(json_path, "r", encoding="utf-8") as f:
-            js = json.load(f)
+            raise FileNotFoundError(f"입력 경로를 찾을 수 없습니다: {json_path}")
+        loaded, failed = load_items(json_path)
     except json.JSONDecodeError as e:
         print(f"[ERROR] JSON 파싱 실패 ({json_path}): {e}")
         return
@@ -140,17 +230,24 @@ def main():
         print(f"[ERROR] JSON 로드 실패: {e}")
         return
 
-    result = run_inference(args.model_path, js)
-
-    try:
-        print(
-            f"{os.path.basename(json_path)} -> "
-            f"pred_cont={result['pred_cont']:.4f}, "
-            f"pred_rounded={result['pred_rounded']}, "
-            f"letter={result['pred_letter']}"
-        )
-    except KeyError as e:
-        print(f"[ERROR] 결과 형식 오류: {e}")
+    names = [name for name, _ in loaded]
+    items = [js for _, js in loaded]
+
+    model = joblib.load(args.model_path)
+    start = time.perf_counter()
+    results = run_inference_batch(model, items)
+    elapsed = time.perf_counter() - start
+
+    if args.per_item or len(results) == 1:
+        for name, result in zip(names, results):
+            print(
+                f"{name} -> "
+                f"pred_cont={result['pred_cont']:.4f}, "
+                f"pred_rounded={result['pred_rounded']}, "
+                f"letter={result['pred_letter']}"
+            )
+    print_report(loaded, results, failed)
+    print(f"예측 소요 시간(모델 로드 제외): {elapsed:.2f}s")
 
 
 if __name__ == "__main__":